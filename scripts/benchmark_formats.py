@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""File format benchmark script.
+
+Filters the same synthetic data stored as CSV, Parquet and Arrow IPC with
+``columnar.filter_file`` and reports the time per input and output
+format, including CSV parsed by pyarrow into Parquet. Data is
+written twice: in random order, where every Parquet row group spans the
+full value range, and sorted by value, where row-group statistics let the
+threshold skip most of the file. Requires pyarrow.
+
+Usage:
+    python scripts/benchmark_formats.py [--rows N] [--thresholds T ...]
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet
+
+from your_package_name.columnar import filter_file
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+CONVERSIONS = [("csv", "csv"), ("csv", "parquet"), ("parquet", "parquet"), ("arrow", "arrow")]
+
+
+def write_dataset(directory: Path, rows: int, row_group_size: int, clustered: bool, seed: int = 0) -> dict[str, Path]:
+    """Write one synthetic table as CSV, Parquet and Arrow IPC.
+
+    Args:
+        directory: Directory for the generated files
+        rows: Number of rows
+        row_group_size: Rows per Parquet row group and Arrow record batch
+        clustered: Sort rows by value so row groups cover narrow value ranges
+        seed: Random seed
+
+    Returns:
+        Paths of the generated files by format name
+    """
+    rng = random.Random(seed)  # noqa: S311
+    values = [rng.random() for _ in range(rows)]
+    if clustered:
+        values.sort()
+    table = pa.table(
+        {
+            "id": [f"row-{index}" for index in range(rows)],
+            "value": values,
+            "payload": [f"payload-{index % 997:03d}" for index in range(rows)],
+        }
+    )
+
+    paths = {"csv": directory / "data.csv", "parquet": directory / "data.parquet", "arrow": directory / "data.arrow"}
+    pyarrow.csv.write_csv(table, paths["csv"], write_options=pyarrow.csv.WriteOptions(quoting_style="needed"))
+    pyarrow.parquet.write_table(table, paths["parquet"], row_group_size=row_group_size)
+    with pyarrow.ipc.new_file(paths["arrow"], table.schema) as writer:
+        writer.write_table(table, max_chunksize=row_group_size)
+    return paths
+
+
+def time_filter(input_path: Path, output_path: Path, threshold: float) -> tuple[float, int, int]:
+    """Filter one file and return seconds, rows written and skipped chunks."""
+    started = time.perf_counter()
+    stats = filter_file(input_path, output_path, threshold)
+    return time.perf_counter() - started, stats.rows_written, stats.chunks_skipped
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark filtering CSV, Parquet and Arrow IPC files")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per dataset (default: 1000000)")
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=64_000,
+        help="Rows per Parquet row group and Arrow batch (default: 64000)",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[0.5, 0.9, 0.99],
+        help="Filter thresholds (default: 0.5 0.9 0.99)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main script entry point."""
+    args = parse_args()
+
+    for clustered in (False, True):
+        layout = "sorted by value" if clustered else "random order"
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_dataset(Path(directory), args.rows, args.row_group_size, clustered)
+            for threshold in args.thresholds:
+                for source, target in CONVERSIONS:
+                    output = paths[target].with_name(f"out-{paths[target].name}")
+                    seconds, written, skipped = time_filter(paths[source], output, threshold)
+                    logger.info(
+                        f"{layout}, threshold {threshold}: {source:>7} -> {target:<7} "
+                        f"{seconds:.3f}s ({written:,} rows kept, {skipped} row groups skipped)"
+                    )
+
+
+if __name__ == "__main__":
+    main()
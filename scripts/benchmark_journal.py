@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Increment journal benchmark script.
+
+Measures durable increment throughput of ``IncrementJournal`` for several
+group-commit latency windows, and the time needed to recover the journal
+from a snapshot plus log tail.
+
+Usage:
+    python scripts/benchmark_journal.py [--ops N] [--threads N]
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from your_package_name.journal import IncrementJournal
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def benchmark_throughput(directory: Path, ops: int, threads: int, commit_interval: float) -> float:
+    """Run durable increments from several threads and return operations per second.
+
+    Args:
+        directory: Empty journal directory
+        ops: Total number of increments across all threads
+        threads: Number of concurrent writer threads
+        commit_interval: Group-commit latency window in seconds
+
+    Returns:
+        Acknowledged (durable) increments per second
+    """
+    per_thread = ops // threads
+    with IncrementJournal(directory, commit_interval=commit_interval, snapshot_every=0) as journal:
+        for index in range(threads):
+            journal.create(f"counter-{index}")
+
+        def worker(name: str) -> None:
+            for _ in range(per_thread):
+                journal.increment(name)
+
+        workers = [threading.Thread(target=worker, args=(f"counter-{i}",)) for i in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    return per_thread * threads / elapsed
+
+
+def benchmark_recovery(directory: Path, counters: int, tail: int) -> tuple[float, float]:
+    """Measure recovery time from a log only, and from a snapshot plus a log tail.
+
+    Args:
+        directory: Empty journal directory
+        counters: Number of counters to create
+        tail: Number of increments logged after the snapshot
+
+    Returns:
+        Recovery seconds without and with a snapshot
+    """
+    with IncrementJournal(directory, snapshot_every=0) as journal:
+        for index in range(counters):
+            journal.create(f"counter-{index}", wait=False)
+        for index in range(tail):
+            journal.increment(f"counter-{index % counters}", wait=False)
+
+    started = time.perf_counter()
+    with IncrementJournal(directory, snapshot_every=0) as journal:
+        log_only = time.perf_counter() - started
+        journal.snapshot()
+        for index in range(tail):
+            journal.increment(f"counter-{index % counters}", wait=False)
+
+    started = time.perf_counter()
+    IncrementJournal(directory, snapshot_every=0).close()
+    with_snapshot = time.perf_counter() - started
+    return log_only, with_snapshot
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the increment journal")
+    parser.add_argument("--ops", type=int, default=20_000, help="Durable increments per run (default: 20000)")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent writer threads (default: 16)")
+    parser.add_argument(
+        "--intervals",
+        type=float,
+        nargs="+",
+        default=[0.0, 0.001, 0.005],
+        help="Group-commit latency windows in seconds (default: 0 0.001 0.005)",
+    )
+    parser.add_argument("--counters", type=int, default=100_000, help="Counters for recovery run (default: 100000)")
+    parser.add_argument("--tail", type=int, default=100_000, help="Log tail length for recovery (default: 100000)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main script entry point."""
+    args = parse_args()
+
+    for interval in args.intervals:
+        with tempfile.TemporaryDirectory() as directory:
+            rate = benchmark_throughput(Path(directory), args.ops, args.threads, interval)
+        logger.info(f"threads={args.threads} commit_interval={interval * 1000:.1f}ms: {rate:,.0f} durable ops/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_only, with_snapshot = benchmark_recovery(Path(directory), args.counters, args.tail)
+    logger.info(f"recovery from full log ({args.counters + args.tail:,} records): {log_only:.3f}s")
+    logger.info(f"recovery from snapshot + {args.tail:,}-record tail: {with_snapshot:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""CSV scanner benchmark script.
+
+Compares ``streaming.filter_csv`` (the ``csv`` module parses every field of
+every row) with ``scanner.filter_csv_mmap`` (only the 'value' field of
+rejected rows is parsed) on the same wide CSV file, across selectivities
+from 1% to 100% of rows kept.
+
+Usage:
+    python scripts/benchmark_scanner.py [--rows N] [--selectivities S ...]
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import csv
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from your_package_name.scanner import filter_csv_mmap
+from your_package_name.streaming import filter_csv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def write_dataset(path: Path, rows: int, quoted_fraction: float, seed: int = 0) -> None:
+    """Write a CSV with an id, a value and several text columns.
+
+    Args:
+        path: Output CSV path
+        rows: Number of data rows
+        quoted_fraction: Fraction of rows whose note field needs quoting
+        seed: Random seed
+    """
+    rng = random.Random(seed)  # noqa: S311
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "category", "value", "source", "note", "payload"])
+        for index in range(rows):
+            note = "multi-line, quoted\nnote" if rng.random() < quoted_fraction else "plain note"
+            writer.writerow([index, f"cat-{index % 17}", f"{rng.random():.6f}", "sensor-a", note, "x" * 40])
+
+
+def time_run(function: str, input_path: Path, output_path: Path, threshold: float) -> tuple[float, int]:
+    """Run one filter and return seconds and rows written."""
+    started = time.perf_counter()
+    if function == "mmap":
+        stats = filter_csv_mmap(input_path, output_path, threshold)
+    else:
+        stats = filter_csv(input_path, output_path, threshold)
+    return time.perf_counter() - started, stats.rows_written
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the mmap CSV scanner against the csv module")
+    parser.add_argument("--rows", type=int, default=500_000, help="Data rows (default: 500000)")
+    parser.add_argument(
+        "--selectivities",
+        type=float,
+        nargs="+",
+        default=[0.01, 0.1, 0.5, 1.0],
+        help="Fractions of rows kept (default: 0.01 0.1 0.5 1.0)",
+    )
+    parser.add_argument(
+        "--quoted-fraction",
+        type=float,
+        default=0.0,
+        help="Fraction of rows with quoted multi-line fields (default: 0)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main script entry point."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "input.csv"
+        write_dataset(source, args.rows, args.quoted_fraction)
+        logger.info(f"Input: {args.rows:,} rows, {source.stat().st_size / 1e6:.1f} MB")
+
+        for selectivity in args.selectivities:
+            threshold = max(0.0, 1.0 - selectivity)
+            csv_seconds, kept = time_run("csv", source, Path(directory) / "csv.csv", threshold)
+            mmap_seconds, mmap_kept = time_run("mmap", source, Path(directory) / "mmap.csv", threshold)
+            if kept != mmap_kept:
+                raise RuntimeError(f"Row counts differ: csv kept {kept}, mmap kept {mmap_kept}")
+            logger.info(
+                f"selectivity {selectivity:>5.0%}: csv {csv_seconds:.3f}s, mmap {mmap_seconds:.3f}s "
+                f"({csv_seconds / mmap_seconds:.1f}x), {kept:,} rows kept"
+            )
+
+
+if __name__ == "__main__":
+    main()
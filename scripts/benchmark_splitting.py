@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Byte-range splitting benchmark script.
+
+Filters one synthetic CSV with ``streaming.filter_csv`` on a single
+process and with ``splitting.filter_csv_split`` on an increasing number of
+processes, and reports the time and speedup of each. The record index is
+built on the first split run and reused afterwards; its build time is
+reported separately.
+
+Usage:
+    python scripts/benchmark_splitting.py [--rows N] [--jobs J ...]
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from your_package_name.splitting import DEFAULT_INDEX_BLOCK_SIZE, filter_csv_split, load_or_build_index
+from your_package_name.streaming import filter_csv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def write_dataset(path: Path, rows: int, seed: int = 0) -> None:
+    """Write a CSV with an id, a value and a note that is sometimes quoted across lines.
+
+    Args:
+        path: Output CSV path
+        rows: Number of data rows
+        seed: Random seed
+    """
+    rng = random.Random(seed)  # noqa: S311
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "value", "note"])
+        for index in range(rows):
+            note = "quoted, with\nnewline" if index % 50 == 0 else "plain note"
+            writer.writerow([index, f"{rng.random():.6f}", note])
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark filtering one CSV split into byte ranges")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Data rows (default: 2000000)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=sorted({2, 4, os.cpu_count() or 1}),
+        help="Process counts to compare (default: 2 4 and the CPU count)",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_INDEX_BLOCK_SIZE,
+        help=f"Record index granularity in bytes (default: {DEFAULT_INDEX_BLOCK_SIZE})",
+    )
+    parser.add_argument("--threshold", type=float, default=0.5, help="Filter threshold (default: 0.5)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main script entry point."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "input.csv"
+        write_dataset(source, args.rows)
+        logger.info(f"Input: {args.rows:,} rows, {source.stat().st_size / 1e6:.1f} MB")
+
+        started = time.perf_counter()
+        baseline = filter_csv(source, Path(directory) / "single.csv", args.threshold)
+        single_seconds = time.perf_counter() - started
+        logger.info(f"filter_csv, 1 process: {single_seconds:.3f}s")
+
+        started = time.perf_counter()
+        index = load_or_build_index(source, block_size=args.block_size, jobs=max(args.jobs))
+        logger.info(f"Record index: {len(index.offsets):,} offsets in {time.perf_counter() - started:.3f}s")
+
+        for jobs in args.jobs:
+            started = time.perf_counter()
+            stats = filter_csv_split(
+                source, Path(directory) / f"split-{jobs}.csv", args.threshold, jobs=jobs, block_size=args.block_size
+            )
+            seconds = time.perf_counter() - started
+            if stats != baseline:
+                raise RuntimeError(f"Split run differs from filter_csv: {stats} != {baseline}")
+            logger.info(f"filter_csv_split, {jobs} process(es): {seconds:.3f}s ({single_seconds / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
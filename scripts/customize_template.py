@@ -4,6 +4,12 @@
 Script to customize the template for a specific project by replacing
 placeholder text with project-specific values.
 
+The repository is listed once (honouring .gitignore), and every
+placeholder is replaced in a single pass per file by one compiled
+pattern. Files without placeholders are skipped after one search,
+files are processed on a thread pool, and each changed file is replaced
+atomically. ``--dry-run`` prints a unified diff instead of writing.
+
 Copyright (C) 2026 Wiktor Hawrylik
 
 This program is free software: you can redistribute it and/or modify
@@ -20,8 +26,28 @@ You should have received a copy of the GNU Affero General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import argparse
+import difflib
+import fnmatch
+import os
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+
+# Files rewritten wherever they are, and trees rewritten by file suffix.
+TEMPLATE_FILES = frozenset(
+    {"README.md", "pyproject.toml", "mkdocs.yml", "CONTRIBUTING.md", "Makefile", "docs/index.md"}
+)
+TEMPLATE_TREES = {"src": ".py", "tests": ".py", "scripts": ".py", "docs": ".md"}
+# This script: rewriting it would replace its own placeholders.
+TEMPLATE_EXCLUDED = frozenset({"scripts/customize_template.py"})
 
 
 def prompt_user() -> dict[str, str]:
@@ -72,6 +98,172 @@ def prompt_user() -> dict[str, str]:
     return config
 
 
+class Replacer:
+    """Replace many placeholders in one pass over a file's bytes.
+
+    All placeholders are compiled into a single regex alternation, longest
+    first, so each position is matched once against every placeholder and
+    a replacement is never itself rewritten by a later placeholder. Files
+    are handled as UTF-8 bytes: a file that contains no placeholder is
+    rejected by one search of the pattern and never decoded.
+
+    Examples:
+        >>> Replacer({"your-package-name": "my-lib"}).apply(b"pip install your-package-name")
+        b'pip install my-lib'
+    """
+
+    def __init__(self, replacements: Mapping[str, str]) -> None:
+        """Compile the placeholders.
+
+        Args:
+            replacements: Dictionary of {old_text: new_text}; empty keys are ignored
+        """
+        self.table = {old.encode("utf-8"): new.encode("utf-8") for old, new in replacements.items() if old}
+        keys = sorted(self.table, key=len, reverse=True)
+        self.pattern = re.compile(b"|".join(re.escape(key) for key in keys)) if keys else None
+
+    def apply(self, data: bytes) -> bytes:
+        """Return ``data`` with every placeholder replaced (``data`` itself if there is none)."""
+        if self.pattern is None or self.pattern.search(data) is None:
+            return data
+        return self.pattern.sub(lambda match: self.table[match.group()], data)
+
+
+@dataclass
+class FileChange:
+    """A file whose contents the replacements change."""
+
+    path: Path
+    before: bytes
+    after: bytes
+
+    def diff(self) -> str:
+        """Return a unified diff of the change."""
+        before = self.before.decode("utf-8", errors="replace").splitlines(keepends=True)
+        after = self.after.decode("utf-8", errors="replace").splitlines(keepends=True)
+        return "".join(difflib.unified_diff(before, after, f"a/{self.path}", f"b/{self.path}"))
+
+
+def is_template_file(relative_path: Path) -> bool:
+    """Return True for the files the template customization rewrites."""
+    if relative_path.as_posix() in TEMPLATE_EXCLUDED:
+        return False
+    if relative_path.as_posix() in TEMPLATE_FILES:
+        return True
+    parts = relative_path.parts
+    return len(parts) > 1 and TEMPLATE_TREES.get(parts[0]) == relative_path.suffix
+
+
+def _ignore_patterns(root: Path) -> list[str]:
+    """Return the patterns of the root .gitignore, without comments and negations."""
+    gitignore = root / ".gitignore"
+    if not gitignore.is_file():
+        return []
+    lines = (line.strip() for line in gitignore.read_text(encoding="utf-8").splitlines())
+    return [line for line in lines if line and not line.startswith(("#", "!"))]
+
+
+def _ignored(relative_path: str, name: str, is_dir: bool, patterns: list[str]) -> bool:
+    """Return True if a path matches one of the .gitignore patterns."""
+    for pattern in patterns:
+        if pattern.endswith("/") and not is_dir:
+            continue
+        glob = pattern.rstrip("/")
+        if glob.startswith("/") or "/" in glob:
+            if fnmatch.fnmatchcase(relative_path, glob.lstrip("/")):
+                return True
+        elif fnmatch.fnmatchcase(name, glob):
+            return True
+    return False
+
+
+def list_files(root: Path) -> list[Path]:
+    """Return every file under ``root`` that git does not ignore, relative to ``root``.
+
+    Inside a git work tree, with git on PATH, the listing comes from
+    ``git ls-files``, which applies every .gitignore exactly. Elsewhere the
+    tree is walked once, skipping ``.git`` and paths matching the root
+    .gitignore (without negated patterns).
+    """
+    git = shutil.which("git")
+    if git is not None:
+        try:
+            result = subprocess.run(  # noqa: S603
+                [git, "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+                cwd=root,
+                capture_output=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            pass
+        else:
+            names = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+            return sorted(Path(name) for name in names if name and (root / name).is_file())
+
+    patterns = _ignore_patterns(root)
+    files: list[Path] = []
+    for directory, dirnames, filenames in os.walk(root):
+        base = Path(directory).relative_to(root)
+        dirnames[:] = sorted(
+            name for name in dirnames if name != ".git" and not _ignored((base / name).as_posix(), name, True, patterns)
+        )
+        files.extend(
+            base / name for name in sorted(filenames) if not _ignored((base / name).as_posix(), name, False, patterns)
+        )
+    return files
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file's contents through a temporary sibling, keeping its permissions."""
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as tmp:
+            tmp.write(data)
+        shutil.copymode(path, tmp_name)
+        Path(tmp_name).replace(path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _replace_one(path: Path, replacer: Replacer, dry_run: bool) -> Optional[FileChange]:
+    """Apply the replacements to one file, returning the change if there is one."""
+    before = path.read_bytes()
+    after = replacer.apply(before)
+    if after == before:
+        return None
+    if not dry_run:
+        _write_atomic(path, after)
+    return FileChange(path, before, after)
+
+
+def replace_in_files(
+    paths: Iterable[Path],
+    replacer: Replacer,
+    *,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> list[FileChange]:
+    """Apply the replacements to many files in parallel.
+
+    Each changed file is written atomically; with ``dry_run`` nothing is
+    written and the changes are only returned.
+
+    Args:
+        paths: Files to process
+        replacer: Compiled placeholders
+        dry_run: Compute the changes without writing them
+        jobs: Worker threads (default: one per CPU, at most 32)
+
+    Returns:
+        The changed files, in the order of ``paths``
+    """
+    workers = jobs if jobs is not None else min(32, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        changes = executor.map(lambda path: _replace_one(path, replacer, dry_run), paths)
+        return [change for change in changes if change is not None]
+
+
 def replace_in_file(file_path: Path, replacements: dict[str, str]) -> None:
     """Replace placeholders in a file.
 
@@ -82,25 +274,31 @@ def replace_in_file(file_path: Path, replacements: dict[str, str]) -> None:
     if not file_path.exists():
         return
 
-    content = file_path.read_text()
-    modified = content
-
-    for old, new in replacements.items():
-        modified = modified.replace(old, new)
-
-    if modified != content:
-        file_path.write_text(modified)
+    if _replace_one(file_path, Replacer(replacements), dry_run=False) is not None:
         print(f"  ✓ Updated: {file_path}")
 
 
-def customize_template(config: dict[str, str]) -> None:
+def customize_template(
+    config: dict[str, str],
+    *,
+    root: Path = Path(),
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> list[FileChange]:
     """Customize all template files.
 
     Args:
         config: Project configuration dictionary
+        root: Repository root (default: the current directory)
+        dry_run: Print a diff of every change instead of writing files or
+            renaming the source directory
+        jobs: Worker threads for reading and rewriting files
+
+    Returns:
+        The changed files
     """
     print()
-    print("Customizing template files...")
+    print("Customizing template files..." if not dry_run else "Dry run: showing changes without writing them...")
     print()
 
     # Define replacements
@@ -113,38 +311,27 @@ def customize_template(config: dict[str, str]) -> None:
         "A modern Python library template": config["description"],
     }
 
-    # Files and directories to process
-    files_to_process = [
-        "README.md",
-        "pyproject.toml",
-        "mkdocs.yml",
-        "CONTRIBUTING.md",
-        "docs/index.md",
-    ]
-
-    # Process specific files
-    for file_name in files_to_process:
-        file_path = Path(file_name)
-        replace_in_file(file_path, replacements)
-
-    # Process all Python files
-    for py_file in Path("src").rglob("*.py"):
-        replace_in_file(py_file, replacements)
-
-    for py_file in Path("tests").rglob("*.py"):
-        replace_in_file(py_file, replacements)
-
-    # Process documentation files
-    for md_file in Path("docs").rglob("*.md"):
-        replace_in_file(md_file, replacements)
+    paths = [root / path for path in list_files(root) if is_template_file(path)]
+    changes = replace_in_files(paths, Replacer(replacements), dry_run=dry_run, jobs=jobs)
+    for change in changes:
+        if dry_run:
+            print(change.diff(), end="")
+        else:
+            print(f"  ✓ Updated: {change.path.relative_to(root)}")
 
     # Rename source directory
-    old_src = Path("src/your_package_name")
-    new_src = Path(f"src/{config['module_name']}")
+    old_src = root / "src" / "your_package_name"
+    new_src = root / "src" / config["module_name"]
 
     if old_src.exists() and old_src != new_src:
-        old_src.rename(new_src)
-        print(f"  ✓ Renamed: {old_src} → {new_src}")
+        if not dry_run:
+            old_src.rename(new_src)
+        print(f"  ✓ {'Would rename' if dry_run else 'Renamed'}: {old_src} → {new_src}")
+
+    if dry_run:
+        print()
+        print(f"{len(changes)} file(s) would change. Nothing was written.")
+        return changes
 
     print()
     print("=" * 60)
@@ -157,13 +344,27 @@ def customize_template(config: dict[str, str]) -> None:
     print("  3. Run tests: make test")
     print("  4. Start coding!")
     print()
+    return changes
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Returns:
+        Parsed command-line arguments
+    """
+    parser = argparse.ArgumentParser(description="Customize the template with your project details")
+    parser.add_argument("--dry-run", action="store_true", help="Print a diff of the changes without writing them")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker threads (default: one per CPU)")
+    return parser.parse_args()
 
 
 def main() -> None:
     """Main entry point."""
+    args = parse_args()
     try:
         config = prompt_user()
-        customize_template(config)
+        customize_template(config, dry_run=args.dry_run, jobs=args.jobs)
     except KeyboardInterrupt:
         print("\n\nCustomization cancelled.")
         sys.exit(1)
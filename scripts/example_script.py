@@ -22,8 +22,24 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import logging
+import signal
 import sys
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
+from typing import Optional
+
+from your_package_name.batch import expand_inputs, filter_incremental
+from your_package_name.columnar import CsvReader
+from your_package_name.ledger import LEDGER_NAME, ReadLedger
+from your_package_name.metrics import DEFAULT_METRICS_INTERVAL, MetricsReporter, PipelineMetrics, format_summary
+from your_package_name.partitioning import filter_partitioned
+from your_package_name.profiling import DEFAULT_TOP, PROFILE_MODES, ProfileReport, profile_run
+from your_package_name.streaming import DEFAULT_CHECKPOINT_INTERVAL, DEFAULT_CHUNK_SIZE
+from your_package_name.validation import ValidationSpec, load_validation_spec
+from your_package_name.watch import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE, watch
 
 # Set up logging
 logging.basicConfig(
@@ -33,17 +49,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def process_file(input_path: Path, output_path: Path, threshold: float = 0.5) -> None:
+def process_file(
+    input_path: Path,
+    output_path: Path,
+    threshold: float = 0.5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    force: bool = False,
+    keep_stale: bool = False,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
+    reader: CsvReader = "csv",
+    jobs: Optional[int] = 1,
+    metrics: Optional[PipelineMetrics] = None,
+    validation: Optional[ValidationSpec] = None,
+    ledger: Optional[ReadLedger] = None,
+) -> None:
     """Process data from input file and save to output file.
 
+    The input is streamed in chunks of ``chunk_size`` rows, so memory use
+    does not grow with file size. The output is written to a temporary
+    file and renamed into place when complete.
+
+    Compressed CSV input (gzip, bzip2, xz) is detected from its content,
+    and an output ending in ``.gz``, ``.bz2`` or ``.xz`` is compressed.
+    Parquet (``.parquet``) and Arrow IPC (``.arrow``, ``.feather``) inputs
+    and outputs are supported when pyarrow is installed; for Parquet input
+    the threshold skips whole row groups using their statistics.
+
+    A manifest in the output directory records the input fingerprint and
+    threshold; the file is skipped when neither changed since the last run
+    and the output is intact.
+
+    With ``checkpoint_interval`` set, an uncompressed CSV run records its
+    progress in a sidecar file next to the output; ``resume`` continues an
+    interrupted run from the last checkpoint.
+
+    With ``jobs`` other than 1, an uncompressed CSV to CSV run is split
+    into record-aligned byte ranges filtered on that many processes; the
+    record index is saved next to the input for the next run.
+
+    With ``validation`` set, a CSV input is checked against the spec in
+    the same pass as the filter (no checkpoints); the output is only
+    written if every check passes.
+
+    With ``ledger`` set, the input bytes are hashed as they are read and
+    the ledger records that the whole input was read (see
+    ``verify_ledger``).
+
     Args:
-        input_path: Path to input CSV file
-        output_path: Path to output CSV file
+        input_path: Path to input CSV, Parquet or Arrow IPC file
+        output_path: Path to output file; its suffix selects the format
         threshold: Threshold value for filtering (default: 0.5)
+        chunk_size: Rows read and filtered per chunk (default: 10000)
+        force: Reprocess even if the manifest says the output is current
+        keep_stale: Keep outputs whose inputs were deleted, only forgetting
+            them in the manifest (default: False, they are deleted)
+        checkpoint_interval: Seconds between checkpoints (default: None, off)
+        resume: Continue from the last checkpoint of an interrupted run
+        reader: "mmap" scans an uncompressed CSV through a memory map, parsing
+            only the 'value' field of rejected rows (no checkpoints);
+            "pipelined" reads, parses, filters and writes on separate threads
+            connected by bounded queues (no checkpoints)
+        jobs: Processes splitting one CSV into byte ranges; None for one
+            per CPU (default: 1, no checkpoints when splitting)
+        metrics: Collects read, parse, filter and write times and row and
+            byte counts of the run
+        validation: Schema, row-level and aggregate checks of the input
+        ledger: Read-completeness ledger to record the run in
 
     Raises:
         FileNotFoundError: If input file doesn't exist
-        ValueError: If threshold is invalid
+        ValueError: If threshold or chunk size is invalid, a value is not
+            numeric, or the input fails validation
+        KeyError: If the input has no 'value' column
+        TypeError: If a columnar input's 'value' column is not numeric
+        ImportError: If a columnar file is used without pyarrow installed
     """
     logger.info(f"Processing {input_path}")
 
@@ -54,26 +134,241 @@ def process_file(input_path: Path, output_path: Path, threshold: float = 0.5) ->
     if not 0 <= threshold <= 1:
         raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
 
-    # Example processing logic
-    # In a real script, you would:
-    # 1. Load data from input_path
-    # 2. Process it according to your needs
-    # 3. Save results to output_path
-
     logger.info(f"Using threshold: {threshold}")
 
-    # Create output directory if it doesn't exist
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    stats, report = filter_incremental(
+        [input_path],
+        output_path,
+        threshold,
+        chunk_size=chunk_size,
+        force=force,
+        keep_stale=keep_stale,
+        checkpoint_interval=checkpoint_interval,
+        resume=resume,
+        reader=reader,
+        jobs=jobs,
+        metrics=metrics,
+        validation=validation,
+        ledger=ledger,
+    )
+    logger.info(report.summary())
+    if stats.validation is not None:
+        logger.info(stats.validation.summary())
+    if stats.pipeline is not None:
+        logger.info(stats.pipeline.summary())
+    if report.processed:
+        logger.info(f"Kept {stats.rows_written} of {stats.rows_read} rows")
+    if stats.chunks_skipped:
+        logger.debug(f"Skipped {stats.chunks_skipped} row group(s) using column statistics")
+
+    logger.info(f"Results saved to {output_path}")
+
 
-    # TODO: Implement actual data processing here
-    # Example: Load data, filter by threshold, and save results
+def process_files(
+    input_paths: list[Path],
+    output_path: Path,
+    threshold: float = 0.5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    jobs: Optional[int] = 1,
+    per_shard: bool = False,
+    force: bool = False,
+    keep_stale: bool = False,
+    reader: CsvReader = "csv",
+    metrics: Optional[PipelineMetrics] = None,
+    validation: Optional[ValidationSpec] = None,
+    ledger: Optional[ReadLedger] = None,
+) -> None:
+    """Process many input shards in parallel.
+
+    Shards are scheduled largest first on a process pool. Results are
+    merged into ``output_path`` in input order, or written to
+    ``output_path/<shard name>`` when ``per_shard`` is set. Outputs that
+    the manifest shows as current are skipped, and outputs of deleted
+    inputs from the same input directories are removed.
 
+    Args:
+        input_paths: Input CSV, Parquet or Arrow IPC files
+        output_path: Merged output CSV file, or output directory if per_shard
+        threshold: Threshold value for filtering (default: 0.5)
+        chunk_size: Rows read and filtered per chunk (default: 10000)
+        jobs: Worker processes; None for one per CPU (default: 1)
+        per_shard: Write one output per input shard
+        force: Reprocess every input regardless of the manifest
+        keep_stale: Keep outputs whose inputs were deleted instead of deleting them
+        reader: CSV reader for CSV shards, "csv", "mmap" or "pipelined"
+        metrics: Collects the row totals of the run
+        validation: Checks applied to each CSV shard on its own
+        ledger: Read-completeness ledger to record every processed shard in
+
+    Raises:
+        ValueError: If threshold or jobs is invalid, shards are incompatible,
+            or a shard fails validation
+    """
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+
+    logger.info(f"Processing {len(input_paths)} files with {jobs or 'all'} worker(s), threshold {threshold}")
+    stats, report = filter_incremental(
+        input_paths,
+        output_path,
+        threshold,
+        jobs=jobs,
+        per_shard=per_shard,
+        chunk_size=chunk_size,
+        force=force,
+        keep_stale=keep_stale,
+        reader=reader,
+        metrics=metrics,
+        validation=validation,
+        ledger=ledger,
+    )
+    logger.info(report.summary())
+    if report.processed:
+        logger.info(f"Kept {stats.rows_written} of {stats.rows_read} rows")
     logger.info(f"Results saved to {output_path}")
 
 
-def parse_args() -> argparse.Namespace:
+def process_partitioned(
+    input_paths: list[Path],
+    output_dir: Path,
+    partition_by: list[str],
+    threshold: float = 0.5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    force: bool = False,
+    metrics: Optional[PipelineMetrics] = None,
+) -> None:
+    """Process CSV inputs into a Hive-partitioned output directory.
+
+    Kept rows are written to ``output_dir/<col>=<value>/.../part-N.csv``
+    files, one directory level per partition column. The whole directory
+    is replaced only when every input has been processed.
+
+    Args:
+        input_paths: Input CSV files with the same header
+        output_dir: Output dataset directory
+        partition_by: Partition columns, outermost first
+        threshold: Threshold value for filtering (default: 0.5)
+        chunk_size: Rows read and filtered per chunk (default: 10000)
+        force: Replace output_dir even if it is not a partitioned dataset
+        metrics: Collects read, parse, filter and write times and row and
+            byte counts of the run
+
+    Raises:
+        ValueError: If threshold is invalid, the partition columns are not
+            in the inputs, input headers differ, a value is not numeric, or
+            output_dir contains an input
+        KeyError: If an input has no 'value' column
+        FileExistsError: If output_dir exists and is not a partitioned
+            dataset, unless force is set
+    """
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+
+    logger.info(f"Partitioning {len(input_paths)} file(s) by {', '.join(partition_by)}, threshold {threshold}")
+    stats, written = filter_partitioned(
+        input_paths, output_dir, threshold, partition_by, chunk_size=chunk_size, metrics=metrics, force=force
+    )
+    logger.info(f"Kept {stats.rows_written} of {stats.rows_read} rows")
+    logger.info(f"Wrote {len(written.files)} files in {written.partitions} partitions to {output_dir}")
+
+
+def ledger_path(output_path: Path, per_shard: bool = False) -> Path:
+    """Return the ledger location for an output, next to its manifest."""
+    return (output_path if per_shard else output_path.parent) / LEDGER_NAME
+
+
+def verify_ledger(path: Path, deep: bool = False, jobs: Optional[int] = None) -> bool:
+    """Verify that every input in a ledger was read in full into its output.
+
+    Unchanged files are trusted from their size and mtime; changed inputs
+    are re-hashed chunk by chunk on ``jobs`` threads. The ledger is saved
+    afterwards so files that were only touched are trusted next time.
+
+    Args:
+        path: Ledger file
+        deep: Re-hash every input and recount every output
+        jobs: Threads re-hashing chunks; None for one per CPU
+
+    Returns:
+        True if verification passed
+
+    Raises:
+        FileNotFoundError: If the ledger does not exist
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Ledger not found: {path}")
+    ledger = ReadLedger.load(path)
+    report = ledger.verify(deep=deep, jobs=jobs)
+    for key, problems in report.issues.items():
+        for problem in problems:
+            logger.error(f"{key}: {problem}")
+    logger.info(report.summary())
+    ledger.save()
+    return report.passed
+
+
+def watch_directory(
+    input_dir: Path,
+    output_dir: Path,
+    threshold: float = 0.5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    jobs: Optional[int] = None,
+    reader: CsvReader = "csv",
+    settle: float = DEFAULT_SETTLE,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> None:
+    """Process files as they land in a directory until SIGINT or SIGTERM.
+
+    Inputs are filtered on a warm process pool into ``output_dir`` and
+    then moved to ``input_dir/done`` or ``input_dir/failed``. The first
+    signal stops picking up new files and waits for files in flight.
+
+    Args:
+        input_dir: Directory receiving input files
+        output_dir: Directory for outputs, named like their inputs
+        threshold: Threshold value for filtering (default: 0.5)
+        chunk_size: Rows read and filtered per chunk (default: 10000)
+        jobs: Worker processes; None for one per CPU
+        reader: CSV reader, "csv", "mmap" or "pipelined"
+        settle: Seconds a file must be unchanged when inotify cannot tell
+            that it is complete (default: 2)
+        poll_interval: Seconds between directory scans (default: 1)
+
+    Raises:
+        FileNotFoundError: If the input directory doesn't exist
+        ValueError: If threshold or jobs is invalid
+    """
+    stop = threading.Event()
+
+    def request_stop(signum: int, _frame: object) -> None:
+        """Stop accepting new files."""
+        logger.info(f"Received {signal.Signals(signum).name}, finishing files in flight")
+        stop.set()
+
+    previous = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        watch(
+            input_dir,
+            output_dir,
+            threshold,
+            stop=stop,
+            jobs=jobs,
+            chunk_size=chunk_size,
+            reader=reader,
+            settle=settle,
+            interval=poll_interval,
+        )
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     """Parse command-line arguments.
 
+    Args:
+        argv: Arguments to parse (default: None, ``sys.argv[1:]``)
+
     Returns:
         Parsed command-line arguments
     """
@@ -88,6 +383,46 @@ Examples:
   # Process with custom threshold
   %(prog)s --input data/raw/input.csv --output data/processed/output.csv --threshold 0.7
 
+  # Process every shard in a directory on 8 processes into one merged file
+  %(prog)s --input data/raw --output data/processed/merged.csv --jobs 8
+
+  # Process a glob of shards into one output per shard (use all CPUs)
+  %(prog)s --input 'data/raw/2026-*.csv' --output data/processed/ --per-shard --jobs 0
+
+  # Read gzip/bzip2/xz input directly; compress the output by extension
+  %(prog)s --input data/raw/archive.csv.gz --output data/processed/output.csv.xz
+
+  # Filter a Parquet file into Parquet (requires pyarrow)
+  %(prog)s --input data/raw/events.parquet --output data/processed/events.parquet --threshold 0.9
+
+  # Split one large CSV into byte ranges filtered on all CPUs
+  %(prog)s --input data/raw/huge.csv --output data/processed/huge.csv --jobs 0
+
+  # Continue a long single-file run that was interrupted
+  %(prog)s --input data/raw/huge.csv --output data/processed/huge.csv --resume
+
+  # Keep running and process files as they land in data/raw/incoming
+  %(prog)s --input data/raw/incoming --output data/processed/ --watch --jobs 4
+
+  # Write kept rows to data/processed/events/date=.../region=.../part-00000.csv
+  %(prog)s --input data/raw/events.csv --output data/processed/events --partition-by date,region
+
+  # Reprocess everything, ignoring the manifest of unchanged inputs
+  %(prog)s --input data/raw --output data/processed/ --per-shard --force
+
+  # Log per-stage timings at the end and export metrics every 10 seconds
+  %(prog)s --input data/raw/in.csv --output data/processed/out.csv --metrics-file m.jsonl --prometheus-file m.prom
+
+  # Check schema, ranges and aggregates in the same pass; write nothing on failure
+  %(prog)s --input data/raw/input.csv --output data/processed/output.csv --validate configs/validation.toml
+
+  # Record proof that every input was read in full, then verify it later
+  %(prog)s --input data/raw --output data/processed/merged.csv --ledger
+  %(prog)s --input data/raw --output data/processed/merged.csv --verify-ledger deep
+
+  # Profile CPU and memory of a slow run (reports in profiles/)
+  %(prog)s --input data/raw/input.csv --output data/processed/output.csv --profile both
+
   # Enable verbose logging
   %(prog)s --input data/raw/input.csv --output data/processed/output.csv --verbose
         """,
@@ -96,9 +431,9 @@ Examples:
     parser.add_argument(
         "--input",
         "-i",
-        type=Path,
+        nargs="+",
         required=True,
-        help="Path to input CSV file",
+        help="Input CSV, Parquet or Arrow files, directories or glob patterns",
     )
 
     parser.add_argument(
@@ -106,7 +441,7 @@ Examples:
         "-o",
         type=Path,
         required=True,
-        help="Path to output CSV file",
+        help="Path to output file, format by suffix (output directory with --per-shard or --partition-by)",
     )
 
     parser.add_argument(
@@ -117,6 +452,157 @@ Examples:
         help="Threshold value for filtering (default: 0.5)",
     )
 
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows read and filtered per chunk (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes, across inputs or byte ranges of one CSV; 0 uses all CPUs (default: 1)",
+    )
+
+    parser.add_argument(
+        "--per-shard",
+        action="store_true",
+        help="Write one output file per input into the --output directory",
+    )
+
+    parser.add_argument(
+        "--partition-by",
+        metavar="COLUMNS",
+        help="Comma-separated CSV columns to split the output by into --output/<col>=<value>/part-N.csv files",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "Reprocess inputs even if the manifest shows their outputs are current; "
+            "with --partition-by, replace an output that is not a partitioned dataset"
+        ),
+    )
+
+    parser.add_argument(
+        "--keep-stale",
+        action="store_true",
+        help="Keep outputs whose inputs were deleted instead of removing them (they are still forgotten)",
+    )
+
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help=f"Seconds between checkpoints of a single CSV input (default: {DEFAULT_CHECKPOINT_INTERVAL:g})",
+    )
+
+    parser.add_argument(
+        "--reader",
+        choices=["csv", "mmap", "pipelined"],
+        default="csv",
+        help=(
+            "CSV reader: 'mmap' parses only the value column of rejected rows; 'pipelined' runs each stage on its "
+            "own thread and logs their utilization; neither checkpoints (default: csv)"
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted single-file run from its last checkpoint",
+    )
+
+    parser.add_argument(
+        "--validate",
+        type=Path,
+        metavar="SPEC",
+        help="Validation spec (JSON, TOML or YAML) checked in the same pass as the filter",
+    )
+
+    parser.add_argument(
+        "--ledger",
+        action="store_true",
+        help=f"Hash inputs as they are read and record the reads in {LEDGER_NAME} next to the output",
+    )
+
+    parser.add_argument(
+        "--verify-ledger",
+        nargs="?",
+        const="quick",
+        choices=["quick", "deep"],
+        help="Verify the ledger next to the output instead of processing; 'deep' re-reads every file",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process files landing in the --input directory into the --output directory",
+    )
+
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE,
+        help=f"Seconds a watched file must stay unchanged before it is processed (default: {DEFAULT_SETTLE:g})",
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Seconds between scans of the watched directory (default: {DEFAULT_POLL_INTERVAL:g})",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Log a table of read, parse, filter and write times, throughput and peak memory at the end",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Append metrics as JSON lines every --metrics-interval seconds (implies --metrics)",
+    )
+
+    parser.add_argument(
+        "--prometheus-file",
+        type=Path,
+        help="Rewrite a Prometheus textfile-collector file every --metrics-interval seconds (implies --metrics)",
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=DEFAULT_METRICS_INTERVAL,
+        help=f"Seconds between metrics snapshots (default: {DEFAULT_METRICS_INTERVAL:g})",
+    )
+
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Write cProfile stats and collapsed stacks (cpu), a tracemalloc report (memory), or both",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=Path("profiles"),
+        help="Directory for --profile reports (default: profiles)",
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        help=f"Allocation sites per section of the memory report (default: {DEFAULT_TOP})",
+    )
+
     parser.add_argument(
         "--verbose",
         "-v",
@@ -124,7 +610,142 @@ Examples:
         help="Enable verbose logging",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.resume and len(args.input) > 1:
+        parser.error("--resume takes a single input file")
+    return args
+
+
+def _build_metrics(args: argparse.Namespace) -> tuple[Optional[PipelineMetrics], AbstractContextManager[object]]:
+    """Return the run's metrics, if any, and the context that exports them periodically."""
+    exported = args.metrics_file is not None or args.prometheus_file is not None
+    if not (args.metrics or exported):
+        return None, nullcontext()
+    metrics = PipelineMetrics()
+    if not exported:
+        return metrics, nullcontext()
+    reporter = MetricsReporter(
+        metrics,
+        jsonl_path=args.metrics_file,
+        prometheus_path=args.prometheus_file,
+        interval=args.metrics_interval,
+    )
+    return metrics, reporter
+
+
+def _build_profiler(args: argparse.Namespace) -> AbstractContextManager[Optional[ProfileReport]]:
+    """Return the context that profiles the run with --profile, or a no-op one."""
+    if not args.profile:
+        return nullcontext()
+    name = f"example_script-{time.strftime('%Y%m%d-%H%M%S')}"
+    return profile_run(args.profile, args.profile_dir, name, top=args.profile_top)
+
+
+def _build_ledger(args: argparse.Namespace) -> Optional[ReadLedger]:
+    """Return the read-completeness ledger with --ledger, loaded from next to the output."""
+    return ReadLedger.load(ledger_path(args.output, args.per_shard)) if args.ledger else None
+
+
+def _run(
+    args: argparse.Namespace,
+    inputs: list[Path],
+    metrics: Optional[PipelineMetrics],
+    validation: Optional[ValidationSpec],
+    ledger: Optional[ReadLedger],
+) -> None:
+    """Dispatch a run to process_partitioned, process_file or process_files.
+
+    Raises:
+        ValueError: If the options do not fit the inputs
+    """
+    if args.partition_by:
+        if args.per_shard or validation is not None or ledger is not None:
+            raise ValueError("--partition-by cannot be combined with --per-shard, --validate or --ledger")
+        process_partitioned(
+            input_paths=inputs,
+            output_dir=args.output,
+            partition_by=[column.strip() for column in args.partition_by.split(",")],
+            threshold=args.threshold,
+            chunk_size=args.chunk_size,
+            force=args.force,
+            metrics=metrics,
+        )
+    elif len(inputs) == 1 and not args.per_shard:
+        process_file(
+            input_path=inputs[0],
+            output_path=args.output,
+            threshold=args.threshold,
+            chunk_size=args.chunk_size,
+            force=args.force,
+            keep_stale=args.keep_stale,
+            checkpoint_interval=args.checkpoint_interval,
+            resume=args.resume,
+            reader=args.reader,
+            jobs=args.jobs or None,
+            metrics=metrics,
+            validation=validation,
+            ledger=ledger,
+        )
+    elif args.resume:
+        raise ValueError(f"--resume takes a single input file, got {len(inputs)}")
+    else:
+        process_files(
+            input_paths=inputs,
+            output_path=args.output,
+            threshold=args.threshold,
+            chunk_size=args.chunk_size,
+            jobs=args.jobs or None,
+            per_shard=args.per_shard,
+            force=args.force,
+            keep_stale=args.keep_stale,
+            reader=args.reader,
+            metrics=metrics,
+            validation=validation,
+            ledger=ledger,
+        )
+
+
+def _watch(args: argparse.Namespace) -> None:
+    """Watch the single input directory given with --watch.
+
+    Raises:
+        ValueError: If more than one input was given
+    """
+    if len(args.input) != 1:
+        raise ValueError("--watch takes exactly one input directory")
+    watch_directory(
+        input_dir=Path(args.input[0]),
+        output_dir=args.output,
+        threshold=args.threshold,
+        chunk_size=args.chunk_size,
+        jobs=args.jobs or None,
+        reader=args.reader,
+        settle=args.settle,
+        poll_interval=args.poll_interval,
+    )
+
+
+def _verify(args: argparse.Namespace) -> None:
+    """Verify the ledger next to the output, exiting with status 1 if it does not hold."""
+    location = ledger_path(args.output, args.per_shard)
+    if not verify_ledger(location, deep=args.verify_ledger == "deep", jobs=args.jobs or None):
+        sys.exit(1)
+
+
+def _process(args: argparse.Namespace) -> None:
+    """Process the inputs with the requested metrics, profiling, validation and ledger."""
+    inputs = expand_inputs(args.input)
+    validation = load_validation_spec(args.validate) if args.validate else None
+    ledger = _build_ledger(args)
+    metrics, reporter = _build_metrics(args)
+    with reporter, _build_profiler(args) as profile:
+        _run(args, inputs, metrics, validation, ledger)
+    if metrics is not None:
+        logger.info(f"Run metrics:\n{format_summary(metrics.snapshot())}")
+    if profile is not None:
+        for path in (profile.pstats_path, profile.collapsed_path, profile.memory_path):
+            if path is not None:
+                logger.info(f"Profile written to {path}")
 
 
 def main() -> None:
@@ -137,21 +758,34 @@ def main() -> None:
         logger.debug("Verbose logging enabled")
 
     try:
-        process_file(
-            input_path=args.input,
-            output_path=args.output,
-            threshold=args.threshold,
-        )
-        logger.info("Processing completed successfully")
+        if args.watch:
+            _watch(args)
+        elif args.verify_ledger:
+            _verify(args)
+        else:
+            _process(args)
+            logger.info("Processing completed successfully")
 
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
         sys.exit(1)
 
+    except FileExistsError as e:
+        logger.error(f"Output exists: {e}")
+        sys.exit(1)
+
     except ValueError as e:
         logger.error(f"Invalid value: {e}")
         sys.exit(1)
 
+    except (KeyError, TypeError) as e:
+        logger.error(f"Invalid input: {e}")
+        sys.exit(1)
+
+    except ImportError as e:
+        logger.error(f"Missing dependency: {e}")
+        sys.exit(1)
+
     except Exception as e:
         logger.exception(f"Unexpected error: {e}")
         sys.exit(1)
@@ -25,5 +25,6 @@ __email__ = "wiktor.hawrylik@gmail.com"
 __license__ = "GPL-3.0"
 
 from your_package_name.core import ExampleClass, process_data
+from your_package_name.registry import ExampleRegistry
 
-__all__ = ["ExampleClass", "process_data"]
+__all__ = ["ExampleClass", "ExampleRegistry", "process_data"]
@@ -0,0 +1,397 @@
+"""Parallel processing of many input files.
+
+This module expands file, directory and glob arguments into a list of
+input shards and filters them with ``columnar.filter_file`` on a process
+pool. Shards are submitted largest first so that one big file does not
+start last and finish alone. Results go either to one output file per
+shard or to a single merged output in input order. ``filter_incremental``
+adds a manifest so reruns skip outputs whose inputs have not changed.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from your_package_name.columnar import FORMAT_SUFFIXES, CsvReader, detect_format, filter_file
+from your_package_name.compression import COMPRESSION_SUFFIXES, write_output
+from your_package_name.ledger import ReadLedger
+from your_package_name.manifest import MANIFEST_NAME, Fingerprint, Manifest, ManifestReport
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.streaming import DEFAULT_CHUNK_SIZE, FilterStats
+from your_package_name.validation import ValidationSpec
+
+_GLOB_CHARS = frozenset("*?[")
+
+INPUT_SUFFIXES = (*FORMAT_SUFFIXES, *(f".csv{suffix}" for suffix in COMPRESSION_SUFFIXES))
+
+
+def _glob(pattern: str) -> list[Path]:
+    """Expand a glob pattern, absolute or relative to the working directory."""
+    path = Path(pattern)
+    if path.anchor:
+        return list(Path(path.anchor).glob(str(path.relative_to(path.anchor))))
+    return list(Path().glob(pattern))
+
+
+def expand_inputs(
+    patterns: Iterable[Union[Path, str]],
+    suffix: Union[str, tuple[str, ...]] = INPUT_SUFFIXES,
+) -> list[Path]:
+    """Expand files, directories and glob patterns into input files.
+
+    Directories contribute their direct children ending in ``suffix``.
+    Glob patterns (containing ``*``, ``?`` or ``[``) may use ``**``.
+    Duplicates are removed; the result is sorted by path.
+
+    Args:
+        patterns: File paths, directory paths or glob patterns
+        suffix: File suffix or suffixes selected from directories
+                (default: CSV, compressed CSV, Parquet and Arrow IPC suffixes)
+
+    Returns:
+        Sorted list of unique input files
+
+    Raises:
+        FileNotFoundError: If a plain path does not exist or nothing matches
+
+    Examples:
+        >>> expand_inputs(["data/raw", "data/external/*.csv"])
+        [Path('data/external/a.csv'), Path('data/raw/shard-000.csv')]
+    """
+    found: set[Path] = set()
+    for pattern in patterns:
+        text = str(pattern)
+        if _GLOB_CHARS.intersection(text):
+            found.update(path for path in _glob(text) if path.is_file())
+            continue
+        path = Path(pattern)
+        if path.is_dir():
+            found.update(child for child in path.iterdir() if child.is_file() and child.name.endswith(suffix))
+        elif path.exists():
+            found.add(path)
+        else:
+            raise FileNotFoundError(f"Input file not found: {path}")
+
+    if not found:
+        raise FileNotFoundError("No input files matched")
+    return sorted(found)
+
+
+def largest_first(paths: Iterable[Path]) -> list[Path]:
+    """Order paths by decreasing file size (ties by path)."""
+    return sorted(paths, key=lambda path: (-path.stat().st_size, path))
+
+
+def _header_bytes(columns: tuple[str, ...]) -> int:
+    """Return the encoded length of the header line ``csv.DictWriter`` writes."""
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerow(columns)
+    return len(buffer.getvalue().encode("utf-8"))
+
+
+def _run(
+    jobs: list[tuple[Path, Path]],
+    threshold: float,
+    chunk_size: int,
+    workers: int,
+    reader: CsvReader = "csv",
+    validation: Optional[ValidationSpec] = None,
+    hash_chunk_size: Optional[int] = None,
+) -> dict[Path, FilterStats]:
+    """Filter (input, output) pairs, largest input first, on up to ``workers`` processes."""
+    order = largest_first(source for source, _ in jobs)
+    destinations = dict(jobs)
+    run = partial(
+        filter_file,
+        threshold=threshold,
+        chunk_size=chunk_size,
+        reader=reader,
+        validation=validation,
+        hash_chunk_size=hash_chunk_size,
+    )
+    if workers == 1:
+        return {source: run(source, destinations[source]) for source in order}
+
+    results: dict[Path, FilterStats] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: dict[Path, Future[FilterStats]] = {
+            source: executor.submit(run, source, destinations[source]) for source in order
+        }
+        try:
+            for source, future in futures.items():
+                results[source] = future.result()
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+    return results
+
+
+def filter_many(
+    inputs: Iterable[Path],
+    output: Path,
+    threshold: float = 0.5,
+    *,
+    jobs: Optional[int] = 1,
+    per_shard: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reader: CsvReader = "csv",
+    validation: Optional[ValidationSpec] = None,
+    hash_chunk_size: Optional[int] = None,
+) -> FilterStats:
+    """Filter many CSV, Parquet or Arrow IPC shards in parallel.
+
+    Args:
+        inputs: Input files
+        output: Output directory if ``per_shard``, otherwise the merged output file
+        threshold: Minimum value to keep (default: 0.5)
+        jobs: Worker processes; None uses one per CPU (default: 1, in-process)
+        per_shard: Write ``output/<input name>`` per shard instead of one merged file
+        chunk_size: Rows per chunk within each shard
+        reader: CSV reader, "csv", "mmap" or "pipelined" (see ``columnar.filter_file``)
+        validation: Checks applied to each shard on its own (see
+            ``columnar.filter_file``)
+        hash_chunk_size: Hash the bytes read from each shard (see
+            ``columnar.filter_file``); the digests are returned per shard
+
+    Returns:
+        Row counts summed over all shards
+
+    Raises:
+        ValueError: If jobs is not positive, shard names collide in per-shard
+            mode, or shards have different columns or the output is not a
+            CSV file in merged mode
+    """
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError(f"Jobs must be positive, got {workers}")
+    sources = sorted(set(inputs))
+
+    if per_shard:
+        names = [source.name for source in sources]
+        if len(set(names)) != len(names):
+            raise ValueError("Input shards must have unique file names in per-shard mode")
+        output.mkdir(parents=True, exist_ok=True)
+        pairs = [(source, output / source.name) for source in sources]
+        results = _run(pairs, threshold, chunk_size, workers, reader, validation, hash_chunk_size)
+        return _total(results.values())
+
+    if detect_format(output) != "csv":
+        raise ValueError(f"Merged output must be a CSV file, got {output}; use per-shard mode for columnar output")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    parts_dir = Path(tempfile.mkdtemp(prefix=f".{output.name}.", dir=output.parent))
+    try:
+        parts = [(source, parts_dir / f"part-{index:06d}.csv") for index, source in enumerate(sources)]
+        results = _run(parts, threshold, chunk_size, workers, reader, validation, hash_chunk_size)
+        columns = {stats.columns for stats in results.values()}
+        if len(columns) > 1:
+            raise ValueError(f"Input shards have different columns: {sorted(columns)}")
+
+        with write_output(output, "wb", fsync=True) as sink:
+            for index, (_, part) in enumerate(parts):
+                with part.open("rb") as handle:
+                    if index:
+                        handle.seek(_header_bytes(results[sources[index]].columns))
+                    shutil.copyfileobj(handle, sink)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    return _total(results.values())
+
+
+def _total(results: Iterable[FilterStats]) -> FilterStats:
+    """Sum row counts of several runs."""
+    total = FilterStats()
+    for stats in results:
+        total.rows_read += stats.rows_read
+        total.rows_written += stats.rows_written
+        total.chunks_skipped += stats.chunks_skipped
+        total.columns = total.columns or stats.columns
+        total.digests.update(stats.digests)
+    return total
+
+
+def _filter_pending(
+    sources: list[Path],
+    pending: list[Path],
+    output: Path,
+    threshold: float,
+    *,
+    jobs: Optional[int],
+    per_shard: bool,
+    chunk_size: int,
+    checkpoint_interval: Optional[float],
+    resume: bool,
+    reader: CsvReader,
+    metrics: Optional[PipelineMetrics],
+    validation: Optional[ValidationSpec],
+    hash_chunk_size: Optional[int],
+) -> FilterStats:
+    """Filter the inputs ``filter_incremental`` found out of date."""
+    if per_shard:
+        stats = filter_many(
+            pending,
+            output,
+            threshold,
+            jobs=jobs,
+            per_shard=True,
+            chunk_size=chunk_size,
+            reader=reader,
+            validation=validation,
+            hash_chunk_size=hash_chunk_size,
+        )
+    elif len(sources) == 1:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        return filter_file(
+            sources[0],
+            output,
+            threshold,
+            chunk_size=chunk_size,
+            checkpoint_interval=checkpoint_interval,
+            resume=resume,
+            reader=reader,
+            jobs=jobs,
+            metrics=metrics,
+            validation=validation,
+            hash_chunk_size=hash_chunk_size,
+        )
+    else:
+        stats = filter_many(
+            sources,
+            output,
+            threshold,
+            jobs=jobs,
+            chunk_size=chunk_size,
+            reader=reader,
+            validation=validation,
+            hash_chunk_size=hash_chunk_size,
+        )
+    if metrics is not None:
+        metrics.add_rows(stats.rows_read, stats.rows_written)
+    return stats
+
+
+def filter_incremental(
+    inputs: Iterable[Path],
+    output: Path,
+    threshold: float = 0.5,
+    *,
+    jobs: Optional[int] = 1,
+    per_shard: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    force: bool = False,
+    keep_stale: bool = False,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
+    reader: CsvReader = "csv",
+    metrics: Optional[PipelineMetrics] = None,
+    validation: Optional[ValidationSpec] = None,
+    ledger: Optional[ReadLedger] = None,
+) -> tuple[FilterStats, ManifestReport]:
+    """Filter inputs like ``filter_many``, skipping outputs that are already current.
+
+    A Manifest (``MANIFEST_NAME``) in the output directory records each
+    output's input fingerprints, parameters and checksum. In per-shard mode
+    every shard is checked on its own; a merged output is rebuilt when any
+    input changes. Outputs recorded for inputs in this run's input
+    directories are deleted and dropped from the manifest once all of their
+    inputs are gone; outputs of inputs elsewhere are left alone.
+
+    Args:
+        inputs: Input files
+        output: Output directory if ``per_shard``, otherwise the output file
+        threshold: Minimum value to keep (default: 0.5)
+        jobs: Worker processes; None uses one per CPU (default: 1). A single
+            uncompressed CSV input is split into byte ranges across them
+        per_shard: Write ``output/<input name>`` per shard instead of one file
+        chunk_size: Rows per chunk within each shard
+        force: Reprocess every input regardless of the manifest
+        keep_stale: Only forget outputs of deleted inputs instead of
+            deleting them (default: False)
+        checkpoint_interval: Seconds between checkpoints of a single input
+            (see ``streaming.filter_csv``); ignored for several inputs
+        resume: Resume a checkpointed single-input run
+        reader: CSV reader, "csv", "mmap" or "pipelined" (see ``columnar.filter_file``)
+        metrics: Collects per-stage metrics of a single input (see
+            ``columnar.filter_file``); several inputs add their row totals
+        validation: Checks applied to each input in the same pass as the
+            filter; a changed spec makes outputs stale
+        ledger: Read-completeness ledger; every processed input is hashed
+            while it is read and recorded in it, and the ledger is saved
+
+    Returns:
+        Row counts of the inputs processed in this run, and the skip report
+
+    Raises:
+        ValueError: As for ``filter_many``
+    """
+    sources = sorted(set(inputs))
+    params: dict[str, Any] = {"threshold": threshold}
+    if validation is not None:
+        params["validation"] = validation.to_dict()
+    targets = [(output / source.name, [source]) for source in sources] if per_shard else [(output, sources)]
+    manifest = Manifest.load((output if per_shard else output.parent) / MANIFEST_NAME)
+    report = ManifestReport()
+
+    pending = []
+    for target, group in targets:
+        if not force and manifest.is_current(target, group, params):
+            report.skipped.extend(group)
+            report.skipped_bytes += sum(source.stat().st_size for source in group)
+        else:
+            pending.append((target, group))
+
+    stats = FilterStats()
+    if pending:
+        fingerprints = {source: Fingerprint.of(source) for _, group in pending for source in group}
+        stats = _filter_pending(
+            sources,
+            list(fingerprints),
+            output,
+            threshold,
+            jobs=jobs,
+            per_shard=per_shard,
+            chunk_size=chunk_size,
+            checkpoint_interval=checkpoint_interval,
+            resume=resume,
+            reader=reader,
+            metrics=metrics,
+            validation=validation,
+            hash_chunk_size=ledger.chunk_size if ledger is not None else None,
+        )
+        for target, group in pending:
+            manifest.record(target, [fingerprints[source] for source in group], params)
+            report.processed.extend(group)
+            if ledger is not None:
+                for source in group:
+                    ledger.record(source, target, stats.digests[str(source.resolve())])
+
+    report.stale = manifest.prune({source.resolve().parent for source in sources}, delete=not keep_stale)
+    report.removed = [] if keep_stale else list(report.stale)
+    manifest.save()
+    if ledger is not None:
+        ledger.prune()
+        ledger.save()
+    return stats, report
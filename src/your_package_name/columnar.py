@@ -0,0 +1,340 @@
+"""Parquet and Arrow IPC input and output for threshold filtering.
+
+This module extends the streaming filter to columnar files using pyarrow,
+an optional dependency (``pip install 'your-package-name[arrow]'``).
+
+For Parquet input the threshold is pushed down to row-group statistics:
+row groups whose maximum ``value`` is below the threshold are skipped
+without being decoded. Surviving row groups are filtered in two steps:
+only the ``value`` column is read to build a mask, and the remaining
+columns are materialized only when at least one row passes. Arrow IPC
+files are memory-mapped and filtered batch by batch.
+
+Filtering keeps the semantics of ``process_data`` (rows with
+``value >= threshold`` are kept, in order) but evaluates the predicate
+vectorized instead of building a dict per row.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import importlib
+import io
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any, Literal, Optional, Union
+
+from your_package_name.compression import detect_compression, open_input, open_text_input, write_output
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.scanner import filter_csv_mmap
+from your_package_name.splitting import filter_csv_split
+from your_package_name.streaming import DEFAULT_CHUNK_SIZE, WRITE_BUFFER_SIZE, FilterStats, filter_csv
+from your_package_name.validation import ValidationSpec
+
+FileFormat = Literal["csv", "parquet", "arrow"]
+CsvReader = Literal["csv", "mmap", "pipelined"]
+
+FORMAT_SUFFIXES: dict[str, FileFormat] = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def detect_format(path: Union[Path, str]) -> FileFormat:
+    """Return the file format implied by a path's suffix (CSV by default, e.g. for ``.csv.gz``)."""
+    return FORMAT_SUFFIXES.get(Path(path).suffix.lower(), "csv")
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow and the submodules used here.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        for name in ("pyarrow.compute", "pyarrow.csv", "pyarrow.ipc", "pyarrow.parquet"):
+            importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet and Arrow files: pip install 'your-package-name[arrow]'"
+        ) from e
+    return importlib.import_module("pyarrow")
+
+
+def _check_schema(pa: Any, schema: Any, path: Path) -> None:
+    """Validate that a schema has a numeric 'value' column.
+
+    Raises:
+        KeyError: If the column is missing
+        TypeError: If the column is not numeric
+    """
+    if "value" not in schema.names:
+        raise KeyError(f"Input is missing 'value' column: {path}")
+    value_type = schema.field("value").type
+    if not (pa.types.is_integer(value_type) or pa.types.is_floating(value_type)):
+        raise TypeError(f"Value must be numeric, got {value_type} in {path}")
+
+
+def _mask(pa: Any, values: Any, threshold: float, path: Path) -> Any:
+    """Return the boolean keep-mask for a value column.
+
+    Raises:
+        TypeError: If the column contains nulls
+    """
+    if values.null_count:
+        raise TypeError(f"Value must be numeric, got {values.null_count} null value(s) in {path}")
+    return pa.compute.greater_equal(values, threshold)
+
+
+def _scan_parquet(pa: Any, path: Path, threshold: float, stats: FilterStats) -> tuple[Any, Iterator[Any]]:
+    """Return the schema and filtered tables of a Parquet file, pruning row groups.
+
+    The ``value`` column is read first to build the mask; the other columns are only read for
+    row groups that keep at least one row, and the ``value`` column is reused rather than re-read.
+    """
+    parquet_file = pa.parquet.ParquetFile(path)
+    schema = parquet_file.schema_arrow
+    _check_schema(pa, schema, path)
+    metadata = parquet_file.metadata
+    value_column = next(
+        (i for i in range(metadata.num_columns) if metadata.schema.column(i).path == "value"),
+        None,
+    )
+    others = [name for name in schema.names if name != "value"]
+
+    def tables() -> Iterator[Any]:
+        for index in range(parquet_file.num_row_groups):
+            row_group = metadata.row_group(index)
+            stats.rows_read += row_group.num_rows
+            column_stats = row_group.column(value_column).statistics if value_column is not None else None
+            if column_stats is not None and column_stats.has_min_max and column_stats.max < threshold:
+                stats.chunks_skipped += 1
+                continue
+
+            values = parquet_file.read_row_group(index, columns=["value"]).column("value")
+            mask = _mask(pa, values, threshold, path)
+            kept = pa.compute.sum(mask).as_py() or 0
+            if kept == 0:
+                continue
+            columns = {"value": values}
+            if others:
+                rest = parquet_file.read_row_group(index, columns=others)
+                columns.update(zip(rest.column_names, rest.columns))
+            table = pa.Table.from_arrays([columns[name] for name in schema.names], schema=schema)
+            yield table if kept == row_group.num_rows else table.filter(mask)
+
+    return schema, tables()
+
+
+def _scan_arrow(pa: Any, path: Path, threshold: float, stats: FilterStats) -> tuple[Any, Iterator[Any]]:
+    """Return the schema and filtered batches of a memory-mapped Arrow IPC file."""
+    reader = pa.ipc.open_file(pa.memory_map(str(path)))
+    _check_schema(pa, reader.schema, path)
+
+    def batches() -> Iterator[Any]:
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            stats.rows_read += batch.num_rows
+            yield batch.filter(_mask(pa, batch.column("value"), threshold, path))
+
+    return reader.schema, batches()
+
+
+def _scan_csv(pa: Any, path: Path, threshold: float, stats: FilterStats) -> tuple[Any, Iterator[Any]]:
+    """Return the schema and filtered batches of a CSV file read by pyarrow.
+
+    Non-value columns are read as strings so their text is preserved.
+    Compressed CSV is decompressed on a background thread.
+    """
+    with open_text_input(path) as handle:
+        columns = next(csv.reader(handle), [])
+    if "value" not in columns:
+        raise KeyError(f"Input is missing 'value' column: {path}")
+    column_types = {name: pa.string() for name in columns}
+    column_types["value"] = pa.float64()
+    source = open_input(path)
+    reader = pa.csv.open_csv(source, convert_options=pa.csv.ConvertOptions(column_types=column_types))
+
+    def batches() -> Iterator[Any]:
+        try:
+            for batch in reader:
+                stats.rows_read += batch.num_rows
+                yield batch.filter(_mask(pa, batch.column("value"), threshold, path))
+        finally:
+            source.close()
+
+    return reader.schema, batches()
+
+
+class _CsvTableWriter:
+    """Write pyarrow tables as CSV in the same dialect as ``streaming.filter_csv``.
+
+    pyarrow's own CSV writer quotes every string and header field, which
+    would make columnar-sourced CSV differ from the pure-Python path and
+    break header skipping when shards are merged.
+    """
+
+    def __init__(self, sink: IO[bytes], columns: list[str]) -> None:
+        """Write the header row.
+
+        Args:
+            sink: Binary output file
+            columns: Column names
+        """
+        self._text = io.TextIOWrapper(sink, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(columns)
+
+    def write_table(self, table: Any) -> None:
+        """Write the rows of a table."""
+        self._writer.writerows(zip(*(column.to_pylist() for column in table.columns)))
+
+    def close(self) -> None:
+        """Flush buffered text and release the sink without closing it."""
+        self._text.flush()
+        self._text.detach()
+
+
+def _open_writer(pa: Any, file_format: FileFormat, sink: IO[bytes], schema: Any) -> Any:
+    """Open a writer with ``write_table`` and ``close`` methods for a format."""
+    if file_format == "parquet":
+        return pa.parquet.ParquetWriter(sink, schema)
+    if file_format == "arrow":
+        return pa.ipc.new_file(sink, schema)
+    return _CsvTableWriter(sink, schema.names)
+
+
+def _record_totals(metrics: Optional[PipelineMetrics], stats: FilterStats, input_path: Path, output_path: Path) -> None:
+    """Add a run's row counts and file sizes to metrics that were not collected per stage."""
+    if metrics is None:
+        return
+    metrics.add_rows(stats.rows_read, stats.rows_written)
+    metrics.bytes_in += input_path.stat().st_size
+    metrics.bytes_out += output_path.stat().st_size
+
+
+def filter_file(
+    input_path: Union[Path, str],
+    output_path: Union[Path, str],
+    threshold: float = 0.5,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
+    reader: CsvReader = "csv",
+    jobs: Optional[int] = 1,
+    metrics: Optional[PipelineMetrics] = None,
+    validation: Optional[ValidationSpec] = None,
+    hash_chunk_size: Optional[int] = None,
+) -> FilterStats:
+    """Filter a CSV, Parquet or Arrow IPC file into a CSV, Parquet or Arrow IPC file.
+
+    Formats are detected from the file suffixes. CSV to CSV uses the
+    pure-Python ``streaming.filter_csv``; every other combination needs
+    pyarrow. The output is written atomically. CSV inputs may be gzip,
+    bzip2 or xz compressed, and CSV outputs ending in ``.gz``, ``.bz2`` or
+    ``.xz`` are compressed (see ``compression``).
+
+    Args:
+        input_path: Input file with a numeric 'value' column
+        output_path: Output file; its suffix selects the output format
+        threshold: Minimum value to keep (default: 0.5)
+        chunk_size: Rows per chunk for CSV to CSV filtering
+        checkpoint_interval: Seconds between checkpoints for CSV to CSV
+            filtering (see ``streaming.filter_csv``)
+        resume: Continue a checkpointed CSV to CSV run
+        reader: "mmap" filters an uncompressed CSV input with
+            ``scanner.filter_csv_mmap`` (no checkpoints); "pipelined" runs
+            ``streaming.filter_csv`` with each stage on its own thread (no
+            checkpoints); "csv" (default) uses ``streaming.filter_csv``
+        jobs: Processes for CSV to CSV filtering; other than 1 (None for one
+            per CPU), an uncompressed input is split into byte ranges with
+            ``splitting.filter_csv_split`` (no checkpoints, any reader)
+        metrics: Collects per-stage times for ``streaming.filter_csv``; other
+            paths add only their row and byte totals
+        validation: Checks applied in the same pass by ``streaming.filter_csv``,
+            which CSV to CSV filtering then always uses
+        hash_chunk_size: Hash the bytes read for a read-completeness ledger
+            (see ``streaming.filter_csv``); like validation, CSV to CSV only
+
+    Returns:
+        Row counts of the run; ``chunks_skipped`` counts pruned Parquet row groups
+
+    Raises:
+        ValueError: If threshold is not between 0 and 1, or resume,
+            validation or read hashing is requested for a columnar file
+        KeyError: If the input has no 'value' column
+        TypeError: If the 'value' column is not numeric or contains nulls
+        ImportError: If pyarrow is needed but not installed
+
+    Examples:
+        >>> filter_file("data/raw/events.parquet", "data/processed/events.parquet", 0.9)
+        FilterStats(rows_read=1000000, rows_written=99871, columns=('id', 'value'), chunks_skipped=7)
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    input_format, output_format = detect_format(input_path), detect_format(output_path)
+    if input_format == output_format == "csv":
+        single_pass = validation is not None or hash_chunk_size is not None
+        random_access = not resume and not single_pass and detect_compression(input_path) is None
+        if jobs != 1 and random_access:
+            stats = filter_csv_split(input_path, output_path, threshold, jobs=jobs, chunk_size=chunk_size)
+        elif reader == "mmap" and random_access:
+            stats = filter_csv_mmap(input_path, output_path, threshold)
+        else:
+            return filter_csv(
+                input_path,
+                output_path,
+                threshold,
+                chunk_size=chunk_size,
+                checkpoint_interval=checkpoint_interval,
+                resume=resume,
+                metrics=metrics,
+                validation=validation,
+                hash_chunk_size=hash_chunk_size,
+                pipelined=reader == "pipelined",
+            )
+        _record_totals(metrics, stats, input_path, output_path)
+        return stats
+    if resume:
+        raise ValueError("Resuming is only supported for CSV to CSV filtering")
+    if validation is not None or hash_chunk_size is not None:
+        raise ValueError("Validation and read hashing are only supported for CSV to CSV filtering")
+
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+
+    pa = _pyarrow()
+    stats = FilterStats()
+    scan = {"parquet": _scan_parquet, "arrow": _scan_arrow, "csv": _scan_csv}[input_format]
+    schema, tables = scan(pa, input_path, threshold, stats)
+    stats.columns = tuple(schema.names)
+
+    with write_output(output_path, "wb", buffering=WRITE_BUFFER_SIZE, fsync=True) as sink:
+        writer = _open_writer(pa, output_format, sink, schema)
+        try:
+            for table in tables:
+                stats.rows_written += table.num_rows
+                if table.num_rows:
+                    writer.write_table(table if isinstance(table, pa.Table) else pa.Table.from_batches([table]))
+        finally:
+            writer.close()
+
+    _record_totals(metrics, stats, input_path, output_path)
+    return stats
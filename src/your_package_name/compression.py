@@ -0,0 +1,352 @@
+"""Transparent compressed input and output.
+
+Input compression (gzip, bzip2, xz) is detected from the file's magic
+bytes, so a mislabelled ``.csv`` that is really gzipped still reads
+correctly. Decompression runs on a background thread that feeds the
+reader through a bounded queue; the stdlib codecs release the GIL while
+they work, so parsing and decompression overlap.
+
+Output compression is chosen from the file extension (``.gz``, ``.bz2``,
+``.xz``). Output is split into fixed-size blocks that are compressed in
+parallel on a thread pool and written in order as independent members
+(streams) of one file. Multi-member files are valid gzip, bzip2 and xz
+and are read back transparently by the stdlib modules and command-line
+tools.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Literal, Optional, Union, cast
+
+from your_package_name.utils import atomic_write
+
+Codec = Literal["gzip", "bz2", "xz"]
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_QUEUE_SIZE = 8
+
+MAGIC_BYTES: dict[bytes, Codec] = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
+COMPRESSION_SUFFIXES: dict[str, Codec] = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+}
+
+_DECOMPRESSORS: dict[Codec, Callable[[Path], io.BufferedIOBase]] = {
+    "gzip": gzip.GzipFile,
+    "bz2": bz2.BZ2File,
+    "xz": lzma.LZMAFile,
+}
+
+
+def detect_compression(path: Union[Path, str]) -> Optional[Codec]:
+    """Return the compression of a file from its magic bytes, or None if uncompressed."""
+    with Path(path).open("rb") as handle:
+        head = handle.read(max(len(magic) for magic in MAGIC_BYTES))
+    for magic, codec in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def codec_for_path(path: Union[Path, str]) -> Optional[Codec]:
+    """Return the compression implied by a file extension, or None."""
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def _compressor(codec: Codec, level: Optional[int]) -> Callable[[bytes], bytes]:
+    """Return a function compressing one block into a complete member."""
+    if codec == "gzip":
+        gzip_level = 6 if level is None else level
+        return lambda block: gzip.compress(block, compresslevel=gzip_level, mtime=0)
+    if codec == "bz2":
+        bz2_level = 9 if level is None else level
+        return lambda block: bz2.compress(block, compresslevel=bz2_level)
+    return lambda block: lzma.compress(block, preset=level)
+
+
+class BackgroundReader(io.RawIOBase):
+    """Read a binary stream on a background thread through a bounded queue.
+
+    The thread reads ``block_size`` bytes at a time from ``source`` (for
+    example a ``gzip.GzipFile``) and blocks once ``queue_size`` blocks are
+    waiting, so memory stays bounded when the consumer is slower. Errors
+    raised by the source are re-raised from ``read`` in the consumer.
+    """
+
+    def __init__(
+        self,
+        source: io.BufferedIOBase,
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Start the reader thread.
+
+        Args:
+            source: Binary stream to read; closed with this reader
+            block_size: Bytes per read from the source
+            queue_size: Maximum blocks buffered ahead of the consumer
+        """
+        super().__init__()
+        self._source = source
+        self._block_size = block_size
+        self._queue: queue.Queue[Union[bytes, BaseException]] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, name="background-reader", daemon=True)
+        self._thread.start()
+
+    def _pump(self) -> None:
+        """Read blocks until EOF, an error, or close; an empty block marks EOF."""
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(self._block_size)
+                self._put(block)
+                if not block:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item: Union[bytes, BaseException]) -> None:
+        """Enqueue an item, giving up if the reader is closed meanwhile."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Copy the next available bytes into ``buffer``; 0 means EOF."""
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        """Stop the reader thread and close the source."""
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+class ParallelCompressWriter(io.BufferedIOBase):
+    """Compress written bytes in parallel blocks into a binary sink.
+
+    Data is cut into ``block_size`` blocks, each compressed into an
+    independent member on a thread pool. Members are written to the sink
+    in order, with at most two blocks per worker in flight. Closing the
+    writer flushes the final block but does not close the sink.
+    """
+
+    def __init__(
+        self,
+        sink: IO[bytes],
+        codec: Codec = "gzip",
+        *,
+        level: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            sink: Binary output stream
+            codec: Compression codec (default: "gzip")
+            level: Compression level or preset (default: codec-specific)
+            block_size: Uncompressed bytes per member (default: 1 MiB)
+            workers: Compression threads (default: one per CPU)
+
+        Raises:
+            ValueError: If block_size or workers is not positive
+        """
+        super().__init__()
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        if workers <= 0:
+            raise ValueError(f"Workers must be positive, got {workers}")
+
+        self._sink = sink
+        self._compress = _compressor(codec, level)
+        self._block_size = block_size
+        self._max_pending = 2 * workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compress")
+        self._pending: deque[Future[bytes]] = deque()
+        self._buffer = bytearray()
+        self._blocks = 0
+
+    def writable(self) -> bool:
+        """Return True."""
+        return True
+
+    def write(self, data: Any) -> int:
+        """Buffer bytes and submit every complete block for compression."""
+        if self.closed:
+            raise ValueError("write to closed file")
+        view = memoryview(data)
+        self._buffer += view
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[: self._block_size]))
+            del self._buffer[: self._block_size]
+        return view.nbytes
+
+    def _submit(self, block: bytes) -> None:
+        """Queue a block and write finished members once too many are in flight."""
+        self._pending.append(self._executor.submit(self._compress, block))
+        self._blocks += 1
+        while len(self._pending) > self._max_pending:
+            self._sink.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        """Compress the final block, write all members, and stop the pool."""
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._blocks:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._sink.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            super().close()
+
+    def abort(self) -> None:
+        """Discard buffered and in-flight data and stop the pool."""
+        self._pending.clear()
+        self._buffer.clear()
+        self._executor.shutdown(cancel_futures=True)
+        super().close()
+
+
+def open_input(
+    path: Union[Path, str],
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> IO[bytes]:
+    """Open a file for binary reading, decompressing it in the background if needed.
+
+    Args:
+        path: File to read; compression is detected from its magic bytes
+        block_size: Decompressed bytes per background read
+        queue_size: Maximum decompressed blocks buffered ahead of the reader
+
+    Returns:
+        Buffered binary stream of the (decompressed) contents
+    """
+    codec = detect_compression(path)
+    if codec is None:
+        return Path(path).open("rb")
+    reader = BackgroundReader(_DECOMPRESSORS[codec](Path(path)), block_size=block_size, queue_size=queue_size)
+    return io.BufferedReader(reader, buffer_size=block_size)
+
+
+def open_text_input(path: Union[Path, str], *, encoding: str = "utf-8", newline: Optional[str] = "") -> IO[str]:
+    """Open a possibly compressed file for text reading (CSV-friendly ``newline=""`` by default)."""
+    return io.TextIOWrapper(open_input(path), encoding=encoding, newline=newline)
+
+
+@contextmanager
+def write_output(
+    path: Union[Path, str],
+    mode: Literal["w", "wb"] = "w",
+    *,
+    encoding: str = "utf-8",
+    newline: Optional[str] = None,
+    buffering: int = -1,
+    fsync: bool = False,
+    level: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Iterator[IO[Any]]:
+    """Write a file atomically, compressing it if its extension asks for it.
+
+    Without a compression extension this is ``utils.atomic_write``. With
+    one, data is compressed by a ParallelCompressWriter before it reaches
+    the temporary file.
+
+    Args:
+        path: Destination path; ``.gz``, ``.bz2`` or ``.xz`` selects compression
+        mode: "w" for text or "wb" for binary (default: "w")
+        encoding: Text encoding (ignored in binary mode)
+        newline: Newline translation for text mode (see ``open``)
+        buffering: Buffer size of the underlying file (see ``open``)
+        fsync: Flush the file to disk before the rename
+        level: Compression level or preset (default: codec-specific)
+        workers: Compression threads (default: one per CPU)
+
+    Yields:
+        Open file object to write to
+
+    Examples:
+        >>> with write_output("data/processed/output.csv.gz", newline="") as handle:
+        ...     csv.writer(handle).writerows(rows)
+    """
+    codec = codec_for_path(path)
+    if codec is None:
+        with atomic_write(path, mode, encoding=encoding, newline=newline, buffering=buffering, fsync=fsync) as handle:
+            yield handle
+        return
+
+    with atomic_write(path, "wb", buffering=buffering, fsync=fsync) as sink:
+        writer = ParallelCompressWriter(sink, codec, level=level, workers=workers)
+        binary = cast(IO[bytes], writer)
+        stream: IO[Any] = binary if mode == "wb" else io.TextIOWrapper(binary, encoding=encoding, newline=newline)
+        try:
+            yield stream
+        except BaseException:
+            writer.abort()
+            raise
+        stream.close()
@@ -0,0 +1,360 @@
+"""Configuration loading for files in the ``configs/`` directory.
+
+This module parses JSON, TOML and YAML configuration layers once, merges
+them with ``merge_dicts(deep=True)``, optionally validates the result with
+a Pydantic model, and exposes it as an immutable ConfigSnapshot.
+
+Parsed YAML and TOML files are cached on disk as JSON, keyed by the source
+file's mtime and size and, when those change, by its SHA-256 hash, so
+repeated process start-ups skip re-parsing unchanged files. ConfigLoader
+polls the source files (one ``stat`` per file, rate-limited) and swaps in a
+new snapshot when they change, so long-running workers pick up edits
+without a restart.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional, Union
+
+import tomllib
+from pydantic import BaseModel
+
+from your_package_name.utils import merge_dicts
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _load_yaml(raw: bytes) -> Any:
+    """Parse YAML bytes, importing PyYAML on first use.
+
+    Raises:
+        ValueError: If the document is not valid YAML
+        ImportError: If PyYAML is not installed
+    """
+    try:
+        yaml = importlib.import_module("yaml")
+    except ImportError as e:
+        raise ImportError("PyYAML is required to load YAML configs: pip install 'your-package-name[yaml]'") from e
+    try:
+        return yaml.safe_load(raw) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+
+
+def _parse(path: Path, raw: bytes) -> dict[str, Any]:
+    """Parse configuration bytes according to the file extension.
+
+    Raises:
+        ValueError: If the extension is unsupported, the file cannot be
+            decoded, or the top level is not a mapping
+        ImportError: If a YAML file is loaded without PyYAML installed
+    """
+    suffix = path.suffix.lower()
+    if suffix not in (".json", ".toml", ".yaml", ".yml"):
+        raise ValueError(f"Unsupported config format: {path}")
+    try:
+        if suffix == ".json":
+            data = json.loads(raw)
+        elif suffix == ".toml":
+            data = tomllib.loads(raw.decode("utf-8"))
+        else:
+            data = _load_yaml(raw)
+    except ValueError as e:
+        raise ValueError(f"Cannot parse config file {path}: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Config file must contain a mapping at the top level: {path}")
+    return data
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only deep copy of parsed configuration data."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Fields of a ParsedFileCache entry and their JSON types.
+_ENTRY_FIELDS = {"mtime_ns": int, "size": int, "sha256": str, "data": dict}
+
+
+class ParsedFileCache:
+    """On-disk cache of parsed configuration files.
+
+    Each entry stores the parsed form as JSON together with the source
+    file's mtime, size and SHA-256 hash. A matching mtime and size returns
+    the cached data without reading the source; otherwise the source is
+    hashed, and only a changed hash triggers a re-parse. Files whose parsed
+    form is not JSON-serializable (e.g. TOML datetimes) are not cached.
+    """
+
+    def __init__(self, directory: Union[Path, str]) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory for cache entries (created on first write)
+        """
+        self.directory = Path(directory)
+
+    def _entry_path(self, path: Path) -> Path:
+        """Return the cache entry path for a source file."""
+        digest = hashlib.sha256(os.fsencode(path.resolve())).hexdigest()[:32]
+        return self.directory / f"{digest}.json"
+
+    def _read_entry(self, path: Path) -> Optional[dict[str, Any]]:
+        """Return the cache entry for a source file, or None if missing or malformed."""
+        try:
+            entry = json.loads(self._entry_path(path).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or any(
+            not isinstance(entry.get(key), kind) for key, kind in _ENTRY_FIELDS.items()
+        ):
+            return None
+        return entry
+
+    def _write_entry(self, path: Path, entry: dict[str, Any]) -> None:
+        """Write a cache entry atomically; cache failures are not fatal."""
+        entry_path = self._entry_path(path)
+        tmp_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+            tmp_path.replace(entry_path)
+        except (OSError, TypeError, ValueError) as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.debug(f"Not caching parsed config {path}: {e}")
+
+    def load(self, path: Path) -> dict[str, Any]:
+        """Return the parsed contents of a configuration file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file cannot be parsed
+        """
+        stat = path.stat()
+        entry = self._read_entry(path)
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            data: dict[str, Any] = entry["data"]
+            return data
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = entry["data"] if entry is not None and entry["sha256"] == digest else _parse(path, raw)
+        self._write_entry(path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest, "data": data})
+        return data
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable, merged view of configuration layers at one point in time.
+
+    Attributes:
+        data: Deep read-only merged configuration (mappings and tuples)
+        model: Validated Pydantic model instance, if a schema was given
+        sources: Source files, lowest priority first
+        version: Incremented each time the loader swaps in a new snapshot
+    """
+
+    data: Mapping[str, Any]
+    model: Optional[BaseModel]
+    sources: tuple[Path, ...]
+    version: int
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a value by dotted key, e.g. ``"api.timeout"``.
+
+        Examples:
+            >>> snapshot.get("api.timeout", 30)
+            10
+        """
+        value: Any = self.data
+        for part in key.split("."):
+            if not isinstance(value, Mapping):
+                return default
+            value = value.get(part, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a top-level value."""
+        return self.data[key]
+
+
+def _build_snapshot(
+    sources: tuple[Path, ...],
+    schema: Optional[type[BaseModel]],
+    cache: Optional[ParsedFileCache],
+    version: int,
+) -> ConfigSnapshot:
+    """Parse, merge and validate configuration layers into a snapshot."""
+    layers = [cache.load(path) if cache is not None else _parse(path, path.read_bytes()) for path in sources]
+    merged = merge_dicts(*layers, deep=True)
+    model = schema.model_validate(merged) if schema is not None else None
+    return ConfigSnapshot(data=_freeze(merged), model=model, sources=sources, version=version)
+
+
+def load_config(
+    *paths: Union[Path, str],
+    schema: Optional[type[BaseModel]] = None,
+    cache_dir: Optional[Union[Path, str]] = None,
+) -> ConfigSnapshot:
+    """Load and merge configuration files once.
+
+    Args:
+        *paths: Configuration files, lowest priority first
+        schema: Optional Pydantic model used to validate the merged data
+        cache_dir: Optional directory for the parsed-form cache
+
+    Returns:
+        Immutable configuration snapshot
+
+    Raises:
+        FileNotFoundError: If a configuration file does not exist
+        ValueError: If a file cannot be parsed or validation fails
+
+    Examples:
+        >>> config = load_config("configs/config.toml", "configs/config.prod.toml")
+        >>> config.get("processing.batch_size")
+        100
+    """
+    cache = ParsedFileCache(cache_dir) if cache_dir is not None else None
+    return _build_snapshot(tuple(Path(path) for path in paths), schema, cache, version=1)
+
+
+class ConfigLoader:
+    """Hot-reloading configuration loader.
+
+    ``snapshot`` returns the current ConfigSnapshot. At most once per
+    ``poll_interval`` seconds it stats the source files and, if any mtime
+    or size changed, rebuilds the snapshot. Readers between polls pay only
+    a clock read. A reload that fails to parse or validate is logged and
+    the previous snapshot is kept.
+
+    Examples:
+        >>> loader = ConfigLoader(["configs/config.yaml"], poll_interval=2.0)
+        >>> batch_size = loader.snapshot.get("processing.batch_size")
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Union[Path, str]],
+        *,
+        schema: Optional[type[BaseModel]] = None,
+        cache_dir: Optional[Union[Path, str]] = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """Load the initial snapshot.
+
+        Args:
+            paths: Configuration files, lowest priority first
+            schema: Optional Pydantic model used to validate the merged data
+            cache_dir: Parsed-form cache directory (default: ``.cache`` next
+                       to the first configuration file)
+            poll_interval: Minimum seconds between change checks (default: 1.0)
+
+        Raises:
+            ValueError: If paths is empty or poll_interval is negative
+            FileNotFoundError: If a configuration file does not exist
+        """
+        if not paths:
+            raise ValueError("At least one config file is required")
+        if poll_interval < 0:
+            raise ValueError(f"Poll interval must be non-negative, got {poll_interval}")
+
+        self.sources = tuple(Path(path) for path in paths)
+        self.schema = schema
+        self.poll_interval = poll_interval
+        self._cache = ParsedFileCache(cache_dir if cache_dir is not None else self.sources[0].parent / ".cache")
+        self._lock = threading.Lock()
+        self._stamps = self._stat_sources()
+        self._snapshot = _build_snapshot(self.sources, schema, self._cache, version=1)
+        self._last_poll = time.monotonic()
+
+    def _stat_sources(self) -> tuple[Optional[tuple[int, int]], ...]:
+        """Return (mtime_ns, size) per source, or None for missing files."""
+        stamps: list[Optional[tuple[int, int]]] = []
+        for path in self.sources:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Return the current snapshot, polling for changes when due."""
+        if time.monotonic() - self._last_poll >= self.poll_interval:
+            self.poll()
+        return self._snapshot
+
+    def poll(self) -> bool:
+        """Check the source files now and reload if any changed.
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        with self._lock:
+            self._last_poll = time.monotonic()
+            stamps = self._stat_sources()
+            if stamps == self._stamps:
+                return False
+            return self._reload(stamps)
+
+    def reload(self) -> bool:
+        """Rebuild the snapshot regardless of file stamps.
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        with self._lock:
+            self._last_poll = time.monotonic()
+            return self._reload(self._stat_sources())
+
+    def _reload(self, stamps: tuple[Optional[tuple[int, int]], ...]) -> bool:
+        """Install a new snapshot; caller holds the lock.
+
+        The stamps are only recorded once the snapshot is built, so a
+        failed reload is retried at the next poll even if the files have
+        not changed since.
+        """
+        try:
+            snapshot = _build_snapshot(self.sources, self.schema, self._cache, self._snapshot.version + 1)
+        except (OSError, ValueError) as e:
+            logger.error(f"Config reload failed, keeping version {self._snapshot.version}: {e}")
+            return False
+        self._stamps = stamps
+        self._snapshot = snapshot
+        logger.info(f"Reloaded config version {snapshot.version} from {len(self.sources)} file(s)")
+        return True
@@ -0,0 +1,478 @@
+"""Crash-safe ExampleClass counters backed by a write-ahead log.
+
+Every ``create``, ``increment`` and ``reset`` is appended to a log before it
+is acknowledged. A background committer thread batches the appends of many
+callers into one ``write`` plus ``fsync`` per latency window (group commit),
+so durability costs one disk flush per batch instead of one per operation.
+
+The log is periodically compacted into a snapshot written with
+``serialization.dump_many``. Recovery loads the latest snapshot and replays
+only the log generations written after it.
+
+Directory layout::
+
+    snapshot-<generation>.excb   state before log generation <generation>
+    journal-<generation>.log     operations appended after that snapshot
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Optional, Union
+
+from your_package_name.core import ExampleClass
+from your_package_name.serialization import dump_many, load_many
+
+logger = logging.getLogger(__name__)
+
+OP_CREATE = 1
+OP_INCREMENT = 2
+OP_RESET = 3
+
+# Record framing: body length and CRC32 of the body, followed by the body
+# (operation, amount, name length, UTF-8 name, optional JSON metadata).
+_FRAME = struct.Struct("<II")
+_BODY = struct.Struct("<BdH")
+
+_SNAPSHOT_PREFIX = "snapshot-"
+_SNAPSHOT_SUFFIX = ".excb"
+_LOG_PREFIX = "journal-"
+_LOG_SUFFIX = ".log"
+
+
+def _encode_record(op: int, name: str, amount: float = 0.0, metadata: Optional[dict[str, Any]] = None) -> bytes:
+    """Encode one log record including its frame."""
+    name_bytes = name.encode("utf-8")
+    body = _BODY.pack(op, amount, len(name_bytes)) + name_bytes
+    if metadata:
+        body += json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _iter_records(data: bytes) -> Iterator[tuple[int, int, str, float, Optional[dict[str, Any]]]]:
+    """Decode records from a log, stopping at the first torn or corrupt one.
+
+    Yields:
+        Tuples of (end offset, operation, name, amount, metadata)
+    """
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        body = data[start : start + length]
+        if len(body) < length or length < _BODY.size or zlib.crc32(body) != crc:
+            return
+        op, amount, name_length = _BODY.unpack_from(body)
+        name_end = _BODY.size + name_length
+        name = body[_BODY.size : name_end].decode("utf-8")
+        metadata = json.loads(body[name_end:]) if len(body) > name_end else None
+        offset = start + length
+        yield offset, op, name, amount, metadata
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist directory entries (renames, new files) where the OS supports it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _generations(directory: Path, prefix: str, suffix: str) -> list[int]:
+    """Return the sorted generation numbers of files matching a name pattern."""
+    generations = []
+    for path in directory.glob(f"{prefix}*{suffix}"):
+        number = path.name[len(prefix) : -len(suffix)]
+        if number.isdigit():
+            generations.append(int(number))
+    return sorted(generations)
+
+
+class IncrementJournal:
+    """Durable collection of named ExampleClass counters.
+
+    Operations are applied to the in-memory instances immediately and are
+    acknowledged once the committer thread has flushed them to disk. Pass
+    ``wait=False`` to return before the flush (the operation is still
+    logged in order and will be durable after the next commit or ``sync``).
+
+    Attributes:
+        directory: Directory holding snapshots and log files
+        commit_interval: Seconds the committer waits to gather a batch
+        snapshot_every: Number of logged operations between snapshots
+
+    Examples:
+        >>> with IncrementJournal("state") as journal:
+        ...     journal.create("requests")
+        ...     journal.increment("requests", 5)
+        >>> IncrementJournal("state").get("requests").value
+        5.0
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str],
+        *,
+        commit_interval: float = 0.002,
+        snapshot_every: int = 100_000,
+    ) -> None:
+        """Open a journal directory, recovering any existing state.
+
+        Args:
+            directory: Directory for snapshots and logs (created if missing)
+            commit_interval: Latency window in seconds for batching fsyncs
+            snapshot_every: Operations between automatic snapshots (0 disables)
+
+        Raises:
+            ValueError: If commit_interval or snapshot_every is negative, or
+                if a log other than the newest one is corrupt
+        """
+        if commit_interval < 0:
+            raise ValueError(f"Commit interval must be non-negative, got {commit_interval}")
+        if snapshot_every < 0:
+            raise ValueError(f"Snapshot interval must be non-negative, got {snapshot_every}")
+
+        self.directory = Path(directory)
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._objects: dict[str, ExampleClass] = {}
+        self._generation = 0
+        self._recover()
+
+        self._fd = os.open(self._log_path(self._generation), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = bytearray()
+        self._appended = 0
+        self._durable = 0
+        self._since_snapshot = 0
+        self._closing = False
+        self._error: Optional[BaseException] = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshotter: Optional[threading.Thread] = None
+        self._committer = threading.Thread(target=self._commit_loop, name="journal-committer", daemon=True)
+        self._committer.start()
+
+    def _log_path(self, generation: int) -> Path:
+        """Return the log file path of a generation."""
+        return self.directory / f"{_LOG_PREFIX}{generation:010d}{_LOG_SUFFIX}"
+
+    def _snapshot_path(self, generation: int) -> Path:
+        """Return the snapshot file path of a generation."""
+        return self.directory / f"{_SNAPSHOT_PREFIX}{generation:010d}{_SNAPSHOT_SUFFIX}"
+
+    def _recover(self) -> None:
+        """Load the latest snapshot and replay the log generations after it."""
+        started = time.perf_counter()
+        snapshots = _generations(self.directory, _SNAPSHOT_PREFIX, _SNAPSHOT_SUFFIX)
+        base = snapshots[-1] if snapshots else 0
+        if snapshots:
+            self._objects = {obj.name: obj for obj in load_many(self._snapshot_path(base))}
+
+        logs = [gen for gen in _generations(self.directory, _LOG_PREFIX, _LOG_SUFFIX) if gen >= base]
+        replayed = 0
+        for generation in logs:
+            path = self._log_path(generation)
+            data = path.read_bytes()
+            end = 0
+            for offset, op, name, amount, metadata in _iter_records(data):
+                self._apply(op, name, amount, metadata)
+                end = offset
+                replayed += 1
+            if end < len(data):
+                if generation != logs[-1]:
+                    raise ValueError(f"Corrupt record at byte {end} of {path}")
+                logger.warning(f"Truncating torn tail of {path} at byte {end}")
+                with path.open("r+b") as handle:
+                    handle.truncate(end)
+
+        self._generation = max([base, *logs])
+        elapsed = time.perf_counter() - started
+        logger.debug(f"Recovered {len(self._objects)} counters, replayed {replayed} records in {elapsed:.3f}s")
+
+    def _apply(self, op: int, name: str, amount: float, metadata: Optional[dict[str, Any]]) -> None:
+        """Apply one operation to the in-memory state."""
+        if op == OP_CREATE:
+            if name in self._objects:
+                raise ValueError(f"Counter already exists: {name!r}")
+            self._objects[name] = ExampleClass(name, amount, metadata=metadata)
+        elif op == OP_INCREMENT:
+            self._get(name).increment(amount)
+        elif op == OP_RESET:
+            self._get(name).reset()
+        else:
+            raise ValueError(f"Unknown journal operation {op}")
+
+    def _get(self, name: str) -> ExampleClass:
+        """Return a counter or raise KeyError."""
+        try:
+            return self._objects[name]
+        except KeyError:
+            raise KeyError(f"Unknown counter: {name!r}") from None
+
+    def _log(self, op: int, name: str, amount: float = 0.0, metadata: Optional[dict[str, Any]] = None) -> int:
+        """Apply an operation and append it to the pending batch.
+
+        Returns:
+            Sequence number of the appended record
+        """
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Journal is closed")
+            # Applying first validates the operation, so invalid calls are never logged.
+            self._apply(op, name, amount, metadata)
+            try:
+                record = _encode_record(op, name, amount, metadata)
+            except TypeError:
+                if op == OP_CREATE:
+                    del self._objects[name]
+                raise
+            self._pending += record
+            self._appended += 1
+            self._cond.notify_all()
+            return self._appended
+
+    def _wait_durable(self, sequence: int) -> None:
+        """Block until the record with the given sequence number is on disk."""
+        with self._cond:
+            while self._durable < sequence and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise RuntimeError("Journal committer failed") from self._error
+
+    def _flush_pending(self) -> None:
+        """Write and fsync the pending batch; caller holds the I/O lock."""
+        with self._cond:
+            batch, self._pending = self._pending, bytearray()
+            sequence = self._appended
+        if batch:
+            os.write(self._fd, batch)
+            os.fsync(self._fd)
+        with self._cond:
+            self._since_snapshot += sequence - self._durable
+            self._durable = sequence
+            self._cond.notify_all()
+
+    def _commit_loop(self) -> None:
+        """Committer thread: flush one batch per latency window."""
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closing:
+                        self._cond.wait()
+                    if self._closing and not self._pending:
+                        return
+                if self.commit_interval:
+                    time.sleep(self.commit_interval)
+                with self._io_lock:
+                    self._flush_pending()
+                if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+                    self._start_snapshot()
+        except BaseException as error:  # pragma: no cover - disk failures
+            logger.exception("Journal committer failed")
+            with self._cond:
+                self._error = error
+                self._cond.notify_all()
+
+    def _start_snapshot(self) -> None:
+        """Write a snapshot on a background thread unless one is in progress.
+
+        Keeps ``dump_many`` off the committer thread so writers waiting for
+        durability are not stalled behind the snapshot.
+        """
+        if self._snapshotter is not None and self._snapshotter.is_alive():
+            return
+        self._snapshotter = threading.Thread(target=self._snapshot_quietly, name="journal-snapshot", daemon=True)
+        self._snapshotter.start()
+
+    def _snapshot_quietly(self) -> None:
+        """Snapshot thread: a failed snapshot leaves the logs in place, so only log it."""
+        try:
+            self.snapshot()
+        except Exception:  # pragma: no cover - disk failures
+            logger.exception("Journal snapshot failed")
+
+    def create(
+        self,
+        name: str,
+        value: float = 0.0,
+        *,
+        metadata: Optional[dict[str, Any]] = None,
+        wait: bool = True,
+    ) -> ExampleClass:
+        """Create and log a new counter.
+
+        Args:
+            name: Unique counter name
+            value: Initial value (default: 0.0)
+            metadata: Optional JSON-serializable metadata
+            wait: Block until the operation is durable (default: True)
+
+        Returns:
+            The live ExampleClass instance
+
+        Raises:
+            ValueError: If the name exists, is empty, or value is negative
+        """
+        sequence = self._log(OP_CREATE, name, value, metadata)
+        if wait:
+            self._wait_durable(sequence)
+        return self._objects[name]
+
+    def increment(self, name: str, amount: float = 1.0, *, wait: bool = True) -> None:
+        """Increment a counter and log the operation.
+
+        Args:
+            name: Counter name
+            amount: Amount to add (default: 1.0)
+            wait: Block until the operation is durable (default: True)
+
+        Raises:
+            KeyError: If the counter does not exist
+            ValueError: If amount is negative
+            TypeError: If amount is not numeric
+        """
+        sequence = self._log(OP_INCREMENT, name, amount)
+        if wait:
+            self._wait_durable(sequence)
+
+    def reset(self, name: str, *, wait: bool = True) -> None:
+        """Reset a counter to zero and log the operation.
+
+        Args:
+            name: Counter name
+            wait: Block until the operation is durable (default: True)
+
+        Raises:
+            KeyError: If the counter does not exist
+        """
+        sequence = self._log(OP_RESET, name)
+        if wait:
+            self._wait_durable(sequence)
+
+    def get(self, name: str) -> ExampleClass:
+        """Return the live instance of a counter.
+
+        Mutate counters only through the journal; direct calls to
+        ``increment`` or ``reset`` on the instance are not logged.
+
+        Raises:
+            KeyError: If the counter does not exist
+        """
+        with self._cond:
+            return self._get(name)
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if a counter with this name exists."""
+        return name in self._objects
+
+    def __len__(self) -> int:
+        """Return the number of counters."""
+        return len(self._objects)
+
+    def sync(self) -> None:
+        """Block until every operation logged so far is durable."""
+        with self._cond:
+            sequence = self._appended
+            self._cond.notify_all()
+        self._wait_durable(sequence)
+
+    def snapshot(self) -> Path:
+        """Write a compacted snapshot and drop the logs it supersedes.
+
+        Returns:
+            Path of the written snapshot
+        """
+        with self._snapshot_lock:
+            with self._io_lock:
+                self._flush_pending()
+                with self._cond:
+                    # Rotate the log and capture state atomically with respect to
+                    # new operations: everything in the snapshot precedes the new
+                    # log. Operations logged since the flush above are already in
+                    # the state, so they go to the old log, not the new one.
+                    tail, self._pending = self._pending, bytearray()
+                    sequence = self._appended
+                    if tail:
+                        os.write(self._fd, tail)
+                    self._generation += 1
+                    generation = self._generation
+                    old_fd = self._fd
+                    self._fd = os.open(self._log_path(generation), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    state = [ExampleClass(obj.name, obj.value, metadata=obj.metadata) for obj in self._objects.values()]
+                    self._since_snapshot = 0
+                if tail:
+                    os.fsync(old_fd)
+                os.close(old_fd)
+                with self._cond:
+                    self._durable = sequence
+                    self._cond.notify_all()
+
+            path = self._snapshot_path(generation)
+            dump_many(state, path, fsync=True)
+            _fsync_directory(self.directory)
+
+            for old in _generations(self.directory, _SNAPSHOT_PREFIX, _SNAPSHOT_SUFFIX):
+                if old < generation:
+                    self._snapshot_path(old).unlink(missing_ok=True)
+            for old in _generations(self.directory, _LOG_PREFIX, _LOG_SUFFIX):
+                if old < generation:
+                    self._log_path(old).unlink(missing_ok=True)
+
+        logger.debug(f"Wrote snapshot {path} with {len(state)} counters")
+        return path
+
+    def close(self) -> None:
+        """Flush pending operations, stop the committer and close the log."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._committer.join()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        with self._io_lock:
+            self._flush_pending()
+            os.close(self._fd)
+
+    def __enter__(self) -> "IncrementJournal":
+        """Return the journal for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the journal on context exit."""
+        self.close()
@@ -0,0 +1,458 @@
+"""Read-completeness ledger: proof that every input was read in full.
+
+A filter run with ``hash_chunk_size`` set hashes the input bytes as the
+pipeline reads them (after decompression) and returns a ReadDigest: the
+number of bytes read, whether the stream was read to its end, the row
+counts, and a SHA-256 hash per ``chunk_size`` bytes. The chunk hashes are
+the leaves of a Merkle tree whose root identifies the data that was read.
+
+A ReadLedger (by default ``.ledger.json`` next to the outputs, like the
+manifest) keeps one entry per input. ``ReadLedger.verify`` checks that
+each input was read to the end, that the recorded hashes are consistent,
+and that the data rows in every output add up to the rows written from
+its inputs. Files whose size and mtime are unchanged since they were
+recorded are trusted without being read; a changed input is re-hashed
+chunk by chunk on a thread pool and compared leaf by leaf, so the report
+names the byte ranges that differ. ``deep=True`` re-reads everything.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Optional, Union
+
+from your_package_name.compression import detect_compression, open_input, open_text_input
+from your_package_name.utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+LEDGER_NAME = ".ledger.json"
+LEDGER_VERSION = 1
+DEFAULT_HASH_CHUNK_SIZE = 4 << 20
+
+# Domain separation of leaf and inner node hashes (as in RFC 6962).
+_LEAF = b"\x00"
+_NODE = b"\x01"
+
+# Changed chunks listed by byte range in a verification issue.
+_LISTED_CHUNKS = 5
+
+
+def merkle_root(chunks: Sequence[str]) -> str:
+    """Return the hex Merkle root of hex chunk hashes (an unpaired node is promoted)."""
+    if not chunks:
+        return hashlib.sha256(_LEAF).hexdigest()
+    level = [bytes.fromhex(chunk) for chunk in chunks]
+    while len(level) > 1:
+        paired = [hashlib.sha256(_NODE + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+@dataclass
+class ReadDigest:
+    """What a run read from one input.
+
+    Attributes:
+        chunk_size: Bytes per hashed chunk (the last chunk may be shorter)
+        bytes_read: Bytes read, after decompression
+        complete: Whether the input was read until end of file
+        chunks: Hex SHA-256 leaf hash of every chunk, in order
+        rows_read: Data rows parsed from the input
+        rows_written: Data rows written to the output
+    """
+
+    chunk_size: int
+    bytes_read: int = 0
+    complete: bool = False
+    chunks: list[str] = field(default_factory=list)
+    rows_read: int = 0
+    rows_written: int = 0
+
+    @property
+    def merkle_root(self) -> str:
+        """Return the Merkle root of the chunk hashes."""
+        return merkle_root(self.chunks)
+
+
+class ChunkHasher(io.RawIOBase):
+    """Raw stream that hashes everything read from another stream in fixed-size chunks.
+
+    Examples:
+        >>> hasher = ChunkHasher(open_input("data/raw/input.csv"), 4 << 20)
+        >>> rows = sum(1 for _ in io.TextIOWrapper(hasher))
+        >>> hasher.digest.complete
+        True
+    """
+
+    def __init__(self, source: IO[bytes], chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> None:
+        """Wrap a binary stream; it is closed with this reader.
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        super().__init__()
+        self._source = source
+        self.digest = ReadDigest(chunk_size)
+        self._hash = hashlib.sha256(_LEAF)
+        self._filled = 0
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read into ``buffer`` and hash the bytes read."""
+        data = self._source.read(len(buffer))
+        size = len(data)
+        if not size and len(buffer):
+            self._finish()
+            return 0
+        buffer[:size] = data
+        self._update(memoryview(data))
+        return size
+
+    def _update(self, data: memoryview) -> None:
+        """Feed bytes into the current chunk, closing chunks as they fill."""
+        chunk_size = self.digest.chunk_size
+        while data:
+            take = min(len(data), chunk_size - self._filled)
+            self._hash.update(data[:take])
+            self._filled += take
+            self.digest.bytes_read += take
+            data = data[take:]
+            if self._filled == chunk_size:
+                self.digest.chunks.append(self._hash.hexdigest())
+                self._hash = hashlib.sha256(_LEAF)
+                self._filled = 0
+
+    def _finish(self) -> None:
+        """Close the last, partial chunk at end of file."""
+        if self.digest.complete:
+            return
+        if self._filled or not self.digest.chunks:
+            self.digest.chunks.append(self._hash.hexdigest())
+        self.digest.complete = True
+
+    def close(self) -> None:
+        """Close the wrapped stream."""
+        if not self.closed:
+            self._source.close()
+        super().close()
+
+
+def hash_chunks(path: Union[Path, str], chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> ReadDigest:
+    """Read a whole file (decompressed) and return its digest."""
+    with ChunkHasher(open_input(path), chunk_size) as hasher:
+        while hasher.read(1 << 20):
+            pass
+        return hasher.digest
+
+
+def _hash_range(path: str, index: int, chunk_size: int) -> str:
+    """Return the leaf hash of chunk ``index`` of an uncompressed file."""
+    with Path(path).open("rb") as handle:
+        handle.seek(index * chunk_size)
+        return hashlib.sha256(_LEAF + handle.read(chunk_size)).hexdigest()
+
+
+def count_csv_rows(path: Union[Path, str]) -> int:
+    """Return the number of data rows of a CSV file, optionally compressed (blank lines excluded)."""
+    with open_text_input(path) as source:
+        return max(sum(1 for row in csv.reader(source) if row) - 1, 0)
+
+
+@dataclass
+class LedgerEntry:
+    """Record of one input read by a run.
+
+    Attributes:
+        source: Absolute input path
+        source_size: Input size in bytes when recorded
+        source_mtime_ns: Input modification time when recorded
+        output: Absolute path of the output the input's rows went to
+        output_size: Output size in bytes when recorded
+        output_mtime_ns: Output modification time when recorded
+        merkle_root: Merkle root of ``digest.chunks``
+        digest: Bytes, rows and chunk hashes read
+    """
+
+    source: str
+    source_size: int
+    source_mtime_ns: int
+    output: str
+    output_size: int
+    output_mtime_ns: int
+    merkle_root: str
+    digest: ReadDigest
+
+
+@dataclass
+class LedgerReport:
+    """Outcome of ``ReadLedger.verify``.
+
+    Attributes:
+        verified: Inputs whose reads were verified
+        issues: Problems found, keyed by input or output path
+        chunks_rehashed: Chunks read again to compare with the ledger
+        bytes_rehashed: Bytes read again to compare with the ledger
+    """
+
+    verified: list[Path] = field(default_factory=list)
+    issues: dict[str, list[str]] = field(default_factory=dict)
+    chunks_rehashed: int = 0
+    bytes_rehashed: int = 0
+
+    @property
+    def passed(self) -> bool:
+        """Return True if no problem was found."""
+        return not self.issues
+
+    def add(self, key: str, message: str) -> None:
+        """Record a problem with ``key``."""
+        self.issues.setdefault(key, []).append(message)
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        status = "passed" if self.passed else f"failed for {len(self.issues)} file(s)"
+        return (
+            f"Ledger verification {status}: {len(self.verified)} input(s) verified, "
+            f"{self.chunks_rehashed} chunk(s) ({self.bytes_rehashed / 1e6:.1f} MB) re-hashed"
+        )
+
+
+def _unchanged(path: str, size: int, mtime_ns: int) -> bool:
+    """Return True if a file still has the recorded size and mtime."""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+class ReadLedger:
+    """Per-input record of bytes, rows and chunk hashes read.
+
+    Examples:
+        >>> ledger = ReadLedger.load(Path("data/processed") / LEDGER_NAME)
+        >>> stats = filter_csv(source, output, hash_chunk_size=ledger.chunk_size)
+        >>> ledger.record(source, output, stats.digests[str(source.resolve())])
+        >>> ledger.save()
+        >>> ledger.verify(jobs=8).passed
+        True
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        entries: Optional[dict[str, LedgerEntry]] = None,
+        chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    ) -> None:
+        """Initialize a ledger.
+
+        Args:
+            path: Ledger file location
+            entries: Entries keyed by absolute input path
+            chunk_size: Bytes per hashed chunk for new entries
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        self.path = Path(path)
+        self.entries: dict[str, LedgerEntry] = entries if entries is not None else {}
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def load(cls, path: Union[Path, str], chunk_size: int = DEFAULT_HASH_CHUNK_SIZE) -> "ReadLedger":
+        """Load a ledger, starting empty if it is missing or unreadable."""
+        path = Path(path)
+        try:
+            data = json.loads(path.read_bytes())
+            if data.get("version") != LEDGER_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            entries = {
+                source: LedgerEntry(**{**entry, "digest": ReadDigest(**entry["digest"])})
+                for source, entry in data["entries"].items()
+            }
+        except FileNotFoundError:
+            return cls(path, chunk_size=chunk_size)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable ledger {path}: {e}")
+            return cls(path, chunk_size=chunk_size)
+        return cls(path, entries, chunk_size)
+
+    def save(self) -> None:
+        """Write the ledger atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": LEDGER_VERSION, "entries": {key: asdict(entry) for key, entry in self.entries.items()}}
+        with atomic_write(self.path) as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+
+    def record(self, source: Union[Path, str], output: Union[Path, str], digest: ReadDigest) -> None:
+        """Record what a run read from ``source`` into ``output``.
+
+        Call it right after the output was written, so the recorded output
+        size and mtime are those of the run.
+        """
+        source, output = Path(source).resolve(), Path(output).resolve()
+        source_stat, output_stat = source.stat(), output.stat()
+        self.entries[str(source)] = LedgerEntry(
+            source=str(source),
+            source_size=source_stat.st_size,
+            source_mtime_ns=source_stat.st_mtime_ns,
+            output=str(output),
+            output_size=output_stat.st_size,
+            output_mtime_ns=output_stat.st_mtime_ns,
+            merkle_root=digest.merkle_root,
+            digest=digest,
+        )
+
+    def prune(self) -> list[Path]:
+        """Forget inputs that no longer exist.
+
+        Returns:
+            Input paths that were forgotten
+        """
+        removed = [Path(key) for key in self.entries if not Path(key).exists()]
+        for path in removed:
+            del self.entries[str(path)]
+        return removed
+
+    def verify(self, *, deep: bool = False, jobs: Optional[int] = None) -> LedgerReport:
+        """Check that every recorded input was read in full into its output.
+
+        Args:
+            deep: Re-hash every input and recount every output, even if unchanged
+            jobs: Threads re-hashing chunks (default: one per CPU)
+
+        Returns:
+            The verification report
+        """
+        report = LedgerReport()
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+            rehashes = {
+                key: self._rehash(entry, executor)
+                for key, entry in self.entries.items()
+                if deep or not _unchanged(entry.source, entry.source_size, entry.source_mtime_ns)
+            }
+            for key, entry in self.entries.items():
+                problems = self._check_read(entry)
+                if key in rehashes:
+                    problems += self._compare(entry, rehashes[key], report)
+                for problem in problems:
+                    report.add(key, problem)
+                if not problems:
+                    report.verified.append(Path(key))
+        self._check_outputs(report, deep)
+        return report
+
+    @staticmethod
+    def _rehash(entry: LedgerEntry, executor: ThreadPoolExecutor) -> Optional[list[Future[Any]]]:
+        """Schedule re-hashing an input's chunks; None if the input is gone.
+
+        Uncompressed inputs are hashed one chunk per task; compressed
+        inputs can only be read sequentially and form a single task that
+        returns a ReadDigest.
+        """
+        path, chunk_size = entry.source, entry.digest.chunk_size
+        if not Path(path).exists():
+            return None
+        if detect_compression(path) is not None:
+            return [executor.submit(hash_chunks, path, chunk_size)]
+        count = -(-Path(path).stat().st_size // chunk_size) or 1
+        return [executor.submit(_hash_range, path, index, chunk_size) for index in range(count)]
+
+    @staticmethod
+    def _check_read(entry: LedgerEntry) -> list[str]:
+        """Return problems with the recorded read itself."""
+        digest = entry.digest
+        problems = []
+        if not digest.complete:
+            problems.append(f"Read stopped after {digest.bytes_read} bytes, before the end of the input")
+        compressed = Path(entry.source).exists() and detect_compression(entry.source) is not None
+        if digest.complete and not compressed and digest.bytes_read != entry.source_size:
+            problems.append(f"Read {digest.bytes_read} of {entry.source_size} bytes")
+        expected_chunks = max(-(-digest.bytes_read // digest.chunk_size), 1) if digest.complete else None
+        if expected_chunks is not None and len(digest.chunks) != expected_chunks:
+            problems.append(f"Ledger has {len(digest.chunks)} chunk hash(es), expected {expected_chunks}")
+        if merkle_root(digest.chunks) != entry.merkle_root:
+            problems.append("Ledger chunk hashes do not match the recorded Merkle root")
+        if digest.rows_written > digest.rows_read:
+            problems.append(f"Wrote {digest.rows_written} rows but read only {digest.rows_read}")
+        return problems
+
+    @staticmethod
+    def _compare(entry: LedgerEntry, futures: Optional[list[Future[Any]]], report: LedgerReport) -> list[str]:
+        """Compare re-hashed chunks with the ledger and return problems."""
+        if futures is None:
+            return ["Input no longer exists"]
+        if detect_compression(entry.source) is not None:
+            current = futures[0].result().chunks
+            report.bytes_rehashed += Path(entry.source).stat().st_size
+        else:
+            current = [future.result() for future in futures]
+            report.bytes_rehashed += min(entry.source_size, Path(entry.source).stat().st_size)
+        report.chunks_rehashed += len(current)
+        if merkle_root(current) == entry.merkle_root:
+            stat = Path(entry.source).stat()
+            entry.source_size, entry.source_mtime_ns = stat.st_size, stat.st_mtime_ns
+            return []
+        recorded = entry.digest.chunks
+        changed = [
+            index
+            for index in range(max(len(current), len(recorded)))
+            if current[index : index + 1] != recorded[index : index + 1]
+        ]
+        size, end = entry.digest.chunk_size, entry.digest.bytes_read
+        ranges = ", ".join(
+            f"{index * size}-{min((index + 1) * size, end)}" if index * size < end else f"{index * size}-"
+            for index in changed[:_LISTED_CHUNKS]
+        )
+        more = f" and {len(changed) - _LISTED_CHUNKS} more" if len(changed) > _LISTED_CHUNKS else ""
+        return [f"Input changed since it was read: {len(changed)} chunk(s) differ (bytes {ranges}{more})"]
+
+    def _check_outputs(self, report: LedgerReport, deep: bool) -> None:
+        """Reconcile each output's data rows with the rows written from its inputs."""
+        groups: dict[str, list[LedgerEntry]] = {}
+        for entry in self.entries.values():
+            groups.setdefault(entry.output, []).append(entry)
+        for output, entries in groups.items():
+            expected = sum(entry.digest.rows_written for entry in entries)
+            first = entries[0]
+            if not Path(output).exists():
+                report.add(output, "Output no longer exists")
+            elif deep or not _unchanged(output, first.output_size, first.output_mtime_ns):
+                actual = count_csv_rows(output)
+                if actual != expected:
+                    report.add(output, f"Output has {actual} data row(s), inputs wrote {expected}")
+            if output in report.issues:
+                sources = {entry.source for entry in entries}
+                report.verified = [path for path in report.verified if str(path) not in sources]
@@ -0,0 +1,265 @@
+"""Processing manifest for incremental reruns.
+
+A Manifest is a JSON file stored next to processed outputs (by default
+``data/processed/.manifest.json``). For every output it records the input
+files it was built from (path, size, mtime and SHA-256), the parameters
+used, and the output's own size, mtime and SHA-256.
+
+An output is current when its inputs and parameters are unchanged and the
+output itself is intact. Checks are cheap in the common case: a matching
+size and mtime is trusted without reading the file, and a changed mtime
+with an unchanged size falls back to comparing the content hash (so a
+``touch`` does not force reprocessing).
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from your_package_name.utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Union[Path, str]) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    with Path(path).open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+@dataclass
+class Fingerprint:
+    """Identity of a file's contents at one point in time.
+
+    Attributes:
+        path: Absolute file path
+        size: Size in bytes
+        mtime_ns: Modification time in nanoseconds
+        sha256: Hex SHA-256 digest of the contents
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: Union[Path, str]) -> "Fingerprint":
+        """Stat and hash a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        return cls(path=str(path), size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=file_sha256(path))
+
+    def matches(self) -> bool:
+        """Return True if the file still has this content.
+
+        A matching size and mtime is trusted; a different mtime with the
+        same size is confirmed by hashing, and the stored mtime is refreshed
+        when the content turns out unchanged.
+        """
+        try:
+            stat = Path(self.path).stat()
+        except FileNotFoundError:
+            return False
+        if stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+        if file_sha256(self.path) != self.sha256:
+            return False
+        self.mtime_ns = stat.st_mtime_ns
+        return True
+
+
+@dataclass
+class ManifestEntry:
+    """Record of how one output was produced.
+
+    Attributes:
+        inputs: Fingerprints of the inputs, in processing order
+        params: Parameters that affect the output (JSON-compatible)
+        output: Fingerprint of the output when it was written
+    """
+
+    inputs: list[Fingerprint]
+    params: dict[str, Any]
+    output: Fingerprint
+
+
+@dataclass
+class ManifestReport:
+    """Summary of an incremental run.
+
+    Attributes:
+        processed: Inputs that were (re)processed
+        skipped: Inputs whose outputs were current
+        stale: Outputs forgotten because all their inputs are gone
+        removed: Stale outputs that were also deleted
+        skipped_bytes: Total size of the skipped inputs
+    """
+
+    processed: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+    stale: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+    skipped_bytes: int = 0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        total = len(self.processed) + len(self.skipped)
+        text = (
+            f"Processed {len(self.processed)} of {total} input(s), skipped {len(self.skipped)} unchanged "
+            f"({self.skipped_bytes / 1e6:.1f} MB), removed {len(self.removed)} stale output(s)"
+        )
+        kept = len(self.stale) - len(self.removed)
+        if kept:
+            text += f", kept {kept} output(s) of deleted inputs"
+        return text
+
+
+def _key(path: Union[Path, str]) -> str:
+    """Return the manifest key of a path."""
+    return str(Path(path).resolve())
+
+
+def _normalize(params: Mapping[str, Any]) -> dict[str, Any]:
+    """Return params as they compare after a JSON round trip."""
+    normalized: dict[str, Any] = json.loads(json.dumps(dict(params), sort_keys=True))
+    return normalized
+
+
+class Manifest:
+    """Per-output record of inputs, parameters and checksums.
+
+    Examples:
+        >>> manifest = Manifest.load(Path("data/processed") / MANIFEST_NAME)
+        >>> if not manifest.is_current(output, [source], {"threshold": 0.5}):
+        ...     fingerprint = Fingerprint.of(source)
+        ...     filter_file(source, output, 0.5)
+        ...     manifest.record(output, [fingerprint], {"threshold": 0.5})
+        >>> manifest.save()
+    """
+
+    def __init__(self, path: Union[Path, str], entries: Optional[dict[str, ManifestEntry]] = None) -> None:
+        """Initialize a manifest.
+
+        Args:
+            path: Manifest file location
+            entries: Entries keyed by absolute output path
+        """
+        self.path = Path(path)
+        self.entries: dict[str, ManifestEntry] = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "Manifest":
+        """Load a manifest, starting empty if it is missing or unreadable."""
+        path = Path(path)
+        try:
+            data = json.loads(path.read_bytes())
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"unsupported version {data.get('version')!r}")
+            entries = {
+                output: ManifestEntry(
+                    inputs=[Fingerprint(**item) for item in entry["inputs"]],
+                    params=entry["params"],
+                    output=Fingerprint(**entry["output"]),
+                )
+                for output, entry in data["entries"].items()
+            }
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+            return cls(path)
+        return cls(path, entries)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "entries": {key: asdict(entry) for key, entry in self.entries.items()}}
+        with atomic_write(self.path) as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+
+    def is_current(
+        self,
+        output: Union[Path, str],
+        inputs: Iterable[Union[Path, str]],
+        params: Mapping[str, Any],
+    ) -> bool:
+        """Return True if an output is up to date with its inputs and parameters.
+
+        Args:
+            output: Output file
+            inputs: Input files, in processing order
+            params: Parameters that affect the output
+        """
+        entry = self.entries.get(_key(output))
+        if entry is None or entry.params != _normalize(params):
+            return False
+        if [item.path for item in entry.inputs] != [_key(path) for path in inputs]:
+            return False
+        return all(item.matches() for item in entry.inputs) and entry.output.matches()
+
+    def record(self, output: Union[Path, str], inputs: Iterable[Fingerprint], params: Mapping[str, Any]) -> None:
+        """Record a freshly written output.
+
+        Input fingerprints should be taken before processing, so an input
+        modified during the run is detected as changed on the next one.
+
+        Args:
+            output: Output file that was just written
+            inputs: Fingerprints of its inputs
+            params: Parameters used
+        """
+        self.entries[_key(output)] = ManifestEntry(list(inputs), _normalize(params), Fingerprint.of(output))
+
+    def prune(self, within: Optional[Iterable[Union[Path, str]]] = None, *, delete: bool = True) -> list[Path]:
+        """Forget, and by default delete, outputs whose inputs no longer exist.
+
+        Args:
+            within: Only consider outputs whose recorded inputs all lie in
+                these directories (default: None, every output)
+            delete: Also delete the output files (default: True; with False
+                they are left in place and are simply no longer tracked)
+
+        Returns:
+            Output paths that were forgotten
+        """
+        directories = None if within is None else {_key(directory) for directory in within}
+        stale = []
+        for key, entry in list(self.entries.items()):
+            if any(Path(item.path).exists() for item in entry.inputs):
+                continue
+            if directories is not None and any(str(Path(item.path).parent) not in directories for item in entry.inputs):
+                continue
+            if delete:
+                Path(key).unlink(missing_ok=True)
+            del self.entries[key]
+            stale.append(Path(key))
+        return stale
@@ -0,0 +1,286 @@
+"""Per-stage throughput and latency metrics for filter runs.
+
+A PipelineMetrics object collects the time spent in each stage of a run
+(reading, parsing, filtering, writing), row and byte counts and the peak
+resident set size. Stage times are exclusive: time spent reading while
+the parser asks for more input counts as reading, not parsing, so the
+stages add up to the measured run time plus a small unattributed rest.
+
+A MetricsReporter samples the metrics on a background thread and appends
+them to a JSON lines file and/or rewrites a Prometheus textfile-collector
+file every ``interval`` seconds. ``format_summary`` renders a final table.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import importlib
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Optional, Union
+
+from your_package_name.utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("read", "parse", "filter", "write")
+DEFAULT_METRICS_INTERVAL = 10.0
+PROMETHEUS_PREFIX = "your_package_name"
+_READ_BUFFER_SIZE = 1 << 20
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process, or None where unsupported."""
+    try:
+        resource = importlib.import_module("resource")
+    except ImportError:
+        return None
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PipelineMetrics:
+    """Stage times and row/byte counts of one run.
+
+    Counters are updated by the thread running the filter; stages may be
+    timed on several threads at once, and ``snapshot`` may be called from
+    any thread.
+
+    Examples:
+        >>> metrics = PipelineMetrics()
+        >>> filter_csv("data/raw/input.csv", "data/processed/output.csv", metrics=metrics)
+        >>> print(format_summary(metrics.snapshot()))
+    """
+
+    def __init__(self) -> None:
+        """Start the run clock with all counters at zero."""
+        self.started = time.perf_counter()
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.stage_seconds: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Attribute the time spent in the block to ``name``, excluding nested stages."""
+        # Nesting is per thread: a pipelined run times stages on several threads.
+        children: Optional[list[float]] = getattr(self._local, "children", None)
+        if children is None:
+            children = self._local.children = []
+        children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = children.pop()
+            with self._lock:
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed - nested
+            if children:
+                children[-1] += elapsed
+
+    def add_rows(self, rows_in: int, rows_out: int) -> None:
+        """Count rows read and written."""
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+
+    def wrap_input(self, stream: IO[bytes]) -> IO[bytes]:
+        """Return a buffered view of ``stream`` that counts bytes and time as the read stage."""
+        return io.BufferedReader(_MeteredReader(stream, self), buffer_size=_READ_BUFFER_SIZE)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current metrics as a JSON-compatible dict."""
+        elapsed = time.perf_counter() - self.started
+        with self._lock:
+            stages = dict(self.stage_seconds)
+        return {
+            "timestamp": time.time(),
+            "elapsed_seconds": elapsed,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "rows_per_second": self.rows_in / elapsed if elapsed > 0 else 0.0,
+            "stage_seconds": stages,
+            "other_seconds": max(elapsed - sum(stages.values()), 0.0),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+
+class _MeteredReader(io.RawIOBase):
+    """Raw stream that counts the bytes and time of reads from another stream."""
+
+    def __init__(self, source: IO[bytes], metrics: PipelineMetrics) -> None:
+        """Wrap a binary stream; it is closed with this reader."""
+        super().__init__()
+        self._source = source
+        self._metrics = metrics
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read into ``buffer`` as the read stage."""
+        with self._metrics.stage("read"):
+            data = self._source.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._metrics.bytes_in += size
+        return size
+
+    def close(self) -> None:
+        """Close the wrapped stream."""
+        if not self.closed:
+            self._source.close()
+        super().close()
+
+
+def format_prometheus(snapshot: dict[str, Any], prefix: str = PROMETHEUS_PREFIX) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {prefix}_rows_total Data rows read (in) and written (out).",
+        f"# TYPE {prefix}_rows_total counter",
+        f'{prefix}_rows_total{{direction="in"}} {snapshot["rows_in"]}',
+        f'{prefix}_rows_total{{direction="out"}} {snapshot["rows_out"]}',
+        f"# HELP {prefix}_bytes_total Bytes read (decompressed) and written.",
+        f"# TYPE {prefix}_bytes_total counter",
+        f'{prefix}_bytes_total{{direction="in"}} {snapshot["bytes_in"]}',
+        f'{prefix}_bytes_total{{direction="out"}} {snapshot["bytes_out"]}',
+        f"# HELP {prefix}_stage_seconds_total Time spent in each stage.",
+        f"# TYPE {prefix}_stage_seconds_total counter",
+        *(
+            f'{prefix}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}'
+            for stage, seconds in {**snapshot["stage_seconds"], "other": snapshot["other_seconds"]}.items()
+        ),
+        f"# HELP {prefix}_rows_per_second Rows read per second of run time.",
+        f"# TYPE {prefix}_rows_per_second gauge",
+        f"{prefix}_rows_per_second {snapshot['rows_per_second']:.3f}",
+        f"# HELP {prefix}_elapsed_seconds Run time so far.",
+        f"# TYPE {prefix}_elapsed_seconds gauge",
+        f"{prefix}_elapsed_seconds {snapshot['elapsed_seconds']:.6f}",
+    ]
+    if snapshot["peak_rss_bytes"] is not None:
+        lines += [
+            f"# HELP {prefix}_peak_rss_bytes Peak resident set size of the process.",
+            f"# TYPE {prefix}_peak_rss_bytes gauge",
+            f"{prefix}_peak_rss_bytes {snapshot['peak_rss_bytes']}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def format_summary(snapshot: dict[str, Any]) -> str:
+    """Render a snapshot as a plain-text table of stage times and totals."""
+    elapsed = snapshot["elapsed_seconds"]
+    stages = {**snapshot["stage_seconds"], "other": snapshot["other_seconds"]}
+    lines = [f"{'Stage':<8} {'Seconds':>10} {'Share':>7}"]
+    for stage, seconds in stages.items():
+        share = seconds / elapsed if elapsed > 0 else 0.0
+        lines.append(f"{stage:<8} {seconds:>10.3f} {share:>7.1%}")
+    lines.append(f"{'total':<8} {elapsed:>10.3f} {1:>7.1%}")
+    peak = snapshot["peak_rss_bytes"]
+    lines += [
+        f"Rows:  {snapshot['rows_in']:,} in, {snapshot['rows_out']:,} out ({snapshot['rows_per_second']:,.0f} rows/s)",
+        f"Bytes: {snapshot['bytes_in'] / 1e6:,.1f} MB in, {snapshot['bytes_out'] / 1e6:,.1f} MB out",
+        f"Peak RSS: {peak / 1e6:,.1f} MB" if peak is not None else "Peak RSS: unavailable",
+    ]
+    return "\n".join(lines)
+
+
+class MetricsReporter:
+    """Write metrics snapshots periodically on a background thread.
+
+    Use as a context manager around the run: a final snapshot (marked
+    ``"final": true`` in the JSON lines) is written on exit.
+
+    Examples:
+        >>> metrics = PipelineMetrics()
+        >>> with MetricsReporter(metrics, jsonl_path="metrics.jsonl", interval=5):
+        ...     filter_csv(source, output, metrics=metrics)
+    """
+
+    def __init__(
+        self,
+        metrics: PipelineMetrics,
+        *,
+        jsonl_path: Optional[Union[Path, str]] = None,
+        prometheus_path: Optional[Union[Path, str]] = None,
+        interval: float = DEFAULT_METRICS_INTERVAL,
+    ) -> None:
+        """Initialize the reporter.
+
+        Args:
+            metrics: Metrics to sample
+            jsonl_path: File to append one JSON object per snapshot to
+            prometheus_path: Textfile-collector file, rewritten atomically
+            interval: Seconds between snapshots (default: 10)
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        self.metrics = metrics
+        self.jsonl_path = Path(jsonl_path) if jsonl_path is not None else None
+        self.prometheus_path = Path(prometheus_path) if prometheus_path is not None else None
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+
+    def emit(self, final: bool = False) -> dict[str, Any]:
+        """Take a snapshot, write it to the configured outputs and return it."""
+        snapshot = self.metrics.snapshot()
+        if self.jsonl_path is not None:
+            with self.jsonl_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps({**snapshot, "final": final}) + "\n")
+        if self.prometheus_path is not None:
+            with atomic_write(self.prometheus_path) as handle:
+                handle.write(format_prometheus(snapshot))
+        return snapshot
+
+    def _run(self) -> None:
+        """Emit a snapshot every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.emit()
+            except OSError as e:
+                logger.warning(f"Could not write metrics: {e}")
+
+    def __enter__(self) -> "MetricsReporter":
+        """Start the reporting thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the thread and write the final snapshot."""
+        self._stop.set()
+        self._thread.join()
+        self.emit(final=True)
@@ -0,0 +1,474 @@
+"""Hive-style partitioned CSV output.
+
+``PartitionedWriter`` splits rows into one directory per combination of
+partition column values, e.g. ``date=2026-01-01/region=eu/part-00000.csv``.
+The partition columns are encoded in the directory names and left out of
+the files, as Hive, Spark and pyarrow datasets expect.
+
+Rows are buffered per partition and written in large appends. Open file
+handles are kept in an LRU pool bounded well below the process's file
+descriptor limit, so inputs with thousands of partitions neither reopen a
+file per row nor run out of descriptors. A partition's file is rolled to
+the next part number once it reaches ``max_file_bytes``.
+
+The dataset is built in a temporary sibling directory that replaces the
+output directory only when the writer is closed without error; a failed
+run leaves any previous output in place. A finished dataset holds a
+``_PARTITIONED`` marker file (ignored by dataset readers, like every
+``_``-prefixed file); only a directory with that marker is replaced
+unless the caller forces it.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import importlib
+import io
+import json
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Optional, Union
+
+from your_package_name.compression import open_input
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.streaming import DEFAULT_CHUNK_SIZE, FilterStats, filter_chunk, iter_chunks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FILE_BYTES = 128 << 20
+DEFAULT_BUFFER_BYTES = 1 << 20
+DEFAULT_MAX_BUFFERED_BYTES = 64 << 20
+DEFAULT_PARTITION_VALUE = "__HIVE_DEFAULT_PARTITION__"
+MARKER_NAME = "_PARTITIONED"
+
+# Characters Hive escapes in partition directory names, besides control characters.
+_ESCAPED = frozenset("\"#%'*/:=?\\\x7f{[]^")
+_FIRST_PRINTABLE = 0x20
+
+
+def default_max_open_files() -> int:
+    """Return a handle pool size well below the soft file descriptor limit."""
+    try:
+        resource = importlib.import_module("resource")
+    except ImportError:
+        return 128
+    soft: int = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft == resource.RLIM_INFINITY:
+        return 512
+    return max(8, min(512, soft // 4))
+
+
+def escape_partition_value(value: Any) -> str:
+    """Return a partition value escaped for use in a ``column=value`` directory name.
+
+    Path separators, ``=``, ``%`` and other characters Hive escapes become
+    ``%XX``; a missing or empty value becomes ``DEFAULT_PARTITION_VALUE``.
+    """
+    text = "" if value is None else str(value)
+    if not text:
+        return DEFAULT_PARTITION_VALUE
+    return "".join(f"%{ord(char):02X}" if char in _ESCAPED or ord(char) < _FIRST_PRINTABLE else char for char in text)
+
+
+def partition_path(partition_by: Sequence[str], values: Sequence[Any]) -> Path:
+    """Return the relative directory of a partition, e.g. ``date=2026-01-01/region=eu``."""
+    return Path(*(f"{column}={escape_partition_value(value)}" for column, value in zip(partition_by, values)))
+
+
+@dataclass
+class PartitionStats:
+    """What a PartitionedWriter wrote.
+
+    Attributes:
+        rows: Rows written
+        partitions: Distinct partitions
+        files: Data files, relative to the output directory, in creation order
+        bytes_written: Bytes written to data files, headers included
+        opens: Times a data file was opened; more than ``len(files)`` means
+            handles were evicted from the pool and reopened
+    """
+
+    rows: int = 0
+    partitions: int = 0
+    files: list[Path] = field(default_factory=list)
+    bytes_written: int = 0
+    opens: int = 0
+
+
+class _Partition:
+    """Buffered rows and current part file of one partition."""
+
+    __slots__ = ("buffer", "directory", "part", "size", "writer")
+
+    def __init__(self, directory: Path) -> None:
+        """Start with an empty buffer and no file."""
+        self.directory = directory
+        self.part = 0
+        self.size = 0
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    @property
+    def path(self) -> Path:
+        """Return the current part file, relative to the output directory."""
+        return self.directory / f"part-{self.part:05d}.csv"
+
+
+class PartitionedWriter:
+    """Write rows into a Hive-partitioned directory of CSV files.
+
+    Use as a context manager: leaving the block without an error flushes
+    every buffer and moves the finished dataset to ``root``, replacing a
+    dataset written there before; an error discards it.
+
+    Examples:
+        >>> with PartitionedWriter("data/processed/events", ["date", "region", "value"], ["date", "region"]) as w:
+        ...     w.writerows(rows)
+        >>> w.stats.files[0]
+        PosixPath('date=2026-01-01/region=eu/part-00000.csv')
+    """
+
+    def __init__(
+        self,
+        root: Union[Path, str],
+        fieldnames: Sequence[str],
+        partition_by: Sequence[str],
+        *,
+        max_open_files: Optional[int] = None,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+        force: bool = False,
+    ) -> None:
+        """Create an empty staging directory next to ``root``.
+
+        Args:
+            root: Output directory of the dataset
+            fieldnames: Columns of the rows to write
+            partition_by: Columns whose values select the partition, outermost first
+            max_open_files: Largest number of data files kept open at once
+                (default: a quarter of the file descriptor limit, at most 512)
+            max_file_bytes: Size at which a partition's file is rolled (default: 128 MiB)
+            buffer_bytes: Buffered size at which a partition is written out (default: 1 MiB)
+            max_buffered_bytes: Buffered size across partitions at which the
+                largest buffers are written out (default: 64 MiB)
+            force: Replace ``root`` even if it was not written by a PartitionedWriter
+
+        Raises:
+            ValueError: If partition_by is empty, names a column not in
+                fieldnames, or leaves no data column, or a limit is not positive
+            FileExistsError: If ``root`` exists and is not a partitioned
+                dataset, unless ``force`` is set
+        """
+        missing = [column for column in partition_by if column not in fieldnames]
+        if not partition_by or missing:
+            raise ValueError(f"Partition columns must be non-empty and among the fields, got {list(partition_by)}")
+        self.columns = [column for column in fieldnames if column not in partition_by]
+        if not self.columns:
+            raise ValueError("At least one column must not be a partition column")
+        self.max_open_files = max_open_files if max_open_files is not None else default_max_open_files()
+        for name, limit in [
+            ("max_open_files", self.max_open_files),
+            ("max_file_bytes", max_file_bytes),
+            ("buffer_bytes", buffer_bytes),
+            ("max_buffered_bytes", max_buffered_bytes),
+        ]:
+            if limit <= 0:
+                raise ValueError(f"{name} must be positive, got {limit}")
+
+        self.root = Path(root)
+        self.force = force
+        _check_replaceable(self.root, force)
+        self.partition_by = list(partition_by)
+        self.max_file_bytes = max_file_bytes
+        self.buffer_bytes = buffer_bytes
+        self.max_buffered_bytes = max_buffered_bytes
+        self.stats = PartitionStats()
+        self._header = _encode_row(self.columns)
+        self._partitions: dict[tuple[Any, ...], _Partition] = {}
+        self._handles: OrderedDict[Path, IO[bytes]] = OrderedDict()
+        self._buffered = 0
+        self._staging = self.root.with_name(f".{self.root.name}.{os.getpid()}.tmp")
+        shutil.rmtree(self._staging, ignore_errors=True)
+        self._staging.mkdir(parents=True)
+
+    def __enter__(self) -> "PartitionedWriter":
+        """Return the writer."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Commit the dataset, or discard it if the block raised."""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def write(self, row: Mapping[str, Any]) -> None:
+        """Buffer one row in its partition, writing the buffer out once it is large."""
+        key = tuple(row[column] for column in self.partition_by)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition(partition_path(self.partition_by, key))
+            self.stats.partitions += 1
+        before = partition.buffer.tell()
+        partition.writer.writerow([row[column] for column in self.columns])
+        self._buffered += partition.buffer.tell() - before
+        self.stats.rows += 1
+        if partition.buffer.tell() >= self.buffer_bytes:
+            self._flush(partition)
+        if self._buffered >= self.max_buffered_bytes:
+            self._flush_largest()
+
+    def writerows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Buffer several rows."""
+        for row in rows:
+            self.write(row)
+
+    def commit(self) -> PartitionStats:
+        """Write out every buffer and move the dataset into place.
+
+        An existing ``root`` is replaced: it is renamed aside, the new
+        dataset renamed in, and the old one deleted, so ``root`` only ever
+        holds a complete dataset (it is briefly absent between the renames).
+
+        Raises:
+            FileExistsError: If ``root`` was created meanwhile and is not a
+                partitioned dataset, unless the writer was forced
+        """
+        try:
+            for partition in self._partitions.values():
+                self._flush(partition)
+            self._close_handles()
+            _check_replaceable(self.root, self.force)
+            marker = {"partition_by": self.partition_by, "columns": self.columns}
+            (self._staging / MARKER_NAME).write_text(json.dumps(marker) + "\n", encoding="utf-8")
+        except BaseException:
+            self.abort()
+            raise
+        backup = self.root.with_name(f".{self.root.name}.{os.getpid()}.old")
+        replaced = self.root.exists() or self.root.is_symlink()
+        if replaced:
+            self.root.replace(backup)
+        self._staging.replace(self.root)
+        if replaced:
+            _remove(backup)
+        logger.debug(
+            f"Wrote {self.stats.rows} rows to {len(self.stats.files)} files in "
+            f"{self.stats.partitions} partitions under {self.root}"
+        )
+        return self.stats
+
+    def abort(self) -> None:
+        """Close every file and delete the staging directory."""
+        self._close_handles()
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def _flush(self, partition: _Partition) -> None:
+        """Append a partition's buffer to its file, rolling to a new part file if it is full."""
+        text = partition.buffer.getvalue()
+        if not text:
+            return
+        data = text.encode("utf-8")
+        partition.buffer.seek(0)
+        partition.buffer.truncate()
+        self._buffered -= len(text)
+        if partition.size and partition.size + len(data) > self.max_file_bytes:
+            handle = self._handles.pop(partition.path, None)
+            if handle is not None:
+                handle.close()
+            partition.part += 1
+            partition.size = 0
+        if not partition.size:
+            data = self._header + data
+            self.stats.files.append(partition.path)
+        self._handle(partition).write(data)
+        partition.size += len(data)
+        self.stats.bytes_written += len(data)
+
+    def _flush_largest(self) -> None:
+        """Write out the largest buffers until at most half the buffer budget is in use."""
+        for partition in sorted(self._partitions.values(), key=lambda p: p.buffer.tell(), reverse=True):
+            if self._buffered <= self.max_buffered_bytes // 2:
+                return
+            self._flush(partition)
+
+    def _handle(self, partition: _Partition) -> IO[bytes]:
+        """Return an open handle to a partition's current file, evicting the least recently used."""
+        path = partition.path
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        while len(self._handles) >= self.max_open_files:
+            _, evicted = self._handles.popitem(last=False)
+            evicted.close()
+        target = self._staging / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        handle = self._handles[path] = target.open("ab")
+        self.stats.opens += 1
+        return handle
+
+    def _close_handles(self) -> None:
+        """Close every pooled handle."""
+        while self._handles:
+            _, handle = self._handles.popitem()
+            handle.close()
+
+
+def _check_replaceable(root: Path, force: bool) -> None:
+    """Refuse to replace anything but a dataset written by a PartitionedWriter, unless forced.
+
+    Raises:
+        FileExistsError: If ``root`` exists without a marker and ``force`` is not set
+    """
+    if force or not (root.exists() or root.is_symlink()):
+        return
+    if root.is_symlink() or not root.is_dir() or not (root / MARKER_NAME).is_file():
+        raise FileExistsError(f"Not replacing {root}: it is not a partitioned dataset (force to replace it)")
+
+
+def _remove(path: Path) -> None:
+    """Delete a file, symlink or directory tree; a symlink's target is left alone."""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _encode_row(values: Sequence[Any]) -> bytes:
+    """Return one CSV record as UTF-8 bytes."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _filter_into(
+    writer: PartitionedWriter,
+    reader: Iterable[dict[str, str]],
+    threshold: float,
+    chunk_size: int,
+    stats: FilterStats,
+    metrics: PipelineMetrics,
+) -> None:
+    """Filter the rows of one input into the writer, chunk by chunk."""
+    chunks = iter_chunks(reader, chunk_size)
+    while True:
+        with metrics.stage("parse"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        with metrics.stage("filter"):
+            kept = filter_chunk(chunk, threshold, first_row=stats.rows_read + 1)
+        with metrics.stage("write"):
+            writer.writerows(kept)
+        stats.rows_read += len(chunk)
+        stats.rows_written += len(kept)
+        metrics.add_rows(len(chunk), len(kept))
+
+
+def filter_partitioned(
+    input_paths: Sequence[Union[Path, str]],
+    output_dir: Union[Path, str],
+    threshold: float,
+    partition_by: Sequence[str],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_open_files: Optional[int] = None,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    metrics: Optional[PipelineMetrics] = None,
+    force: bool = False,
+) -> tuple[FilterStats, PartitionStats]:
+    """Filter CSV inputs with ``process_data`` into a Hive-partitioned dataset.
+
+    Inputs (optionally compressed) are read in order in chunks; kept rows
+    go to a PartitionedWriter that replaces ``output_dir`` once every
+    input has been processed.
+
+    Args:
+        input_paths: Input CSVs with the same header, containing 'value'
+            and the partition columns
+        output_dir: Dataset directory, replaced on success; it must not
+            contain an input
+        threshold: Minimum value to keep
+        partition_by: Partition columns, outermost first
+        chunk_size: Rows per chunk (default: 10000)
+        max_open_files: Handle pool size (see ``PartitionedWriter``)
+        max_file_bytes: Size at which partition files are rolled
+        metrics: Collects read, parse, filter and write times and row and
+            byte counts
+        force: Replace ``output_dir`` even if it is not a partitioned dataset
+
+    Returns:
+        Row counts of the inputs, and what was written
+
+    Raises:
+        KeyError: If an input has no 'value' column
+        ValueError: If the inputs' headers differ, a value is not numeric,
+            an input is inside ``output_dir``, or the partition columns are
+            invalid (see ``PartitionedWriter``)
+        FileExistsError: If ``output_dir`` exists and is not a partitioned
+            dataset, unless ``force`` is set
+    """
+    root = Path(output_dir).resolve()
+    for input_path in input_paths:
+        resolved = Path(input_path).resolve()
+        if resolved == root or root in resolved.parents:
+            raise ValueError(f"Input {input_path} is inside the output directory {output_dir}, which is replaced")
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    stats = FilterStats()
+    writer: Optional[PartitionedWriter] = None
+    try:
+        for input_path in input_paths:
+            with io.TextIOWrapper(metrics.wrap_input(open_input(input_path)), encoding="utf-8", newline="") as source:
+                with metrics.stage("parse"):
+                    reader = csv.DictReader(source)
+                    fieldnames = tuple(reader.fieldnames or ())
+                if "value" not in fieldnames:
+                    raise KeyError(f"Input is missing 'value' column: {input_path}")
+                if writer is None:
+                    stats.columns = fieldnames
+                    writer = PartitionedWriter(
+                        output_dir,
+                        fieldnames,
+                        partition_by,
+                        max_open_files=max_open_files,
+                        max_file_bytes=max_file_bytes,
+                        force=force,
+                    )
+                elif fieldnames != stats.columns:
+                    raise ValueError(f"Header of {input_path} differs from the first input: {list(fieldnames)}")
+                _filter_into(writer, reader, threshold, chunk_size, stats, metrics)
+        if writer is None:
+            raise ValueError("No inputs to partition")
+        with metrics.stage("write"):
+            written = writer.commit()
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    metrics.bytes_out += written.bytes_written
+    return stats, written
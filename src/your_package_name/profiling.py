@@ -0,0 +1,224 @@
+"""CPU and memory profiling of a block of code.
+
+``profile_run`` wraps a run and writes, depending on the mode:
+
+- ``<name>.pstats``: cProfile statistics, readable with ``pstats`` or
+  viewers such as snakeviz
+- ``<name>.collapsed``: sampled call stacks in the collapsed format
+  (``outer;inner;leaf count`` per line) that flamegraph.pl, speedscope and
+  inferno accept
+- ``<name>.memory.txt``: peak traced memory, the top allocation sites at
+  the end of the run, and the top differences between tracemalloc
+  snapshots taken at the start and the end
+
+Only the calling thread is profiled; work done in worker processes is
+not. No profiler, sampler or tracing runs outside ``profile_run``.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import cProfile
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Literal, Optional, Union
+
+from your_package_name.utils import atomic_write
+
+ProfileMode = Literal["cpu", "memory", "both"]
+
+PROFILE_MODES: tuple[ProfileMode, ...] = ("cpu", "memory", "both")
+DEFAULT_TOP = 25
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_IGNORED_ALLOCATIONS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Return a flamegraph frame name: function, file name and first line."""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample the call stack of one thread at a fixed interval.
+
+    Samples are counted per distinct stack, root first, which is the
+    collapsed-stack format read by flamegraph tools.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        """Initialize the sampler.
+
+        Args:
+            thread_id: Thread to sample (default: the calling thread)
+            interval: Seconds between samples (default: 5 ms)
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        """Record one stack per interval until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def memory_report(start: tracemalloc.Snapshot, end: tracemalloc.Snapshot, peak: int, top: int = DEFAULT_TOP) -> str:
+    """Render the top allocation sites and the snapshot difference as text.
+
+    Args:
+        start: Snapshot taken at the start of the run
+        end: Snapshot taken at the end of the run
+        peak: Peak traced memory in bytes during the run
+        top: Number of lines per section
+    """
+    start, end = start.filter_traces(_IGNORED_ALLOCATIONS), end.filter_traces(_IGNORED_ALLOCATIONS)
+    lines = [f"Peak traced memory: {peak / 1e6:,.1f} MB", "", f"Top {top} allocation sites at the end of the run:"]
+    lines += [f"  {stat}" for stat in end.statistics("lineno")[:top]]
+    lines += ["", f"Top {top} differences between the start and the end of the run:"]
+    lines += [f"  {stat}" for stat in end.compare_to(start, "lineno")[:top]]
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class ProfileReport:
+    """Files written by ``profile_run``; paths stay None for disabled modes.
+
+    Attributes:
+        pstats_path: cProfile statistics
+        collapsed_path: Sampled stacks in collapsed format
+        memory_path: tracemalloc report
+    """
+
+    pstats_path: Optional[Path] = None
+    collapsed_path: Optional[Path] = None
+    memory_path: Optional[Path] = None
+
+
+@contextmanager
+def profile_run(
+    mode: ProfileMode,
+    output_dir: Union[Path, str],
+    name: str = "profile",
+    *,
+    top: int = DEFAULT_TOP,
+    sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+) -> Iterator[ProfileReport]:
+    """Profile the enclosed block and write the reports when it exits.
+
+    Reports are also written when the block raises. Memory snapshots are
+    taken outside the CPU profiling window, so they do not show up in it.
+
+    Args:
+        mode: "cpu", "memory" or "both"
+        output_dir: Directory for the report files (created if missing)
+        name: File name prefix of the reports
+        top: Lines per section of the memory report
+        sample_interval: Seconds between stack samples
+
+    Yields:
+        The report paths, filled in on exit
+
+    Raises:
+        ValueError: If mode is unknown
+
+    Examples:
+        >>> with profile_run("both", "profiles", "nightly") as report:
+        ...     filter_csv("data/raw/input.csv", "data/processed/output.csv")
+        >>> report.collapsed_path
+        PosixPath('profiles/nightly.collapsed')
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Profile mode must be one of {', '.join(PROFILE_MODES)}, got {mode!r}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cpu, memory = mode in ("cpu", "both"), mode in ("memory", "both")
+    report = ProfileReport()
+
+    was_tracing = tracemalloc.is_tracing()
+    start_snapshot = None
+    if memory:
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start_snapshot = tracemalloc.take_snapshot()
+
+    profiler = cProfile.Profile() if cpu else None
+    sampler = StackSampler(interval=sample_interval) if cpu else None
+    if profiler is not None and sampler is not None:
+        sampler.start()
+        profiler.enable()
+
+    try:
+        yield report
+    finally:
+        if profiler is not None and sampler is not None:
+            profiler.disable()
+            sampler.stop()
+
+        if start_snapshot is not None:
+            end_snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+            report.memory_path = output_dir / f"{name}.memory.txt"
+            with atomic_write(report.memory_path) as handle:
+                handle.write(memory_report(start_snapshot, end_snapshot, peak, top))
+
+        if profiler is not None and sampler is not None:
+            report.pstats_path = output_dir / f"{name}.pstats"
+            profiler.dump_stats(report.pstats_path)
+            report.collapsed_path = output_dir / f"{name}.collapsed"
+            with atomic_write(report.collapsed_path) as handle:
+                handle.write(sampler.collapsed())
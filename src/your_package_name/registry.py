@@ -0,0 +1,324 @@
+"""Indexed collection of ExampleClass instances.
+
+This module provides ExampleRegistry, which replaces linear scans over a
+list of instances with a name index (dict) and a value index of
+``(value, name)`` keys. The value index is a list of sorted buckets of
+about 512 keys with the largest key of each bucket kept alongside, so an
+update bisects the bucket maxima and then one bucket (O(log n) plus a
+bucket-sized move) instead of shifting one list of every key.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Optional
+
+from your_package_name.core import ExampleClass
+
+_value_of = itemgetter(0)
+
+# Keys per bucket of the value index; a bucket is split at twice this size.
+_BUCKET_SIZE = 512
+
+_Key = tuple[float, str]
+
+
+class _SortedKeys:
+    """Sorted (value, name) keys stored as a list of bounded, sorted buckets.
+
+    Inserting into a flat sorted list shifts every later key, so updates
+    cost O(n). Here a key is placed by bisecting the bucket maxima and
+    then its bucket, so an update moves at most ``2 * _BUCKET_SIZE`` keys.
+    Positional queries add up the lengths of the buckets before the key,
+    which is O(n / _BUCKET_SIZE) but done in C by ``sum(map(len, ...))``.
+    """
+
+    def __init__(self, keys: Iterable[_Key] = ()) -> None:
+        """Build the index from keys in any order."""
+        ordered = sorted(keys)
+        self._buckets = [ordered[i : i + _BUCKET_SIZE] for i in range(0, len(ordered), _BUCKET_SIZE)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return self._len
+
+    def __iter__(self) -> Iterator[_Key]:
+        """Iterate over keys in ascending order."""
+        return chain.from_iterable(self._buckets)
+
+    def add(self, key: _Key) -> None:
+        """Insert a key."""
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+        else:
+            index = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+            bucket = self._buckets[index]
+            insort(bucket, key)
+            self._maxes[index] = bucket[-1]
+            if len(bucket) > 2 * _BUCKET_SIZE:
+                self._buckets[index : index + 1] = [bucket[:_BUCKET_SIZE], bucket[_BUCKET_SIZE:]]
+                self._maxes[index : index + 1] = [bucket[_BUCKET_SIZE - 1], bucket[-1]]
+        self._len += 1
+
+    def remove(self, key: _Key) -> None:
+        """Remove a key that is in the index."""
+        index = bisect_left(self._maxes, key)
+        bucket = self._buckets[index]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+        self._len -= 1
+
+    def _position(self, bucket: int, offset: int) -> int:
+        """Return the overall position of an offset within a bucket."""
+        return sum(map(len, self._buckets[:bucket])) + offset
+
+    def index(self, key: _Key) -> int:
+        """Return the position at which a key is or would be inserted."""
+        bucket = bisect_left(self._maxes, key)
+        if bucket == len(self._maxes):
+            return self._len
+        return self._position(bucket, bisect_left(self._buckets[bucket], key))
+
+    def bisect_value_left(self, value: float) -> int:
+        """Return the position of the first key with a value of at least ``value``."""
+        bucket = bisect_left(self._maxes, value, key=_value_of)
+        if bucket == len(self._maxes):
+            return self._len
+        return self._position(bucket, bisect_left(self._buckets[bucket], value, key=_value_of))
+
+    def bisect_value_right(self, value: float) -> int:
+        """Return the position of the first key with a value above ``value``."""
+        bucket = bisect_right(self._maxes, value, key=_value_of)
+        if bucket == len(self._maxes):
+            return self._len
+        return self._position(bucket, bisect_right(self._buckets[bucket], value, key=_value_of))
+
+    def __getitem__(self, position: int) -> _Key:
+        """Return the key at a position; negative positions count from the end.
+
+        Raises:
+            IndexError: If the position is out of range
+        """
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("Registry rank out of range")
+        for bucket in self._buckets:
+            if position < len(bucket):
+                return bucket[position]
+            position -= len(bucket)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def between(self, start: int, stop: int) -> Iterator[_Key]:
+        """Iterate over the keys at positions ``start`` to ``stop - 1``."""
+        bucket = 0
+        while bucket < len(self._buckets) and start >= len(self._buckets[bucket]):
+            start -= len(self._buckets[bucket])
+            stop -= len(self._buckets[bucket])
+            bucket += 1
+        return islice(chain.from_iterable(self._buckets[bucket:]), start, max(start, stop))
+
+
+class ExampleRegistry:
+    """Collection of ExampleClass instances indexed by name and by value.
+
+    Lookup by name is O(1). The value index keeps (value, name) keys in
+    sorted buckets of bounded size, so updates cost O(log n) plus a
+    bucket-sized move instead of the O(n) shift of one sorted list, and
+    range, rank and top-N queries cost O(log n + n / 512) plus the size of
+    the result. Ties in value are ordered by name, so query results are
+    deterministic.
+
+    The value index is only kept correct for changes made through the
+    registry: call ``increment`` and ``reset`` on the registry, not on the
+    instances it returns.
+
+    Examples:
+        >>> registry = ExampleRegistry([ExampleClass("a", 1), ExampleClass("b", 5)])
+        >>> registry.increment("a", 10)
+        >>> [obj.name for obj in registry.top(1)]
+        ['a']
+        >>> registry.between(0, 6)
+        [ExampleClass(name='b', value=5)]
+    """
+
+    def __init__(self, objects: Iterable[ExampleClass] = ()) -> None:
+        """Initialize the registry.
+
+        Args:
+            objects: Initial instances; names must be unique
+
+        Raises:
+            ValueError: If two instances share a name
+        """
+        self._by_name: dict[str, ExampleClass] = {}
+        for obj in objects:
+            if obj.name in self._by_name:
+                raise ValueError(f"Duplicate name in registry: {obj.name!r}")
+            self._by_name[obj.name] = obj
+        self._by_value = _SortedKeys((obj.value, obj.name) for obj in self._by_name.values())
+
+    def add(self, obj: ExampleClass) -> None:
+        """Add an instance to the registry.
+
+        Args:
+            obj: Instance to add
+
+        Raises:
+            ValueError: If an instance with the same name is registered
+        """
+        if obj.name in self._by_name:
+            raise ValueError(f"Duplicate name in registry: {obj.name!r}")
+        self._by_name[obj.name] = obj
+        self._by_value.add((obj.value, obj.name))
+
+    def remove(self, name: str) -> ExampleClass:
+        """Remove and return an instance.
+
+        Raises:
+            KeyError: If no instance has this name
+        """
+        obj = self[name]
+        self._by_value.remove((obj.value, name))
+        del self._by_name[name]
+        return obj
+
+    def __getitem__(self, name: str) -> ExampleClass:
+        """Return the instance with the given name.
+
+        Raises:
+            KeyError: If no instance has this name
+        """
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f"No instance named {name!r} in registry") from None
+
+    def get(self, name: str) -> Optional[ExampleClass]:
+        """Return the instance with the given name, or None."""
+        return self._by_name.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if an instance with this name is registered."""
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        """Return the number of registered instances."""
+        return len(self._by_name)
+
+    def __iter__(self) -> Iterator[ExampleClass]:
+        """Iterate over instances in ascending value order."""
+        for _, name in self._by_value:
+            yield self._by_name[name]
+
+    def increment(self, name: str, amount: float = 1.0) -> None:
+        """Increment an instance and update the value index.
+
+        Args:
+            name: Name of the instance
+            amount: Amount to add (default: 1.0)
+
+        Raises:
+            KeyError: If no instance has this name
+            ValueError: If amount is negative
+            TypeError: If amount is not numeric
+        """
+        obj = self[name]
+        old_value = obj.value
+        obj.increment(amount)
+        self._by_value.remove((old_value, name))
+        self._by_value.add((obj.value, name))
+
+    def reset(self, name: str) -> None:
+        """Reset an instance to zero and update the value index.
+
+        Raises:
+            KeyError: If no instance has this name
+        """
+        obj = self[name]
+        self._by_value.remove((obj.value, name))
+        obj.reset()
+        self._by_value.add((obj.value, name))
+
+    def between(self, low: float, high: float) -> list[ExampleClass]:
+        """Return instances with ``low <= value <= high`` in ascending order.
+
+        Args:
+            low: Inclusive lower bound
+            high: Inclusive upper bound
+
+        Returns:
+            Matching instances ordered by value, then name
+        """
+        start = self._by_value.bisect_value_left(low)
+        end = self._by_value.bisect_value_right(high)
+        return [self._by_name[name] for _, name in self._by_value.between(start, end)]
+
+    def count_between(self, low: float, high: float) -> int:
+        """Return the number of instances with ``low <= value <= high``."""
+        start = self._by_value.bisect_value_left(low)
+        end = self._by_value.bisect_value_right(high)
+        return max(0, end - start)
+
+    def rank(self, name: str) -> int:
+        """Return the 0-based position of an instance in ascending value order.
+
+        Raises:
+            KeyError: If no instance has this name
+        """
+        obj = self[name]
+        return self._by_value.index((obj.value, name))
+
+    def nth(self, rank: int) -> ExampleClass:
+        """Return the instance at a 0-based position in ascending value order.
+
+        Negative ranks count from the largest value.
+
+        Raises:
+            IndexError: If rank is out of range
+        """
+        _, name = self._by_value[rank]
+        return self._by_name[name]
+
+    def top(self, n: int) -> list[ExampleClass]:
+        """Return the ``n`` instances with the largest values, largest first.
+
+        Instances with equal values are ordered by name, as everywhere else.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError(f"n must be non-negative, got {n}")
+        n = min(n, len(self._by_value))
+        if n == 0:
+            return []
+        # Start at the first key tied with the n-th largest so that ties at
+        # the cut are broken by name rather than by position in the index.
+        lowest, _ = self._by_value[-n]
+        start = self._by_value.bisect_value_left(lowest)
+        keys = sorted(self._by_value.between(start, len(self._by_value)), key=lambda key: (-key[0], key[1]))
+        return [self._by_name[name] for _, name in keys[:n]]
@@ -0,0 +1,319 @@
+"""Binary serialization for ExampleClass collections.
+
+This module stores many ExampleClass instances in a compact, versioned,
+column-oriented file instead of pickling the object graph. Files can be
+loaded eagerly with ``load_many`` or opened lazily with ``open_many``,
+which memory-maps the file and decodes single instances on demand.
+
+File layout (all integers little-endian; the header and the numeric
+sections are multiples of 8 bytes, so every number is 8-byte aligned, and
+the byte sections at the end are not padded)::
+
+    header        magic, version, reserved, count, names size, metadata size
+    values        count x float64
+    name offsets  (count + 1) x uint64 into the name table
+    meta offsets  (count + 1) x uint64 into the metadata blob
+    name table    concatenated UTF-8 names
+    metadata blob concatenated JSON objects (empty span for empty metadata)
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Optional, Union, overload
+
+from your_package_name.core import ExampleClass
+
+MAGIC = b"EXCB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQQ")
+_VALUE = struct.Struct("<d")
+_OFFSET = struct.Struct("<Q")
+
+
+def _to_little_endian(column: "array[Any]") -> bytes:
+    """Return the raw bytes of an array in little-endian order."""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_little_endian(typecode: str, raw: Union[bytes, memoryview]) -> "array[Any]":
+    """Build an array from little-endian raw bytes."""
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class _Layout:
+    """Section offsets of a collection file, derived from its header."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], size: int) -> None:
+        """Validate the header and compute section offsets.
+
+        Raises:
+            ValueError: If the header is invalid or the file is truncated
+        """
+        if size < _HEADER.size:
+            raise ValueError("File is too short to be an ExampleClass collection")
+
+        magic, version, _reserved, count, names_size, meta_size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an ExampleClass collection file (bad magic)")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported collection format version {version}, expected {FORMAT_VERSION}")
+
+        self.count: int = count
+        self.values = _HEADER.size
+        self.name_offsets = self.values + count * _VALUE.size
+        self.meta_offsets = self.name_offsets + (count + 1) * _OFFSET.size
+        self.names = self.meta_offsets + (count + 1) * _OFFSET.size
+        self.meta = self.names + names_size
+        self.end = self.meta + meta_size
+
+        if size < self.end:
+            raise ValueError(f"Truncated collection file: expected {self.end} bytes, got {size}")
+
+
+def dump_many(objects: Iterable[ExampleClass], path: Union[Path, str], *, fsync: bool = False) -> int:
+    """Write ExampleClass instances to a binary collection file.
+
+    The file is written to a temporary sibling and renamed into place, so
+    an interrupted dump never leaves a partially written checkpoint.
+
+    Args:
+        objects: Instances to serialize, in the order they should be stored
+        path: Destination file path
+        fsync: Flush the file to stable storage before renaming it into place
+
+    Returns:
+        Number of instances written
+
+    Raises:
+        TypeError: If any metadata dictionary is not JSON-serializable
+
+    Examples:
+        >>> dump_many([ExampleClass("a", 1.0)], "objects.excb")
+        1
+    """
+    path = Path(path)
+    values: array[float] = array("d")
+    name_offsets: array[int] = array("Q", [0])
+    meta_offsets: array[int] = array("Q", [0])
+    names = bytearray()
+    meta = bytearray()
+
+    for obj in objects:
+        values.append(obj.value)
+        names += obj.name.encode("utf-8")
+        name_offsets.append(len(names))
+        metadata = obj.metadata
+        if metadata:
+            meta += json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+        meta_offsets.append(len(meta))
+
+    count = len(values)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, len(names), len(meta)))
+        handle.write(_to_little_endian(values))
+        handle.write(_to_little_endian(name_offsets))
+        handle.write(_to_little_endian(meta_offsets))
+        handle.write(names)
+        handle.write(meta)
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+    tmp_path.replace(path)
+
+    return count
+
+
+def load_many(path: Union[Path, str]) -> list[ExampleClass]:
+    """Read every instance from a binary collection file.
+
+    Args:
+        path: Collection file written by ``dump_many``
+
+    Returns:
+        List of ExampleClass instances in stored order
+
+    Raises:
+        ValueError: If the file is not a valid collection file
+
+    Examples:
+        >>> load_many("objects.excb")
+        [ExampleClass(name='a', value=1.0)]
+    """
+    data = Path(path).read_bytes()
+    layout = _Layout(data, len(data))
+    count = layout.count
+
+    view = memoryview(data)
+    values = _from_little_endian("d", view[layout.values : layout.name_offsets])
+    name_offsets = _from_little_endian("Q", view[layout.name_offsets : layout.meta_offsets])
+    meta_offsets = _from_little_endian("Q", view[layout.meta_offsets : layout.names])
+    names = data[layout.names : layout.meta]
+    meta = data[layout.meta : layout.end]
+
+    result = []
+    for i in range(count):
+        name = names[name_offsets[i] : name_offsets[i + 1]].decode("utf-8")
+        meta_start, meta_end = meta_offsets[i], meta_offsets[i + 1]
+        metadata = json.loads(meta[meta_start:meta_end]) if meta_end > meta_start else None
+        result.append(ExampleClass(name, values[i], metadata=metadata))
+
+    return result
+
+
+class MappedExampleCollection(Sequence[ExampleClass]):
+    """Lazy, memory-mapped view over a binary collection file.
+
+    Only the header is decoded when the file is opened. Indexing decodes a
+    single instance, and ``name_at``/``value_at`` read one column without
+    constructing an ExampleClass at all.
+
+    Examples:
+        >>> with open_many("objects.excb") as collection:
+        ...     collection[0]
+        ExampleClass(name='a', value=1.0)
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        """Open and memory-map a collection file.
+
+        Args:
+            path: Collection file written by ``dump_many``
+
+        Raises:
+            ValueError: If the file is not a valid collection file
+        """
+        with Path(path).open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._layout = _Layout(self._mmap, len(self._mmap))
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        """Return the number of stored instances."""
+        return self._layout.count
+
+    def _index(self, index: int) -> int:
+        """Normalize a possibly negative index and bounds-check it."""
+        count = self._layout.count
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("collection index out of range")
+        return index
+
+    def _span(self, table: int, index: int) -> tuple[int, int]:
+        """Return the start and end offsets stored at ``index`` of an offset table."""
+        position = table + index * _OFFSET.size
+        start: int = _OFFSET.unpack_from(self._mmap, position)[0]
+        end: int = _OFFSET.unpack_from(self._mmap, position + _OFFSET.size)[0]
+        return start, end
+
+    def value_at(self, index: int) -> float:
+        """Return the stored value of one instance without decoding it."""
+        index = self._index(index)
+        value: float = _VALUE.unpack_from(self._mmap, self._layout.values + index * _VALUE.size)[0]
+        return value
+
+    def name_at(self, index: int) -> str:
+        """Return the stored name of one instance without decoding it."""
+        index = self._index(index)
+        start, end = self._span(self._layout.name_offsets, index)
+        base = self._layout.names
+        return self._mmap[base + start : base + end].decode("utf-8")
+
+    def metadata_at(self, index: int) -> dict[str, Any]:
+        """Return the stored metadata of one instance without decoding it."""
+        index = self._index(index)
+        start, end = self._span(self._layout.meta_offsets, index)
+        if end == start:
+            return {}
+        base = self._layout.meta
+        metadata: dict[str, Any] = json.loads(self._mmap[base + start : base + end])
+        return metadata
+
+    @overload
+    def __getitem__(self, index: int) -> ExampleClass: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ExampleClass]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ExampleClass, list[ExampleClass]]:
+        """Decode one instance, or a list of instances for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._index(index)
+        return ExampleClass(
+            self.name_at(index),
+            self.value_at(index),
+            metadata=self.metadata_at(index) or None,
+        )
+
+    def __iter__(self) -> Iterator[ExampleClass]:
+        """Decode instances one at a time in stored order."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedExampleCollection":
+        """Return the collection for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the memory map on context exit."""
+        self.close()
+
+
+def open_many(path: Union[Path, str]) -> MappedExampleCollection:
+    """Open a binary collection file for lazy random access.
+
+    Args:
+        path: Collection file written by ``dump_many``
+
+    Returns:
+        Memory-mapped collection; close it or use it as a context manager
+
+    Raises:
+        ValueError: If the file is not a valid collection file
+    """
+    return MappedExampleCollection(path)
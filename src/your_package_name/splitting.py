@@ -0,0 +1,402 @@
+"""Parallel filtering of one CSV file split into byte ranges.
+
+A single large CSV is cut into contiguous byte ranges that start and end
+on record boundaries. The ranges are filtered on a process pool with
+``process_data`` (through ``streaming.filter_chunk``), and the filtered
+parts are concatenated in input order behind one header, so the output is
+identical to ``streaming.filter_csv``.
+
+Record boundaries are found without parsing: a newline ends a record
+only when an even number of quote characters precedes it in the file
+(RFC 4180 escapes a quote as two, so a newline inside a quoted field
+always follows an odd count). A pre-scan counts quotes per fixed-size
+block in parallel; the running parity at each block start then locates
+the first record boundary after it. The offsets are saved in a
+RecordIndex sidecar next to the input (``.<name>.index.json``) and reused
+while the input's size and modification time are unchanged.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from bisect import bisect_left
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import IO, Optional, Union
+
+from your_package_name.compression import detect_compression, write_output
+from your_package_name.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    WRITE_BUFFER_SIZE,
+    FilterStats,
+    ends_in_quotes,
+    filter_chunk,
+    iter_chunks,
+    iter_records,
+)
+from your_package_name.utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_BLOCK_SIZE = 8 << 20
+_READ_SIZE = 1 << 20
+
+
+def index_path(input_path: Union[Path, str]) -> Path:
+    """Return the record index sidecar path of an input file."""
+    input_path = Path(input_path)
+    return input_path.with_name(f".{input_path.name}.index.json")
+
+
+def _count_quotes(path: Path, start: int, end: int) -> int:
+    """Count the quote characters in a byte range of a file."""
+    count = 0
+    with path.open("rb") as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0 and (block := handle.read(min(_READ_SIZE, remaining))):
+            count += block.count(b'"')
+            remaining -= len(block)
+    return count
+
+
+def _next_boundary(handle: IO[bytes], offset: int, parity: int) -> Optional[int]:
+    """Return the first record start after ``offset``, or None at end of file.
+
+    Args:
+        handle: Binary file
+        offset: Byte offset to search from
+        parity: Number of quote characters before ``offset``, modulo 2
+    """
+    handle.seek(offset)
+    position = offset
+    while block := handle.read(_READ_SIZE):
+        start = 0
+        while (newline := block.find(b"\n", start)) >= 0:
+            parity = (parity + block.count(b'"', start, newline)) % 2
+            if not parity:
+                return position + newline + 1
+            start = newline + 1
+        parity = (parity + block.count(b'"', start)) % 2
+        position += len(block)
+    return None
+
+
+@dataclass
+class RecordIndex:
+    """Record-aligned byte offsets of a CSV file.
+
+    Attributes:
+        input_size: Input file size when the index was built
+        input_mtime_ns: Input modification time when the index was built
+        block_size: Approximate bytes between consecutive offsets
+        offsets: Record start offsets in increasing order; the first is the
+            end of the header and the last is the end of the file
+    """
+
+    input_size: int
+    input_mtime_ns: int
+    block_size: int
+    offsets: list[int]
+
+    @classmethod
+    def build(
+        cls,
+        input_path: Union[Path, str],
+        *,
+        block_size: int = DEFAULT_INDEX_BLOCK_SIZE,
+        jobs: Optional[int] = 1,
+    ) -> "RecordIndex":
+        """Scan a CSV file for record boundaries about every ``block_size`` bytes.
+
+        Args:
+            input_path: Uncompressed CSV file
+            block_size: Bytes per pre-scan block (default: 8 MiB)
+            jobs: Processes counting quotes; None uses one per CPU (default: 1)
+
+        Raises:
+            ValueError: If block_size or jobs is not positive
+        """
+        workers = jobs if jobs is not None else os.cpu_count() or 1
+        if block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        if workers <= 0:
+            raise ValueError(f"Jobs must be positive, got {workers}")
+
+        input_path = Path(input_path)
+        stat = input_path.stat()
+        starts = list(range(0, stat.st_size, block_size))
+        ends = [*starts[1:], stat.st_size]
+        count = partial(_count_quotes, input_path)
+        if workers == 1 or len(starts) <= 1:
+            counts = list(map(count, starts, ends))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as executor:
+                counts = list(executor.map(count, starts, ends))
+
+        with input_path.open("rb") as handle:
+            header_end = _next_boundary(handle, 0, 0)
+            data_start = header_end if header_end is not None else stat.st_size
+            offsets = {data_start, stat.st_size}
+            parity = 0
+            for start, quotes in zip(starts, counts):
+                if start > data_start:
+                    boundary = _next_boundary(handle, start, parity)
+                    if boundary is not None:
+                        offsets.add(boundary)
+                parity = (parity + quotes) % 2
+
+        return cls(stat.st_size, stat.st_mtime_ns, block_size, sorted(offsets))
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> Optional["RecordIndex"]:
+        """Load an index sidecar, or return None if it is missing or unreadable."""
+        try:
+            data = json.loads(Path(path).read_bytes())
+            if data.pop("version", None) != INDEX_VERSION:
+                return None
+            return cls(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable record index {path}: {e}")
+            return None
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Write the index atomically."""
+        with atomic_write(path) as handle:
+            json.dump({"version": INDEX_VERSION, **asdict(self)}, handle)
+
+    def matches(self, input_path: Union[Path, str]) -> bool:
+        """Return True if the input has the size and mtime the index was built from."""
+        try:
+            stat = Path(input_path).stat()
+        except FileNotFoundError:
+            return False
+        return stat.st_size == self.input_size and stat.st_mtime_ns == self.input_mtime_ns
+
+    def ranges(self, parts: int) -> list[tuple[int, int]]:
+        """Split the data into at most ``parts`` contiguous record-aligned byte ranges.
+
+        Cuts are placed at the indexed offsets closest to equal-size
+        splits; a small file yields fewer ranges, and no data yields none.
+        """
+        first, last = self.offsets[0], self.offsets[-1]
+        cuts = {first, last}
+        for part in range(1, parts):
+            target = first + (last - first) * part // parts
+            position = bisect_left(self.offsets, target)
+            nearby = self.offsets[max(position - 1, 0) : position + 1]
+            cuts.add(min(nearby, key=lambda offset: abs(offset - target)))
+        ordered = sorted(cuts)
+        return list(zip(ordered, ordered[1:]))
+
+
+def load_or_build_index(
+    input_path: Union[Path, str],
+    *,
+    block_size: int = DEFAULT_INDEX_BLOCK_SIZE,
+    jobs: Optional[int] = 1,
+    persist: bool = True,
+) -> RecordIndex:
+    """Return the input's saved record index if it is current, otherwise build one.
+
+    Args:
+        input_path: Uncompressed CSV file
+        block_size: Bytes per pre-scan block for a new index
+        jobs: Processes for a new index; None uses one per CPU
+        persist: Save a new index next to the input; failures to save are
+            logged and ignored (e.g. a read-only input directory)
+    """
+    sidecar = index_path(input_path)
+    index = RecordIndex.load(sidecar)
+    if index is not None and index.matches(input_path) and index.block_size <= block_size:
+        return index
+
+    index = RecordIndex.build(input_path, block_size=block_size, jobs=jobs)
+    if persist:
+        try:
+            index.save(sidecar)
+        except OSError as e:
+            logger.warning(f"Could not save record index {sidecar}: {e}")
+    return index
+
+
+def _iter_lines(source: IO[bytes], length: int) -> Iterator[bytes]:
+    """Yield binary lines from ``source`` until ``length`` bytes are consumed."""
+    while length > 0 and (line := source.readline(length)):
+        length -= len(line)
+        yield line
+
+
+def filter_range(
+    input_path: Path,
+    part_path: Path,
+    start: int,
+    end: int,
+    *,
+    columns: list[str],
+    threshold: float,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> FilterStats:
+    """Filter the records in one byte range of a CSV into a headerless part file.
+
+    Args:
+        input_path: Uncompressed input CSV
+        part_path: Output part file
+        start: Offset of the first record in the range
+        end: Offset just past the last record in the range
+        columns: Input header columns
+        threshold: Minimum value to keep
+        chunk_size: Rows per chunk
+
+    Returns:
+        Row counts of the range
+
+    Raises:
+        ValueError: If a value is not numeric or a record is not valid CSV
+            (rows are numbered within the range), or the range ends inside a
+            quoted field
+    """
+    stats = FilterStats(columns=tuple(columns))
+    with input_path.open("rb") as source:
+        source.seek(start)
+        with part_path.open("w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as sink:
+            writer = csv.DictWriter(sink, fieldnames=columns)
+            for chunk in iter_chunks(iter_records(_iter_lines(source, end - start)), chunk_size):
+                # The index places boundaries by quote parity, which a literal
+                # quote in an unquoted field (5" screen) throws off. Only the
+                # range's last record can end inside quotes, and then the
+                # boundary after it split a quoted field.
+                if ends_in_quotes(chunk[-1]):
+                    raise ValueError(
+                        f"Byte range {start}-{end} ends inside a quoted field: the input's quoting "
+                        "cannot be split by quote parity, filter it with one job"
+                    )
+                try:
+                    rows = list(csv.DictReader([record.decode("utf-8") for record in chunk], fieldnames=columns))
+                    kept = filter_chunk(rows, threshold, first_row=stats.rows_read + 1)
+                except (csv.Error, ValueError) as e:
+                    raise ValueError(f"{e} (in byte range {start}-{end})") from None
+                writer.writerows(kept)
+                stats.rows_read += len(rows)
+                stats.rows_written += len(kept)
+    return stats
+
+
+def _header_line(columns: list[str]) -> bytes:
+    """Return the header line ``csv.DictWriter.writeheader`` writes."""
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue().encode("utf-8")
+
+
+def filter_csv_split(
+    input_path: Union[Path, str],
+    output_path: Union[Path, str],
+    threshold: float = 0.5,
+    *,
+    jobs: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    block_size: int = DEFAULT_INDEX_BLOCK_SIZE,
+    persist_index: bool = True,
+) -> FilterStats:
+    """Filter one uncompressed CSV on several processes, one byte range each.
+
+    Produces the same output as ``streaming.filter_csv``. Parts are
+    written to a temporary directory next to the output and concatenated
+    in input order; the output is written atomically.
+
+    Args:
+        input_path: Uncompressed input CSV with a header row containing 'value'
+        output_path: Output CSV path; ``.gz``, ``.bz2`` or ``.xz`` compresses it
+        threshold: Minimum value to keep (default: 0.5)
+        jobs: Worker processes and byte ranges; None uses one per CPU
+        chunk_size: Rows per chunk within each range
+        block_size: Granularity of the record index (default: 8 MiB)
+        persist_index: Save the record index next to the input for reuse
+
+    Returns:
+        Row counts summed over all ranges
+
+    Raises:
+        KeyError: If the input has no 'value' column
+        ValueError: If threshold or jobs is invalid, the input is
+            compressed, or a value is not numeric
+
+    Examples:
+        >>> filter_csv_split("data/raw/huge.csv", "data/processed/huge.csv", 0.9, jobs=8)
+        FilterStats(rows_read=400000000, rows_written=39998512, columns=('id', 'value'), chunks_skipped=0)
+    """
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+    if workers <= 0:
+        raise ValueError(f"Jobs must be positive, got {workers}")
+    input_path, output_path = Path(input_path), Path(output_path)
+    if detect_compression(input_path) is not None:
+        raise ValueError(f"Byte-range splitting requires an uncompressed CSV input: {input_path}")
+
+    index = load_or_build_index(input_path, block_size=block_size, jobs=workers, persist=persist_index)
+    with input_path.open("rb") as handle:
+        header = handle.read(index.offsets[0])
+    columns = next(csv.reader([header.decode("utf-8")]), [])
+    if "value" not in columns:
+        raise KeyError(f"Input is missing 'value' column: {input_path}")
+
+    ranges = index.ranges(workers)
+    logger.debug(f"Filtering {input_path} as {len(ranges)} byte range(s) on {workers} process(es)")
+    parts_dir = Path(tempfile.mkdtemp(prefix=f".{output_path.name}.", dir=output_path.parent))
+    try:
+        parts = [parts_dir / f"part-{number:06d}.csv" for number in range(len(ranges))]
+        run = partial(filter_range, input_path, columns=columns, threshold=threshold, chunk_size=chunk_size)
+        if workers == 1 or len(ranges) <= 1:
+            results = [run(part, start, end) for part, (start, end) in zip(parts, ranges)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+                futures: list[Future[FilterStats]] = [
+                    executor.submit(run, part, start, end) for part, (start, end) in zip(parts, ranges)
+                ]
+                try:
+                    results = [future.result() for future in futures]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        with write_output(output_path, "wb", fsync=True) as sink:
+            sink.write(_header_line(columns))
+            for part in parts:
+                with part.open("rb") as handle:
+                    shutil.copyfileobj(handle, sink)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    stats = FilterStats(columns=tuple(columns))
+    for result in results:
+        stats.rows_read += result.rows_read
+        stats.rows_written += result.rows_written
+    return stats
@@ -0,0 +1,417 @@
+"""Composable pipeline stages with content-addressed result caching.
+
+A Pipeline is a DAG of named stages. Each stage is a generator function
+that receives the records of its upstream stages as iterators (one
+positional argument per input, in order) and its parameters as keyword
+arguments, and yields JSON-compatible records:
+
+    pipeline = Pipeline()
+    pipeline.add(Stage("read", read_csv_rows, params={"path": "data/raw/input.csv"}, files=("data/raw/input.csv",)))
+    pipeline.add(Stage("filter", filter_rows, inputs=("read",), params={"threshold": 0.7}))
+    pipeline.add(Stage("write", write_csv_rows, inputs=("filter",), params={"path": "out.csv"}, cache=False))
+    results = pipeline.run(jobs=4)
+
+Stage outputs are stored as JSON lines in a StageCache (by default under
+``data/cache/stages``), addressed by a key that hashes the stage name,
+its code version (a hash of the function source unless given), its
+parameters, the content hashes of its upstream outputs and of any
+``files`` it reads. A rerun whose key is already cached reuses the
+stored output without calling the function; a change anywhere upstream
+changes the keys of exactly the stages downstream of it. Stages that
+exist for their side effects (such as writing an output file) should set
+``cache=False`` so they run every time.
+
+Stages whose inputs are complete run concurrently on a thread pool, so
+independent branches of the DAG overlap.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from your_package_name.compression import open_text_input, write_output
+from your_package_name.manifest import file_sha256
+from your_package_name.streaming import DEFAULT_CHUNK_SIZE, WRITE_BUFFER_SIZE, filter_chunk, iter_chunks
+from your_package_name.utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache/stages")
+CACHE_KEY_VERSION = 1
+
+StageFunction = Callable[..., Iterable[Any]]
+
+
+def code_version(func: Callable[..., Any]) -> str:
+    """Return a short hash of a function's source code (of its qualified name if the source is unavailable)."""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = f"{func.__module__}.{func.__qualname__}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of a Pipeline.
+
+    Attributes:
+        name: Unique stage name
+        func: Generator function ``func(*upstream_records, **params)``
+        inputs: Names of upstream stages, passed to ``func`` in this order
+        params: Keyword arguments of ``func``; part of the cache key, so
+            they must be JSON-compatible (paths are keyed by their text)
+        files: Files the stage reads; their contents are part of the cache key
+        version: Code version in the cache key (default: hash of the source of ``func``)
+        cache: Reuse a cached output; False always runs the stage (for side effects)
+    """
+
+    name: str
+    func: StageFunction
+    inputs: tuple[str, ...] = ()
+    params: Mapping[str, Any] = field(default_factory=dict)
+    files: tuple[Union[Path, str], ...] = ()
+    version: Optional[str] = None
+    cache: bool = True
+
+
+@dataclass
+class StageResult:
+    """Output of one stage in a run.
+
+    Attributes:
+        name: Stage name
+        key: Cache key of the output
+        path: JSON lines file holding the output records
+        digest: SHA-256 of the output file, the content hash downstream keys use
+        records: Number of records
+        cached: Whether the output was reused instead of computed
+        seconds: Time spent computing (or looking up) the output
+    """
+
+    name: str
+    key: str
+    path: Path
+    digest: str
+    records: int
+    cached: bool
+    seconds: float = 0.0
+
+
+class StageCache:
+    """Directory of stage outputs addressed by cache key.
+
+    Each output is ``<root>/<key[:2]>/<key>.jsonl`` with a ``.json``
+    sidecar holding its content hash and record count; an output without a
+    complete sidecar is treated as missing. Hashes of stage ``files`` are
+    kept in ``<root>/files.json`` and reused while a file's size and mtime
+    are unchanged.
+    """
+
+    def __init__(self, root: Union[Path, str] = DEFAULT_CACHE_DIR) -> None:
+        """Initialize the cache.
+
+        Args:
+            root: Cache directory (created on first write)
+        """
+        self.root = Path(root)
+        self._files_path = self.root / "files.json"
+        self._files: Optional[dict[str, dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _file_index(self) -> dict[str, dict[str, Any]]:
+        """Return the index of file hashes, loading it on first use (call with the lock held)."""
+        if self._files is None:
+            try:
+                self._files = json.loads(self._files_path.read_bytes())
+            except (OSError, ValueError):
+                self._files = {}
+        return self._files
+
+    def file_digest(self, path: Union[Path, str]) -> str:
+        """Return the SHA-256 of a file, hashing it only if it changed since it was last hashed.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        with self._lock:
+            known = self._file_index().get(str(path))
+        if known is not None and (known["size"], known["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            return str(known["sha256"])
+        digest = file_sha256(path)
+        with self._lock:
+            index = self._file_index()
+            index[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+            self.root.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self._files_path) as handle:
+                json.dump(index, handle, indent=2, sort_keys=True)
+        return digest
+
+    def path(self, key: str) -> Path:
+        """Return the output file of a key."""
+        return self.root / key[:2] / f"{key}.jsonl"
+
+    def get(self, key: str) -> Optional[tuple[str, int]]:
+        """Return the content hash and record count of a cached output, or None."""
+        path = self.path(key)
+        try:
+            meta = json.loads(path.with_suffix(".json").read_bytes())
+            if path.stat().st_size != meta["size"]:
+                return None
+            return meta["digest"], meta["records"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def put(self, key: str, records: Iterable[Any]) -> tuple[str, int]:
+        """Store records as JSON lines and return their content hash and count."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        count = 0
+        with atomic_write(path, "wb", buffering=WRITE_BUFFER_SIZE) as handle:
+            for record in records:
+                line = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+                digest.update(line)
+                handle.write(line)
+                count += 1
+        hexdigest = digest.hexdigest()
+        meta = {"digest": hexdigest, "records": count, "size": path.stat().st_size}
+        with atomic_write(path.with_suffix(".json")) as handle:
+            json.dump(meta, handle)
+        return hexdigest, count
+
+    @staticmethod
+    def read(path: Union[Path, str]) -> Iterator[Any]:
+        """Yield the records of a stored output."""
+        with Path(path).open("rb") as handle:
+            for line in handle:
+                yield json.loads(line)
+
+
+class Pipeline:
+    """DAG of stages run with per-stage result caching.
+
+    Stages must be added after their inputs, which keeps the graph acyclic.
+
+    Examples:
+        >>> pipeline = Pipeline(StageCache("data/cache/stages"))
+        >>> @pipeline.stage(params={"path": "data/raw/input.csv"}, files=("data/raw/input.csv",))
+        ... def read(path):
+        ...     yield from read_csv_rows(path)
+        >>> @pipeline.stage(inputs=("read",), params={"threshold": 0.9})
+        ... def keep(rows, threshold):
+        ...     yield from filter_rows(rows, threshold)
+        >>> results = pipeline.run()
+        >>> results["keep"].cached, results["keep"].records
+        (False, 1012)
+    """
+
+    def __init__(self, cache: Optional[StageCache] = None) -> None:
+        """Initialize an empty pipeline.
+
+        Args:
+            cache: Where stage outputs are stored (default: ``data/cache/stages``)
+        """
+        self.cache = cache if cache is not None else StageCache()
+        self.stages: dict[str, Stage] = {}
+
+    def add(self, stage: Stage) -> Stage:
+        """Add a stage whose inputs are already in the pipeline.
+
+        Raises:
+            ValueError: If the name is taken or an input is unknown
+        """
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name: {stage.name!r}")
+        unknown = [name for name in stage.inputs if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {stage.name!r} has unknown input(s): {', '.join(unknown)}")
+        self.stages[stage.name] = stage
+        return stage
+
+    def stage(
+        self,
+        name: Optional[str] = None,
+        *,
+        inputs: Sequence[str] = (),
+        params: Optional[Mapping[str, Any]] = None,
+        files: Sequence[Union[Path, str]] = (),
+        version: Optional[str] = None,
+        cache: bool = True,
+    ) -> Callable[[StageFunction], StageFunction]:
+        """Decorator adding a function as a stage (named after it by default); see Stage."""
+
+        def register(func: StageFunction) -> StageFunction:
+            self.add(
+                Stage(
+                    name=name or func.__name__,
+                    func=func,
+                    inputs=tuple(inputs),
+                    params=dict(params or {}),
+                    files=tuple(files),
+                    version=version,
+                    cache=cache,
+                )
+            )
+            return func
+
+        return register
+
+    def _needed(self, targets: Iterable[str]) -> list[str]:
+        """Return the targets and their ancestors, in insertion (topological) order."""
+        needed: set[str] = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name!r}")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].inputs)
+        return [name for name in self.stages if name in needed]
+
+    def key(self, stage: Stage, upstream: Sequence[StageResult]) -> str:
+        """Return the cache key of a stage given its upstream results."""
+        identity = {
+            "cache_key_version": CACHE_KEY_VERSION,
+            "stage": stage.name,
+            "version": stage.version if stage.version is not None else code_version(stage.func),
+            "params": stage.params,
+            "inputs": [result.digest for result in upstream],
+            "files": [self.cache.file_digest(path) for path in stage.files],
+        }
+        encoded = json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _execute(self, stage: Stage, upstream: Sequence[StageResult], force: bool) -> StageResult:
+        """Reuse or compute the output of one stage."""
+        start = time.perf_counter()
+        key = self.key(stage, upstream)
+        hit = self.cache.get(key) if stage.cache and not force else None
+        if hit is not None:
+            digest, records = hit
+            logger.debug(f"Stage {stage.name!r}: reusing cached output {key[:12]}")
+        else:
+            inputs = [self.cache.read(result.path) for result in upstream]
+            digest, records = self.cache.put(key, stage.func(*inputs, **stage.params))
+            logger.debug(f"Stage {stage.name!r}: computed {records} record(s)")
+        elapsed = time.perf_counter() - start
+        return StageResult(stage.name, key, self.cache.path(key), digest, records, hit is not None, elapsed)
+
+    def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        *,
+        jobs: Optional[int] = None,
+        force: bool = False,
+    ) -> dict[str, StageResult]:
+        """Run the stages needed for ``targets``, reusing cached outputs.
+
+        Args:
+            targets: Stages to produce (default: all stages)
+            jobs: Threads running independent stages (default: one per CPU)
+            force: Recompute every stage, ignoring the cache
+
+        Returns:
+            Results of every stage that ran, by name
+
+        Raises:
+            ValueError: If a target is unknown or jobs is not positive
+        """
+        order = self._needed(targets if targets is not None else self.stages)
+        workers = jobs if jobs is not None else os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError(f"Jobs must be positive, got {workers}")
+
+        results: dict[str, StageResult] = {}
+        running: dict[Future[StageResult], str] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as executor:
+            try:
+                while len(results) < len(order):
+                    for name in order:
+                        stage = self.stages[name]
+                        ready = all(upstream in results for upstream in stage.inputs)
+                        if ready and name not in results and name not in running.values():
+                            upstream = [results[upstream] for upstream in stage.inputs]
+                            running[executor.submit(self._execute, stage, upstream, force)] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        results[running.pop(future)] = result
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+        return results
+
+    def read(self, result: StageResult) -> Iterator[Any]:
+        """Yield the output records of a stage result."""
+        return self.cache.read(result.path)
+
+
+def read_csv_rows(path: Union[Path, str]) -> Iterator[dict[str, str]]:
+    """Source stage: yield the rows of a CSV file, optionally compressed, as dicts."""
+    with open_text_input(path) as source:
+        yield from csv.DictReader(source)
+
+
+def filter_rows(
+    rows: Iterable[dict[str, str]],
+    threshold: float = 0.5,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict[str, str]]:
+    """Transform stage: yield rows whose 'value' is >= threshold, via ``process_data``."""
+    first_row = 1
+    for chunk in iter_chunks(rows, chunk_size):
+        yield from filter_chunk(chunk, threshold, first_row)
+        first_row += len(chunk)
+
+
+def write_csv_rows(rows: Iterable[dict[str, str]], path: Union[Path, str]) -> Iterator[dict[str, Any]]:
+    """Sink stage: write rows to a CSV file atomically and yield one summary record.
+
+    Columns are taken from the first row; an empty input writes an empty file.
+    """
+    iterator = iter(rows)
+    first = next(iterator, None)
+    count = 0
+    with write_output(path, newline="", buffering=WRITE_BUFFER_SIZE) as sink:
+        if first is not None:
+            writer = csv.DictWriter(sink, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            count = 1
+            for row in iterator:
+                writer.writerow(row)
+                count += 1
+    yield {"path": str(path), "rows": count}
@@ -0,0 +1,628 @@
+"""Streaming, chunked CSV processing.
+
+This module filters CSV files of any size with ``process_data`` while
+keeping memory bounded by the chunk size: rows are read in chunks,
+filtered, and written incrementally through a buffered writer to a
+temporary file that replaces the output only once it is complete.
+Compressed inputs and outputs are handled by ``compression``.
+
+Long runs over uncompressed CSV can checkpoint: the output is flushed to
+disk and a sidecar file records the input byte offset, row counts and
+output position, so an interrupted run resumes where it stopped.
+
+A ``validation.ValidationSpec`` passed to ``filter_csv`` is checked in the
+same pass, on the rows parsed for filtering; a failed check leaves the
+output untouched. With ``hash_chunk_size`` set, the bytes read are hashed
+in chunks for a read-completeness ledger (see ``ledger``).
+
+With ``pipelined`` set, reading, parsing, filtering and writing each run
+on their own thread, connected by bounded queues of chunks (see
+``pipelining``).
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import io
+import json
+import logging
+import mmap
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Optional, TypeVar, Union, cast
+
+from your_package_name.compression import codec_for_path, detect_compression, open_input, write_output
+from your_package_name.core import process_data
+from your_package_name.ledger import ChunkHasher, ReadDigest
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.pipelining import PipelineReport, StageFunction, run_pipelined
+from your_package_name.utils import atomic_write
+from your_package_name.validation import ValidationReport, ValidationSpec, Validator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+WRITE_BUFFER_SIZE = 1 << 20
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+T = TypeVar("T")
+
+
+@dataclass
+class FilterStats:
+    """Row counts of a streaming filter run.
+
+    Attributes:
+        rows_read: Data rows read from the input
+        rows_written: Data rows written to the output
+        columns: Column names of the input header
+        chunks_skipped: Input chunks (e.g. Parquet row groups) skipped without decoding
+        validation: Report of the checks run alongside the filter, if any
+        digests: What was read from each input, by absolute input path, when
+            read hashing was requested
+        pipeline: Per-stage utilization of a pipelined run
+    """
+
+    rows_read: int = 0
+    rows_written: int = 0
+    columns: tuple[str, ...] = ()
+    chunks_skipped: int = 0
+    validation: Optional[ValidationReport] = None
+    digests: dict[str, ReadDigest] = field(default_factory=dict)
+    pipeline: Optional[PipelineReport] = None
+
+
+def iter_chunks(rows: Iterable[T], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[T]]:
+    """Group rows into lists of at most ``chunk_size`` rows.
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def ends_in_quotes(
+    data: Union[bytes, mmap.mmap],
+    start: int = 0,
+    end: Optional[int] = None,
+    *,
+    quoted: bool = False,
+) -> bool:
+    """Return True if the CSV text ``data[start:end]`` ends inside a quoted field.
+
+    Follows the reading rules of the csv module: a quote opens a quoted
+    field only as the first character of a field and is literal anywhere
+    else (e.g. ``5" screen``); inside a quoted field a doubled quote is an
+    escaped quote, and text after the closing quote runs to the next comma.
+
+    Args:
+        data: CSV bytes, e.g. one line or a memory map
+        start: Offset of the first byte to scan
+        end: Offset after the last byte to scan (default: end of data)
+        quoted: Whether ``start`` is inside a quoted field already, i.e.
+            the text continues a record from a previous line
+    """
+    end = len(data) if end is None else end
+    find = data.find
+    position = start
+    while position < end:
+        if quoted:
+            close = find(b'"', position, end)
+            if close < 0:
+                return True
+            if data[close + 1 : close + 2] == b'"' and close + 1 < end:
+                position = close + 2
+                continue
+            quoted = False
+            position = close + 1
+        elif data[position : position + 1] == b'"':
+            quoted = True
+            position += 1
+            continue
+        comma = find(b",", position, end)
+        if comma < 0:
+            return False
+        position = comma + 1
+    return quoted
+
+
+def iter_records(source: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield raw CSV records, including their line terminators, from binary lines.
+
+    A newline inside a quoted field does not end a record: lines are
+    joined while the record ends inside quotes, as decided by
+    ``ends_in_quotes`` with the same rules the csv module reads by, so a
+    stray quote in an unquoted field does not swallow the next line. The
+    lengths of the yielded records add up to the bytes consumed, so
+    callers can track byte offsets.
+
+    Args:
+        source: Binary lines, e.g. a file opened in ``"rb"`` mode
+    """
+    parts: list[bytes] = []
+    for line in source:
+        if parts:
+            parts.append(line)
+            if ends_in_quotes(line, quoted=True):
+                continue
+            yield b"".join(parts)
+            parts = []
+        elif b'"' in line and ends_in_quotes(line):
+            parts.append(line)
+        else:
+            yield line
+    if parts:
+        yield b"".join(parts)
+
+
+def parse_value(raw: Any, row_number: int) -> float:
+    """Parse the 'value' field of a CSV row.
+
+    Raises:
+        ValueError: If the field is not a number
+    """
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"Row {row_number}: value must be numeric, got {raw!r}") from None
+
+
+def filter_chunk(rows: list[dict[str, str]], threshold: float, first_row: int = 1) -> list[dict[str, str]]:
+    """Filter one chunk of raw CSV rows with ``process_data``.
+
+    Only the parsed 'value' is handed to ``process_data``; the kept rows
+    are returned unchanged, so the output preserves the input text exactly.
+
+    Args:
+        rows: Raw CSV rows (string fields) containing a 'value' field
+        threshold: Minimum value to keep
+        first_row: 1-based data row number of ``rows[0]`` for error messages
+
+    Returns:
+        Rows whose value is >= threshold, in input order
+    """
+    if not rows:
+        return []
+    numeric = [{"value": parse_value(row["value"], first_row + i)} for i, row in enumerate(rows)]
+    kept = {id(item) for item in process_data(numeric, threshold=threshold)}
+    return [row for row, item in zip(rows, numeric) if id(item) in kept]
+
+
+def filter_csv(
+    input_path: Union[Path, str],
+    output_path: Union[Path, str],
+    threshold: float = 0.5,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
+    metrics: Optional[PipelineMetrics] = None,
+    validation: Optional[ValidationSpec] = None,
+    hash_chunk_size: Optional[int] = None,
+    pipelined: bool = False,
+) -> FilterStats:
+    """Stream a CSV file through ``process_data`` into an output CSV.
+
+    Memory use is bounded by ``chunk_size`` regardless of file size. The
+    output is written atomically: a crash leaves any previous output in
+    place and never a half-written file. A gzip, bzip2 or xz input is
+    decompressed on a background thread, and an output path ending in
+    ``.gz``, ``.bz2`` or ``.xz`` is compressed in parallel blocks.
+
+    Args:
+        input_path: Input CSV, optionally compressed, with a header row containing 'value'
+        output_path: Output CSV path (same columns as the input)
+        threshold: Minimum value to keep (default: 0.5)
+        chunk_size: Rows per chunk (default: 10000)
+        checkpoint_interval: Seconds between checkpoints (default: None, no
+            checkpoints); ignored for compressed input or output, with
+            validation, read hashing and pipelining
+        resume: Continue from the last checkpoint of a previous run, if any
+        metrics: Collects read, parse, filter and write times and row and
+            byte counts (see ``metrics.PipelineMetrics``)
+        validation: Checks applied to every row in the same pass (see
+            ``validation.Validator``)
+        hash_chunk_size: Hash the input bytes read in chunks of this size
+            and return the ReadDigest in ``digests`` (see ``ledger``)
+        pipelined: Run reading, parsing, filtering and writing on separate
+            threads; ``pipeline`` in the result reports their utilization
+
+    Returns:
+        Row counts of the run (including rows from before a resume)
+
+    Raises:
+        KeyError: If the input has no 'value' column
+        ValueError: If threshold is invalid, a value is not numeric, or
+            resume is requested for compressed input or output, with
+            validation, read hashing or pipelining
+        ValidationError: If the input fails validation (a ValueError)
+
+    Examples:
+        >>> filter_csv("data/raw/input.csv", "data/processed/output.csv", 0.7)
+        FilterStats(rows_read=1000, rows_written=300, columns=('id', 'value'))
+    """
+    if validation is not None or hash_chunk_size is not None or pipelined:
+        if resume:
+            raise ValueError(
+                "Validation, read hashing and pipelining need one uninterrupted pass and cannot resume a run"
+            )
+        checkpoint_interval = None
+    if checkpoint_interval is not None or resume:
+        if detect_compression(input_path) is None and codec_for_path(output_path) is None:
+            interval = checkpoint_interval if checkpoint_interval is not None else DEFAULT_CHECKPOINT_INTERVAL
+            input_path, output_path = Path(input_path), Path(output_path)
+            return _filter_csv_checkpointed(input_path, output_path, threshold, chunk_size, interval, resume, metrics)
+        if resume:
+            raise ValueError("Resuming requires uncompressed CSV input and output")
+        logger.debug(f"Not checkpointing compressed input or output: {input_path} -> {output_path}")
+
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    validator = Validator(validation) if validation is not None else None
+    run = _filter_csv_pipelined if pipelined else _filter_csv_sequential
+    return run(input_path, output_path, threshold, chunk_size, metrics, validator, hash_chunk_size)
+
+
+def _record_digest(stats: FilterStats, hasher: Optional[ChunkHasher], input_path: Union[Path, str]) -> None:
+    """Store the input's ReadDigest in the stats when read hashing was requested."""
+    if hasher is not None:
+        hasher.digest.rows_read, hasher.digest.rows_written = stats.rows_read, stats.rows_written
+        stats.digests[str(Path(input_path).resolve())] = hasher.digest
+
+
+def _open_hashed(
+    input_path: Union[Path, str], hash_chunk_size: Optional[int]
+) -> tuple[IO[bytes], Optional[ChunkHasher]]:
+    """Open an input for reading, through a ChunkHasher if ``hash_chunk_size`` is set."""
+    stream = open_input(input_path)
+    if hash_chunk_size is None:
+        return stream, None
+    hasher = ChunkHasher(stream, hash_chunk_size)
+    return cast(IO[bytes], hasher), hasher
+
+
+def _validate_and_filter(
+    rows: list[dict[str, str]], threshold: float, first_row: int, validator: Optional[Validator]
+) -> list[dict[str, str]]:
+    """Validate a chunk if a validator is given and return its kept rows, none once validation failed."""
+    if validator is not None:
+        # DictReader rows map surplus fields to None, which the validator checks for.
+        validator.check_rows(cast(list[dict[Optional[str], str]], rows), first_row=first_row)
+        if not validator.report.passed:
+            return []
+    return filter_chunk(rows, threshold, first_row=first_row)
+
+
+def _filter_csv_sequential(
+    input_path: Union[Path, str],
+    output_path: Union[Path, str],
+    threshold: float,
+    chunk_size: int,
+    metrics: PipelineMetrics,
+    validator: Optional[Validator],
+    hash_chunk_size: Optional[int],
+) -> FilterStats:
+    """Filter a CSV chunk by chunk on the calling thread (see ``filter_csv``)."""
+    raw, hasher = _open_hashed(input_path, hash_chunk_size)
+    with io.TextIOWrapper(metrics.wrap_input(raw), encoding="utf-8", newline="") as source:
+        with metrics.stage("parse"):
+            reader = csv.DictReader(source)
+            fieldnames = reader.fieldnames or []
+        if "value" not in fieldnames:
+            raise KeyError(f"Input is missing 'value' column: {input_path}")
+        stats = FilterStats(columns=tuple(fieldnames))
+        if validator is not None:
+            validator.check_header(fieldnames)
+
+        with write_output(output_path, newline="", buffering=WRITE_BUFFER_SIZE, fsync=True) as sink:
+            writer = csv.DictWriter(sink, fieldnames=fieldnames)
+            writer.writeheader()
+            chunks = iter_chunks(reader, chunk_size)
+            while True:
+                with metrics.stage("parse"):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                if validator is not None:
+                    with metrics.stage("validate"):
+                        validator.check_rows(chunk, first_row=stats.rows_read + 1)
+                    if not validator.report.passed:
+                        # The output will be discarded: stop filtering, finish the report.
+                        stats.rows_read += len(chunk)
+                        continue
+                with metrics.stage("filter"):
+                    kept = filter_chunk(chunk, threshold, first_row=stats.rows_read + 1)
+                with metrics.stage("write"):
+                    writer.writerows(kept)
+                stats.rows_read += len(chunk)
+                stats.rows_written += len(kept)
+                metrics.add_rows(len(chunk), len(kept))
+            if validator is not None:
+                stats.validation = validator.finish()
+            with metrics.stage("write"):
+                sink.flush()
+
+    metrics.bytes_out += Path(output_path).stat().st_size
+    _record_digest(stats, hasher, input_path)
+    return stats
+
+
+def _filter_csv_pipelined(
+    input_path: Union[Path, str],
+    output_path: Union[Path, str],
+    threshold: float,
+    chunk_size: int,
+    metrics: PipelineMetrics,
+    validator: Optional[Validator],
+    hash_chunk_size: Optional[int],
+) -> FilterStats:
+    """Filter a CSV with each stage on its own thread (see ``filter_csv``).
+
+    The read thread splits the (decompressed) input into chunks of raw
+    records, which are parsed with ``csv.DictReader``, filtered and
+    written with ``csv.DictWriter`` on three more threads, producing the
+    same output as the sequential path.
+    """
+    raw, hasher = _open_hashed(input_path, hash_chunk_size)
+    with io.BufferedReader(cast(io.RawIOBase, raw), buffer_size=WRITE_BUFFER_SIZE) as source:
+        header = next(iter_records(source), b"")
+        metrics.bytes_in += len(header)
+        fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+        if "value" not in fieldnames:
+            raise KeyError(f"Input is missing 'value' column: {input_path}")
+        stats = FilterStats(columns=tuple(fieldnames))
+        if validator is not None:
+            validator.check_header(fieldnames)
+
+        def read() -> Iterator[list[bytes]]:
+            for records in iter_chunks(iter_records(source), chunk_size):
+                metrics.bytes_in += sum(len(record) for record in records)
+                yield records
+
+        def parse(records: list[bytes]) -> list[dict[str, str]]:
+            return list(csv.DictReader(io.StringIO(b"".join(records).decode("utf-8"), newline=""), fieldnames))
+
+        def keep(rows: list[dict[str, str]]) -> tuple[int, list[dict[str, str]]]:
+            first_row = stats.rows_read + 1
+            stats.rows_read += len(rows)
+            return len(rows), _validate_and_filter(rows, threshold, first_row, validator)
+
+        with write_output(output_path, newline="", buffering=WRITE_BUFFER_SIZE, fsync=True) as sink:
+            writer = csv.DictWriter(sink, fieldnames=fieldnames)
+            writer.writeheader()
+
+            def write(batch: tuple[int, list[dict[str, str]]]) -> None:
+                count, kept = batch
+                writer.writerows(kept)
+                stats.rows_written += len(kept)
+                metrics.add_rows(count, len(kept))
+
+            stages: list[tuple[str, StageFunction]] = [("parse", parse), ("filter", keep), ("write", write)]
+            stats.pipeline = run_pipelined(read(), stages, metrics=metrics)
+            if validator is not None:
+                stats.validation = validator.finish()
+            sink.flush()
+
+    metrics.bytes_out += Path(output_path).stat().st_size
+    _record_digest(stats, hasher, input_path)
+    return stats
+
+
+def checkpoint_paths(output_path: Union[Path, str]) -> tuple[Path, Path]:
+    """Return the partial-output and checkpoint sidecar paths of an output."""
+    output_path = Path(output_path)
+    return (
+        output_path.with_name(f".{output_path.name}.partial"),
+        output_path.with_name(f".{output_path.name}.checkpoint.json"),
+    )
+
+
+@dataclass
+class Checkpoint:
+    """Committed progress of a checkpointed filter run.
+
+    The partial output is flushed to disk before the checkpoint is saved,
+    so ``output_offset`` never points past durable data. Output written
+    after the last checkpoint is truncated when the run resumes.
+
+    Attributes:
+        input_size: Input file size when the run started
+        input_mtime_ns: Input modification time when the run started
+        threshold: Threshold of the run
+        columns: Input header columns
+        input_offset: Byte offset of the first unprocessed input record
+        output_offset: Byte length of the committed partial output
+        rows_read: Data rows read up to ``input_offset``
+        rows_written: Data rows written up to ``output_offset``
+    """
+
+    input_size: int
+    input_mtime_ns: int
+    threshold: float
+    columns: list[str]
+    input_offset: int
+    output_offset: int
+    rows_read: int
+    rows_written: int
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        """Load a checkpoint, or return None if it is missing or unreadable."""
+        try:
+            data = json.loads(path.read_bytes())
+            if data.pop("version", None) != CHECKPOINT_VERSION:
+                return None
+            return cls(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def save(self, path: Path) -> None:
+        """Write the checkpoint atomically and durably."""
+        with atomic_write(path, fsync=True) as handle:
+            json.dump({"version": CHECKPOINT_VERSION, **asdict(self)}, handle)
+
+
+def _commit(sink: IO[bytes], checkpoint: Checkpoint, checkpoint_path: Path) -> None:
+    """Make the partial output durable, then record the checkpoint."""
+    sink.flush()
+    os.fsync(sink.fileno())
+    checkpoint.save(checkpoint_path)
+
+
+def _parse_records(records: list[bytes], columns: list[str], first_row: int) -> list[dict[str, str]]:
+    """Parse raw CSV records into rows keyed by ``columns``.
+
+    Raises:
+        ValueError: If the records are not valid CSV
+    """
+    try:
+        return list(csv.DictReader([record.decode("utf-8") for record in records], fieldnames=columns))
+    except csv.Error as e:
+        raise ValueError(f"Rows {first_row}-{first_row + len(records) - 1}: malformed CSV: {e}") from None
+
+
+def _load_resumable(
+    checkpoint_path: Path,
+    partial_path: Path,
+    stat: os.stat_result,
+    threshold: float,
+) -> Optional[Checkpoint]:
+    """Return the checkpoint of an earlier run of the same job, or None to start over."""
+    state = Checkpoint.load(checkpoint_path)
+    if state is None:
+        logger.info(f"No checkpoint {checkpoint_path}, starting from the beginning")
+        return None
+    if not (
+        state.input_size == stat.st_size
+        and state.input_mtime_ns == stat.st_mtime_ns
+        and state.threshold == threshold
+        and partial_path.exists()
+        and partial_path.stat().st_size >= state.output_offset
+    ):
+        logger.warning(f"Checkpoint {checkpoint_path} does not match the input or output, starting over")
+        return None
+    return state
+
+
+def _filter_records(
+    source: IO[bytes],
+    sink: IO[bytes],
+    state: Checkpoint,
+    checkpoint_path: Path,
+    chunk_size: int,
+    interval: float,
+    metrics: PipelineMetrics,
+) -> None:
+    """Filter the records after ``state.input_offset`` into the partial output, committing every interval."""
+    text = io.TextIOWrapper(sink, encoding="utf-8", newline="", write_through=True)
+    try:
+        writer = csv.DictWriter(text, fieldnames=state.columns)
+        if state.output_offset == 0:
+            writer.writeheader()
+            state.output_offset = sink.tell()
+            metrics.bytes_out += state.output_offset
+
+        chunks = iter_chunks(iter_records(metrics.wrap_input(source)), chunk_size)
+        last_commit = time.monotonic()
+        while True:
+            with metrics.stage("parse"):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                rows = _parse_records(chunk, state.columns, state.rows_read + 1)
+            with metrics.stage("filter"):
+                kept = filter_chunk(rows, state.threshold, first_row=state.rows_read + 1)
+            with metrics.stage("write"):
+                writer.writerows(kept)
+                offset = sink.tell()
+            state.input_offset += sum(len(record) for record in chunk)
+            metrics.bytes_out += offset - state.output_offset
+            state.output_offset = offset
+            state.rows_read += len(rows)
+            state.rows_written += len(kept)
+            metrics.add_rows(len(rows), len(kept))
+            if time.monotonic() - last_commit >= interval:
+                with metrics.stage("write"):
+                    _commit(sink, state, checkpoint_path)
+                last_commit = time.monotonic()
+        with metrics.stage("write"):
+            sink.flush()
+            os.fsync(sink.fileno())
+    finally:
+        text.detach()
+
+
+def _filter_csv_checkpointed(
+    input_path: Path,
+    output_path: Path,
+    threshold: float,
+    chunk_size: int,
+    interval: float,
+    resume: bool,
+    metrics: Optional[PipelineMetrics] = None,
+) -> FilterStats:
+    """Filter an uncompressed CSV with periodic checkpoints (see ``filter_csv``).
+
+    Records are read as raw bytes so their offsets are known; each chunk
+    is parsed with ``csv.DictReader`` and written with ``csv.DictWriter``,
+    producing the same output as the non-checkpointed path. The output is
+    built in a partial file that replaces ``output_path`` when complete.
+    An interrupted run (KeyboardInterrupt or SystemExit) records its
+    progress before exiting; a run that fails keeps its last checkpoint.
+    """
+    partial_path, checkpoint_path = checkpoint_paths(output_path)
+    stat = input_path.stat()
+    state = _load_resumable(checkpoint_path, partial_path, stat, threshold) if resume else None
+
+    with input_path.open("rb") as source:
+        sink: IO[bytes]
+        if state is not None:
+            logger.info(f"Resuming {input_path} at byte {state.input_offset} (row {state.rows_read})")
+            source.seek(state.input_offset)
+            sink = partial_path.open("r+b")
+            sink.truncate(state.output_offset)
+            sink.seek(state.output_offset)
+        else:
+            header = next(iter_records(source), b"")
+            columns = next(csv.reader([header.decode("utf-8")]), [])
+            if "value" not in columns:
+                raise KeyError(f"Input is missing 'value' column: {input_path}")
+            state = Checkpoint(stat.st_size, stat.st_mtime_ns, threshold, columns, len(header), 0, 0, 0)
+            sink = partial_path.open("wb")
+
+        try:
+            metrics = metrics if metrics is not None else PipelineMetrics()
+            _filter_records(source, sink, state, checkpoint_path, chunk_size, interval, metrics)
+        except (KeyboardInterrupt, SystemExit):
+            _commit(sink, state, checkpoint_path)
+            raise
+        finally:
+            sink.close()
+
+    partial_path.replace(output_path)
+    checkpoint_path.unlink(missing_ok=True)
+    return FilterStats(rows_read=state.rows_read, rows_written=state.rows_written, columns=tuple(state.columns))
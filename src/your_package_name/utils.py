@@ -18,8 +18,25 @@ You should have received a copy of the GNU Affero General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import asyncio
+import contextlib
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Union
+from typing import IO, Any, Literal, Optional, TypeVar, Union, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
 
 
 def validate_file_path(path: Union[Path, str]) -> Path:
@@ -50,11 +67,251 @@ def validate_file_path(path: Union[Path, str]) -> Path:
     return path
 
 
-def merge_dicts(*dicts: dict[str, Any]) -> dict[str, Any]:
+@contextlib.contextmanager
+def atomic_write(
+    path: Union[Path, str],
+    mode: Literal["w", "wb"] = "w",
+    *,
+    encoding: Optional[str] = "utf-8",
+    newline: Optional[str] = None,
+    buffering: int = -1,
+    fsync: bool = False,
+) -> Iterator[IO[Any]]:
+    """Write a file through a temporary sibling that is renamed into place.
+
+    Readers never observe a partially written file: on success the temporary
+    file replaces ``path`` atomically, and on error it is removed and ``path``
+    is left untouched.
+
+    Args:
+        path: Destination file path
+        mode: "w" for text or "wb" for binary (default: "w")
+        encoding: Text encoding (ignored in binary mode)
+        newline: Newline translation passed to ``open`` in text mode
+        buffering: Buffer size passed to ``open`` (default: -1, system default)
+        fsync: Flush the file to stable storage before renaming
+
+    Yields:
+        Open file object for the temporary file
+
+    Examples:
+        >>> with atomic_write("data/processed/output.csv", newline="") as handle:
+        ...     handle.writelines(lines)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    text_options: dict[str, Any] = {} if "b" in mode else {"encoding": encoding, "newline": newline}
+    try:
+        with tmp_path.open(mode, buffering=buffering, **text_options) as handle:
+            yield handle
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class DirectoryListingCache:
+    """Thread-safe cache of directory listings with a time-to-live.
+
+    Used by ``validate_file_paths`` to answer existence checks for many
+    files in one directory from a single ``os.scandir`` call. Entries older
+    than ``ttl`` seconds are re-listed on the next lookup.
+
+    Examples:
+        >>> cache = DirectoryListingCache(ttl=30.0)
+        >>> result = validate_file_paths(["data/raw/a.csv"], cache=cache)
+    """
+
+    def __init__(self, ttl: float = 5.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a listing stays valid (default: 5.0)
+
+        Raises:
+            ValueError: If ttl is negative
+        """
+        if ttl < 0:
+            raise ValueError(f"TTL must be non-negative, got {ttl}")
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, frozenset[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, directory: str) -> Optional[frozenset[str]]:
+        """Return the cached listing of a directory, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(directory)
+            if entry is None:
+                return None
+            stored_at, names = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._entries[directory]
+                return None
+            return names
+
+    def put(self, directory: str, names: frozenset[str]) -> None:
+        """Store the listing of a directory."""
+        with self._lock:
+            self._entries[directory] = (time.monotonic(), names)
+
+    def clear(self) -> None:
+        """Drop all cached listings."""
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass
+class PathValidationResult:
+    """Outcome of ``validate_file_paths``.
+
+    Attributes:
+        valid: Existing paths, in input order
+        errors: ``(input, exception)`` pairs for rejected inputs, in input order
+    """
+
+    valid: list[Path] = field(default_factory=list)
+    errors: list[tuple[Any, Exception]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return True if every input was valid."""
+        return not self.errors
+
+
+def _list_existing(directory: str) -> Optional[frozenset[str]]:
+    """List the names in a directory that exist when followed as paths.
+
+    Returns:
+        Existing entry names, an empty set if the directory is missing, or
+        None if the directory cannot be listed and paths must be checked one by one
+    """
+    names = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    # Path.exists() follows links; a dangling link does not exist.
+                    try:
+                        entry.stat()
+                    except OSError:
+                        continue
+                names.add(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+    except OSError:
+        return None
+    return frozenset(names)
+
+
+def _validate_group(
+    directory: str,
+    members: list[tuple[int, Path]],
+    cache: Optional[DirectoryListingCache],
+) -> list[tuple[int, Path, bool]]:
+    """Check existence for all paths sharing one parent directory."""
+    listing = cache.get(directory) if cache is not None else None
+    if listing is None:
+        listing = _list_existing(directory)
+        if listing is not None and cache is not None:
+            cache.put(directory, listing)
+
+    results = []
+    for index, path in members:
+        exists = path.exists() if listing is None or path.name in ("", ".", "..") else path.name in listing
+        results.append((index, path, exists))
+    return results
+
+
+def validate_file_paths(
+    paths: Iterable[Union[Path, str]],
+    *,
+    max_workers: Optional[int] = None,
+    cache: Optional[DirectoryListingCache] = None,
+) -> PathValidationResult:
+    """Validate many file paths with one directory listing per parent directory.
+
+    Batch counterpart of ``validate_file_path`` for large path lists on slow
+    (e.g. network) file systems. Paths are grouped by parent directory and
+    each group is resolved with a single ``os.scandir`` instead of one stat
+    per path. Errors are collected rather than raised.
+
+    Args:
+        paths: File paths as strings or Path objects
+        max_workers: Number of threads listing directories concurrently
+                     (default: None, list directories sequentially)
+        cache: Optional listing cache shared between calls
+
+    Returns:
+        Result holding the existing paths and the collected errors
+        (TypeError for invalid inputs, FileNotFoundError for missing files)
+
+    Examples:
+        >>> result = validate_file_paths(["existing_file.txt", "missing.txt"])
+        >>> result.valid
+        [Path('existing_file.txt')]
+        >>> result.errors
+        [('missing.txt', FileNotFoundError('File not found: missing.txt'))]
+    """
+    inputs: list[Any] = []
+    outcomes: dict[int, Union[Path, Exception]] = {}
+    groups: dict[str, list[tuple[int, Path]]] = {}
+
+    for index, raw in enumerate(paths):
+        inputs.append(raw)
+        if isinstance(raw, str):
+            path = Path(raw)
+        elif isinstance(raw, Path):
+            path = raw
+        else:
+            outcomes[index] = TypeError(f"Path must be str or Path, got {type(raw).__name__}")
+            continue
+        groups.setdefault(os.fspath(path.parent), []).append((index, path))
+
+    if max_workers is None or len(groups) <= 1:
+        resolved = [_validate_group(directory, members, cache) for directory, members in groups.items()]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_validate_group, d, members, cache) for d, members in groups.items()]
+            resolved = [future.result() for future in futures]
+
+    for group in resolved:
+        for index, path, exists in group:
+            outcomes[index] = path if exists else FileNotFoundError(f"File not found: {path}")
+
+    result = PathValidationResult()
+    for index, raw in enumerate(inputs):
+        outcome = outcomes[index]
+        if isinstance(outcome, Path):
+            result.valid.append(outcome)
+        else:
+            result.errors.append((raw, outcome))
+    return result
+
+
+def _deep_merge(layers: list[Mapping[str, Any]]) -> dict[str, Any]:
+    """Deep-merge mappings (lowest priority first) into a new dict."""
+    result: dict[str, Any] = {}
+    for layer in layers:
+        for key, value in layer.items():
+            current = result.get(key)
+            if isinstance(value, Mapping):
+                result[key] = _deep_merge([current, value] if isinstance(current, dict) else [value])
+            else:
+                result[key] = value
+    return result
+
+
+def merge_dicts(*dicts: Mapping[str, Any], deep: bool = False) -> dict[str, Any]:
     """Merge multiple dictionaries with later values overriding earlier ones.
 
     Args:
         *dicts: Variable number of dictionaries to merge
+        deep: Merge nested dictionaries key by key instead of replacing them
+              (default: False). Nested dictionaries in the result are new
+              objects, so mutating the result never changes the inputs.
 
     Returns:
         Merged dictionary
@@ -65,8 +322,490 @@ def merge_dicts(*dicts: dict[str, Any]) -> dict[str, Any]:
 
         >>> merge_dicts({})
         {}
+
+        >>> merge_dicts({"db": {"host": "x", "port": 1}}, {"db": {"port": 2}}, deep=True)
+        {'db': {'host': 'x', 'port': 2}}
     """
+    if deep:
+        return _deep_merge(list(dicts))
+
     result: dict[str, Any] = {}
     for d in dicts:
         result.update(d)
     return result
+
+
+class LayeredDict(Mapping[str, Any]):
+    """Lazy, read-only deep-merged view over a stack of mappings.
+
+    Like ``collections.ChainMap`` but with ``merge_dicts(deep=True)``
+    semantics and the same priority order as ``merge_dicts``: later layers
+    override earlier ones, and nested mappings are merged key by key.
+    Nothing is merged or copied up front; each key is resolved on first
+    access and cached, nested mappings are returned as LayeredDict views,
+    and ``to_dict`` caches the fully flattened result.
+
+    The view keeps references to the caller's mappings. ``push_layer`` and
+    ``replace_layer`` refresh it; after mutating a layer in place, call
+    ``invalidate``. A view and the nested views resolved from it share one
+    version counter, so invalidating any of them refreshes them all.
+
+    Examples:
+        >>> config = LayeredDict({"db": {"host": "x", "port": 1}}, {"db": {"port": 2}})
+        >>> config["db"]["port"]
+        2
+        >>> config["db"]["host"]
+        'x'
+        >>> config.to_dict()
+        {'db': {'host': 'x', 'port': 2}}
+    """
+
+    def __init__(self, *layers: Mapping[str, Any]) -> None:
+        """Initialize the view.
+
+        Args:
+            *layers: Mappings ordered from lowest to highest priority
+        """
+        self._layers: list[Mapping[str, Any]] = list(layers)
+        self._version = [0]
+        self._seen = 0
+        self._resolved: dict[str, Any] = {}
+        self._keys: Optional[list[str]] = None
+        self._flat: Optional[dict[str, Any]] = None
+
+    @classmethod
+    def _nested(cls, layers: list[Mapping[str, Any]], version: list[int]) -> "LayeredDict":
+        """Return a view over nested mappings sharing its parent's version counter."""
+        view = cls(*layers)
+        view._version = version
+        view._seen = version[0]
+        return view
+
+    @property
+    def layers(self) -> tuple[Mapping[str, Any], ...]:
+        """Return the layers, lowest priority first."""
+        return tuple(self._layers)
+
+    def invalidate(self) -> None:
+        """Drop cached lookups of this view and its nested views after a layer was mutated in place."""
+        self._version[0] += 1
+
+    def _refresh(self) -> None:
+        """Clear the caches if the view was invalidated since they were filled."""
+        if self._seen != self._version[0]:
+            self._resolved.clear()
+            self._keys = None
+            self._flat = None
+            self._seen = self._version[0]
+
+    def push_layer(self, layer: Mapping[str, Any]) -> None:
+        """Add a mapping as the new highest-priority layer."""
+        self._layers.append(layer)
+        self.invalidate()
+
+    def replace_layer(self, index: int, layer: Mapping[str, Any]) -> None:
+        """Replace the layer at ``index`` (supports negative indexes).
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        self._layers[index] = layer
+        self.invalidate()
+
+    def __getitem__(self, key: str) -> Any:
+        """Resolve a key, deep-merging nested mappings on demand.
+
+        Raises:
+            KeyError: If no layer contains the key
+        """
+        self._refresh()
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        nested: list[Mapping[str, Any]] = []
+        for layer in reversed(self._layers):
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, Mapping):
+                if not nested:
+                    self._resolved[key] = value
+                    return value
+                # A scalar below a mapping is overridden, together with anything under it.
+                break
+            nested.append(value)
+
+        if not nested:
+            raise KeyError(key)
+        view = LayeredDict._nested(nested[::-1], self._version)
+        self._resolved[key] = view
+        return view
+
+    def _key_order(self) -> list[str]:
+        """Return keys in first-seen order across layers, as merge_dicts would."""
+        self._refresh()
+        if self._keys is None:
+            self._keys = list(dict.fromkeys(key for layer in self._layers for key in layer))
+        return self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over keys present in any layer."""
+        return iter(self._key_order())
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys across layers."""
+        return len(self._key_order())
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if any layer contains the key."""
+        return any(key in layer for layer in self._layers)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the fully deep-merged dict, cached until the view is invalidated.
+
+        The returned dict is shared between calls; copy it before mutating.
+        """
+        self._refresh()
+        if self._flat is None:
+            self._flat = _deep_merge(self._layers)
+        return self._flat
+
+    def __repr__(self) -> str:
+        """Return string representation of the view."""
+        return f"LayeredDict({', '.join(repr(layer) for layer in self._layers)})"
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by ``Cache.stats``.
+
+    Attributes:
+        hits: Lookups that found a live entry
+        misses: Lookups that found no entry or an expired one
+        evictions: Entries removed to respect the entry or byte bounds
+        expirations: Entries removed because their TTL elapsed
+        entries: Current number of entries
+        bytes: Current estimated size of all entries
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class _CacheEntry:
+    """Cached value with its bookkeeping."""
+
+    __slots__ = ("expires_at", "hits", "size", "value")
+
+    def __init__(self, value: Any, size: int, expires_at: Optional[float]) -> None:
+        """Initialize the entry."""
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.hits = 0
+
+
+class Cache:
+    """Thread-safe in-memory cache with LRU, LFU or TTL eviction.
+
+    Eviction policies:
+        - ``"lru"``: evict the least recently used entry
+        - ``"lfu"``: evict the least frequently used entry (LRU among ties)
+        - ``"ttl"``: evict the entry closest to expiry (oldest insertion)
+
+    Independently of the policy, entries older than ``ttl`` seconds are
+    treated as missing. The cache is bounded by entry count, by estimated
+    bytes (``sizeof`` per value, ``sys.getsizeof`` by default, which does
+    not follow references), or both.
+
+    Examples:
+        >>> cache = Cache(max_entries=2)
+        >>> cache.set("a", 1)
+        >>> cache.set("b", 2)
+        >>> cache.get("a")
+        1
+        >>> cache.set("c", 3)
+        >>> "b" in cache
+        False
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        policy: Literal["lru", "lfu", "ttl"] = "lru",
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum total estimated size in bytes (None for unbounded)
+            ttl: Seconds after insertion an entry expires (None for never)
+            policy: Eviction policy, one of "lru", "lfu" or "ttl"
+            sizeof: Function estimating the size of a value in bytes
+
+        Raises:
+            ValueError: If a bound is not positive, or policy is unknown, or
+                policy is "ttl" without a ttl
+        """
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        if policy not in ("lru", "lfu", "ttl"):
+            raise ValueError(f"Unknown cache policy: {policy!r}")
+        if policy == "ttl" and ttl is None:
+            raise ValueError("The 'ttl' policy requires a ttl")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+        self._sizeof = sizeof
+        self._lock = threading.RLock()
+        self._entries: dict[Hashable, _CacheEntry] = {}
+        # Eviction order: one queue for LRU/TTL, one queue per hit count for LFU.
+        self._order: OrderedDict[Hashable, None] = OrderedDict()
+        self._frequencies: dict[int, OrderedDict[Hashable, None]] = {}
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    def _track(self, key: Hashable, entry: _CacheEntry) -> None:
+        """Add a key to the eviction order."""
+        if self.policy == "lfu":
+            self._frequencies.setdefault(entry.hits, OrderedDict())[key] = None
+        else:
+            self._order[key] = None
+
+    def _untrack(self, key: Hashable, entry: _CacheEntry) -> None:
+        """Remove a key from the eviction order."""
+        if self.policy == "lfu":
+            bucket = self._frequencies[entry.hits]
+            del bucket[key]
+            if not bucket:
+                del self._frequencies[entry.hits]
+        else:
+            del self._order[key]
+
+    def _touch(self, key: Hashable, entry: _CacheEntry) -> None:
+        """Record a hit for eviction purposes."""
+        if self.policy == "lfu":
+            self._untrack(key, entry)
+            entry.hits += 1
+            self._track(key, entry)
+        else:
+            entry.hits += 1
+            if self.policy == "lru":
+                self._order.move_to_end(key)
+
+    def _remove(self, key: Hashable) -> _CacheEntry:
+        """Remove an entry and return it."""
+        entry = self._entries.pop(key)
+        self._untrack(key, entry)
+        self._bytes -= entry.size
+        return entry
+
+    def _victim(self) -> Hashable:
+        """Return the key the policy evicts next."""
+        if self.policy == "lfu":
+            bucket = self._frequencies[min(self._frequencies)]
+            return next(iter(bucket))
+        return next(iter(self._order))
+
+    def _over_bounds(self, extra_size: int = 0) -> bool:
+        """Return True if adding an entry of ``extra_size`` would exceed a bound."""
+        if self.max_entries is not None and len(self._entries) + 1 > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes + extra_size > self.max_bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key, or ``default`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            self._stats.hits += 1
+            self._touch(key, entry)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting entries as needed to respect the bounds.
+
+        Values larger than ``max_bytes`` on their own are not stored.
+        """
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            while self._entries and self._over_bounds(size):
+                self._remove(self._victim())
+                self._stats.evictions += 1
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            entry = _CacheEntry(value, size, expires_at)
+            self._entries[key] = entry
+            self._track(key, entry)
+            self._bytes += size
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; return True if it was present."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self._frequencies.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if a live entry exists, without counting a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            return entry.expires_at is None or entry.expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries (including not yet purged expired ones)."""
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Return a copy of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+
+def _make_key(*args: Any, **kwargs: Any) -> Hashable:
+    """Build a cache key from call arguments."""
+    if not kwargs:
+        return args
+    return (args, _MISSING, tuple(sorted(kwargs.items())))
+
+
+def _memoize_sync(func: Callable[..., Any], store: Cache, make_key: Callable[..., Hashable]) -> Any:
+    """Return a caching wrapper for a plain function."""
+
+    @functools.wraps(func)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = make_key(*args, **kwargs)
+        value = store.get(cache_key, _MISSING)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            store.set(cache_key, value)
+        return value
+
+    return sync_wrapper
+
+
+def _memoize_async(func: Callable[..., Any], store: Cache, make_key: Callable[..., Hashable]) -> Any:
+    """Return a caching wrapper for a coroutine function that shares in-flight calls.
+
+    A miss starts the computation as a task of its own, which every caller
+    for the key awaits through ``asyncio.shield``: a cancelled caller stops
+    waiting without cancelling the computation the others share.
+    """
+    # A task belongs to one event loop, so in-flight calls are tracked per loop.
+    inflight: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Future[Any]]] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    @functools.wraps(func)
+    async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = make_key(*args, **kwargs)
+        value = store.get(cache_key, _MISSING)
+        if value is not _MISSING:
+            return value
+        tasks = inflight.setdefault(asyncio.get_running_loop(), {})
+        task = tasks.get(cache_key)
+        if task is None:
+            task = tasks[cache_key] = asyncio.ensure_future(cast(Awaitable[Any], func(*args, **kwargs)))
+
+            def settle(done: "asyncio.Future[Any]") -> None:
+                del tasks[cache_key]
+                # exception() also marks a failure retrieved, so it is not logged without waiters.
+                if not done.cancelled() and done.exception() is None:
+                    store.set(cache_key, done.result())
+
+            task.add_done_callback(settle)
+        return await asyncio.shield(task)
+
+    return async_wrapper
+
+
+def memoize(
+    cache: Optional[Cache] = None,
+    *,
+    key: Optional[Callable[..., Hashable]] = None,
+    **cache_options: Any,
+) -> Callable[[F], F]:
+    """Decorate a function or coroutine function to cache its results.
+
+    For coroutine functions, concurrent calls that miss on the same key
+    share one computation, run as its own task on the event loop, and all
+    await its result; cancelling one caller does not cancel the computation.
+    Exceptions are propagated and never cached.
+
+    Args:
+        cache: Cache to store results in (default: a new Cache built from
+               ``cache_options``)
+        key: Function mapping the call arguments to a hashable key
+             (default: positional and keyword arguments)
+        **cache_options: Options for a new Cache (max_entries, max_bytes,
+                         ttl, policy, sizeof)
+
+    Returns:
+        Decorator; the decorated function has ``cache`` and ``cache_clear``
+        attributes
+
+    Examples:
+        >>> @memoize(max_entries=1024, ttl=60.0)
+        ... def load_table(name: str) -> list[dict[str, Any]]: ...
+
+        >>> @memoize(policy="lfu", max_bytes=50_000_000)
+        ... async def fetch(url: str) -> bytes: ...
+    """
+    if cache is not None and cache_options:
+        raise TypeError("Pass either a cache or cache options, not both")
+    store = cache if cache is not None else Cache(**cache_options)
+    make_key = key if key is not None else _make_key
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            wrapper = _memoize_async(func, store, make_key)
+        else:
+            wrapper = _memoize_sync(func, store, make_key)
+        wrapper.cache = store
+        wrapper.cache_clear = store.clear
+        return cast(F, wrapper)
+
+    return decorator
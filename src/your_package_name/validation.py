@@ -0,0 +1,519 @@
+"""Declarative, single-pass validation of CSV data.
+
+A ValidationSpec declares schema checks (required columns, extra
+columns), row-level checks per column (type, nullability, value range,
+uniqueness) and aggregate checks (row count, per-column sum, mean,
+standard deviation and null fraction). A Validator compiles the spec
+once and checks rows as they stream past, so every check runs in the
+same pass, over the same parsed rows, as the filter:
+
+    filter_csv("data/raw/input.csv", "data/processed/output.csv", validation=spec)
+
+Schema issues, exceeding ``max_rows`` and reaching ``max_errors`` issues
+are fatal: validation, and the filter run it is part of, stops at once.
+Aggregate checks run when the input is exhausted. Any issue fails the
+run with a ValidationError carrying a structured ValidationReport.
+
+Specs are usually loaded from a JSON, TOML or YAML file:
+
+    max_rows = 1000000
+
+    [columns.id]
+    dtype = "int"
+    nullable = false
+    unique = true
+
+    [columns.value]
+    dtype = "float"
+    nullable = false
+    min_value = 0.0
+    max_value = 1.0
+    max_mean = 0.6
+
+Uniqueness keeps every distinct value of the column in memory.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import io
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, field, fields
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional, Union
+
+from your_package_name.compression import open_input
+from your_package_name.config import load_config
+
+ColumnType = Literal["str", "int", "float"]
+
+COLUMN_TYPES: tuple[ColumnType, ...] = ("str", "int", "float")
+DEFAULT_MAX_ERRORS = 100
+_CONVERTERS: dict[str, Callable[[str], Any]] = {"int": int, "float": float}
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """Checks of one column; unset bounds are not checked.
+
+    Empty fields and fields missing from short rows are nulls. Range and
+    aggregate checks need a numeric ``dtype`` and ignore nulls.
+
+    Attributes:
+        dtype: "str", "int" or "float"; other fields fail the type check
+        nullable: Whether nulls are allowed
+        min_value: Smallest allowed value
+        max_value: Largest allowed value
+        unique: Whether values must be distinct (nulls are not compared)
+        min_sum: Lower bound of the column sum
+        max_sum: Upper bound of the column sum
+        min_mean: Lower bound of the column mean
+        max_mean: Upper bound of the column mean
+        min_stddev: Lower bound of the sample standard deviation
+        max_stddev: Upper bound of the sample standard deviation
+        max_null_fraction: Largest allowed share of null fields (0 to 1)
+    """
+
+    dtype: ColumnType = "str"
+    nullable: bool = True
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    unique: bool = False
+    min_sum: Optional[float] = None
+    max_sum: Optional[float] = None
+    min_mean: Optional[float] = None
+    max_mean: Optional[float] = None
+    min_stddev: Optional[float] = None
+    max_stddev: Optional[float] = None
+    max_null_fraction: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        """Check that the rule is consistent.
+
+        Raises:
+            ValueError: If dtype is unknown, a bound needs a numeric dtype,
+                or max_null_fraction is not between 0 and 1
+        """
+        if self.dtype not in COLUMN_TYPES:
+            raise ValueError(f"Column type must be one of {', '.join(COLUMN_TYPES)}, got {self.dtype!r}")
+        numeric = ("min_value", "max_value", "min_sum", "max_sum", "min_mean", "max_mean", "min_stddev", "max_stddev")
+        bounded = [name for name in numeric if getattr(self, name) is not None]
+        if bounded and self.dtype == "str":
+            raise ValueError(f"{', '.join(bounded)} need a numeric column type, got 'str'")
+        if self.max_null_fraction is not None and not 0 <= self.max_null_fraction <= 1:
+            raise ValueError(f"max_null_fraction must be between 0 and 1, got {self.max_null_fraction}")
+
+
+@dataclass(frozen=True)
+class ValidationSpec:
+    """Declarative checks of a CSV input.
+
+    Attributes:
+        columns: Rules by column name; every named column is required
+        allow_extra_columns: Whether the header may contain unnamed columns
+        min_rows: Fewest data rows allowed
+        max_rows: Most data rows allowed (checked while streaming)
+        max_errors: Issues after which validation stops (1 stops at the first)
+    """
+
+    columns: Mapping[str, ColumnRule] = field(default_factory=dict)
+    allow_extra_columns: bool = True
+    min_rows: Optional[int] = None
+    max_rows: Optional[int] = None
+    max_errors: int = DEFAULT_MAX_ERRORS
+
+    def __post_init__(self) -> None:
+        """Check that the spec is consistent.
+
+        Raises:
+            ValueError: If max_errors is not positive
+        """
+        if self.max_errors <= 0:
+            raise ValueError(f"max_errors must be positive, got {self.max_errors}")
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "ValidationSpec":
+        """Build a spec from parsed configuration data.
+
+        Raises:
+            ValueError: If a setting is unknown or invalid
+        """
+        _check_keys(data, cls, "validation setting")
+        columns = data.get("columns", {})
+        if not isinstance(columns, Mapping):
+            raise ValueError("'columns' must map column names to rules")
+        rules = {}
+        for name, rule in columns.items():
+            if not isinstance(rule, Mapping):
+                raise ValueError(f"Rule of column {name!r} must be a mapping")
+            _check_keys(rule, ColumnRule, f"setting of column {name!r}")
+            rules[name] = ColumnRule(**rule)
+        return cls(**{**data, "columns": rules})
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the spec as JSON-compatible data, as accepted by ``from_mapping``."""
+        return {**asdict(self), "columns": {name: asdict(rule) for name, rule in self.columns.items()}}
+
+
+def _check_keys(data: Mapping[str, Any], cls: type, what: str) -> None:
+    """Raise ValueError if ``data`` has keys that are not fields of ``cls``."""
+    unknown = set(data) - {item.name for item in fields(cls)}
+    if unknown:
+        raise ValueError(f"Unknown {what}: {', '.join(sorted(map(str, unknown)))}")
+
+
+def load_validation_spec(path: Union[Path, str]) -> ValidationSpec:
+    """Load a ValidationSpec from a JSON, TOML or YAML file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file cannot be parsed or the spec is invalid
+    """
+    return ValidationSpec.from_mapping(load_config(path).data)
+
+
+@dataclass
+class ValidationIssue:
+    """One failed check.
+
+    Attributes:
+        check: "schema", "type", "null", "range", "unique", "count",
+            "sum", "mean", "stddev" or "null_fraction"
+        message: Human-readable description
+        column: Column checked, if any
+        row: 1-based data row number for row-level checks
+    """
+
+    check: str
+    message: str
+    column: Optional[str] = None
+    row: Optional[int] = None
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of a validation pass.
+
+    Attributes:
+        rows_checked: Data rows checked
+        issues: The first ``max_errors`` issues, in the order found
+        issue_counts: Number of issues per check
+        stopped_early: Whether a fatal issue ended validation before the
+            end of the input (aggregate checks are then skipped)
+        columns: Per-column statistics: non-null count, nulls and, for
+            numeric columns, sum, mean, stddev, min and max
+    """
+
+    rows_checked: int = 0
+    issues: list[ValidationIssue] = field(default_factory=list)
+    issue_counts: dict[str, int] = field(default_factory=dict)
+    stopped_early: bool = False
+    columns: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        """Return True if no check failed."""
+        return not self.issue_counts
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as JSON-compatible data."""
+        return {**asdict(self), "passed": self.passed}
+
+    def summary(self) -> str:
+        """Return a one-line description of the outcome."""
+        if self.passed:
+            return f"Validation passed: {self.rows_checked} row(s) checked"
+        counts = ", ".join(f"{check}: {count}" for check, count in self.issue_counts.items())
+        stopped = ", stopped early" if self.stopped_early else ""
+        return f"Validation failed: {self.rows_checked} row(s) checked, {counts}{stopped}"
+
+
+class ValidationError(ValueError):
+    """Raised when data fails validation; ``report`` holds the details."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        """Wrap a failed report."""
+        super().__init__(report)
+        self.report = report
+
+    def __str__(self) -> str:
+        """Return the summary and the first issues."""
+        lines = [self.report.summary(), *(f"  {issue.message}" for issue in self.report.issues[:5])]
+        hidden = sum(self.report.issue_counts.values()) - min(len(self.report.issues), 5)
+        if hidden > 0:
+            lines.append(f"  ... and {hidden} more")
+        return "\n".join(lines)
+
+
+class _ValidationStoppedError(Exception):
+    """Internal signal that a fatal issue ended validation."""
+
+
+class _ColumnCheck:
+    """Compiled rule of one column with its running statistics."""
+
+    __slots__ = (
+        "convert",
+        "count",
+        "high",
+        "low",
+        "maximum",
+        "mean",
+        "minimum",
+        "name",
+        "nulls",
+        "rule",
+        "seen",
+        "squares",
+        "total",
+    )
+
+    def __init__(self, name: str, rule: ColumnRule) -> None:
+        """Compile ``rule`` for column ``name``."""
+        self.name = name
+        self.rule = rule
+        self.convert = _CONVERTERS.get(rule.dtype)
+        self.low = rule.min_value
+        self.high = rule.max_value
+        self.seen: Optional[set[Any]] = set() if rule.unique else None
+        self.count = 0
+        self.nulls = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Update the running sum, mean, variance (Welford) and extremes."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the column statistics for the report."""
+        if self.convert is None:
+            return {"count": self.count, "nulls": self.nulls}
+        stddev = math.sqrt(self.squares / (self.count - 1)) if self.count > 1 else None
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "sum": self.total,
+            "mean": self.mean if self.count else None,
+            "stddev": stddev,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+        }
+
+
+class Validator:
+    """Apply a ValidationSpec to a stream of parsed CSV rows.
+
+    Call ``check_header`` once, ``check_rows`` for each chunk of rows (as
+    produced by ``csv.DictReader``) and ``finish`` at the end. Each method
+    raises ValidationError as soon as the outcome is known to be a failure
+    that ends validation; ``finish`` raises for any issue.
+
+    Examples:
+        >>> validator = Validator(spec)
+        >>> validator.check_header(reader.fieldnames)
+        >>> for chunk in iter_chunks(reader):
+        ...     validator.check_rows(chunk)
+        >>> report = validator.finish()
+    """
+
+    def __init__(self, spec: ValidationSpec) -> None:
+        """Compile the spec."""
+        self.spec = spec
+        self.report = ValidationReport()
+        self._checks = [_ColumnCheck(name, rule) for name, rule in spec.columns.items()]
+        self._issues = 0
+
+    def _issue(self, check: str, message: str, column: Optional[str] = None, row: Optional[int] = None) -> None:
+        """Record an issue and stop once ``max_errors`` issues were found."""
+        self._issues += 1
+        self.report.issue_counts[check] = self.report.issue_counts.get(check, 0) + 1
+        if len(self.report.issues) < self.spec.max_errors:
+            self.report.issues.append(ValidationIssue(check, message, column, row))
+        if self._issues >= self.spec.max_errors:
+            raise _ValidationStoppedError
+
+    def _stop(self) -> ValidationError:
+        """Mark the report as stopped early and return the error to raise."""
+        self.report.stopped_early = True
+        self.report.columns = {check.name: check.statistics() for check in self._checks}
+        return ValidationError(self.report)
+
+    def check_header(self, columns: Sequence[str]) -> None:
+        """Check the header columns against the spec.
+
+        Raises:
+            ValidationError: If a required column is missing or an extra
+                column is not allowed (schema issues are fatal)
+        """
+        present = set(columns)
+        missing = [name for name in self.spec.columns if name not in present]
+        extra = [] if self.spec.allow_extra_columns else [name for name in columns if name not in self.spec.columns]
+        try:
+            for name in missing:
+                self._issue("schema", f"Missing column {name!r}", name)
+            for name in extra:
+                self._issue("schema", f"Unexpected column {name!r}", name)
+        except _ValidationStoppedError:
+            raise self._stop() from None
+        if missing or extra:
+            raise self._stop()
+
+    def check_rows(self, rows: Sequence[Mapping[Optional[str], Any]], first_row: Optional[int] = None) -> None:
+        """Check a chunk of rows.
+
+        Args:
+            rows: Rows as produced by ``csv.DictReader``
+            first_row: 1-based data row number of ``rows[0]`` (default: the
+                row after the last one checked)
+
+        Raises:
+            ValidationError: If ``max_rows`` is exceeded, a row has more
+                fields than the header, or ``max_errors`` issues were found
+        """
+        start = first_row if first_row is not None else self.report.rows_checked + 1
+        max_rows = self.spec.max_rows
+        try:
+            for number, row in enumerate(rows, start):
+                self.report.rows_checked += 1
+                if max_rows is not None and self.report.rows_checked > max_rows:
+                    self._issue("count", f"More than {max_rows} row(s)")
+                    raise _ValidationStoppedError
+                if None in row:
+                    self._issue("schema", f"Row {number}: more fields than the header", row=number)
+                    raise _ValidationStoppedError
+                for check in self._checks:
+                    self._check_field(check, row.get(check.name), number)
+        except _ValidationStoppedError:
+            raise self._stop() from None
+
+    def _check_field(self, check: _ColumnCheck, raw: Any, number: int) -> None:
+        """Apply the row-level checks of one column to one field."""
+        if raw is None or raw == "":
+            check.nulls += 1
+            if not check.rule.nullable:
+                self._issue("null", f"Row {number}: {check.name!r} is empty", check.name, number)
+            return
+        value = raw
+        if check.convert is not None:
+            try:
+                value = check.convert(raw)
+            except ValueError:
+                message = f"Row {number}: {check.name!r} is not {check.rule.dtype}: {raw!r}"
+                self._issue("type", message, check.name, number)
+                return
+            if not math.isfinite(value):
+                # nan and inf parse as floats but would poison every aggregate.
+                message = f"Row {number}: {check.name!r} is not a finite {check.rule.dtype}: {raw!r}"
+                self._issue("type", message, check.name, number)
+                return
+            check.add(value)
+            if (check.low is not None and value < check.low) or (check.high is not None and value > check.high):
+                self._issue("range", f"Row {number}: {check.name!r} out of range: {raw!r}", check.name, number)
+        else:
+            check.count += 1
+        if check.seen is not None:
+            if value in check.seen:
+                self._issue("unique", f"Row {number}: duplicate {check.name!r}: {raw!r}", check.name, number)
+            else:
+                check.seen.add(value)
+
+    def finish(self) -> ValidationReport:
+        """Run the aggregate checks and return the report.
+
+        Raises:
+            ValidationError: If any check failed
+        """
+        try:
+            self._check_aggregates()
+        except _ValidationStoppedError:
+            raise self._stop() from None
+        self.report.columns = {check.name: check.statistics() for check in self._checks}
+        if not self.report.passed:
+            raise ValidationError(self.report)
+        return self.report
+
+    def _check_aggregates(self) -> None:
+        """Check the row count and the per-column aggregate bounds."""
+        if self.spec.min_rows is not None and self.report.rows_checked < self.spec.min_rows:
+            self._issue("count", f"Fewer than {self.spec.min_rows} row(s): {self.report.rows_checked}")
+        for check in self._checks:
+            stats = check.statistics()
+            rule = check.rule
+            bounds = (
+                ("sum", stats.get("sum"), rule.min_sum, rule.max_sum),
+                ("mean", stats.get("mean"), rule.min_mean, rule.max_mean),
+                ("stddev", stats.get("stddev"), rule.min_stddev, rule.max_stddev),
+            )
+            for name, actual, low, high in bounds:
+                if low is None and high is None:
+                    continue
+                if actual is None:
+                    self._issue(name, f"{check.name!r}: {name} is undefined for {check.count} value(s)", check.name)
+                elif (
+                    not math.isfinite(actual)
+                    or (low is not None and actual < low)
+                    or (high is not None and actual > high)
+                ):
+                    self._issue(name, f"{check.name!r}: {name} {actual:g} outside [{low}, {high}]", check.name)
+            rows = self.report.rows_checked
+            limit = rule.max_null_fraction
+            if limit is not None and rows and check.nulls / rows > limit:
+                message = f"{check.name!r}: {check.nulls / rows:.1%} nulls, over {limit:.1%}"
+                self._issue("null_fraction", message, check.name)
+
+
+def validate_csv(
+    input_path: Union[Path, str],
+    spec: ValidationSpec,
+    *,
+    chunk_size: int = 10_000,
+) -> ValidationReport:
+    """Validate a CSV file without filtering it.
+
+    Args:
+        input_path: Input CSV, optionally compressed
+        spec: Checks to apply
+        chunk_size: Rows per chunk
+
+    Returns:
+        The report, passed or failed (stopped early on a fatal issue)
+
+    Examples:
+        >>> validate_csv("data/raw/input.csv", load_validation_spec("configs/validation.toml")).passed
+        True
+    """
+    validator = Validator(spec)
+    with io.TextIOWrapper(open_input(input_path), encoding="utf-8", newline="") as source:
+        reader = csv.DictReader(source)
+        try:
+            validator.check_header(reader.fieldnames or [])
+            while chunk := list(islice(reader, chunk_size)):
+                validator.check_rows(chunk)
+            return validator.finish()
+        except ValidationError as e:
+            return e.report
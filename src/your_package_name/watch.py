@@ -0,0 +1,382 @@
+"""Long-running directory watcher that filters input files as they land.
+
+``watch`` keeps a process pool warm and processes each new input file in
+a directory with ``columnar.filter_file``, writing ``output_dir/<name>``
+and then moving the input into a ``done`` or ``failed`` subdirectory.
+
+A file is handed over when it is complete. On Linux, inotify reports
+files that were closed after writing or renamed into the directory, and
+those are processed at once. Every other file (and every file where
+inotify is unavailable) is polled and processed once its size and
+modification time have not changed for ``settle`` seconds. Writers
+should create files under a hidden name (starting with ``.``) and rename
+them into place; hidden files are never picked up.
+
+Setting the ``stop`` event stops accepting new files; files already
+being processed are finished and moved before ``watch`` returns.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import shutil
+import signal
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Optional, Union
+
+from your_package_name.batch import INPUT_SUFFIXES
+from your_package_name.columnar import CsvReader, filter_file
+from your_package_name.streaming import DEFAULT_CHUNK_SIZE, FilterStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+IN_CLOSE_WRITE = 0x08
+IN_MOVED_TO = 0x80
+_INOTIFY_EVENT = struct.Struct("iIII")
+_INOTIFY_READ_SIZE = 64 * 1024
+
+
+class _Inotify:
+    """Minimal inotify watch on one directory through libc."""
+
+    def __init__(self, directory: Path) -> None:
+        """Start watching a directory for completed writes and renames into it.
+
+        Raises:
+            OSError: If inotify is unavailable or the watch cannot be added
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float) -> list[str]:
+        """Wait up to ``timeout`` seconds and return the names of completed files."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, _INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            names.append(os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """Report input files in a directory once they are complete.
+
+    Each file is reported once until ``forget`` is called for it, for
+    example after it has been moved away.
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str],
+        *,
+        suffix: Union[str, tuple[str, ...]] = INPUT_SUFFIXES,
+        settle: float = DEFAULT_SETTLE,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch (not recursive)
+            suffix: File suffix or suffixes to pick up
+            settle: Seconds a file's size and mtime must stay unchanged
+            interval: Seconds between directory scans
+            use_inotify: Use inotify; None uses it when available
+
+        Raises:
+            OSError: If use_inotify is True and inotify is unavailable
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.settle = settle
+        self.interval = interval
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._reported: set[Path] = set()
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify or (use_inotify is None and sys.platform.startswith("linux")):
+            try:
+                self._inotify = _Inotify(self.directory)
+            except (OSError, AttributeError) as e:
+                if use_inotify:
+                    raise OSError(f"inotify is unavailable: {e}") from e
+                logger.debug(f"inotify unavailable, polling {self.directory}: {e}")
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Return True if completed writes are detected with inotify."""
+        return self._inotify is not None
+
+    def _wanted(self, name: str) -> bool:
+        """Return True for visible files with a watched suffix."""
+        return not name.startswith(".") and name.endswith(self.suffix)
+
+    def poll(self, completed: Iterable[str] = ()) -> list[Path]:
+        """Scan the directory once and return newly complete files, sorted.
+
+        Args:
+            completed: Names known to be complete (e.g. from inotify),
+                reported without waiting for them to settle
+        """
+        now = time.monotonic()
+        completed = set(completed)
+        ready = []
+        seen = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not self._wanted(entry.name) or not entry.is_file():
+                    continue
+                path = Path(entry.path)
+                seen.add(path)
+                if path in self._reported:
+                    continue
+                stat = entry.stat()
+                signature = (stat.st_size, stat.st_mtime_ns)
+                state = self._pending.get(path)
+                if state is None or state[0] != signature:
+                    state = self._pending[path] = (signature, now)
+                if entry.name in completed or now - state[1] >= self.settle:
+                    ready.append(path)
+                    self._reported.add(path)
+                    del self._pending[path]
+        self._pending = {path: state for path, state in self._pending.items() if path in seen}
+        return sorted(ready)
+
+    def wait(self, timeout: Optional[float] = None) -> list[Path]:
+        """Wait for activity up to ``timeout`` seconds (default: the poll interval) and poll."""
+        timeout = self.interval if timeout is None else timeout
+        if self._inotify is None:
+            time.sleep(timeout)
+            return self.poll()
+        return self.poll(self._inotify.read(timeout))
+
+    def forget(self, path: Path) -> None:
+        """Allow a reported path to be reported again when a new file appears there."""
+        self._reported.discard(path)
+
+    def close(self) -> None:
+        """Release the inotify watch, if any."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+@dataclass
+class WatchReport:
+    """Summary of a watch session.
+
+    Attributes:
+        processed: Inputs filtered successfully (now in the done directory)
+        failed: Inputs that raised an error (now in the failed directory)
+        rows_read: Data rows read from processed inputs
+        rows_written: Data rows written for processed inputs
+    """
+
+    processed: list[Path] = field(default_factory=list)
+    failed: list[Path] = field(default_factory=list)
+    rows_read: int = 0
+    rows_written: int = 0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        return (
+            f"Processed {len(self.processed)} file(s), {len(self.failed)} failed; "
+            f"kept {self.rows_written} of {self.rows_read} rows"
+        )
+
+
+def _ignore_stop_signals() -> None:
+    """Leave SIGINT and SIGTERM to the parent so in-flight files can finish (pool initializer)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def _move(source: Path, directory: Path) -> Path:
+    """Move a file into a directory, replacing a file of the same name."""
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / source.name
+    shutil.move(source, target)
+    return target
+
+
+class _Session:
+    """Queue, in-flight futures and report of one ``watch`` call."""
+
+    def __init__(self, watcher: DirectoryWatcher, report: WatchReport, *, done: Path, failed: Path) -> None:
+        """Start with the files already in the watched directory queued."""
+        self.watcher = watcher
+        self.report = report
+        self.done = done
+        self.failed = failed
+        self.queued: deque[Path] = deque(watcher.poll())
+        self.running: dict[Future[FilterStats], Path] = {}
+
+    def finish(self, future: Future[FilterStats], source: Path) -> None:
+        """Move a finished input to the done or failed directory."""
+        try:
+            stats = future.result()
+        except Exception as e:
+            logger.error(f"Failed {source.name}: {e}")
+            target = _move(source, self.failed)
+            target.with_name(f"{target.name}.error.txt").write_text(f"{type(e).__name__}: {e}\n", encoding="utf-8")
+            self.report.failed.append(target)
+        else:
+            logger.info(f"Processed {source.name}: kept {stats.rows_written} of {stats.rows_read} rows")
+            self.report.processed.append(_move(source, self.done))
+            self.report.rows_read += stats.rows_read
+            self.report.rows_written += stats.rows_written
+        self.watcher.forget(source)
+
+    def run(
+        self,
+        executor: ProcessPoolExecutor,
+        process: Callable[[Path, Path], FilterStats],
+        output_dir: Path,
+        *,
+        workers: int,
+        stop: threading.Event,
+        interval: float,
+    ) -> None:
+        """Process queued and arriving files, ``workers`` at a time, until ``stop`` is set; then drain."""
+        while not stop.is_set():
+            while self.queued and len(self.running) < workers:
+                source = self.queued.popleft()
+                self.running[executor.submit(process, source, output_dir / source.name)] = source
+            full = len(self.running) >= workers
+            if self.running:
+                finished, _ = wait(self.running, timeout=interval if full else 0, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self.finish(future, self.running.pop(future))
+            if not full:
+                self.queued.extend(self.watcher.wait())
+
+        if self.running:
+            logger.info(f"Stopping: finishing {len(self.running)} file(s) in flight")
+        for future, source in list(self.running.items()):
+            wait([future])
+            self.finish(future, source)
+
+
+def watch(
+    directory: Union[Path, str],
+    output_dir: Union[Path, str],
+    threshold: float = 0.5,
+    *,
+    stop: threading.Event,
+    done_dir: Optional[Union[Path, str]] = None,
+    failed_dir: Optional[Union[Path, str]] = None,
+    jobs: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reader: CsvReader = "csv",
+    settle: float = DEFAULT_SETTLE,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    use_inotify: Optional[bool] = None,
+) -> WatchReport:
+    """Filter files arriving in a directory until ``stop`` is set.
+
+    Files already in the directory are processed first. At most ``jobs``
+    files are in flight; the rest wait in the directory, so stopping never
+    abandons queued work. A failed input is moved to ``failed_dir`` with a
+    ``<name>.error.txt`` next to it describing the error.
+
+    Args:
+        directory: Directory receiving input files
+        output_dir: Directory for outputs, named like their inputs
+        threshold: Minimum value to keep (default: 0.5)
+        stop: Event that ends the session; in-flight files are drained
+        done_dir: Where processed inputs go (default: ``directory/done``)
+        failed_dir: Where failed inputs go (default: ``directory/failed``)
+        jobs: Worker processes; None uses one per CPU
+        chunk_size: Rows per chunk
+        reader: CSV reader, "csv", "mmap" or "pipelined" (see ``columnar.filter_file``)
+        settle: Seconds an unannounced file must be unchanged (default: 2)
+        interval: Seconds between directory scans (default: 1)
+        use_inotify: Use inotify; None uses it when available
+
+    Returns:
+        What was processed and what failed
+
+    Raises:
+        ValueError: If threshold or jobs is invalid
+        FileNotFoundError: If the directory does not exist
+
+    Examples:
+        >>> stop = threading.Event()
+        >>> signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        >>> watch("data/raw", "data/processed", 0.7, stop=stop).summary()
+        'Processed 12 file(s), 0 failed; kept 3611 of 12000 rows'
+    """
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Threshold must be between 0 and 1, got {threshold}")
+    if workers <= 0:
+        raise ValueError(f"Jobs must be positive, got {workers}")
+    directory, output_dir = Path(directory), Path(output_dir)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Watch directory not found: {directory}")
+    done = Path(done_dir) if done_dir is not None else directory / "done"
+    failed = Path(failed_dir) if failed_dir is not None else directory / "failed"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    report = WatchReport()
+    watcher = DirectoryWatcher(directory, settle=settle, interval=interval, use_inotify=use_inotify)
+    method = "inotify" if watcher.uses_inotify else f"polling every {interval:g}s"
+    logger.info(f"Watching {directory} ({method}, settle {settle:g}s) with {workers} worker(s)")
+
+    run = partial(filter_file, threshold=threshold, chunk_size=chunk_size, reader=reader)
+    session = _Session(watcher, report, done=done, failed=failed)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_ignore_stop_signals) as executor:
+            session.run(executor, run, output_dir, workers=workers, stop=stop, interval=interval)
+    finally:
+        watcher.close()
+
+    logger.info(report.summary())
+    return report
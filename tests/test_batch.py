@@ -0,0 +1,145 @@
+"""Tests for batch module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from your_package_name.batch import expand_inputs, filter_many, largest_first
+
+
+def write_shard(path: Path, values: list[float], columns: tuple[str, ...] = ("id", "value")) -> Path:
+    """Write a CSV shard with the given values."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows({"id": f"{path.stem}-{i}", "value": str(value)} for i, value in enumerate(values))
+    return path
+
+
+def read_ids(path: Path) -> list[str]:
+    """Read the id column of a CSV file."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [row["id"] for row in csv.DictReader(handle)]
+
+
+class TestExpandInputs:
+    """Tests for expand_inputs function."""
+
+    def test_files_directories_and_globs(self, tmp_path: Path) -> None:
+        """Test that all argument kinds are expanded, deduplicated and sorted."""
+        a = write_shard(tmp_path / "raw" / "a.csv", [0.1])
+        b = write_shard(tmp_path / "raw" / "b.csv", [0.1])
+        (tmp_path / "raw" / "notes.txt").write_text("skip", encoding="utf-8")
+        c = write_shard(tmp_path / "extra" / "deep" / "c.csv", [0.1])
+
+        result = expand_inputs([tmp_path / "raw", str(tmp_path / "extra" / "**" / "*.csv"), a])
+
+        assert result == sorted([a, b, c])
+
+    def test_relative_glob(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test glob patterns relative to the working directory."""
+        write_shard(tmp_path / "raw" / "a.csv", [0.1])
+        monkeypatch.chdir(tmp_path)
+        assert expand_inputs(["raw/*.csv"]) == [Path("raw/a.csv")]
+
+    def test_missing_path_raises_error(self, tmp_path: Path) -> None:
+        """Test that missing plain paths raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Input file not found"):
+            expand_inputs([tmp_path / "missing.csv"])
+
+    def test_no_matches_raises_error(self, tmp_path: Path) -> None:
+        """Test that an empty expansion raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="No input files matched"):
+            expand_inputs([str(tmp_path / "*.csv")])
+
+
+class TestLargestFirst:
+    """Tests for largest_first function."""
+
+    def test_orders_by_size(self, tmp_path: Path) -> None:
+        """Test that larger files are scheduled first."""
+        small = write_shard(tmp_path / "small.csv", [0.1])
+        large = write_shard(tmp_path / "large.csv", [0.1] * 100)
+        medium = write_shard(tmp_path / "medium.csv", [0.1] * 10)
+        assert largest_first([small, large, medium]) == [large, medium, small]
+
+
+class TestFilterMany:
+    """Tests for filter_many function."""
+
+    @pytest.fixture
+    def shards(self, tmp_path: Path) -> list[Path]:
+        """Create shards of different sizes."""
+        return [
+            write_shard(tmp_path / "raw" / "s0.csv", [0.9, 0.1]),
+            write_shard(tmp_path / "raw" / "s1.csv", [0.6] * 50),
+            write_shard(tmp_path / "raw" / "s2.csv", [0.2, 0.7]),
+        ]
+
+    def test_merged_output_in_input_order(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that the merged output has one header and rows in input order."""
+        output = tmp_path / "out" / "merged.csv"
+        stats = filter_many(shards, output, 0.5)
+
+        assert (stats.rows_read, stats.rows_written) == (54, 52)
+        ids = read_ids(output)
+        assert ids[0] == "s0-0"
+        assert ids[1:51] == [f"s1-{i}" for i in range(50)]
+        assert ids[51] == "s2-1"
+        assert output.read_text(encoding="utf-8").count("id,value") == 1
+        assert [path.name for path in output.parent.iterdir()] == ["merged.csv"]
+
+    def test_process_pool(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that the pool produces the same merged output."""
+        serial = tmp_path / "serial.csv"
+        parallel = tmp_path / "parallel.csv"
+        filter_many(shards, serial, 0.5)
+        filter_many(shards, parallel, 0.5, jobs=2)
+        assert parallel.read_bytes() == serial.read_bytes()
+
+    def test_per_shard_outputs(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test writing one output file per shard."""
+        output_dir = tmp_path / "processed"
+        filter_many(shards, output_dir, 0.5, jobs=None, per_shard=True)
+        assert sorted(path.name for path in output_dir.iterdir()) == ["s0.csv", "s1.csv", "s2.csv"]
+        assert read_ids(output_dir / "s2.csv") == ["s2-1"]
+
+    def test_per_shard_name_collision(self, tmp_path: Path) -> None:
+        """Test that duplicate shard names are rejected in per-shard mode."""
+        shards = [write_shard(tmp_path / "a" / "x.csv", [0.1]), write_shard(tmp_path / "b" / "x.csv", [0.1])]
+        with pytest.raises(ValueError, match="unique file names"):
+            filter_many(shards, tmp_path / "out", per_shard=True)
+
+    def test_mismatched_columns(self, tmp_path: Path) -> None:
+        """Test that merging shards with different columns fails cleanly."""
+        shards = [
+            write_shard(tmp_path / "a.csv", [0.9]),
+            write_shard(tmp_path / "b.csv", [0.9], columns=("value", "id")),
+        ]
+        output = tmp_path / "out" / "merged.csv"
+        with pytest.raises(ValueError, match="different columns"):
+            filter_many(shards, output)
+        assert not output.parent.exists() or not list(output.parent.iterdir())
+
+    def test_invalid_jobs(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that a non-positive job count is rejected."""
+        with pytest.raises(ValueError, match="Jobs must be positive"):
+            filter_many(shards, tmp_path / "out.csv", jobs=0)
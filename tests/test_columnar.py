@@ -0,0 +1,178 @@
+"""Tests for columnar module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from your_package_name.batch import filter_many
+from your_package_name.columnar import detect_format, filter_file
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ipc = pytest.importorskip("pyarrow.ipc")
+
+
+@pytest.fixture
+def table() -> Any:
+    """Return 100 rows with ascending values, so row groups cover narrow ranges."""
+    return pa.table({"id": [f"row-{i}" for i in range(100)], "value": [i / 100 for i in range(100)]})
+
+
+def write_parquet(path: Path, table: Any, row_group_size: int = 10) -> Path:
+    """Write a table as Parquet with small row groups."""
+    pq.write_table(table, path, row_group_size=row_group_size)
+    return path
+
+
+def write_arrow(path: Path, table: Any) -> Path:
+    """Write a table as an Arrow IPC file in several batches."""
+    with ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table, max_chunksize=25)
+    return path
+
+
+class TestDetectFormat:
+    """Tests for detect_format function."""
+
+    def test_suffixes(self) -> None:
+        """Test that suffixes map to formats, defaulting to CSV."""
+        assert detect_format("a.parquet") == "parquet"
+        assert detect_format("a.PQ") == "parquet"
+        assert detect_format("a.feather") == "arrow"
+        assert detect_format("a.csv") == "csv"
+        assert detect_format("a.txt") == "csv"
+
+
+class TestFilterFile:
+    """Tests for filter_file function."""
+
+    def test_parquet_prunes_row_groups(self, tmp_path: Path, table: Any) -> None:
+        """Test that row groups below the threshold are skipped by statistics."""
+        source = write_parquet(tmp_path / "in.parquet", table)
+        stats = filter_file(source, tmp_path / "out.parquet", threshold=0.75)
+
+        assert stats.rows_read == 100
+        assert stats.rows_written == 25
+        assert stats.chunks_skipped == 7
+        assert stats.columns == ("id", "value")
+        result = pq.read_table(tmp_path / "out.parquet")
+        assert result.column("id").to_pylist() == [f"row-{i}" for i in range(75, 100)]
+
+    def test_parquet_random_order_matches_threshold(self, tmp_path: Path) -> None:
+        """Test filtering when every row group spans the value range."""
+        values = [(i * 37 % 100) / 100 for i in range(100)]
+        source = write_parquet(tmp_path / "in.parquet", pa.table({"value": values}))
+        stats = filter_file(source, tmp_path / "out.arrow", threshold=0.5)
+
+        assert stats.chunks_skipped == 0
+        result = ipc.open_file(tmp_path / "out.arrow").read_all()
+        assert result.column("value").to_pylist() == [value for value in values if value >= 0.5]
+
+    def test_parquet_reads_value_column_once(self, tmp_path: Path, table: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that surviving row groups reuse the value column and keep the column order."""
+        source = write_parquet(tmp_path / "in.parquet", table.select(["value", "id"]))
+        requested: list[Any] = []
+        read_row_group = pq.ParquetFile.read_row_group
+
+        def spy(self: Any, index: int, columns: Any = None, **kwargs: Any) -> Any:
+            requested.append(columns)
+            return read_row_group(self, index, columns=columns, **kwargs)
+
+        monkeypatch.setattr(pq.ParquetFile, "read_row_group", spy)
+        stats = filter_file(source, tmp_path / "out.parquet", threshold=0.75)
+
+        assert requested == [["value"], ["id"], ["value"], ["id"], ["value"], ["id"]]
+        assert stats.columns == ("value", "id")
+        result = pq.read_table(tmp_path / "out.parquet")
+        assert result.column_names == ["value", "id"]
+        assert result.column("id").to_pylist() == [f"row-{i}" for i in range(75, 100)]
+
+    def test_arrow_to_csv(self, tmp_path: Path, table: Any) -> None:
+        """Test filtering an Arrow IPC file into CSV."""
+        source = write_arrow(tmp_path / "in.arrow", table)
+        stats = filter_file(source, tmp_path / "out.csv", threshold=0.98)
+
+        assert stats.rows_written == 2
+        with (tmp_path / "out.csv").open(newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        assert rows == [{"id": "row-98", "value": "0.98"}, {"id": "row-99", "value": "0.99"}]
+
+    def test_csv_to_parquet_preserves_text_columns(self, tmp_path: Path) -> None:
+        """Test that non-value CSV columns are read as strings."""
+        source = tmp_path / "in.csv"
+        source.write_text("id,value\n007,0.9\n008,0.1\n", encoding="utf-8")
+        filter_file(source, tmp_path / "out.parquet", threshold=0.5)
+
+        assert pq.read_table(tmp_path / "out.parquet").to_pylist() == [{"id": "007", "value": 0.9}]
+
+    def test_empty_result_keeps_schema(self, tmp_path: Path, table: Any) -> None:
+        """Test that an output with no rows still has the input schema."""
+        source = write_parquet(tmp_path / "in.parquet", table)
+        stats = filter_file(source, tmp_path / "out.parquet", threshold=1.0)
+
+        assert stats.rows_written == 0
+        assert pq.read_table(tmp_path / "out.parquet").schema.names == ["id", "value"]
+
+    def test_missing_value_column(self, tmp_path: Path) -> None:
+        """Test that a missing 'value' column raises KeyError."""
+        source = write_parquet(tmp_path / "in.parquet", pa.table({"id": ["a"]}))
+        with pytest.raises(KeyError, match="missing 'value' column"):
+            filter_file(source, tmp_path / "out.parquet")
+
+    def test_non_numeric_value_column(self, tmp_path: Path) -> None:
+        """Test that a string 'value' column raises TypeError."""
+        source = write_parquet(tmp_path / "in.parquet", pa.table({"value": ["a"]}))
+        with pytest.raises(TypeError, match="must be numeric"):
+            filter_file(source, tmp_path / "out.parquet")
+
+    def test_null_values(self, tmp_path: Path) -> None:
+        """Test that nulls in a decoded value column raise TypeError."""
+        source = write_arrow(tmp_path / "in.arrow", pa.table({"value": [0.9, None]}))
+        with pytest.raises(TypeError, match="null"):
+            filter_file(source, tmp_path / "out.arrow")
+        assert not (tmp_path / "out.arrow").exists()
+
+    def test_invalid_threshold(self, tmp_path: Path, table: Any) -> None:
+        """Test that out-of-range thresholds are rejected."""
+        source = write_parquet(tmp_path / "in.parquet", table)
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            filter_file(source, tmp_path / "out.parquet", threshold=1.5)
+
+
+class TestFilterManyColumnar:
+    """Tests for filter_many with columnar shards."""
+
+    def test_merges_parquet_shards_into_csv(self, tmp_path: Path, table: Any) -> None:
+        """Test merging Parquet shards into one CSV in input order."""
+        first = write_parquet(tmp_path / "a.parquet", table.slice(0, 50))
+        second = write_parquet(tmp_path / "b.parquet", table.slice(50))
+        stats = filter_many([second, first], tmp_path / "merged.csv", threshold=0.45)
+
+        assert stats.rows_written == 55
+        with (tmp_path / "merged.csv").open(newline="", encoding="utf-8") as handle:
+            ids = [row["id"] for row in csv.DictReader(handle)]
+        assert ids == [f"row-{i}" for i in range(45, 100)]
+
+    def test_merged_columnar_output_rejected(self, tmp_path: Path, table: Any) -> None:
+        """Test that merged mode requires a CSV output."""
+        source = write_parquet(tmp_path / "a.parquet", table)
+        with pytest.raises(ValueError, match="must be a CSV file"):
+            filter_many([source], tmp_path / "merged.parquet")
@@ -0,0 +1,163 @@
+"""Tests for compression module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from your_package_name.compression import (
+    BackgroundReader,
+    ParallelCompressWriter,
+    codec_for_path,
+    detect_compression,
+    open_input,
+    open_text_input,
+    write_output,
+)
+from your_package_name.streaming import filter_csv
+
+CSV_TEXT = "id,value\n" + "".join(f"{i},{i / 1000}\n" for i in range(1000))
+
+
+class TestDetection:
+    """Tests for detect_compression and codec_for_path functions."""
+
+    @pytest.mark.parametrize(
+        ("compress", "codec"),
+        [(gzip.compress, "gzip"), (bz2.compress, "bz2"), (lzma.compress, "xz")],
+    )
+    def test_magic_bytes(self, tmp_path: Path, compress: Callable[[bytes], bytes], codec: str) -> None:
+        """Test that compression is detected from content, not the file name."""
+        path = tmp_path / "mislabelled.csv"
+        path.write_bytes(compress(b"id,value\n"))
+        assert detect_compression(path) == codec
+
+    def test_uncompressed(self, tmp_path: Path) -> None:
+        """Test that plain and empty files are not reported as compressed."""
+        (tmp_path / "plain.csv").write_text(CSV_TEXT, encoding="utf-8")
+        (tmp_path / "empty.csv").write_bytes(b"")
+        assert detect_compression(tmp_path / "plain.csv") is None
+        assert detect_compression(tmp_path / "empty.csv") is None
+
+    def test_codec_for_path(self) -> None:
+        """Test that output compression is chosen by extension."""
+        assert codec_for_path("out.csv.GZ") == "gzip"
+        assert codec_for_path("out.csv.bz2") == "bz2"
+        assert codec_for_path("out.csv.xz") == "xz"
+        assert codec_for_path("out.csv") is None
+
+
+class TestBackgroundReader:
+    """Tests for BackgroundReader class."""
+
+    def test_reads_all_blocks(self) -> None:
+        """Test that small blocks and a small queue still deliver every byte."""
+        data = bytes(range(256)) * 100
+        with io.BufferedReader(BackgroundReader(io.BytesIO(data), block_size=7, queue_size=2)) as reader:
+            assert reader.read() == data
+
+    def test_source_error_is_raised(self, tmp_path: Path) -> None:
+        """Test that a decompression error surfaces in the consumer."""
+        path = tmp_path / "truncated.csv.gz"
+        path.write_bytes(gzip.compress(CSV_TEXT.encode())[:-20])
+        with open_input(path) as handle, pytest.raises(EOFError):
+            handle.read()
+
+    def test_close_before_eof(self) -> None:
+        """Test that closing early stops the reader thread."""
+        reader = BackgroundReader(io.BytesIO(b"x" * 10_000), block_size=1, queue_size=1)
+        reader.read(1)
+        reader.close()
+        assert reader.closed
+
+
+class TestParallelCompressWriter:
+    """Tests for ParallelCompressWriter class."""
+
+    def test_multi_member_gzip(self) -> None:
+        """Test that blocks become ordered gzip members that decompress as one stream."""
+        sink = io.BytesIO()
+        data = b"".join(f"{i}\n".encode() for i in range(10_000))
+        with ParallelCompressWriter(sink, "gzip", block_size=1000, workers=4) as writer:
+            writer.write(data)
+
+        compressed = sink.getvalue()
+        assert gzip.decompress(compressed) == data
+        assert compressed.count(b"\x1f\x8b\x08") >= len(data) // 1000
+
+    def test_empty_output_is_valid(self) -> None:
+        """Test that writing nothing still produces a valid compressed file."""
+        sink = io.BytesIO()
+        ParallelCompressWriter(sink, "xz", workers=1).close()
+        assert lzma.decompress(sink.getvalue()) == b""
+
+    def test_invalid_block_size(self) -> None:
+        """Test that a non-positive block size is rejected."""
+        with pytest.raises(ValueError, match="Block size must be positive"):
+            ParallelCompressWriter(io.BytesIO(), block_size=0)
+
+
+class TestWriteOutput:
+    """Tests for write_output and open_text_input functions."""
+
+    @pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+    def test_round_trip(self, tmp_path: Path, suffix: str) -> None:
+        """Test writing compressed text and reading it back."""
+        path = tmp_path / f"out.csv{suffix}"
+        with write_output(path, newline="") as handle:
+            handle.write(CSV_TEXT)
+
+        assert detect_compression(path) == codec_for_path(path)
+        with open_text_input(path) as handle:
+            assert handle.read() == CSV_TEXT
+
+    def test_error_leaves_no_file(self, tmp_path: Path) -> None:
+        """Test that a failed compressed write does not create the output."""
+        path = tmp_path / "out.csv.gz"
+        with pytest.raises(RuntimeError), write_output(path) as handle:
+            handle.write("partial")
+            raise RuntimeError("boom")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_uncompressed_passthrough(self, tmp_path: Path) -> None:
+        """Test that paths without a compression extension are written as is."""
+        path = tmp_path / "out.csv"
+        with write_output(path) as handle:
+            handle.write(CSV_TEXT)
+        assert path.read_text(encoding="utf-8") == CSV_TEXT
+
+
+class TestCompressedFilter:
+    """Tests for filtering compressed CSV files."""
+
+    def test_gzip_in_bz2_out(self, tmp_path: Path) -> None:
+        """Test filtering a gzipped input into a bzip2 output."""
+        source = tmp_path / "in.csv.gz"
+        source.write_bytes(gzip.compress(CSV_TEXT.encode()))
+        stats = filter_csv(source, tmp_path / "out.csv.bz2", threshold=0.9)
+
+        assert stats.rows_read == 1000
+        assert stats.rows_written == 100
+        lines = bz2.decompress((tmp_path / "out.csv.bz2").read_bytes()).decode().splitlines()
+        assert lines[0] == "id,value"
+        assert lines[1] == "900,0.9"
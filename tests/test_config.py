@@ -0,0 +1,248 @@
+"""Tests for config module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from your_package_name import config as config_module
+from your_package_name.config import ConfigLoader, ConfigSnapshot, ParsedFileCache, load_config
+
+
+class ProcessingConfig(BaseModel):
+    """Schema used for validation tests."""
+
+    batch_size: int
+    normalize: bool = False
+
+
+class AppConfig(BaseModel):
+    """Schema used for validation tests."""
+
+    processing: ProcessingConfig
+
+
+def write(path: Path, text: str) -> Path:
+    """Write a config file and return its path."""
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def touch_later(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is detectable."""
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def fail_parse(path: Path, raw: bytes) -> None:
+    """Stand-in parser that fails if a cached file is parsed again."""
+    raise AssertionError(f"{path} was parsed again")
+
+
+class TestLoadConfig:
+    """Tests for load_config function."""
+
+    def test_merges_layers_across_formats(self, tmp_path: Path) -> None:
+        """Test deep merging of TOML, JSON and YAML layers."""
+        base = write(
+            tmp_path / "config.toml",
+            "[processing]\nbatch_size = 100\nnormalize = true\n[api]\ntimeout = 30\n",
+        )
+        env = write(tmp_path / "config.prod.json", json.dumps({"processing": {"batch_size": 500}}))
+        local = write(tmp_path / "config.local.json", json.dumps({"api": {"timeout": 5}, "tags": ["a", "b"]}))
+
+        snapshot = load_config(base, env, local)
+
+        assert snapshot.get("processing.batch_size") == 500
+        assert snapshot.get("processing.normalize") is True
+        assert snapshot.get("api.timeout") == 5
+        assert snapshot["tags"] == ("a", "b")
+        assert snapshot.get("missing.key", "default") == "default"
+        assert snapshot.sources == (base, env, local)
+
+    def test_yaml_layer(self, tmp_path: Path) -> None:
+        """Test loading YAML when PyYAML is installed."""
+        pytest.importorskip("yaml")
+        snapshot = load_config(write(tmp_path / "config.yaml", "api:\n  timeout: 5\n"))
+        assert snapshot.get("api.timeout") == 5
+
+    def test_snapshot_is_immutable(self, tmp_path: Path) -> None:
+        """Test that snapshot data cannot be modified."""
+        snapshot = load_config(write(tmp_path / "c.json", '{"a": {"b": [1]}}'))
+        assert isinstance(snapshot.data, MappingProxyType)
+        with pytest.raises(TypeError):
+            snapshot.data["a"]["b"] = 2
+
+    def test_schema_validation(self, tmp_path: Path) -> None:
+        """Test validation with a Pydantic model."""
+        good = write(tmp_path / "good.json", '{"processing": {"batch_size": 10}}')
+        snapshot = load_config(good, schema=AppConfig)
+        assert isinstance(snapshot.model, AppConfig)
+        assert snapshot.model.processing.batch_size == 10
+
+        bad = write(tmp_path / "bad.json", '{"processing": {"batch_size": "many"}}')
+        with pytest.raises(ValueError, match="batch_size"):
+            load_config(bad, schema=AppConfig)
+
+    def test_unsupported_format_raises_error(self, tmp_path: Path) -> None:
+        """Test that unknown extensions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported config format"):
+            load_config(write(tmp_path / "config.ini", "[a]"))
+
+    def test_non_mapping_raises_error(self, tmp_path: Path) -> None:
+        """Test that a non-mapping top level is rejected."""
+        with pytest.raises(ValueError, match="mapping at the top level"):
+            load_config(write(tmp_path / "config.json", "[1, 2]"))
+
+    @pytest.mark.parametrize(
+        ("name", "text"),
+        [("config.json", "{not json"), ("config.toml", "a = [1,"), ("config.yaml", "a: [1,\n")],
+    )
+    def test_decode_errors_raise_value_error(self, tmp_path: Path, name: str, text: str) -> None:
+        """Test that syntax errors in every format are reported as ValueError with the path."""
+        if name.endswith(".yaml"):
+            pytest.importorskip("yaml")
+        with pytest.raises(ValueError, match=f"Cannot parse config file .*{name}"):
+            load_config(write(tmp_path / name, text))
+
+    def test_missing_file_raises_error(self, tmp_path: Path) -> None:
+        """Test that missing files raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_config(tmp_path / "missing.toml")
+
+
+class TestParsedFileCache:
+    """Tests for ParsedFileCache."""
+
+    def test_cache_hit_skips_parsing(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that unchanged files are served from the cache."""
+        path = write(tmp_path / "config.toml", "a = 1\n")
+        cache = ParsedFileCache(tmp_path / "cache")
+        assert cache.load(path) == {"a": 1}
+
+        monkeypatch.setattr("your_package_name.config._parse", fail_parse)
+        assert cache.load(path) == {"a": 1}
+
+    def test_touched_file_with_same_hash_is_not_reparsed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an mtime change with identical content reuses the parse."""
+        path = write(tmp_path / "config.toml", "a = 1\n")
+        cache = ParsedFileCache(tmp_path / "cache")
+        cache.load(path)
+
+        touch_later(path, "a = 1\n")
+        monkeypatch.setattr("your_package_name.config._parse", fail_parse)
+        assert cache.load(path) == {"a": 1}
+
+    def test_changed_file_is_reparsed(self, tmp_path: Path) -> None:
+        """Test that content changes invalidate the cache entry."""
+        path = write(tmp_path / "config.toml", "a = 1\n")
+        cache = ParsedFileCache(tmp_path / "cache")
+        cache.load(path)
+        touch_later(path, "a = 2\n")
+        assert cache.load(path) == {"a": 2}
+
+    @pytest.mark.parametrize("entry", ["[1, 2]", "{}", '{"mtime_ns": "1", "size": 6, "sha256": "x", "data": {}}'])
+    def test_malformed_entry_is_a_miss(self, tmp_path: Path, entry: str) -> None:
+        """Test that a malformed cache entry is re-parsed and rewritten instead of raising."""
+        path = write(tmp_path / "config.toml", "a = 1\n")
+        cache = ParsedFileCache(tmp_path / "cache")
+        cache.load(path)
+        (entry_path,) = (tmp_path / "cache").glob("*.json")
+        entry_path.write_text(entry)
+        assert cache.load(path) == {"a": 1}
+        assert json.loads(entry_path.read_text())["data"] == {"a": 1}
+
+    def test_non_json_values_are_not_cached(self, tmp_path: Path) -> None:
+        """Test that parse results with datetimes are returned but not cached."""
+        path = write(tmp_path / "config.toml", "when = 2026-01-01T00:00:00\n")
+        cache = ParsedFileCache(tmp_path / "cache")
+        assert "when" in cache.load(path)
+        assert not list((tmp_path / "cache").glob("*.json"))
+
+
+class TestConfigLoader:
+    """Tests for ConfigLoader."""
+
+    def test_hot_reload(self, tmp_path: Path) -> None:
+        """Test that file changes are picked up on the next poll."""
+        path = write(tmp_path / "config.json", '{"a": 1}')
+        loader = ConfigLoader([path], poll_interval=0)
+        assert loader.snapshot.get("a") == 1
+        assert loader.snapshot.version == 1
+        assert not loader.poll()
+
+        touch_later(path, '{"a": 2}')
+        assert loader.snapshot.get("a") == 2
+        assert loader.snapshot.version == 2
+
+    def test_poll_interval_limits_checks(self, tmp_path: Path) -> None:
+        """Test that reads between polls do not stat the files."""
+        path = write(tmp_path / "config.json", '{"a": 1}')
+        loader = ConfigLoader([path], poll_interval=3600)
+        touch_later(path, '{"a": 2}')
+        assert loader.snapshot.get("a") == 1
+        assert loader.poll()
+        assert loader.snapshot.get("a") == 2
+
+    def test_failed_reload_keeps_previous_snapshot(self, tmp_path: Path) -> None:
+        """Test that a broken edit does not replace a good snapshot."""
+        path = write(tmp_path / "config.json", '{"processing": {"batch_size": 1}}')
+        loader = ConfigLoader([path], schema=AppConfig, poll_interval=0)
+
+        touch_later(path, '{"processing": {"batch_size": "x"}}')
+        assert not loader.poll()
+        assert loader.snapshot.get("processing.batch_size") == 1
+
+        touch_later(path, "{not json")
+        assert not loader.poll()
+        assert loader.snapshot.version == 1
+
+    def test_failed_reload_is_retried(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a reload that failed is retried even if the files did not change again."""
+        path = write(tmp_path / "config.json", '{"a": 1}')
+        loader = ConfigLoader([path], poll_interval=0)
+        build = config_module._build_snapshot
+
+        def fail_once(*args: Any) -> ConfigSnapshot:
+            monkeypatch.setattr(config_module, "_build_snapshot", build)
+            raise OSError("transient")
+
+        monkeypatch.setattr(config_module, "_build_snapshot", fail_once)
+        touch_later(path, '{"a": 2}')
+        assert not loader.poll()
+        assert loader.poll()
+        assert loader.snapshot.get("a") == 2
+
+    def test_default_cache_dir(self, tmp_path: Path) -> None:
+        """Test that the parsed-form cache defaults to a .cache directory."""
+        path = write(tmp_path / "config.toml", "a = 1\n")
+        ConfigLoader([path])
+        assert list((tmp_path / ".cache").glob("*.json"))
+
+    def test_invalid_arguments(self, tmp_path: Path) -> None:
+        """Test argument validation."""
+        with pytest.raises(ValueError, match="At least one"):
+            ConfigLoader([])
+        with pytest.raises(ValueError, match="non-negative"):
+            ConfigLoader([write(tmp_path / "c.json", "{}")], poll_interval=-1)
@@ -0,0 +1,177 @@
+"""Tests for the template customization script.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import shutil
+import stat
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests.test_example_script import load_module
+
+CUSTOMIZE = load_module("scripts/customize_template.py", "customize_template")
+
+CONFIG = {
+    "package_name": "my-lib",
+    "module_name": "my_lib",
+    "author_name": "Ada Lovelace",
+    "author_email": "ada@example.org",
+    "github_user": "ada",
+    "description": "Numbers, engines",
+}
+
+
+def make_template(root: Path) -> Path:
+    """Create a small template tree with placeholders inside and outside the customized files."""
+    files = {
+        "README.md": "# your-package-name\n\nBy Your Name <your.email@example.com>\n",
+        "pyproject.toml": 'name = "your-package-name"\n',
+        "src/your_package_name/__init__.py": '"""A modern Python library template."""\n',
+        "tests/test_core.py": "from your_package_name import core\n",
+        "docs/api/core.md": "::: your_package_name.core\n",
+        "docs/notes.txt": "your_package_name stays\n",
+        "scripts/run.py": "import your_package_name\n",
+        "scripts/customize_template.py": 'REPLACEMENTS = {"your_package_name": "..."}\n',
+        "scripts/notes.txt": "your_package_name stays\n",
+        "Makefile": "test:\n\tpytest --cov=your_package_name\n",
+        "build/out.py": "your_package_name\n",
+        ".gitignore": "/build/\n",
+    }
+    for name, text in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+    return root
+
+
+class TestReplacer:
+    """Tests for Replacer class."""
+
+    def test_single_pass(self) -> None:
+        """Test that a replacement is never rewritten by another placeholder."""
+        assert CUSTOMIZE.Replacer({"a": "b", "b": "c"}).apply(b"ab") == b"bc"
+
+    def test_longest_placeholder_wins(self) -> None:
+        """Test that overlapping placeholders prefer the longer match."""
+        replacer = CUSTOMIZE.Replacer({"your": "X", "your_package_name": "pkg"})
+        assert replacer.apply(b"your_package_name your") == b"pkg X"
+
+    def test_unmatched_data_is_returned_unchanged(self) -> None:
+        """Test that data without placeholders, including invalid UTF-8, is passed through."""
+        data = b"\xff\xfe binary"
+        assert CUSTOMIZE.Replacer({"your": "X"}).apply(data) is data
+        assert CUSTOMIZE.Replacer({}).apply(b"your") == b"your"
+
+    def test_bytes_around_matches_are_preserved(self) -> None:
+        """Test that non-UTF-8 bytes next to a placeholder survive replacement."""
+        assert CUSTOMIZE.Replacer({"Your Name": "Zoë"}).apply(b"\xff Your Name\r\n") == b"\xff Zo\xc3\xab\r\n"
+
+
+class TestListFiles:
+    """Tests for list_files function."""
+
+    def test_walk_respects_gitignore(self, tmp_path: Path) -> None:
+        """Test that outside git the root .gitignore patterns are skipped."""
+        make_template(tmp_path)
+        (tmp_path / ".gitignore").write_text("/build/\n*.txt\n# comment\n")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text("")
+        files = {path.as_posix() for path in CUSTOMIZE.list_files(tmp_path)}
+        assert "README.md" in files and "src/your_package_name/__init__.py" in files
+        assert not {"build/out.py", "docs/notes.txt", ".git/config"} & files
+
+    def test_git_listing(self, tmp_path: Path) -> None:
+        """Test that inside a git work tree untracked ignored files are left out."""
+        git = shutil.which("git")
+        if git is None:
+            pytest.skip("git is not installed")
+        make_template(tmp_path)
+        subprocess.run([git, "init", "-q"], cwd=tmp_path, check=True)  # noqa: S603
+        (tmp_path / "docs" / ".gitignore").write_text("*.txt\n")
+        files = {path.as_posix() for path in CUSTOMIZE.list_files(tmp_path)}
+        assert "tests/test_core.py" in files
+        assert not {"build/out.py", "docs/notes.txt"} & files
+
+
+class TestReplaceInFiles:
+    """Tests for replace_in_files function."""
+
+    def test_rewrites_atomically_keeping_mode(self, tmp_path: Path) -> None:
+        """Test that changed files are replaced with their permissions kept and no temporary files left."""
+        script = tmp_path / "run.sh"
+        script.write_text("echo your_package_name\n")
+        script.chmod(0o755)
+        untouched = tmp_path / "other.txt"
+        untouched.write_text("nothing here\n")
+        mtime = untouched.stat().st_mtime_ns
+
+        changes = CUSTOMIZE.replace_in_files(
+            [script, untouched], CUSTOMIZE.Replacer({"your_package_name": "my_lib"}), jobs=2
+        )
+        assert [change.path for change in changes] == [script]
+        assert script.read_text() == "echo my_lib\n"
+        assert stat.S_IMODE(script.stat().st_mode) == 0o755
+        assert untouched.stat().st_mtime_ns == mtime
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["other.txt", "run.sh"]
+
+    def test_dry_run_writes_nothing(self, tmp_path: Path) -> None:
+        """Test that a dry run returns a diff and leaves the file alone."""
+        path = tmp_path / "README.md"
+        path.write_text("# your-package-name\n")
+        (change,) = CUSTOMIZE.replace_in_files(
+            [path], CUSTOMIZE.Replacer({"your-package-name": "my-lib"}), dry_run=True
+        )
+        assert path.read_text() == "# your-package-name\n"
+        assert "-# your-package-name\n+# my-lib\n" in change.diff()
+
+
+class TestCustomizeTemplate:
+    """Tests for customize_template function."""
+
+    def test_customizes_template_files(self, tmp_path: Path) -> None:
+        """Test that template files are rewritten, others kept, and the package renamed."""
+        make_template(tmp_path)
+        CUSTOMIZE.customize_template(CONFIG, root=tmp_path)
+        assert (tmp_path / "README.md").read_text() == "# my-lib\n\nBy Ada Lovelace <ada@example.org>\n"
+        assert (tmp_path / "src" / "my_lib" / "__init__.py").read_text() == '"""Numbers, engines."""\n'
+        assert not (tmp_path / "src" / "your_package_name").exists()
+        assert (tmp_path / "tests" / "test_core.py").read_text() == "from my_lib import core\n"
+        assert (tmp_path / "docs" / "api" / "core.md").read_text() == "::: my_lib.core\n"
+        assert (tmp_path / "scripts" / "run.py").read_text() == "import my_lib\n"
+        assert (tmp_path / "Makefile").read_text() == "test:\n\tpytest --cov=my_lib\n"
+        for unchanged in ("docs/notes.txt", "scripts/notes.txt", "scripts/customize_template.py", "build/out.py"):
+            assert "your_package_name" in (tmp_path / unchanged).read_text()
+
+    def test_dry_run_prints_diff(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that a dry run prints the changes and leaves the tree as it was."""
+        make_template(tmp_path)
+        before = {path: path.read_bytes() for path in tmp_path.rglob("*") if path.is_file()}
+        changes = CUSTOMIZE.customize_template(CONFIG, root=tmp_path, dry_run=True)
+        assert len(changes) == 7
+        assert {path: path.read_bytes() for path in tmp_path.rglob("*") if path.is_file()} == before
+        output = capsys.readouterr().out
+        assert "+from my_lib import core" in output and "Would rename" in output
+
+
+class TestReplaceInFile:
+    """Tests for replace_in_file function."""
+
+    def test_missing_file_is_ignored(self, tmp_path: Path) -> None:
+        """Test that a missing file is skipped silently."""
+        CUSTOMIZE.replace_in_file(tmp_path / "missing.md", {"a": "b"})
+        assert not any(tmp_path.iterdir())
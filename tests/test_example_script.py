@@ -0,0 +1,206 @@
+"""Tests for the example data processing script.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import importlib.util
+import os
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_module(relative_path: str, module_name: str) -> ModuleType:
+    """Load a script module directly from a repository path."""
+    module_path = REPO_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    assert spec is not None
+    assert spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+EXAMPLE_SCRIPT = load_module("scripts/example_script.py", "example_script")
+
+
+def write_values(path: Path, values: list[float]) -> Path:
+    """Write a CSV with id and value columns."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "value"])
+        writer.writerows([i, value] for i, value in enumerate(values))
+    return path
+
+
+def read_values(path: Path) -> list[float]:
+    """Read the value column of a CSV file."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [float(row["value"]) for row in csv.DictReader(handle)]
+
+
+class TestProcessFile:
+    """Tests for process_file function."""
+
+    def test_filters_input_into_output(self, tmp_path: Path) -> None:
+        """Test that rows below the threshold are dropped."""
+        source = write_values(tmp_path / "raw" / "input.csv", [0.1, 0.5, 0.9, 0.3])
+        output = tmp_path / "processed" / "nested" / "output.csv"
+
+        EXAMPLE_SCRIPT.process_file(source, output, threshold=0.5, chunk_size=2)
+
+        assert read_values(output) == [0.5, 0.9]
+
+    def test_missing_input_raises_error(self, tmp_path: Path) -> None:
+        """Test that a missing input raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Input file not found"):
+            EXAMPLE_SCRIPT.process_file(tmp_path / "missing.csv", tmp_path / "out.csv")
+
+    def test_invalid_threshold_raises_error(self, tmp_path: Path) -> None:
+        """Test that an out-of-range threshold raises ValueError."""
+        source = write_values(tmp_path / "input.csv", [0.5])
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            EXAMPLE_SCRIPT.process_file(source, tmp_path / "out.csv", threshold=2.0)
+
+    def test_rerun_skips_until_forced(self, tmp_path: Path) -> None:
+        """Test that an unchanged input is skipped unless force is set."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9])
+        output = tmp_path / "processed" / "output.csv"
+        EXAMPLE_SCRIPT.process_file(source, output)
+
+        # Same size and mtime: the manifest trusts the output without rereading it.
+        stat = output.stat()
+        output.write_bytes(output.read_bytes().replace(b"0.9", b"0.8"))
+        os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        EXAMPLE_SCRIPT.process_file(source, output)
+        assert read_values(output) == [0.8]
+
+        EXAMPLE_SCRIPT.process_file(source, output, force=True)
+        assert read_values(output) == [0.9]
+
+    def test_collects_metrics(self, tmp_path: Path) -> None:
+        """Test that metrics passed in receive the run's row counts."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9, 0.7])
+        metrics = EXAMPLE_SCRIPT.PipelineMetrics()
+        EXAMPLE_SCRIPT.process_file(source, tmp_path / "output.csv", metrics=metrics)
+        assert (metrics.rows_in, metrics.rows_out) == (3, 2)
+
+    def test_validation_failure_writes_nothing(self, tmp_path: Path) -> None:
+        """Test that an input failing validation produces no output."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9, 0.7])
+        spec = EXAMPLE_SCRIPT.ValidationSpec.from_mapping({"max_rows": 2})
+        with pytest.raises(ValueError, match="More than 2"):
+            EXAMPLE_SCRIPT.process_file(source, tmp_path / "output.csv", validation=spec)
+        assert not (tmp_path / "output.csv").exists()
+
+    def test_ledger_records_and_verifies(self, tmp_path: Path) -> None:
+        """Test that a recorded ledger verifies until the output loses rows."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9, 0.7])
+        output = tmp_path / "out" / "output.csv"
+        location = EXAMPLE_SCRIPT.ledger_path(output)
+        EXAMPLE_SCRIPT.process_file(source, output, ledger=EXAMPLE_SCRIPT.ReadLedger.load(location))
+        assert EXAMPLE_SCRIPT.verify_ledger(location, deep=True)
+        output.write_text(output.read_text().splitlines()[0] + "\n")
+        assert not EXAMPLE_SCRIPT.verify_ledger(location)
+
+    def test_jobs_split_single_input(self, tmp_path: Path) -> None:
+        """Test that several jobs on one CSV give the same output as one."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9, 0.5, 0.3, 0.7])
+        EXAMPLE_SCRIPT.process_file(source, tmp_path / "one.csv")
+        EXAMPLE_SCRIPT.process_file(source, tmp_path / "many.csv", jobs=2)
+        assert (tmp_path / "many.csv").read_bytes() == (tmp_path / "one.csv").read_bytes()
+
+    def test_pipelined_reader(self, tmp_path: Path) -> None:
+        """Test that the pipelined reader gives the same output as the default one."""
+        source = write_values(tmp_path / "input.csv", [0.1, 0.9, 0.5, 0.3, 0.7])
+        EXAMPLE_SCRIPT.process_file(source, tmp_path / "one.csv")
+        EXAMPLE_SCRIPT.process_file(source, tmp_path / "pipelined.csv", chunk_size=2, reader="pipelined")
+        assert (tmp_path / "pipelined.csv").read_bytes() == (tmp_path / "one.csv").read_bytes()
+
+
+class TestProcessFiles:
+    """Tests for process_files function."""
+
+    def test_merges_shards(self, tmp_path: Path) -> None:
+        """Test processing several shards into one merged output."""
+        shards = [
+            write_values(tmp_path / "raw" / "a.csv", [0.9, 0.1]),
+            write_values(tmp_path / "raw" / "b.csv", [0.2, 0.8, 0.7]),
+        ]
+        output = tmp_path / "processed" / "merged.csv"
+
+        EXAMPLE_SCRIPT.process_files(shards, output, threshold=0.5, jobs=2)
+
+        assert read_values(output) == [0.9, 0.8, 0.7]
+
+    def test_invalid_threshold_raises_error(self, tmp_path: Path) -> None:
+        """Test that an out-of-range threshold raises ValueError."""
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            EXAMPLE_SCRIPT.process_files([], tmp_path / "out.csv", threshold=-1.0)
+
+
+class TestProcessPartitioned:
+    """Tests for process_partitioned function."""
+
+    def test_partitioned_output(self, tmp_path: Path) -> None:
+        """Test that kept rows are split into one directory per partition value."""
+        source = tmp_path / "input.csv"
+        source.write_text("region,value\neu,0.9\nus,0.1\nus,0.7\n")
+        output = tmp_path / "processed" / "events"
+        EXAMPLE_SCRIPT.process_partitioned([source], output, ["region"], threshold=0.5)
+        assert (output / "region=eu" / "part-00000.csv").read_text().splitlines() == ["value", "0.9"]
+        assert (output / "region=us" / "part-00000.csv").read_text().splitlines() == ["value", "0.7"]
+
+    def test_existing_directory_needs_force(self, tmp_path: Path) -> None:
+        """Test that a directory not written by a partitioned run is only replaced with force."""
+        source = tmp_path / "input.csv"
+        source.write_text("region,value\neu,0.9\n")
+        output = tmp_path / "events"
+        (output / "notes.txt").parent.mkdir()
+        (output / "notes.txt").write_text("keep\n")
+        with pytest.raises(FileExistsError):
+            EXAMPLE_SCRIPT.process_partitioned([source], output, ["region"])
+        assert (output / "notes.txt").exists()
+        EXAMPLE_SCRIPT.process_partitioned([source], output, ["region"], force=True)
+        assert not (output / "notes.txt").exists()
+
+
+class TestParseArgs:
+    """Tests for parse_args function."""
+
+    def test_resume_rejects_several_inputs(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that --resume with more than one input is a usage error."""
+        with pytest.raises(SystemExit):
+            EXAMPLE_SCRIPT.parse_args(["--input", "a.csv", "b.csv", "--output", "out.csv", "--resume"])
+        assert "--resume takes a single input file" in capsys.readouterr().err
+
+    def test_resume_rejects_expanded_inputs(self, tmp_path: Path) -> None:
+        """Test that --resume is rejected when one input argument expands to several files."""
+        write_values(tmp_path / "raw" / "a.csv", [0.9])
+        write_values(tmp_path / "raw" / "b.csv", [0.8])
+        args = EXAMPLE_SCRIPT.parse_args(
+            ["--input", str(tmp_path / "raw"), "--output", str(tmp_path / "out.csv"), "--resume"]
+        )
+        with pytest.raises(ValueError, match="--resume takes a single input file, got 2"):
+            EXAMPLE_SCRIPT._process(args)
+        assert not (tmp_path / "out.csv").exists()
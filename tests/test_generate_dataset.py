@@ -0,0 +1,147 @@
+"""Tests for the synthetic dataset generator script.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.test_example_script import load_module
+
+GENERATE = load_module("scripts/generate_dataset.py", "generate_dataset")
+# Worker processes unpickle write_shard by module name.
+sys.modules.setdefault("generate_dataset", GENERATE)
+
+
+def read_rows(path: Path) -> list[dict[str, str]]:
+    """Read a generated CSV shard."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+class TestDatasetSpec:
+    """Tests for DatasetSpec class."""
+
+    def test_shards_cover_all_rows(self) -> None:
+        """Test that shard id ranges are contiguous and add up to the row count."""
+        spec = GENERATE.DatasetSpec(rows=10, shards=3)
+        assert [list(spec.shard_rows(shard)) for shard in range(3)] == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+    def test_columns(self) -> None:
+        """Test that extra columns cycle through the integer, float and category kinds."""
+        spec = GENERATE.DatasetSpec(rows=1, extra_columns=4)
+        assert spec.columns == ["id", "value", "int_0", "float_1", "category_2", "int_3"]
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"rows": -1},
+            {"shards": 0},
+            {"null_rate": 1.5},
+            {"duplicate_rate": -0.1},
+            {"alpha": 0},
+            {"distribution": "x"},
+        ],
+    )
+    def test_invalid_spec_raises_error(self, options: dict[str, object]) -> None:
+        """Test that out-of-range settings are rejected."""
+        with pytest.raises(ValueError):
+            GENERATE.DatasetSpec(**{"rows": 10, **options})
+
+
+class TestGenerateRows:
+    """Tests for generate_rows function."""
+
+    @pytest.mark.parametrize("distribution", ["uniform", "beta", "pareto"])
+    def test_value_ranges(self, distribution: str) -> None:
+        """Test that values fall in the support of each distribution."""
+        spec = GENERATE.DatasetSpec(rows=2000, distribution=distribution)
+        values = [row[1] for row in GENERATE.generate_rows(spec, 0)]
+        assert min(values) >= 0
+        if distribution == "pareto":
+            assert max(values) > 1
+        else:
+            assert max(values) <= 1
+
+    def test_null_and_duplicate_rates(self) -> None:
+        """Test that nulls and repeated rows appear at roughly the requested rates."""
+        spec = GENERATE.DatasetSpec(rows=20_000, extra_columns=3, null_rate=0.1, duplicate_rate=0.2)
+        rows = list(GENERATE.generate_rows(spec, 0))
+        cells = [cell for row in rows for cell in row[2:]]
+        assert 0.08 < cells.count(None) / len(cells) < 0.12
+        duplicates = len(rows) - len({row[0] for row in rows})
+        assert 0.17 < duplicates / len(rows) < 0.23
+        assert all(row[1] is not None for row in rows)
+
+    def test_shards_differ(self) -> None:
+        """Test that each shard draws its own values."""
+        spec = GENERATE.DatasetSpec(rows=200, shards=2)
+        first, second = (list(GENERATE.generate_rows(spec, shard)) for shard in range(2))
+        assert [row[1] for row in first] != [row[1] for row in second]
+
+
+class TestGenerateDataset:
+    """Tests for generate_dataset function."""
+
+    def test_reproducible_across_runs_and_jobs(self, tmp_path: Path) -> None:
+        """Test that the same seed gives identical shards whatever the job count."""
+        spec = GENERATE.DatasetSpec(rows=3000, shards=3, extra_columns=3, null_rate=0.05, duplicate_rate=0.05)
+        serial = GENERATE.generate_dataset(spec, tmp_path / "serial", jobs=1)
+        parallel = GENERATE.generate_dataset(spec, tmp_path / "parallel", jobs=3)
+        assert [path.name for path in serial] == [f"synthetic-0000{i}-of-00003.csv" for i in range(3)]
+        assert [path.read_bytes() for path in serial] == [path.read_bytes() for path in parallel]
+        reseeded = GENERATE.generate_dataset(
+            GENERATE.DatasetSpec(rows=3000, shards=3, seed=1), tmp_path / "reseeded", jobs=1
+        )
+        assert reseeded[0].read_bytes() != serial[0].read_bytes()
+
+    def test_csv_nulls_are_empty_fields(self, tmp_path: Path) -> None:
+        """Test that CSV shards have a header, every row and empty null cells."""
+        spec = GENERATE.DatasetSpec(rows=500, extra_columns=2, null_rate=0.5)
+        (path,) = GENERATE.generate_dataset(spec, tmp_path)
+        rows = read_rows(path)
+        assert len(rows) == 500 and list(rows[0]) == spec.columns
+        assert any(row["int_0"] == "" for row in rows)
+
+    def test_jsonl(self, tmp_path: Path) -> None:
+        """Test that JSON Lines shards hold one object per row with JSON nulls."""
+        spec = GENERATE.DatasetSpec(rows=100, extra_columns=1, null_rate=1.0)
+        (path,) = GENERATE.generate_dataset(spec, tmp_path, output_format="jsonl")
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 100 and records[0]["int_0"] is None
+        assert [record["id"] for record in records] == list(range(100))
+
+    def test_arrow(self, tmp_path: Path) -> None:
+        """Test that Arrow IPC shards are typed and readable."""
+        pa_ipc = pytest.importorskip("pyarrow.ipc")
+        spec = GENERATE.DatasetSpec(rows=25_000, extra_columns=3, null_rate=0.1)
+        (path,) = GENERATE.generate_dataset(spec, tmp_path, output_format="arrow")
+        table = pa_ipc.open_file(path).read_all()
+        assert table.num_rows == 25_000
+        assert [str(field.type) for field in table.schema] == ["int64", "double", "int64", "double", "string"]
+
+    def test_output_feeds_example_script(self, tmp_path: Path) -> None:
+        """Test that a generated shard can be filtered by the example script."""
+        example = load_module("scripts/example_script.py", "example_script")
+        spec = GENERATE.DatasetSpec(rows=1000, extra_columns=2, null_rate=0.1, distribution="beta")
+        (path,) = GENERATE.generate_dataset(spec, tmp_path / "raw")
+        example.process_file(path, tmp_path / "processed" / "out.csv", threshold=0.5)
+        kept = read_rows(tmp_path / "processed" / "out.csv")
+        assert kept == [row for row in read_rows(path) if float(row["value"]) >= 0.5]
@@ -0,0 +1,176 @@
+"""Tests for journal module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from your_package_name.core import ExampleClass
+from your_package_name.journal import IncrementJournal
+
+
+class TestIncrementJournal:
+    """Tests for IncrementJournal."""
+
+    def test_operations_survive_reopen(self, tmp_path: Path) -> None:
+        """Test that logged operations are recovered after reopening."""
+        with IncrementJournal(tmp_path) as journal:
+            journal.create("a", 1.0, metadata={"unit": "req"})
+            journal.create("b")
+            journal.increment("a", 4.0)
+            journal.increment("b")
+            journal.reset("b")
+
+        with IncrementJournal(tmp_path) as journal:
+            assert len(journal) == 2
+            assert journal.get("a") == ExampleClass("a", 5.0)
+            assert journal.get("a").metadata == {"unit": "req"}
+            assert journal.get("b").value == 0.0
+
+    def test_recovery_without_close(self, tmp_path: Path) -> None:
+        """Test that acknowledged operations are durable without a clean close."""
+        journal = IncrementJournal(tmp_path, commit_interval=0)
+        journal.create("a")
+        journal.increment("a", 2.0)
+
+        recovered = IncrementJournal(tmp_path)
+        assert recovered.get("a").value == 2.0
+        recovered.close()
+        journal.close()
+
+    def test_invalid_operations_are_not_logged(self, tmp_path: Path) -> None:
+        """Test that rejected operations leave no trace in the log."""
+        with IncrementJournal(tmp_path) as journal:
+            journal.create("a", 1.0)
+            with pytest.raises(ValueError, match="non-negative"):
+                journal.increment("a", -1.0)
+            with pytest.raises(KeyError, match="Unknown counter"):
+                journal.increment("missing")
+            with pytest.raises(ValueError, match="already exists"):
+                journal.create("a")
+            with pytest.raises(TypeError):
+                journal.create("bad", metadata={"x": object()})
+            assert "bad" not in journal
+
+        with IncrementJournal(tmp_path) as journal:
+            assert len(journal) == 1
+            assert journal.get("a").value == 1.0
+
+    def test_snapshot_compacts_logs(self, tmp_path: Path) -> None:
+        """Test that a snapshot replaces older logs and is used for recovery."""
+        with IncrementJournal(tmp_path, snapshot_every=0) as journal:
+            journal.create("a")
+            for _ in range(10):
+                journal.increment("a", wait=False)
+            journal.snapshot()
+            journal.increment("a", 5.0)
+
+        names = sorted(path.name for path in tmp_path.iterdir())
+        assert names == ["journal-0000000001.log", "snapshot-0000000001.excb"]
+
+        with IncrementJournal(tmp_path) as journal:
+            assert journal.get("a").value == 15.0
+
+    def test_automatic_snapshot(self, tmp_path: Path) -> None:
+        """Test that snapshots are taken after snapshot_every operations."""
+        with IncrementJournal(tmp_path, snapshot_every=5) as journal:
+            journal.create("a")
+            for _ in range(10):
+                journal.increment("a")
+
+        assert list(tmp_path.glob("snapshot-*.excb"))
+        with IncrementJournal(tmp_path) as journal:
+            assert journal.get("a").value == 10.0
+
+    def test_torn_tail_is_truncated(self, tmp_path: Path) -> None:
+        """Test that a partially written last record is discarded."""
+        with IncrementJournal(tmp_path) as journal:
+            journal.create("a")
+            journal.increment("a", 3.0)
+
+        log_path = tmp_path / "journal-0000000000.log"
+        intact_size = log_path.stat().st_size
+        with log_path.open("ab") as handle:
+            handle.write(b"\x20\x00\x00\x00garbage")
+
+        with IncrementJournal(tmp_path) as journal:
+            assert journal.get("a").value == 3.0
+        assert log_path.stat().st_size == intact_size
+
+    def test_concurrent_increments(self, tmp_path: Path) -> None:
+        """Test that concurrent writers are batched without losing updates."""
+        with IncrementJournal(tmp_path, commit_interval=0.001) as journal:
+            journal.create("a")
+
+            def worker() -> None:
+                for _ in range(50):
+                    journal.increment("a")
+
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with IncrementJournal(tmp_path) as journal:
+            assert journal.get("a").value == 400.0
+
+    def test_snapshot_during_concurrent_writes(self, tmp_path: Path) -> None:
+        """Test that operations racing a snapshot are recovered exactly once."""
+        with IncrementJournal(tmp_path, commit_interval=0) as journal:
+            journal.create("a")
+            running = threading.Event()
+
+            def worker(index: int) -> None:
+                running.set()
+                for step in range(20000):
+                    journal.increment("a", wait=False)
+                    if step % 100 == 0:
+                        journal.create(f"c-{index}-{step}", wait=False)
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+            for thread in threads:
+                thread.start()
+            running.wait()
+            while any(thread.is_alive() for thread in threads):
+                journal.snapshot()
+            for thread in threads:
+                thread.join()
+            expected = {
+                name: journal.get(name).value
+                for name in ["a", *(f"c-{i}-{s}" for i in range(4) for s in range(0, 20000, 100))]
+            }
+
+        with IncrementJournal(tmp_path) as journal:
+            assert len(journal) == len(expected)
+            assert {name: journal.get(name).value for name in expected} == expected
+            assert journal.get("a").value == 80000.0
+
+    def test_closed_journal_rejects_operations(self, tmp_path: Path) -> None:
+        """Test that operations after close raise RuntimeError."""
+        journal = IncrementJournal(tmp_path)
+        journal.create("a")
+        journal.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            journal.increment("a")
+
+    def test_negative_commit_interval_raises_error(self, tmp_path: Path) -> None:
+        """Test that a negative latency window is rejected."""
+        with pytest.raises(ValueError, match="non-negative"):
+            IncrementJournal(tmp_path, commit_interval=-1)
@@ -0,0 +1,208 @@
+"""Tests for ledger module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+
+from your_package_name.batch import filter_incremental
+from your_package_name.ledger import (
+    LEDGER_NAME,
+    ChunkHasher,
+    ReadLedger,
+    count_csv_rows,
+    hash_chunks,
+    merkle_root,
+)
+from your_package_name.streaming import filter_csv
+
+CSV_DATA = b"id,value\n" + b"".join(b"%d,%.1f\n" % (row, (row % 10) / 10) for row in range(100))
+
+
+def leaf(data: bytes) -> str:
+    """Return the leaf hash of one chunk."""
+    return hashlib.sha256(b"\x00" + data).hexdigest()
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Write a CSV with 100 rows, half of them at or above 0.5."""
+    path = tmp_path / "raw" / "input.csv"
+    path.parent.mkdir()
+    path.write_bytes(CSV_DATA)
+    return path
+
+
+class TestChunkHasher:
+    """Tests for ChunkHasher class."""
+
+    def test_hashes_fixed_size_chunks(self) -> None:
+        """Test that reads of any size are hashed in chunk_size blocks."""
+        hasher = ChunkHasher(io.BytesIO(b"abcdefghij"), chunk_size=4)
+        assert hasher.read(3) == b"abc"
+        assert hasher.read(100) == b"defghij"
+        assert not hasher.digest.complete
+        assert hasher.read(100) == b""
+        assert hasher.digest.complete
+        assert hasher.digest.bytes_read == 10
+        assert hasher.digest.chunks == [leaf(b"abcd"), leaf(b"efgh"), leaf(b"ij")]
+
+    def test_empty_input_has_one_chunk(self) -> None:
+        """Test that an empty stream still has a root."""
+        digest = ChunkHasher(io.BytesIO(b""), chunk_size=4)
+        assert digest.read() == b""
+        assert digest.digest.chunks == [leaf(b"")]
+
+    def test_invalid_chunk_size_raises_error(self) -> None:
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError, match="Chunk size"):
+            ChunkHasher(io.BytesIO(b""), chunk_size=0)
+
+
+class TestMerkleRoot:
+    """Tests for merkle_root function."""
+
+    def test_single_leaf_is_root(self) -> None:
+        """Test that one chunk is its own root."""
+        assert merkle_root([leaf(b"a")]) == leaf(b"a")
+
+    def test_root_depends_on_order(self) -> None:
+        """Test that swapping chunks changes the root."""
+        chunks = [leaf(b"a"), leaf(b"b"), leaf(b"c")]
+        assert merkle_root(chunks) != merkle_root(chunks[::-1])
+
+    def test_odd_leaf_is_promoted(self) -> None:
+        """Test the root of three leaves."""
+        a, b, c = (bytes.fromhex(leaf(data)) for data in (b"a", b"b", b"c"))
+        expected = hashlib.sha256(b"\x01" + hashlib.sha256(b"\x01" + a + b).digest() + c).hexdigest()
+        assert merkle_root([leaf(b"a"), leaf(b"b"), leaf(b"c")]) == expected
+
+
+class TestFilterDigest:
+    """Tests for read hashing in filter_csv."""
+
+    def test_digest_covers_whole_input(self, source: Path, tmp_path: Path) -> None:
+        """Test that the digest matches hashing the file directly."""
+        stats = filter_csv(source, tmp_path / "output.csv", hash_chunk_size=64)
+        digest = stats.digests[str(source.resolve())]
+        assert digest.complete
+        assert digest.bytes_read == len(CSV_DATA)
+        assert (digest.rows_read, digest.rows_written) == (100, 50)
+        assert digest.chunks == hash_chunks(source, 64).chunks
+
+    def test_compressed_input_hashes_decompressed_bytes(self, tmp_path: Path) -> None:
+        """Test that a gzip input is hashed after decompression."""
+        path = tmp_path / "input.csv.gz"
+        path.write_bytes(gzip.compress(CSV_DATA))
+        stats = filter_csv(path, tmp_path / "output.csv", hash_chunk_size=64)
+        assert stats.digests[str(path.resolve())].bytes_read == len(CSV_DATA)
+
+
+class TestReadLedger:
+    """Tests for ReadLedger class."""
+
+    def run(self, source: Path, tmp_path: Path) -> ReadLedger:
+        """Filter ``source`` into tmp_path/out with a ledger and return the reloaded ledger."""
+        ledger = ReadLedger.load(tmp_path / "out" / LEDGER_NAME, chunk_size=32)
+        filter_incremental([source], tmp_path / "out" / "output.csv", ledger=ledger)
+        return ReadLedger.load(tmp_path / "out" / LEDGER_NAME)
+
+    def test_records_and_verifies(self, source: Path, tmp_path: Path) -> None:
+        """Test that a fresh run verifies without reading anything again."""
+        ledger = self.run(source, tmp_path)
+        entry = ledger.entries[str(source.resolve())]
+        assert entry.digest.rows_written == 50
+        report = ledger.verify()
+        assert report.passed, report.issues
+        assert report.chunks_rehashed == 0
+        assert report.verified == [source.resolve()]
+
+    def test_deep_verify_rehashes_in_parallel(self, source: Path, tmp_path: Path) -> None:
+        """Test that a deep verification re-reads every chunk and passes."""
+        report = self.run(source, tmp_path).verify(deep=True, jobs=4)
+        assert report.passed, report.issues
+        assert report.chunks_rehashed == -(-len(CSV_DATA) // 32)
+        assert report.bytes_rehashed == len(CSV_DATA)
+
+    def test_touched_input_is_trusted_after_rehash(self, source: Path, tmp_path: Path) -> None:
+        """Test that an input with a new mtime but the same content passes."""
+        ledger = self.run(source, tmp_path)
+        source.touch()
+        source.write_bytes(CSV_DATA)
+        assert ledger.verify().passed
+        assert ledger.verify().chunks_rehashed == 0
+
+    def test_changed_chunk_is_located(self, source: Path, tmp_path: Path) -> None:
+        """Test that a modified input is reported with the byte range that differs."""
+        ledger = self.run(source, tmp_path)
+        data = bytearray(CSV_DATA)
+        data[40] = ord("9") if data[40] != ord("9") else ord("8")
+        source.write_bytes(bytes(data))
+        report = ledger.verify()
+        assert not report.passed
+        assert "1 chunk(s) differ (bytes 32-64)" in report.issues[str(source.resolve())][0]
+
+    def test_incomplete_read_is_reported(self, source: Path, tmp_path: Path) -> None:
+        """Test that a read that stopped early fails verification."""
+        ledger = self.run(source, tmp_path)
+        digest = ledger.entries[str(source.resolve())].digest
+        digest.complete = False
+        assert "before the end of the input" in ledger.verify().issues[str(source.resolve())][0]
+
+    def test_output_rows_are_reconciled(self, source: Path, tmp_path: Path) -> None:
+        """Test that an output missing rows fails verification."""
+        ledger = self.run(source, tmp_path)
+        output = tmp_path / "out" / "output.csv"
+        output.write_text("\n".join(output.read_text().splitlines()[:-1]) + "\n")
+        report = ledger.verify()
+        assert report.issues[str(output.resolve())] == ["Output has 49 data row(s), inputs wrote 50"]
+        assert report.verified == []
+
+    def test_merged_output_sums_inputs(self, tmp_path: Path) -> None:
+        """Test that several inputs merged into one output reconcile together."""
+        shards = []
+        for index in range(3):
+            shard = tmp_path / "raw" / f"shard-{index}.csv"
+            shard.parent.mkdir(exist_ok=True)
+            shard.write_bytes(CSV_DATA)
+            shards.append(shard)
+        ledger = ReadLedger(tmp_path / "out" / LEDGER_NAME, chunk_size=32)
+        filter_incremental(shards, tmp_path / "out" / "merged.csv", jobs=2, ledger=ledger)
+        report = ReadLedger.load(ledger.path).verify(deep=True)
+        assert report.passed, report.issues
+        assert len(report.verified) == 3
+        assert count_csv_rows(tmp_path / "out" / "merged.csv") == 150
+
+    def test_deleted_inputs_are_pruned(self, source: Path, tmp_path: Path) -> None:
+        """Test that entries of deleted inputs are forgotten on the next run."""
+        ledger = self.run(source, tmp_path)
+        other = source.with_name("other.csv")
+        other.write_bytes(CSV_DATA)
+        source.unlink()
+        assert ledger.verify().issues[str(source.resolve())] == ["Input no longer exists"]
+        ledger = self.run(other, tmp_path)
+        assert list(ledger.entries) == [str(other.resolve())]
+
+    def test_unreadable_ledger_starts_empty(self, tmp_path: Path) -> None:
+        """Test that a corrupt ledger file is ignored."""
+        path = tmp_path / LEDGER_NAME
+        path.write_text("{not json")
+        assert ReadLedger.load(path).entries == {}
@@ -0,0 +1,176 @@
+"""Tests for manifest module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from your_package_name.batch import filter_incremental
+from your_package_name.manifest import MANIFEST_NAME, Fingerprint, Manifest
+
+
+def write_values(path: Path, values: list[float]) -> Path:
+    """Write a CSV with a value column."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("value\n" + "".join(f"{value}\n" for value in values), encoding="utf-8")
+    return path
+
+
+def shift_mtime(path: Path, seconds: int = 10) -> None:
+    """Move a file's mtime without changing its contents."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+class TestFingerprint:
+    """Tests for Fingerprint class."""
+
+    def test_touch_keeps_match(self, tmp_path: Path) -> None:
+        """Test that a changed mtime with identical content still matches."""
+        path = write_values(tmp_path / "a.csv", [0.5])
+        fingerprint = Fingerprint.of(path)
+        shift_mtime(path)
+
+        assert fingerprint.matches()
+        assert fingerprint.mtime_ns == path.stat().st_mtime_ns
+
+    def test_same_size_edit_detected(self, tmp_path: Path) -> None:
+        """Test that a same-size content change is caught by the hash."""
+        path = write_values(tmp_path / "a.csv", [0.5])
+        fingerprint = Fingerprint.of(path)
+        write_values(path, [0.6])
+        shift_mtime(path)
+
+        assert not fingerprint.matches()
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a deleted file no longer matches."""
+        path = write_values(tmp_path / "a.csv", [0.5])
+        fingerprint = Fingerprint.of(path)
+        path.unlink()
+        assert not fingerprint.matches()
+
+
+class TestManifest:
+    """Tests for Manifest class."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that recorded entries survive save and load."""
+        source = write_values(tmp_path / "a.csv", [0.5])
+        output = write_values(tmp_path / "out.csv", [0.5])
+        manifest = Manifest(tmp_path / MANIFEST_NAME)
+        manifest.record(output, [Fingerprint.of(source)], {"threshold": 0.5})
+        manifest.save()
+
+        loaded = Manifest.load(tmp_path / MANIFEST_NAME)
+        assert loaded.is_current(output, [source], {"threshold": 0.5})
+        assert not loaded.is_current(output, [source], {"threshold": 0.7})
+
+    def test_damaged_output_is_not_current(self, tmp_path: Path) -> None:
+        """Test that an edited output is reprocessed."""
+        source = write_values(tmp_path / "a.csv", [0.5])
+        output = write_values(tmp_path / "out.csv", [0.5])
+        manifest = Manifest(tmp_path / MANIFEST_NAME)
+        manifest.record(output, [Fingerprint.of(source)], {"threshold": 0.5})
+        output.write_text("value\n", encoding="utf-8")
+
+        assert not manifest.is_current(output, [source], {"threshold": 0.5})
+
+    def test_unreadable_manifest_starts_empty(self, tmp_path: Path) -> None:
+        """Test that a corrupt manifest is ignored rather than fatal."""
+        (tmp_path / MANIFEST_NAME).write_text("{not json", encoding="utf-8")
+        assert Manifest.load(tmp_path / MANIFEST_NAME).entries == {}
+
+
+class TestFilterIncremental:
+    """Tests for filter_incremental function."""
+
+    @pytest.fixture
+    def shards(self, tmp_path: Path) -> list[Path]:
+        """Create three small input shards."""
+        return [write_values(tmp_path / "raw" / f"shard-{i}.csv", [0.1 * i, 0.9]) for i in range(3)]
+
+    def test_rerun_skips_unchanged_shards(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that only changed shards are reprocessed on a rerun."""
+        output = tmp_path / "processed"
+        _, first = filter_incremental(shards, output, per_shard=True)
+        assert len(first.processed) == 3
+
+        write_values(shards[1], [0.95])
+        _, second = filter_incremental(shards, output, per_shard=True)
+        assert second.processed == [shards[1]]
+        assert second.skipped == [shards[0], shards[2]]
+        assert (output / "shard-1.csv").read_text(encoding="utf-8") == "value\n0.95\n"
+
+    def test_force_reprocesses(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that force ignores the manifest."""
+        output = tmp_path / "processed"
+        filter_incremental(shards, output, per_shard=True)
+        _, report = filter_incremental(shards, output, per_shard=True, force=True)
+        assert len(report.processed) == 3
+        assert report.skipped == []
+
+    def test_threshold_change_reprocesses(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that a different threshold invalidates merged output."""
+        output = tmp_path / "processed" / "merged.csv"
+        filter_incremental(shards, output, 0.5)
+        _, same = filter_incremental(shards, output, 0.5)
+        _, changed = filter_incremental(shards, output, 0.05)
+        assert same.processed == []
+        assert changed.processed == shards
+
+    def test_deleted_input_removes_output(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that outputs of deleted inputs are deleted by default."""
+        output = tmp_path / "processed"
+        filter_incremental(shards, output, per_shard=True)
+        shards[2].unlink()
+
+        _, report = filter_incremental(shards[:2], output, per_shard=True)
+        assert report.stale == [(output / "shard-2.csv").resolve()]
+        assert report.removed == report.stale
+        assert not (output / "shard-2.csv").exists()
+        assert "removed 1 stale output(s)" in report.summary()
+
+    def test_keep_stale_only_forgets_output(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that keep_stale forgets outputs of deleted inputs but leaves the files."""
+        output = tmp_path / "processed"
+        filter_incremental(shards, output, per_shard=True)
+        shards[2].unlink()
+
+        _, report = filter_incremental(shards[:2], output, per_shard=True, keep_stale=True)
+        assert report.stale == [(output / "shard-2.csv").resolve()]
+        assert report.removed == []
+        assert (output / "shard-2.csv").exists()
+        assert "kept 1 output(s) of deleted inputs" in report.summary()
+
+        _, again = filter_incremental(shards[:2], output, per_shard=True)
+        assert again.stale == []
+        assert (output / "shard-2.csv").exists()
+
+    def test_outputs_of_other_input_directories_are_kept(self, tmp_path: Path, shards: list[Path]) -> None:
+        """Test that a run only removes outputs of inputs from its own input directories."""
+        output = tmp_path / "processed"
+        archived = write_values(tmp_path / "archive" / "old.csv", [0.9])
+        filter_incremental([archived], output, per_shard=True)
+        archived.unlink()
+
+        _, report = filter_incremental(shards, output, per_shard=True)
+        assert report.stale == []
+        assert (output / "old.csv").exists()
+        assert str((output / "old.csv").resolve()) in Manifest.load(output / MANIFEST_NAME).entries
@@ -0,0 +1,153 @@
+"""Tests for metrics module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from your_package_name.columnar import filter_file
+from your_package_name.metrics import MetricsReporter, PipelineMetrics, format_prometheus, format_summary
+from your_package_name.streaming import filter_csv
+
+CSV_DATA = b"id,value\n" + b"".join(b"%d,%.1f\n" % (row, (row % 10) / 10) for row in range(100))
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Write a CSV with 100 rows, half of them at or above 0.5."""
+    path = tmp_path / "input.csv"
+    path.write_bytes(CSV_DATA)
+    return path
+
+
+class TestPipelineMetrics:
+    """Tests for PipelineMetrics class."""
+
+    def test_nested_stage_time_is_exclusive(self) -> None:
+        """Test that time in a nested stage is not counted for the outer stage."""
+        metrics = PipelineMetrics()
+        with metrics.stage("parse"):
+            with metrics.stage("read"):
+                time.sleep(0.05)
+            time.sleep(0.01)
+        assert metrics.stage_seconds["read"] >= 0.05
+        assert 0.01 <= metrics.stage_seconds["parse"] < 0.05
+
+    def test_stages_on_other_threads_are_not_nested(self) -> None:
+        """Test that a stage timed on another thread does not count as nested."""
+        metrics = PipelineMetrics()
+        entered = threading.Event()
+
+        def read() -> None:
+            entered.wait()
+            with metrics.stage("read"):
+                time.sleep(0.05)
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        with metrics.stage("parse"):
+            entered.set()
+            thread.join()
+        assert metrics.stage_seconds["read"] >= 0.05
+        assert metrics.stage_seconds["parse"] >= 0.05
+
+    def test_wrap_input_counts_bytes(self) -> None:
+        """Test that reads through the wrapper are counted."""
+        metrics = PipelineMetrics()
+        assert metrics.wrap_input(io.BytesIO(b"abc" * 1000)).read() == b"abc" * 1000
+        assert metrics.bytes_in == 3000
+
+    def test_snapshot(self) -> None:
+        """Test that a snapshot is JSON-compatible and has every stage."""
+        metrics = PipelineMetrics()
+        metrics.add_rows(10, 4)
+        snapshot = json.loads(json.dumps(metrics.snapshot()))
+        assert (snapshot["rows_in"], snapshot["rows_out"]) == (10, 4)
+        assert set(snapshot["stage_seconds"]) == {"read", "parse", "filter", "write"}
+        assert snapshot["other_seconds"] >= 0
+
+
+class TestFilterMetrics:
+    """Tests for metrics collected by the filter functions."""
+
+    @pytest.mark.parametrize("checkpoint_interval", [None, 60.0])
+    def test_filter_csv(self, tmp_path: Path, source: Path, checkpoint_interval: float) -> None:
+        """Test row and byte counts of the plain and checkpointed paths."""
+        metrics = PipelineMetrics()
+        output = tmp_path / "output.csv"
+        filter_csv(source, output, 0.5, chunk_size=7, checkpoint_interval=checkpoint_interval, metrics=metrics)
+        assert (metrics.rows_in, metrics.rows_out) == (100, 50)
+        assert metrics.bytes_out == output.stat().st_size
+        assert 0 < metrics.bytes_in <= len(CSV_DATA)
+        assert metrics.stage_seconds["filter"] > 0
+
+    def test_compressed_input_counts_decompressed_bytes(self, tmp_path: Path) -> None:
+        """Test that bytes in are counted after decompression."""
+        path = tmp_path / "input.csv.gz"
+        path.write_bytes(gzip.compress(CSV_DATA))
+        metrics = PipelineMetrics()
+        filter_csv(path, tmp_path / "output.csv", metrics=metrics)
+        assert metrics.bytes_in == len(CSV_DATA)
+
+    def test_filter_file_mmap_totals(self, tmp_path: Path, source: Path) -> None:
+        """Test that paths without stage timing still add row and byte totals."""
+        metrics = PipelineMetrics()
+        filter_file(source, tmp_path / "output.csv", 0.5, reader="mmap", metrics=metrics)
+        assert (metrics.rows_in, metrics.rows_out, metrics.bytes_in) == (100, 50, len(CSV_DATA))
+
+
+class TestReporting:
+    """Tests for MetricsReporter and the formatting functions."""
+
+    def test_reporter_writes_outputs(self, tmp_path: Path) -> None:
+        """Test that periodic and final snapshots reach both outputs."""
+        metrics = PipelineMetrics()
+        jsonl, prom = tmp_path / "metrics.jsonl", tmp_path / "run.prom"
+        with MetricsReporter(metrics, jsonl_path=jsonl, prometheus_path=prom, interval=0.01):
+            metrics.add_rows(5, 2)
+            time.sleep(0.05)
+        lines = [json.loads(line) for line in jsonl.read_text().splitlines()]
+        assert len(lines) >= 2
+        assert [line["final"] for line in lines].count(True) == 1
+        assert lines[-1]["final"] and lines[-1]["rows_in"] == 5
+        assert 'your_package_name_rows_total{direction="out"} 2' in prom.read_text()
+
+    def test_invalid_interval(self) -> None:
+        """Test that a non-positive interval is rejected."""
+        with pytest.raises(ValueError, match="Interval"):
+            MetricsReporter(PipelineMetrics(), interval=0)
+
+    def test_format_prometheus(self) -> None:
+        """Test that every sample line is a metric name with a numeric value."""
+        text = format_prometheus(PipelineMetrics().snapshot(), prefix="job")
+        samples = [line for line in text.splitlines() if not line.startswith("#")]
+        assert all(line.startswith("job_") and float(line.rsplit(" ", 1)[1]) >= 0 for line in samples)
+        assert 'job_stage_seconds_total{stage="other"}' in text
+
+    def test_format_summary(self) -> None:
+        """Test that the summary table lists every stage and the totals."""
+        metrics = PipelineMetrics()
+        metrics.add_rows(1000, 10)
+        table = format_summary(metrics.snapshot())
+        for label in ("read", "parse", "filter", "write", "other", "total", "1,000 in", "Peak RSS"):
+            assert label in table
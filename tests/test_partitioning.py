@@ -0,0 +1,230 @@
+"""Tests for partitioning module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.partitioning import (
+    DEFAULT_PARTITION_VALUE,
+    MARKER_NAME,
+    PartitionedWriter,
+    escape_partition_value,
+    filter_partitioned,
+    partition_path,
+)
+
+FIELDS = ["date", "region", "id", "value"]
+
+
+def rows(count: int, regions: int = 3) -> list[dict[str, str]]:
+    """Return rows spread over two dates and several regions."""
+    return [
+        {"date": f"2026-01-0{i % 2 + 1}", "region": f"r{i % regions}", "id": str(i), "value": f"{i % 10 / 10}"}
+        for i in range(count)
+    ]
+
+
+def read_dataset(root: Path) -> list[dict[str, str]]:
+    """Read every part file back, restoring the partition columns from the path."""
+    result: list[dict[str, str]] = []
+    for path in sorted(root.rglob("*.csv")):
+        keys = dict(part.split("=", 1) for part in path.relative_to(root).parent.parts)
+        with path.open(newline="", encoding="utf-8") as handle:
+            result.extend({**keys, **row} for row in csv.DictReader(handle))
+    return result
+
+
+def by_id(items: list[dict[str, str]]) -> list[dict[str, str]]:
+    """Sort rows by their integer id."""
+    return sorted(items, key=lambda row: int(row["id"]))
+
+
+class TestPartitionPath:
+    """Tests for partition_path and escape_partition_value functions."""
+
+    def test_hive_layout(self) -> None:
+        """Test that each column becomes one column=value directory level."""
+        assert partition_path(["date", "region"], ["2026-01-01", "eu"]) == Path("date=2026-01-01/region=eu")
+
+    def test_escapes_special_characters(self) -> None:
+        """Test that separators and other reserved characters are percent-escaped."""
+        assert escape_partition_value("a/b=c%d") == "a%2Fb%3Dc%25d"
+        assert escape_partition_value("..\\x\n") == "..%5Cx%0A"
+
+    def test_empty_value_uses_default_partition(self) -> None:
+        """Test that empty and missing values map to the default partition."""
+        assert escape_partition_value("") == escape_partition_value(None) == DEFAULT_PARTITION_VALUE
+
+
+class TestPartitionedWriter:
+    """Tests for PartitionedWriter class."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that every row lands in its partition without the partition columns."""
+        data = rows(60)
+        with PartitionedWriter(tmp_path / "out", FIELDS, ["date", "region"]) as writer:
+            writer.writerows(data)
+        assert writer.stats.partitions == 6 and writer.stats.rows == 60
+        first = tmp_path / "out" / "date=2026-01-01" / "region=r0" / "part-00000.csv"
+        assert first.read_text().splitlines()[0] == "id,value"
+        assert by_id(read_dataset(tmp_path / "out")) == data
+
+    def test_handle_pool_is_bounded(self, tmp_path: Path) -> None:
+        """Test that no more than max_open_files files are open and evicted files are reopened."""
+        data = rows(200, regions=20)
+        writer = PartitionedWriter(tmp_path / "out", FIELDS, ["region"], max_open_files=3, buffer_bytes=1)
+        peak = 0
+        for row in data:
+            writer.write(row)
+            peak = max(peak, len(writer._handles))
+        writer.commit()
+        assert peak == 3
+        assert writer.stats.opens > len(writer.stats.files) == 20
+        assert by_id(read_dataset(tmp_path / "out")) == data
+
+    def test_rolls_files_at_size_threshold(self, tmp_path: Path) -> None:
+        """Test that a partition's file is rolled once it reaches max_file_bytes."""
+        data = rows(100, regions=1)
+        with PartitionedWriter(tmp_path / "out", FIELDS, ["region"], max_file_bytes=200, buffer_bytes=50) as writer:
+            writer.writerows(data)
+        parts = sorted((tmp_path / "out" / "region=r0").iterdir())
+        assert len(parts) > 1 and parts[1].name == "part-00001.csv"
+        assert all(part.stat().st_size <= 200 + 50 for part in parts)
+        assert all(part.read_bytes().startswith(b"date,id,value\r\n") for part in parts)
+        assert by_id(read_dataset(tmp_path / "out")) == data
+
+    def test_buffer_budget_flushes_largest(self, tmp_path: Path) -> None:
+        """Test that the total buffered size stays bounded across partitions."""
+        writer = PartitionedWriter(tmp_path / "out", FIELDS, ["region"], max_buffered_bytes=300)
+        for row in rows(200, regions=5):
+            writer.write(row)
+            assert writer._buffered < 300
+        writer.commit()
+
+    def test_commit_replaces_previous_output(self, tmp_path: Path) -> None:
+        """Test that committing swaps in the new dataset and leaves no staging files."""
+        with PartitionedWriter(tmp_path / "out", FIELDS, ["region"]) as writer:
+            writer.writerows(rows(5, regions=5))
+        with PartitionedWriter(tmp_path / "out", FIELDS, ["region"]) as writer:
+            writer.writerows(rows(5, regions=2))
+        assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [MARKER_NAME, "region=r0", "region=r1"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+
+    def test_error_keeps_previous_output(self, tmp_path: Path) -> None:
+        """Test that an error inside the block discards the new dataset."""
+        previous = tmp_path / "out" / "region=old" / "part-00000.csv"
+        previous.parent.mkdir(parents=True)
+        previous.write_text("id\n")
+        with pytest.raises(RuntimeError), PartitionedWriter(tmp_path / "out", FIELDS, ["region"], force=True) as writer:
+            writer.writerows(rows(5))
+            raise RuntimeError("interrupted")
+        assert previous.read_text() == "id\n"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+
+    @pytest.mark.parametrize("kind", ["directory", "file"])
+    def test_foreign_output_is_not_replaced(self, tmp_path: Path, kind: str) -> None:
+        """Test that a directory or file not written by the writer is kept unless forced."""
+        root = tmp_path / "out"
+        if kind == "directory":
+            (root / "keep").mkdir(parents=True)
+        else:
+            root.write_text("keep\n")
+        with pytest.raises(FileExistsError, match="not a partitioned dataset"):
+            PartitionedWriter(root, FIELDS, ["region"])
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+        with PartitionedWriter(root, FIELDS, ["region"], force=True) as writer:
+            writer.writerows(rows(5))
+        assert (root / MARKER_NAME).is_file()
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+
+    def test_forced_replace_keeps_symlink_target(self, tmp_path: Path) -> None:
+        """Test that replacing a symlinked output removes the link, not what it points to."""
+        target = tmp_path / "elsewhere"
+        (target / "region=x").mkdir(parents=True)
+        (target / MARKER_NAME).write_text("{}\n")
+        (tmp_path / "out").symlink_to(target, target_is_directory=True)
+        with pytest.raises(FileExistsError):
+            PartitionedWriter(tmp_path / "out", FIELDS, ["region"])
+        with PartitionedWriter(tmp_path / "out", FIELDS, ["region"], force=True) as writer:
+            writer.writerows(rows(5))
+        assert not (tmp_path / "out").is_symlink()
+        assert sorted(path.name for path in target.iterdir()) == [MARKER_NAME, "region=x"]
+
+    def test_invalid_partition_columns(self, tmp_path: Path) -> None:
+        """Test that unknown, empty or all-covering partition columns are rejected."""
+        for partition_by in (["missing"], [], ["value"]):
+            with pytest.raises(ValueError):
+                PartitionedWriter(tmp_path / "out", ["value"], partition_by)
+        with pytest.raises(ValueError, match="max_open_files"):
+            PartitionedWriter(tmp_path / "out", FIELDS, ["region"], max_open_files=0)
+
+
+class TestFilterPartitioned:
+    """Tests for filter_partitioned function."""
+
+    def write_input(self, path: Path, data: list[dict[str, str]]) -> Path:
+        """Write rows to a CSV file."""
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(data)
+        return path
+
+    def test_filters_several_inputs(self, tmp_path: Path) -> None:
+        """Test that kept rows of every input are partitioned together."""
+        data = rows(40)
+        inputs = [self.write_input(tmp_path / "a.csv", data[:25]), self.write_input(tmp_path / "b.csv", data[25:])]
+        metrics = PipelineMetrics()
+        stats, written = filter_partitioned(inputs, tmp_path / "out", 0.5, ["date"], chunk_size=7, metrics=metrics)
+        expected = [{"date": row["date"], **row} for row in data if float(row["value"]) >= 0.5]
+        assert (stats.rows_read, stats.rows_written, written.rows) == (40, len(expected), len(expected))
+        assert [{key: row[key] for key in FIELDS} for row in by_id(read_dataset(tmp_path / "out"))] == expected
+        assert metrics.bytes_out == written.bytes_written
+
+    def test_bad_value_keeps_previous_output(self, tmp_path: Path) -> None:
+        """Test that a parse error leaves the previous dataset and no staging directory."""
+        data = rows(10)
+        data[7]["value"] = "oops"
+        filter_partitioned([self.write_input(tmp_path / "a.csv", rows(10))], tmp_path / "out", 0.5, ["date"])
+        previous = read_dataset(tmp_path / "out")
+        source = self.write_input(tmp_path / "a.csv", data)
+        with pytest.raises(ValueError, match="Row 8"):
+            filter_partitioned([source], tmp_path / "out", 0.5, ["date"])
+        assert read_dataset(tmp_path / "out") == previous
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.csv", "out"]
+
+    def test_input_inside_output_rejected(self, tmp_path: Path) -> None:
+        """Test that an output directory containing an input is refused before anything is written."""
+        (tmp_path / "out").mkdir()
+        source = self.write_input(tmp_path / "out" / "a.csv", rows(10))
+        with pytest.raises(ValueError, match="inside the output directory"):
+            filter_partitioned([source], tmp_path / "out", 0.5, ["date"], force=True)
+        assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["a.csv"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+
+    def test_mismatched_headers_rejected(self, tmp_path: Path) -> None:
+        """Test that inputs with different headers cannot share a dataset."""
+        first = self.write_input(tmp_path / "a.csv", rows(3))
+        second = tmp_path / "b.csv"
+        second.write_text("date,value\n2026-01-01,0.9\n")
+        with pytest.raises(ValueError, match="differs"):
+            filter_partitioned([first, second], tmp_path / "out", 0.5, ["date"])
+        assert not (tmp_path / "out").exists()
@@ -0,0 +1,189 @@
+"""Tests for pipelining module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import gzip
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from your_package_name.ledger import hash_chunks
+from your_package_name.metrics import PipelineMetrics
+from your_package_name.pipelining import PipelineReport, StageUtilization, run_pipelined
+from your_package_name.streaming import filter_csv
+from your_package_name.validation import ValidationError, ValidationSpec
+
+
+def write_values(path: Path, count: int) -> Path:
+    """Write a CSV with id, quoted note and value columns."""
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "note", "value"])
+        writer.writerows([i, f"row\n{i}, quoted", (i * 37 % 100) / 100] for i in range(count))
+    return path
+
+
+class TestRunPipelined:
+    """Tests for run_pipelined function."""
+
+    def test_batches_flow_in_order(self) -> None:
+        """Test that every batch passes through every stage in order."""
+        written: list[list[int]] = []
+        report = run_pipelined(
+            ([i, i + 1] for i in range(0, 20, 2)),
+            [("double", lambda batch: [2 * item for item in batch]), ("write", written.append)],
+            queue_size=1,
+        )
+        assert [item for batch in written for item in batch] == [2 * i for i in range(20)]
+        assert [stage.name for stage in report.stages] == ["read", "double", "write"]
+        assert all(stage.batches == 10 and stage.items == 20 for stage in report.stages)
+
+    def test_stages_run_concurrently(self) -> None:
+        """Test that two stages overlap in time rather than running one after another."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def first(batch: int) -> int:
+            if batch > 1:
+                barrier.wait()
+            return batch
+
+        def second(batch: int) -> None:
+            # Batch n is processed here while the first stage works on batch n + 1.
+            if batch < 3:
+                barrier.wait()
+
+        run_pipelined(iter([1, 2, 3]), [("first", first), ("second", second)], queue_size=1)
+
+    def test_bounded_queue_applies_backpressure(self) -> None:
+        """Test that a fast source is blocked while a slow sink catches up."""
+        produced: list[int] = []
+
+        def source() -> Iterator[int]:
+            for i in range(6):
+                produced.append(i)
+                yield i
+
+        def slow(batch: int) -> None:
+            time.sleep(0.02)
+            # The source runs at most two queued batches plus one in hand ahead of the sink.
+            assert len(produced) <= batch + 4
+
+        report = run_pipelined(source(), [("write", slow)], queue_size=1)
+        read, write = report.stages
+        assert read.blocked_seconds > 0.05
+        assert report.bottleneck == "write"
+        assert write.utilization(report.elapsed_seconds) > 0.5
+
+    def test_error_stops_every_stage(self) -> None:
+        """Test that a failing stage stops the source and its error is raised."""
+
+        def source() -> Iterator[int]:
+            i = 0
+            while True:
+                yield i
+                i += 1
+
+        def broken(batch: int) -> int:
+            if batch == 3:
+                raise RuntimeError("bad batch")
+            return batch
+
+        with pytest.raises(RuntimeError, match="bad batch"):
+            run_pipelined(source(), [("broken", broken), ("write", lambda batch: None)])
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
+
+    def test_records_busy_time_in_metrics(self) -> None:
+        """Test that each stage's busy time is added to the metrics stage times."""
+        metrics = PipelineMetrics()
+
+        def slow(batch: int) -> int:
+            time.sleep(0.01)
+            return batch
+
+        run_pipelined(iter(range(3)), [("filter", slow)], metrics=metrics)
+        assert metrics.stage_seconds["filter"] >= 0.03
+
+    def test_invalid_arguments(self) -> None:
+        """Test that an empty pipeline and a non-positive queue size are rejected."""
+        with pytest.raises(ValueError, match="at least one stage"):
+            run_pipelined([], [])
+        with pytest.raises(ValueError, match="Queue size"):
+            run_pipelined([], [("write", print)], queue_size=0)
+
+
+class TestPipelineReport:
+    """Tests for PipelineReport class."""
+
+    def test_to_dict_and_summary(self) -> None:
+        """Test the serialized report and its one-line summary."""
+        report = PipelineReport(2.0, [StageUtilization("read", 0.5, 0.0, 1.5), StageUtilization("write", 1.5, 0.5)])
+        data = report.to_dict()
+        assert data["bottleneck"] == "write"
+        assert [stage["utilization"] for stage in data["stages"]] == [0.25, 0.75]
+        assert report.summary().startswith("Pipelined 2.00s, bottleneck write: read 25% busy")
+
+
+class TestFilterCsvPipelined:
+    """Tests for filter_csv with pipelined=True."""
+
+    def test_same_output_as_sequential_run(self, tmp_path: Path) -> None:
+        """Test that the pipelined filter writes the same bytes and counts as the sequential one."""
+        source = write_values(tmp_path / "input.csv", 500)
+        expected = filter_csv(source, tmp_path / "sequential.csv", 0.5, chunk_size=64)
+        stats = filter_csv(source, tmp_path / "pipelined.csv", 0.5, chunk_size=64, pipelined=True)
+        assert (tmp_path / "pipelined.csv").read_bytes() == (tmp_path / "sequential.csv").read_bytes()
+        assert (stats.rows_read, stats.rows_written) == (expected.rows_read, expected.rows_written)
+        assert stats.pipeline is not None
+        assert [stage.name for stage in stats.pipeline.stages] == ["read", "parse", "filter", "write"]
+
+    def test_compressed_input_with_read_hashing(self, tmp_path: Path) -> None:
+        """Test that a gzip input is hashed exactly as its decompressed bytes."""
+        plain = write_values(tmp_path / "input.csv", 100)
+        source = tmp_path / "input.csv.gz"
+        source.write_bytes(gzip.compress(plain.read_bytes()))
+        metrics = PipelineMetrics()
+        stats = filter_csv(source, tmp_path / "output.csv", 0.5, pipelined=True, hash_chunk_size=1024, metrics=metrics)
+        digest = stats.digests[str(source.resolve())]
+        assert digest.complete and digest.chunks == hash_chunks(plain, 1024).chunks
+        assert metrics.bytes_in == plain.stat().st_size
+        assert metrics.rows_in == 100
+
+    def test_validation_failure_keeps_previous_output(self, tmp_path: Path) -> None:
+        """Test that a failed check raises and leaves the output untouched."""
+        source = write_values(tmp_path / "input.csv", 50)
+        output = tmp_path / "output.csv"
+        output.write_text("previous\n")
+        with pytest.raises(ValidationError):
+            filter_csv(source, output, pipelined=True, validation=ValidationSpec.from_mapping({"max_rows": 10}))
+        assert output.read_text() == "previous\n"
+
+    def test_bad_value_raises_error(self, tmp_path: Path) -> None:
+        """Test that a parse error in the filter thread is raised to the caller."""
+        source = tmp_path / "input.csv"
+        source.write_text("id,value\n1,0.5\n2,oops\n")
+        with pytest.raises(ValueError, match="Row 2"):
+            filter_csv(source, tmp_path / "output.csv", pipelined=True)
+
+    def test_resume_rejected(self, tmp_path: Path) -> None:
+        """Test that a pipelined run cannot resume from a checkpoint."""
+        source = write_values(tmp_path / "input.csv", 5)
+        with pytest.raises(ValueError, match="cannot resume"):
+            filter_csv(source, tmp_path / "output.csv", pipelined=True, resume=True)
@@ -0,0 +1,110 @@
+"""Tests for profiling module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from your_package_name.profiling import StackSampler, profile_run
+
+
+def busy_loop(seconds: float = 0.1) -> int:
+    """Spin for ``seconds`` so the profilers have something to see."""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class TestProfileRun:
+    """Tests for profile_run function."""
+
+    def test_cpu_mode_writes_pstats(self, tmp_path: Path) -> None:
+        """Test that CPU mode writes statistics that pstats can load."""
+        with profile_run("cpu", tmp_path, "run") as report:
+            busy_loop()
+        assert report.pstats_path == tmp_path / "run.pstats"
+        assert report.memory_path is None
+        stats = pstats.Stats(str(report.pstats_path))
+        assert "busy_loop" in stats.get_stats_profile().func_profiles
+
+    def test_cpu_mode_writes_collapsed_stacks(self, tmp_path: Path) -> None:
+        """Test that sampled stacks name the busy function and end with a count."""
+        with profile_run("cpu", tmp_path, sample_interval=0.001) as report:
+            busy_loop()
+        assert report.collapsed_path is not None
+        lines = report.collapsed_path.read_text().splitlines()
+        assert any("busy_loop (test_profiling.py" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_memory_mode_writes_report(self, tmp_path: Path) -> None:
+        """Test that memory mode reports the peak and stops tracing afterwards."""
+        assert not tracemalloc.is_tracing()
+        with profile_run("memory", tmp_path) as report:
+            blocks = [bytes(1000) for _ in range(1000)]
+        assert report.memory_path is not None
+        assert report.pstats_path is None
+        text = report.memory_path.read_text()
+        assert text.startswith("Peak traced memory:")
+        assert "test_profiling.py" in text
+        assert not tracemalloc.is_tracing()
+        assert len(blocks) == 1000
+
+    def test_memory_mode_keeps_existing_tracing(self, tmp_path: Path) -> None:
+        """Test that tracing started by the caller is left running."""
+        tracemalloc.start()
+        try:
+            with profile_run("memory", tmp_path):
+                pass
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_both_mode_writes_all_reports(self, tmp_path: Path) -> None:
+        """Test that both mode writes the pstats, collapsed and memory files."""
+        with profile_run("both", tmp_path, "run") as report:
+            busy_loop(0.02)
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["run.collapsed", "run.memory.txt", "run.pstats"]
+        assert report.collapsed_path == tmp_path / "run.collapsed"
+
+    def test_writes_reports_when_block_raises(self, tmp_path: Path) -> None:
+        """Test that reports are written even if the profiled code fails."""
+        with pytest.raises(RuntimeError), profile_run("cpu", tmp_path, "run"):
+            raise RuntimeError("boom")
+        assert (tmp_path / "run.pstats").exists()
+
+    def test_invalid_mode_raises_error(self, tmp_path: Path) -> None:
+        """Test that an unknown mode is rejected before anything is written."""
+        mode: Any = "wall"
+        with pytest.raises(ValueError, match="Profile mode"), profile_run(mode, tmp_path / "profiles"):
+            pass
+        assert not (tmp_path / "profiles").exists()
+
+
+class TestStackSampler:
+    """Tests for StackSampler class."""
+
+    def test_invalid_interval_raises_error(self) -> None:
+        """Test that a non-positive interval is rejected."""
+        with pytest.raises(ValueError, match="Interval"):
+            StackSampler(interval=0)
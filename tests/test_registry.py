@@ -0,0 +1,163 @@
+"""Tests for registry module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from your_package_name.core import ExampleClass
+from your_package_name.registry import ExampleRegistry
+
+
+@pytest.fixture
+def registry() -> ExampleRegistry:
+    """Return a registry with a handful of instances."""
+    return ExampleRegistry(
+        [
+            ExampleClass("a", 3.0),
+            ExampleClass("b", 1.0),
+            ExampleClass("c", 7.0),
+            ExampleClass("d", 3.0),
+            ExampleClass("e", 10.0),
+        ]
+    )
+
+
+def names(objects: list[ExampleClass]) -> list[str]:
+    """Return the names of a list of instances."""
+    return [obj.name for obj in objects]
+
+
+class TestExampleRegistry:
+    """Tests for ExampleRegistry."""
+
+    def test_lookup_by_name(self, registry: ExampleRegistry) -> None:
+        """Test name lookup, membership and length."""
+        assert registry["c"] == ExampleClass("c", 7.0)
+        assert registry.get("missing") is None
+        assert "a" in registry
+        assert "missing" not in registry
+        assert len(registry) == 5
+
+    def test_missing_name_raises_error(self, registry: ExampleRegistry) -> None:
+        """Test that unknown names raise KeyError."""
+        with pytest.raises(KeyError, match="No instance named"):
+            registry["missing"]
+
+    def test_duplicate_name_raises_error(self, registry: ExampleRegistry) -> None:
+        """Test that duplicate names are rejected."""
+        with pytest.raises(ValueError, match="Duplicate name"):
+            registry.add(ExampleClass("a", 0.0))
+        with pytest.raises(ValueError, match="Duplicate name"):
+            ExampleRegistry([ExampleClass("x", 1.0), ExampleClass("x", 2.0)])
+
+    def test_iteration_in_value_order(self, registry: ExampleRegistry) -> None:
+        """Test that iteration is ordered by value, then name."""
+        assert names(list(registry)) == ["b", "a", "d", "c", "e"]
+
+    def test_between_is_inclusive(self, registry: ExampleRegistry) -> None:
+        """Test range queries with inclusive bounds."""
+        assert names(registry.between(3.0, 7.0)) == ["a", "d", "c"]
+        assert names(registry.between(4.0, 6.0)) == []
+        assert registry.count_between(1.0, 3.0) == 3
+        assert registry.count_between(5.0, 2.0) == 0
+
+    def test_rank_nth_and_top(self, registry: ExampleRegistry) -> None:
+        """Test order-statistics queries."""
+        assert registry.rank("b") == 0
+        assert registry.rank("e") == 4
+        assert registry.nth(2).name == "d"
+        assert registry.nth(-1).name == "e"
+        assert names(registry.top(2)) == ["e", "c"]
+        assert registry.top(0) == []
+        assert len(registry.top(100)) == 5
+
+    def test_top_orders_ties_by_name(self, registry: ExampleRegistry) -> None:
+        """Test that equal values are returned in name order, also at the cut."""
+        registry.reset("c")
+        registry.reset("e")
+        registry.increment("b", 2.0)
+        assert names(registry.top(3)) == ["a", "b", "d"]
+        assert names(registry.top(2)) == ["a", "b"]
+
+    def test_top_negative_raises_error(self, registry: ExampleRegistry) -> None:
+        """Test that a negative top-N count is rejected."""
+        with pytest.raises(ValueError, match="non-negative"):
+            registry.top(-1)
+
+    def test_increment_updates_index(self, registry: ExampleRegistry) -> None:
+        """Test that increments through the registry reorder the value index."""
+        registry.increment("b", 20.0)
+        assert registry["b"].value == 21.0
+        assert names(registry.top(1)) == ["b"]
+        assert registry.rank("b") == 4
+        assert names(registry.between(0.0, 2.0)) == []
+
+    def test_reset_updates_index(self, registry: ExampleRegistry) -> None:
+        """Test that resets through the registry reorder the value index."""
+        registry.reset("e")
+        assert registry.rank("e") == 0
+        assert names(registry.between(0.0, 0.0)) == ["e"]
+
+    def test_failed_increment_leaves_index_intact(self, registry: ExampleRegistry) -> None:
+        """Test that a rejected increment does not corrupt the index."""
+        with pytest.raises(ValueError, match="non-negative"):
+            registry.increment("a", -1.0)
+        assert names(list(registry)) == ["b", "a", "d", "c", "e"]
+
+    def test_remove(self, registry: ExampleRegistry) -> None:
+        """Test removing instances from both indexes."""
+        removed = registry.remove("c")
+        assert removed.name == "c"
+        assert "c" not in registry
+        assert names(registry.between(5.0, 8.0)) == []
+        with pytest.raises(KeyError):
+            registry.remove("c")
+
+    def test_add(self) -> None:
+        """Test adding instances to an empty registry."""
+        registry = ExampleRegistry()
+        registry.add(ExampleClass("x", 2.0))
+        registry.add(ExampleClass("y", 1.0))
+        assert names(list(registry)) == ["y", "x"]
+
+    def test_large_registry_matches_sorted_reference(self) -> None:
+        """Test queries across many index buckets against a sorted list."""
+        registry = ExampleRegistry(ExampleClass(f"n{i}", float(i * 37 % 100)) for i in range(3000))
+        for step in range(3000):
+            name = f"n{step * 7919 % 3000}"
+            if step % 5 == 0:
+                registry.reset(name)
+            else:
+                registry.increment(name, float(step % 50))
+        for i in range(3000, 3500):
+            registry.add(ExampleClass(f"n{i}", float(i * 53 % 200)))
+        for i in range(0, 3500, 3):
+            registry.remove(f"n{i}")
+
+        reference = sorted((obj.value, obj.name) for obj in registry)
+        assert [(obj.value, obj.name) for obj in registry] == reference
+        assert len(registry) == len(reference)
+        for rank in (0, 1, 511, 512, 1024, len(reference) - 1, -1):
+            assert registry.nth(rank).name == reference[rank][1]
+        for value, name in reference[::97]:
+            assert registry.rank(name) == reference.index((value, name))
+        assert names(registry.between(50.0, 120.0)) == [name for value, name in reference if 50.0 <= value <= 120.0]
+        assert registry.count_between(0.0, 10.0) == sum(1 for value, _ in reference if value <= 10.0)
+        expected_top = [name for _, name in sorted(reference, key=lambda key: (-key[0], key[1]))[:700]]
+        assert names(registry.top(700)) == expected_top
+        with pytest.raises(IndexError):
+            registry.nth(len(reference))
@@ -0,0 +1,176 @@
+"""Tests for scanner module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from your_package_name.columnar import filter_file
+from your_package_name.scanner import filter_csv_mmap, iter_record_spans, project_field
+from your_package_name.streaming import filter_csv
+
+TRICKY_CSV = (
+    b"id,value,note\r\n"
+    b'1,0.9,"multi\nline, with comma"\r\n'
+    b"2,0.1,plain\r\n"
+    b"\r\n"
+    b'3,"0.75","say ""hi"""\r\n'
+    b"4,0.6\r\n"
+    b'5,0.2,"rejected\nquoted"\r\n'
+    b"6,1.0,last"
+)
+
+
+def filter_both(tmp_path: Path, data: bytes, threshold: float = 0.5) -> tuple[bytes, bytes]:
+    """Filter the same input with filter_csv and filter_csv_mmap and return both outputs."""
+    source = tmp_path / "input.csv"
+    source.write_bytes(data)
+    filter_csv(source, tmp_path / "csv.csv", threshold)
+    filter_csv_mmap(source, tmp_path / "mmap.csv", threshold)
+    return (tmp_path / "csv.csv").read_bytes(), (tmp_path / "mmap.csv").read_bytes()
+
+
+class TestIterRecordSpans:
+    """Tests for iter_record_spans function."""
+
+    def test_spans_include_terminators(self) -> None:
+        """Test that spans cover whole records including their line endings."""
+        data = b"a,b\r\n1,2\n3,4"
+        assert [data[start:end] for start, end in iter_record_spans(data)] == [b"a,b\r\n", b"1,2\n", b"3,4"]
+
+    def test_quoted_newline_stays_in_record(self) -> None:
+        """Test that a newline inside quotes does not split the record."""
+        data = b'1,"a\nb"\n2,c\n'
+        assert [data[start:end] for start, end in iter_record_spans(data)] == [b'1,"a\nb"\n', b"2,c\n"]
+
+    def test_stray_quote_does_not_join_records(self) -> None:
+        """Test that a quote inside an unquoted field is literal."""
+        data = b'1,5" screen,0.7\n2,x,0.1\n'
+        assert [data[start:end] for start, end in iter_record_spans(data)] == [b'1,5" screen,0.7\n', b"2,x,0.1\n"]
+
+    def test_start_offset(self) -> None:
+        """Test that scanning starts at the given offset."""
+        data = b"a\nb\nc\n"
+        assert list(iter_record_spans(data, 2)) == [(2, 4), (4, 6)]
+
+
+class TestProjectField:
+    """Tests for project_field function."""
+
+    def test_unquoted(self) -> None:
+        """Test that an unquoted record is split only up to the wanted field."""
+        assert project_field(b"1,0.5,x,y\n", 1) == b"0.5"
+
+    def test_quoted(self) -> None:
+        """Test that quoted fields are unquoted."""
+        assert project_field(b'"a,b","0.5",x\n', 1) == b"0.5"
+
+    def test_missing_field(self) -> None:
+        """Test that a short record yields None."""
+        assert project_field(b"1\n", 1) is None
+
+
+class TestFilterCsvMmap:
+    """Tests for filter_csv_mmap function."""
+
+    def test_matches_filter_csv(self, tmp_path: Path) -> None:
+        """Test byte-identical output with quoting, CRLF, blank lines and short rows."""
+        expected, actual = filter_both(tmp_path, TRICKY_CSV)
+        assert actual == expected
+
+    @pytest.mark.parametrize("threshold", [0.0, 0.5, 1.0])
+    def test_stats_match_filter_csv(self, tmp_path: Path, threshold: float) -> None:
+        """Test that row counts match filter_csv at several thresholds."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(TRICKY_CSV)
+        expected = filter_csv(source, tmp_path / "csv.csv", threshold)
+        actual = filter_csv_mmap(source, tmp_path / "mmap.csv", threshold)
+        assert actual == expected
+        assert (tmp_path / "mmap.csv").read_bytes() == (tmp_path / "csv.csv").read_bytes()
+
+    def test_value_not_first_or_last(self, tmp_path: Path) -> None:
+        """Test projecting a middle column of a wide file."""
+        rows = b"".join(b"%d,x,%.2f,y,z\n" % (index, index / 10) for index in range(11))
+        expected, actual = filter_both(tmp_path, b"id,a,value,b,c\n" + rows, 0.35)
+        assert actual == expected
+
+    def test_nan_values_dropped_like_filter_csv(self, tmp_path: Path) -> None:
+        """Test that NaN values are dropped, as process_data drops them."""
+        expected, actual = filter_both(tmp_path, b"id,value\n1,nan\n2,0.9\n3,NaN\n4,inf\n", 0.5)
+        assert actual == expected
+        assert actual == b"id,value\r\n2,0.9\r\n4,inf\r\n"
+
+    def test_stray_quote_matches_filter_csv(self, tmp_path: Path) -> None:
+        """Test that a quote inside an unquoted field is read like the csv module reads it."""
+        expected, actual = filter_both(tmp_path, b'id,note,value\n1,5" screen,0.7\n2,"a\nb",0.9\n3,x,0.1\n')
+        assert actual == expected
+
+    def test_compressed_output(self, tmp_path: Path) -> None:
+        """Test that a .gz output path is compressed."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(TRICKY_CSV)
+        filter_csv_mmap(source, tmp_path / "output.csv.gz")
+        assert (tmp_path / "output.csv.gz").read_bytes()[:2] == b"\x1f\x8b"
+
+    def test_non_numeric_value(self, tmp_path: Path) -> None:
+        """Test that a non-numeric value reports its row."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(b"id,value\n1,0.5\n2,abc\n")
+        with pytest.raises(ValueError, match="Row 2"):
+            filter_csv_mmap(source, tmp_path / "output.csv")
+        assert not (tmp_path / "output.csv").exists()
+
+    def test_too_many_fields(self, tmp_path: Path) -> None:
+        """Test that a kept row wider than the header is rejected."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(b"id,value\n1,0.9,extra\n")
+        with pytest.raises(ValueError, match="Row 1"):
+            filter_csv_mmap(source, tmp_path / "output.csv")
+
+    def test_missing_value_column(self, tmp_path: Path) -> None:
+        """Test that a header without 'value' is rejected."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(b"id,other\n1,2\n")
+        with pytest.raises(KeyError, match="value"):
+            filter_csv_mmap(source, tmp_path / "output.csv")
+
+    def test_empty_input(self, tmp_path: Path) -> None:
+        """Test that an empty file is rejected like a missing column."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(b"")
+        with pytest.raises(KeyError, match="value"):
+            filter_csv_mmap(source, tmp_path / "output.csv")
+
+    def test_invalid_threshold(self, tmp_path: Path) -> None:
+        """Test that an out-of-range threshold is rejected."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(TRICKY_CSV)
+        with pytest.raises(ValueError, match="Threshold"):
+            filter_csv_mmap(source, tmp_path / "output.csv", 1.5)
+
+
+class TestFilterFileReader:
+    """Tests for the reader option of columnar.filter_file."""
+
+    def test_mmap_reader(self, tmp_path: Path) -> None:
+        """Test that reader='mmap' produces the same output as the default reader."""
+        source = tmp_path / "input.csv"
+        source.write_bytes(TRICKY_CSV)
+        filter_file(source, tmp_path / "csv.csv", 0.5)
+        filter_file(source, tmp_path / "mmap.csv", 0.5, reader="mmap")
+        assert (tmp_path / "mmap.csv").read_bytes() == (tmp_path / "csv.csv").read_bytes()
@@ -0,0 +1,138 @@
+"""Tests for serialization module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from your_package_name.core import ExampleClass
+from your_package_name.serialization import dump_many, load_many, open_many
+
+
+@pytest.fixture
+def objects() -> list[ExampleClass]:
+    """Return a small mixed collection of instances."""
+    return [
+        ExampleClass("alpha", 1.5),
+        ExampleClass("zażółć", 0.0, metadata={"tags": ["x", "y"], "n": 3}),
+        ExampleClass("gamma", 42, metadata={"nested": {"ok": True}}),
+    ]
+
+
+class TestDumpLoadMany:
+    """Tests for dump_many and load_many."""
+
+    def test_round_trip(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test that instances survive a dump and load unchanged."""
+        path = tmp_path / "objects.excb"
+        assert dump_many(objects, path) == 3
+
+        loaded = load_many(path)
+        assert loaded == objects
+        assert [obj.metadata for obj in loaded] == [obj.metadata for obj in objects]
+
+    def test_empty_collection(self, tmp_path: Path) -> None:
+        """Test dumping and loading an empty collection."""
+        path = tmp_path / "empty.excb"
+        assert dump_many([], path) == 0
+        assert load_many(path) == []
+
+    def test_accepts_generator_and_string_path(self, tmp_path: Path) -> None:
+        """Test that any iterable and str paths are accepted."""
+        path = str(tmp_path / "gen.excb")
+        dump_many((ExampleClass(f"obj{i}", i) for i in range(100)), path)
+        loaded = load_many(path)
+        assert len(loaded) == 100
+        assert loaded[99] == ExampleClass("obj99", 99.0)
+
+    def test_no_temporary_file_left(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test that the temporary file is renamed into place."""
+        dump_many(objects, tmp_path / "objects.excb")
+        assert [p.name for p in tmp_path.iterdir()] == ["objects.excb"]
+
+    def test_non_json_metadata_raises_error(self, tmp_path: Path) -> None:
+        """Test that non-serializable metadata raises TypeError."""
+        with pytest.raises(TypeError):
+            dump_many([ExampleClass("a", 1.0, metadata={"x": object()})], tmp_path / "bad.excb")
+
+    def test_bad_magic_raises_error(self, tmp_path: Path) -> None:
+        """Test that foreign files are rejected."""
+        path = tmp_path / "foreign.bin"
+        path.write_bytes(b"\x00" * 64)
+        with pytest.raises(ValueError, match="bad magic"):
+            load_many(path)
+
+    def test_unsupported_version_raises_error(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test that files from a newer format version are rejected."""
+        path = tmp_path / "objects.excb"
+        dump_many(objects, path)
+        data = bytearray(path.read_bytes())
+        data[4] = 99
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="Unsupported collection format version 99"):
+            load_many(path)
+
+    def test_truncated_file_raises_error(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test that truncated files are detected."""
+        path = tmp_path / "objects.excb"
+        dump_many(objects, path)
+        path.write_bytes(path.read_bytes()[:-5])
+        with pytest.raises(ValueError, match="Truncated"):
+            load_many(path)
+
+
+class TestOpenMany:
+    """Tests for the memory-mapped collection view."""
+
+    def test_random_access(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test indexing single instances and columns."""
+        path = tmp_path / "objects.excb"
+        dump_many(objects, path)
+
+        with open_many(path) as collection:
+            assert len(collection) == 3
+            assert collection[1] == objects[1]
+            assert collection[-1] == objects[2]
+            assert collection.name_at(1) == "zażółć"
+            assert collection.value_at(2) == 42.0
+            assert collection.metadata_at(0) == {}
+            assert collection.metadata_at(2) == {"nested": {"ok": True}}
+
+    def test_slice_and_iteration(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test slicing and iterating the view."""
+        path = tmp_path / "objects.excb"
+        dump_many(objects, path)
+
+        with open_many(path) as collection:
+            assert collection[1:] == objects[1:]
+            assert list(collection) == objects
+
+    def test_index_out_of_range(self, tmp_path: Path, objects: list[ExampleClass]) -> None:
+        """Test that out-of-range indexes raise IndexError."""
+        path = tmp_path / "objects.excb"
+        dump_many(objects, path)
+
+        with open_many(path) as collection, pytest.raises(IndexError):
+            collection.value_at(3)
+
+    def test_invalid_file_raises_error(self, tmp_path: Path) -> None:
+        """Test that opening a foreign file raises ValueError."""
+        path = tmp_path / "short.bin"
+        path.write_bytes(b"EXCB")
+        with pytest.raises(ValueError, match="too short"):
+            open_many(path)
@@ -0,0 +1,207 @@
+"""Tests for splitting module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from your_package_name.columnar import filter_file
+from your_package_name.splitting import RecordIndex, filter_csv_split, index_path, load_or_build_index
+from your_package_name.streaming import filter_csv
+
+QUOTED_CSV = b"".join(
+    [
+        b"id,value,note\r\n",
+        *(
+            b'%d,%.2f,"line one\nline ""two"", %d"\r\n' % (row, (row % 10) / 10, row)
+            if row % 3 == 0
+            else b"%d,%.2f,plain\r\n" % (row, (row % 10) / 10)
+            for row in range(60)
+        ),
+        b"\r\n",
+        b"60,0.9",
+    ]
+)
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Write a CSV with quoted newlines, escaped quotes and CRLF line endings."""
+    path = tmp_path / "input.csv"
+    path.write_bytes(QUOTED_CSV)
+    return path
+
+
+def record_starts(data: bytes) -> set[int]:
+    """Return the offsets where records start, found by a sequential quote-aware scan."""
+    starts, inside = set(), False
+    for position, byte in enumerate(data):
+        if byte == ord('"'):
+            inside = not inside
+        elif byte == ord("\n") and not inside:
+            starts.add(position + 1)
+    return starts
+
+
+class TestRecordIndex:
+    """Tests for RecordIndex class."""
+
+    def test_offsets_are_record_starts(self, source: Path) -> None:
+        """Test that every offset is a record boundary even with quoted newlines in tiny blocks."""
+        index = RecordIndex.build(source, block_size=7)
+        assert index.offsets[0] == QUOTED_CSV.index(b"\n") + 1
+        assert index.offsets[-1] == len(QUOTED_CSV)
+        assert set(index.offsets[:-1]) <= record_starts(QUOTED_CSV)
+        assert len(index.offsets) > 10
+
+    def test_parallel_build_matches_sequential(self, source: Path) -> None:
+        """Test that counting quotes on several processes gives the same index."""
+        assert RecordIndex.build(source, block_size=11, jobs=3) == RecordIndex.build(source, block_size=11)
+
+    def test_ranges_are_contiguous(self, source: Path) -> None:
+        """Test that ranges cover the data without gaps or overlaps."""
+        index = RecordIndex.build(source, block_size=16)
+        ranges = index.ranges(4)
+        assert len(ranges) == 4
+        assert ranges[0][0] == index.offsets[0]
+        assert ranges[-1][1] == len(QUOTED_CSV)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    def test_ranges_of_small_file(self, tmp_path: Path) -> None:
+        """Test that a file smaller than one block yields a single range, and no data none."""
+        path = tmp_path / "small.csv"
+        path.write_bytes(b"id,value\n1,0.5\n")
+        assert RecordIndex.build(path).ranges(8) == [(9, 15)]
+        path.write_bytes(b"id,value\n")
+        assert RecordIndex.build(path).ranges(8) == []
+
+    def test_invalid_block_size(self, source: Path) -> None:
+        """Test that a non-positive block size is rejected."""
+        with pytest.raises(ValueError, match="Block size"):
+            RecordIndex.build(source, block_size=0)
+
+
+class TestLoadOrBuildIndex:
+    """Tests for load_or_build_index function."""
+
+    def test_persists_and_reuses(self, source: Path) -> None:
+        """Test that the sidecar is saved and reused while the input is unchanged."""
+        built = load_or_build_index(source, block_size=16)
+        assert index_path(source).exists()
+        assert RecordIndex.load(index_path(source)) == built
+
+        stale = RecordIndex(built.input_size, built.input_mtime_ns, 16, [built.offsets[0], built.input_size])
+        stale.save(index_path(source))
+        assert load_or_build_index(source, block_size=16) == stale
+
+    def test_rebuilds_after_change(self, source: Path) -> None:
+        """Test that a modified input invalidates the sidecar."""
+        load_or_build_index(source, block_size=16)
+        source.write_bytes(QUOTED_CSV + b"\r\n61,0.1")
+        assert load_or_build_index(source, block_size=16).input_size == len(QUOTED_CSV) + 8
+
+    def test_not_persisted(self, source: Path) -> None:
+        """Test that persist=False leaves no sidecar."""
+        load_or_build_index(source, persist=False)
+        assert not index_path(source).exists()
+
+    def test_corrupt_sidecar(self, source: Path) -> None:
+        """Test that an unreadable sidecar is rebuilt."""
+        index_path(source).write_text("{not json")
+        assert load_or_build_index(source, block_size=16).offsets[-1] == len(QUOTED_CSV)
+
+
+class TestFilterCsvSplit:
+    """Tests for filter_csv_split function."""
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_matches_filter_csv(self, tmp_path: Path, source: Path, jobs: int) -> None:
+        """Test that the stitched output is byte-identical to filter_csv."""
+        expected = filter_csv(source, tmp_path / "expected.csv", 0.5)
+        actual = filter_csv_split(source, tmp_path / "actual.csv", 0.5, jobs=jobs, block_size=16)
+        assert actual == expected
+        assert (tmp_path / "actual.csv").read_bytes() == (tmp_path / "expected.csv").read_bytes()
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            ".input.csv.index.json",
+            "actual.csv",
+            "expected.csv",
+            "input.csv",
+        ]
+
+    def test_compressed_output(self, tmp_path: Path, source: Path) -> None:
+        """Test that a .gz output is compressed after stitching."""
+        filter_csv(source, tmp_path / "expected.csv", 0.5)
+        filter_csv_split(source, tmp_path / "actual.csv.gz", 0.5, jobs=2, block_size=16)
+        assert gzip.decompress((tmp_path / "actual.csv.gz").read_bytes()) == (tmp_path / "expected.csv").read_bytes()
+
+    def test_compressed_input_rejected(self, tmp_path: Path) -> None:
+        """Test that compressed input cannot be split."""
+        path = tmp_path / "input.csv.gz"
+        path.write_bytes(gzip.compress(QUOTED_CSV))
+        with pytest.raises(ValueError, match="uncompressed"):
+            filter_csv_split(path, tmp_path / "output.csv", jobs=2)
+
+    def test_non_numeric_value(self, tmp_path: Path) -> None:
+        """Test that a bad value is reported with its byte range and no output is left."""
+        path = tmp_path / "input.csv"
+        path.write_bytes(b"id,value\n1,0.5\n2,abc\n")
+        with pytest.raises(ValueError, match=r"Row 2: value must be numeric.*byte range"):
+            filter_csv_split(path, tmp_path / "output.csv", jobs=2)
+        assert not (tmp_path / "output.csv").exists()
+        assert [item.name for item in tmp_path.iterdir() if item.name.startswith(".output")] == []
+
+    def test_stray_quote_refused(self, tmp_path: Path) -> None:
+        """Test that a range split inside a quoted field is refused rather than misread."""
+        path = tmp_path / "input.csv"
+        rows = b"".join(b'%d,"multi\nline",0.9\n' % index for index in range(2, 40))
+        path.write_bytes(b'id,note,value\n1,5" screen,0.7\n' + rows)
+        assert filter_csv(path, tmp_path / "expected.csv", 0.5).rows_written == 39
+        with pytest.raises(ValueError, match="ends inside a quoted field"):
+            filter_csv_split(path, tmp_path / "output.csv", jobs=2, block_size=64, persist_index=False)
+        assert not (tmp_path / "output.csv").exists()
+
+    def test_missing_value_column(self, tmp_path: Path) -> None:
+        """Test that a header without 'value' is rejected."""
+        path = tmp_path / "input.csv"
+        path.write_bytes(b"id,other\n1,2\n")
+        with pytest.raises(KeyError, match="value"):
+            filter_csv_split(path, tmp_path / "output.csv", jobs=2)
+
+    def test_empty_input(self, tmp_path: Path) -> None:
+        """Test that an empty file is rejected like a missing column."""
+        path = tmp_path / "input.csv"
+        path.write_bytes(b"")
+        with pytest.raises(KeyError, match="value"):
+            filter_csv_split(path, tmp_path / "output.csv", jobs=2)
+
+    def test_invalid_jobs(self, source: Path, tmp_path: Path) -> None:
+        """Test that a non-positive job count is rejected."""
+        with pytest.raises(ValueError, match="Jobs"):
+            filter_csv_split(source, tmp_path / "output.csv", jobs=0)
+
+
+class TestFilterFileJobs:
+    """Tests for the jobs option of columnar.filter_file."""
+
+    def test_split_matches_single_process(self, tmp_path: Path, source: Path) -> None:
+        """Test that jobs > 1 splits the file and produces the same output."""
+        filter_file(source, tmp_path / "single.csv", 0.5)
+        filter_file(source, tmp_path / "split.csv", 0.5, jobs=2)
+        assert (tmp_path / "split.csv").read_bytes() == (tmp_path / "single.csv").read_bytes()
+        assert index_path(source).exists()
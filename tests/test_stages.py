@@ -0,0 +1,194 @@
+"""Tests for stages module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from your_package_name.stages import (
+    Pipeline,
+    Stage,
+    StageCache,
+    filter_rows,
+    read_csv_rows,
+    write_csv_rows,
+)
+
+CSV_TEXT = "id,value\n1,0.2\n2,0.9\n3,0.7\n"
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Write a small CSV input."""
+    path = tmp_path / "input.csv"
+    path.write_text(CSV_TEXT)
+    return path
+
+
+def build(tmp_path: Path, source: Path, calls: Counter[str], threshold: float = 0.5) -> Pipeline:
+    """Return a read, filter, write pipeline that counts stage calls."""
+    pipeline = Pipeline(StageCache(tmp_path / "cache"))
+
+    @pipeline.stage(params={"path": str(source)}, files=(source,))
+    def read(path: str) -> Iterator[dict[str, str]]:
+        calls["read"] += 1
+        yield from read_csv_rows(path)
+
+    @pipeline.stage(inputs=("read",), params={"threshold": threshold})
+    def keep(rows: Iterable[dict[str, str]], threshold: float) -> Iterator[dict[str, str]]:
+        calls["keep"] += 1
+        yield from filter_rows(rows, threshold)
+
+    @pipeline.stage(inputs=("keep",), params={"path": str(tmp_path / "output.csv")}, cache=False)
+    def write(rows: Iterable[dict[str, str]], path: str) -> Iterator[dict[str, Any]]:
+        calls["write"] += 1
+        yield from write_csv_rows(rows, path)
+
+    return pipeline
+
+
+class TestPipeline:
+    """Tests for Pipeline class."""
+
+    def test_runs_stages_in_order(self, tmp_path: Path, source: Path) -> None:
+        """Test that a read, filter, write chain produces the filtered CSV."""
+        results = build(tmp_path, source, Counter()).run()
+        assert (tmp_path / "output.csv").read_text().splitlines() == ["id,value", "2,0.9", "3,0.7"]
+        assert results["keep"].records == 2
+        assert list(Pipeline(StageCache(tmp_path / "cache")).read(results["write"])) == [
+            {"path": str(tmp_path / "output.csv"), "rows": 2}
+        ]
+
+    def test_rerun_reuses_cached_outputs(self, tmp_path: Path, source: Path) -> None:
+        """Test that an unchanged rerun only runs the uncached sink."""
+        calls: Counter[str] = Counter()
+        build(tmp_path, source, calls).run()
+        results = build(tmp_path, source, calls).run()
+        assert calls == {"read": 1, "keep": 1, "write": 2}
+        assert results["read"].cached and results["keep"].cached and not results["write"].cached
+
+    def test_changed_params_rerun_downstream_only(self, tmp_path: Path, source: Path) -> None:
+        """Test that a new threshold recomputes the filter but not the read."""
+        calls: Counter[str] = Counter()
+        build(tmp_path, source, calls).run()
+        results = build(tmp_path, source, calls, threshold=0.8).run()
+        assert calls == {"read": 1, "keep": 2, "write": 2}
+        assert results["keep"].records == 1
+
+    def test_changed_file_reruns_source(self, tmp_path: Path, source: Path) -> None:
+        """Test that editing an input file invalidates the stages reading it."""
+        calls: Counter[str] = Counter()
+        build(tmp_path, source, calls).run()
+        source.write_text(CSV_TEXT + "4,0.95\n")
+        results = build(tmp_path, source, calls).run()
+        assert calls["read"] == 2 and calls["keep"] == 2
+        assert results["keep"].records == 3
+
+    def test_same_upstream_content_keeps_downstream_cached(self, tmp_path: Path, source: Path) -> None:
+        """Test that recomputing a stage with identical output does not invalidate its consumers."""
+        calls: Counter[str] = Counter()
+        build(tmp_path, source, calls).run()
+        pipeline = build(tmp_path, source, calls)
+        pipeline.stages["read"] = replace(pipeline.stages["read"], version="v2")
+        results = pipeline.run()
+        assert calls["read"] == 2
+        assert results["keep"].cached
+
+    def test_force_recomputes(self, tmp_path: Path, source: Path) -> None:
+        """Test that force ignores cached outputs."""
+        calls: Counter[str] = Counter()
+        build(tmp_path, source, calls).run()
+        build(tmp_path, source, calls).run(force=True)
+        assert calls == {"read": 2, "keep": 2, "write": 2}
+
+    def test_targets_run_only_ancestors(self, tmp_path: Path, source: Path) -> None:
+        """Test that requesting one stage runs just it and its inputs."""
+        calls: Counter[str] = Counter()
+        results = build(tmp_path, source, calls).run(["keep"])
+        assert set(results) == {"read", "keep"}
+        assert "write" not in calls
+
+    def test_independent_branches_run_concurrently(self, tmp_path: Path) -> None:
+        """Test that two stages without a dependency overlap in time."""
+        barrier = threading.Barrier(2, timeout=5)
+        pipeline = Pipeline(StageCache(tmp_path / "cache"))
+
+        def branch(name: str) -> Iterator[str]:
+            barrier.wait()
+            yield name
+
+        pipeline.add(Stage("left", branch, params={"name": "left"}))
+        pipeline.add(Stage("right", branch, params={"name": "right"}))
+        pipeline.add(Stage("join", lambda left, right: [*left, *right], inputs=("left", "right")))
+        results = pipeline.run(jobs=2)
+        assert list(pipeline.read(results["join"])) == ["left", "right"]
+
+    def test_failed_stage_is_not_cached(self, tmp_path: Path) -> None:
+        """Test that a stage raising an error leaves no cache entry and propagates."""
+        pipeline = Pipeline(StageCache(tmp_path / "cache"))
+
+        def broken() -> Iterator[int]:
+            yield 1
+            raise RuntimeError("boom")
+
+        pipeline.add(Stage("broken", broken))
+        with pytest.raises(RuntimeError, match="boom"):
+            pipeline.run()
+        assert not list((tmp_path / "cache").rglob("*.jsonl"))
+
+    def test_invalid_graph_raises_error(self, tmp_path: Path) -> None:
+        """Test that duplicate names, unknown inputs and unknown targets are rejected."""
+        pipeline = Pipeline(StageCache(tmp_path / "cache"))
+        pipeline.add(Stage("a", lambda: [1]))
+        with pytest.raises(ValueError, match="Duplicate"):
+            pipeline.add(Stage("a", lambda: [2]))
+        with pytest.raises(ValueError, match="unknown input"):
+            pipeline.add(Stage("b", lambda rows: rows, inputs=("missing",)))
+        with pytest.raises(ValueError, match="Unknown stage"):
+            pipeline.run(["missing"])
+
+
+class TestStageCache:
+    """Tests for StageCache class."""
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """Test storing and reading back records."""
+        cache = StageCache(tmp_path)
+        digest, count = cache.put("ab" * 32, [{"a": 1}, [2, 3], "x"])
+        assert count == 3
+        assert cache.get("ab" * 32) == (digest, 3)
+        assert list(cache.read(cache.path("ab" * 32))) == [{"a": 1}, [2, 3], "x"]
+
+    def test_truncated_output_is_a_miss(self, tmp_path: Path) -> None:
+        """Test that an output whose size does not match its sidecar is ignored."""
+        cache = StageCache(tmp_path)
+        cache.put("cd" * 32, range(10))
+        cache.path("cd" * 32).write_bytes(b"1\n")
+        assert cache.get("cd" * 32) is None
+
+    def test_file_digest_is_reused(self, tmp_path: Path, source: Path) -> None:
+        """Test that an unchanged file is not hashed again by a new cache instance."""
+        first = StageCache(tmp_path / "cache").file_digest(source)
+        index = (tmp_path / "cache" / "files.json").read_text()
+        assert first in index
+        assert StageCache(tmp_path / "cache").file_digest(source) == first
@@ -0,0 +1,276 @@
+"""Tests for streaming module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import gzip
+import io
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from your_package_name import streaming
+from your_package_name.streaming import (
+    Checkpoint,
+    checkpoint_paths,
+    ends_in_quotes,
+    filter_chunk,
+    filter_csv,
+    iter_chunks,
+    iter_records,
+)
+from your_package_name.utils import atomic_write
+
+
+def write_csv(path: Path, rows: list[dict[str, str]], fieldnames: list[str]) -> Path:
+    """Write rows to a CSV file with a header."""
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def read_csv(path: Path) -> list[dict[str, str]]:
+    """Read a CSV file into a list of rows."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+class TestIterChunks:
+    """Tests for iter_chunks function."""
+
+    def test_chunk_sizes(self) -> None:
+        """Test that rows are grouped into bounded chunks."""
+        chunks = list(iter_chunks(({"value": str(i)} for i in range(7)), chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+    def test_invalid_chunk_size(self) -> None:
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError, match="must be positive"):
+            list(iter_chunks([], chunk_size=0))
+
+
+class TestFilterChunk:
+    """Tests for filter_chunk function."""
+
+    def test_preserves_raw_rows(self) -> None:
+        """Test that kept rows are returned unchanged."""
+        rows = [{"name": "a", "value": "0.50"}, {"name": "b", "value": "0.1"}, {"name": "c", "value": "1"}]
+        assert filter_chunk(rows, threshold=0.5) == [rows[0], rows[2]]
+
+    def test_empty_chunk(self) -> None:
+        """Test that an empty chunk yields no rows."""
+        assert filter_chunk([], threshold=0.5) == []
+
+    def test_non_numeric_value_reports_row(self) -> None:
+        """Test that parse errors name the offending row."""
+        with pytest.raises(ValueError, match="Row 12: value must be numeric"):
+            filter_chunk([{"value": "0.5"}, {"value": "abc"}], threshold=0.5, first_row=11)
+
+
+class TestFilterCsv:
+    """Tests for filter_csv function."""
+
+    def test_filters_across_chunks(self, tmp_path: Path) -> None:
+        """Test streaming a file through several chunks."""
+        rows = [{"id": str(i), "value": str(i / 100)} for i in range(100)]
+        source = write_csv(tmp_path / "in.csv", rows, ["id", "value"])
+        output = tmp_path / "out.csv"
+
+        stats = filter_csv(source, output, threshold=0.9, chunk_size=7)
+
+        assert (stats.rows_read, stats.rows_written) == (100, 10)
+        assert read_csv(output) == rows[90:]
+
+    def test_header_only_input(self, tmp_path: Path) -> None:
+        """Test that an input without data rows produces a header-only output."""
+        source = write_csv(tmp_path / "in.csv", [], ["value"])
+        output = tmp_path / "out.csv"
+        assert filter_csv(source, output).rows_read == 0
+        assert output.read_text(encoding="utf-8").strip() == "value"
+
+    def test_quoted_fields(self, tmp_path: Path) -> None:
+        """Test that quoted commas and newlines survive the round trip."""
+        rows = [{"note": 'a, "quoted"\nline', "value": "0.9"}]
+        source = write_csv(tmp_path / "in.csv", rows, ["note", "value"])
+        output = tmp_path / "out.csv"
+        filter_csv(source, output)
+        assert read_csv(output) == rows
+
+    def test_missing_value_column(self, tmp_path: Path) -> None:
+        """Test that inputs without a value column are rejected."""
+        source = write_csv(tmp_path / "in.csv", [{"x": "1"}], ["x"])
+        with pytest.raises(KeyError, match="missing 'value' column"):
+            filter_csv(source, tmp_path / "out.csv")
+
+    def test_failure_keeps_previous_output(self, tmp_path: Path) -> None:
+        """Test that a failed run leaves no partial output."""
+        source = write_csv(tmp_path / "in.csv", [{"value": "0.9"}, {"value": "bad"}], ["value"])
+        output = tmp_path / "out.csv"
+        output.write_text("previous", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Row 2"):
+            filter_csv(source, output, chunk_size=1)
+
+        assert output.read_text(encoding="utf-8") == "previous"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["in.csv", "out.csv"]
+
+
+class TestIterRecords:
+    """Tests for iter_records function."""
+
+    def test_quoted_newlines(self) -> None:
+        """Test that newlines inside quotes do not split records."""
+        data = b'a,b\n1,"x\ny"\n2,"say ""hi"""\r\n3,z'
+        records = list(iter_records(io.BytesIO(data)))
+        assert records == [b"a,b\n", b'1,"x\ny"\n', b'2,"say ""hi"""\r\n', b"3,z"]
+        assert sum(len(record) for record in records) == len(data)
+
+    def test_stray_quote_in_unquoted_field(self) -> None:
+        """Test that a quote inside an unquoted field is literal, as for the csv module."""
+        data = b'id,note,value\n1,5" screen,0.7\n2,"a ""b"" c",0.1\n3,"x"y,0.2\n'
+        records = list(iter_records(io.BytesIO(data)))
+        assert len(records) == 4
+        assert list(csv.reader(record.decode() for record in records)) == list(csv.reader(io.StringIO(data.decode())))
+
+    @pytest.mark.parametrize(
+        ("text", "quoted", "expected"),
+        [
+            (b"a,b\n", False, False),
+            (b'a,"b\n', False, True),
+            (b'a,5" b\n', False, False),
+            (b'a,"b ""c\n', False, True),
+            (b'a,"b ""c""",d\n', False, False),
+            (b'rest of b",c\n', True, False),
+            (b'still ""quoted\n', True, True),
+        ],
+    )
+    def test_ends_in_quotes(self, text: bytes, quoted: bool, expected: bool) -> None:
+        """Test quote state tracking across field boundaries and escapes."""
+        assert ends_in_quotes(text, quoted=quoted) is expected
+
+
+class TestCheckpointedFilter:
+    """Tests for filter_csv with checkpoints and resume."""
+
+    @pytest.fixture
+    def rows(self) -> list[dict[str, str]]:
+        """Return rows with quoted newlines and values spread over [0, 1)."""
+        return [{"note": f"line\n{i}", "value": str(i / 50)} for i in range(50)]
+
+    def test_same_output_as_plain_run(self, tmp_path: Path, rows: list[dict[str, str]]) -> None:
+        """Test that checkpointing does not change the output."""
+        source = write_csv(tmp_path / "in.csv", rows, ["note", "value"])
+        filter_csv(source, tmp_path / "plain.csv", chunk_size=7)
+        stats = filter_csv(source, tmp_path / "checked.csv", chunk_size=7, checkpoint_interval=0)
+
+        assert (tmp_path / "checked.csv").read_bytes() == (tmp_path / "plain.csv").read_bytes()
+        assert (stats.rows_read, stats.rows_written) == (50, 25)
+        assert not any(path.exists() for path in checkpoint_paths(tmp_path / "checked.csv"))
+
+    def test_resume_after_interrupt(
+        self, tmp_path: Path, rows: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a resumed run neither duplicates nor drops rows."""
+        source = write_csv(tmp_path / "in.csv", rows, ["note", "value"])
+        output = tmp_path / "out.csv"
+        calls = 0
+        original = streaming.filter_chunk
+
+        def interrupt_third_chunk(chunk: list[dict[str, str]], threshold: float, first_row: int) -> list[Any]:
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise KeyboardInterrupt
+            return original(chunk, threshold, first_row)
+
+        monkeypatch.setattr(streaming, "filter_chunk", interrupt_third_chunk)
+        with pytest.raises(KeyboardInterrupt):
+            filter_csv(source, output, chunk_size=10, checkpoint_interval=3600)
+        monkeypatch.undo()
+
+        checkpoint = Checkpoint.load(checkpoint_paths(output)[1])
+        assert checkpoint is not None
+        assert checkpoint.rows_read == 20
+        assert not output.exists()
+
+        stats = filter_csv(source, output, chunk_size=10, resume=True)
+        assert (stats.rows_read, stats.rows_written) == (50, 25)
+        assert read_csv(output) == rows[25:]
+
+    def test_changed_input_starts_over(self, tmp_path: Path, rows: list[dict[str, str]]) -> None:
+        """Test that a checkpoint for a different input is discarded."""
+        source = write_csv(tmp_path / "in.csv", rows, ["note", "value"])
+        output = tmp_path / "out.csv"
+        partial, sidecar = checkpoint_paths(output)
+        partial.write_text("garbage", encoding="utf-8")
+        Checkpoint(1, 1, 0.5, ["note", "value"], 5, 3, 1, 1).save(sidecar)
+
+        filter_csv(source, output, resume=True)
+        assert read_csv(output) == rows[25:]
+
+    def test_stray_quote_matches_plain_run(self, tmp_path: Path) -> None:
+        """Test that a quote in an unquoted field does not break checkpointed reading."""
+        source = tmp_path / "in.csv"
+        source.write_bytes(b'id,note,value\n1,5" screen,0.7\n2,"multi\nline",0.9\n3,plain,0.1\n')
+        filter_csv(source, tmp_path / "plain.csv")
+        stats = filter_csv(source, tmp_path / "checked.csv", checkpoint_interval=0)
+
+        assert (tmp_path / "checked.csv").read_bytes() == (tmp_path / "plain.csv").read_bytes()
+        assert (stats.rows_read, stats.rows_written) == (3, 2)
+
+    def test_malformed_csv_raises_value_error(self, tmp_path: Path) -> None:
+        """Test that csv module errors are reported as ValueError."""
+        source = tmp_path / "in.csv"
+        source.write_text(f"note,value\n{'x' * (csv.field_size_limit() + 1)},0.7\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="malformed CSV"):
+            filter_csv(source, tmp_path / "out.csv", checkpoint_interval=60)
+
+    def test_failure_does_not_checkpoint(
+        self, tmp_path: Path, rows: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that only interrupts, not errors, record a checkpoint on the way out."""
+        source = write_csv(tmp_path / "in.csv", rows, ["note", "value"])
+        output = tmp_path / "out.csv"
+
+        def fail(chunk: list[dict[str, str]], threshold: float, first_row: int) -> list[Any]:
+            raise ValueError("bad chunk")
+
+        monkeypatch.setattr(streaming, "filter_chunk", fail)
+        with pytest.raises(ValueError, match="bad chunk"):
+            filter_csv(source, output, chunk_size=10, checkpoint_interval=3600)
+        assert not checkpoint_paths(output)[1].exists()
+
+    def test_resume_compressed_rejected(self, tmp_path: Path) -> None:
+        """Test that resuming a compressed input is rejected."""
+        source = tmp_path / "in.csv.gz"
+        source.write_bytes(gzip.compress(b"value\n0.5\n"))
+        with pytest.raises(ValueError, match="uncompressed"):
+            filter_csv(source, tmp_path / "out.csv", resume=True)
+
+
+class TestAtomicWrite:
+    """Tests for atomic_write helper."""
+
+    def test_binary_mode(self, tmp_path: Path) -> None:
+        """Test writing a binary file atomically."""
+        path = tmp_path / "out.bin"
+        with atomic_write(path, "wb", fsync=True) as handle:
+            handle.write(b"data")
+        assert path.read_bytes() == b"data"
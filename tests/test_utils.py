@@ -16,12 +16,24 @@ You should have received a copy of the GNU Affero General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import asyncio
 import tempfile
+import threading
+import time
 from pathlib import Path
+from typing import Any, cast
 
 import pytest
 
-from your_package_name.utils import merge_dicts, validate_file_path
+from your_package_name.utils import (
+    Cache,
+    DirectoryListingCache,
+    LayeredDict,
+    memoize,
+    merge_dicts,
+    validate_file_path,
+    validate_file_paths,
+)
 
 
 class TestValidateFilePath:
@@ -62,6 +74,87 @@ class TestValidateFilePath:
             validate_file_path(123)  # type: ignore
 
 
+class TestValidateFilePaths:
+    """Tests for validate_file_paths function."""
+
+    def test_mixed_inputs(self, tmp_path: Path) -> None:
+        """Test that valid paths and errors are collected in input order."""
+        (tmp_path / "a.csv").touch()
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        (sub / "b.csv").touch()
+
+        inputs = [str(tmp_path / "a.csv"), 123, sub / "b.csv", tmp_path / "missing.csv", sub]
+        result = validate_file_paths(cast(Any, inputs))
+
+        assert result.valid == [tmp_path / "a.csv", sub / "b.csv", sub]
+        assert [raw for raw, _ in result.errors] == [123, tmp_path / "missing.csv"]
+        assert isinstance(result.errors[0][1], TypeError)
+        assert isinstance(result.errors[1][1], FileNotFoundError)
+        assert "File not found" in str(result.errors[1][1])
+        assert not result.ok
+
+    def test_all_valid(self, tmp_path: Path) -> None:
+        """Test a batch without errors."""
+        paths = [tmp_path / f"{i}.csv" for i in range(20)]
+        for path in paths:
+            path.touch()
+        result = validate_file_paths(paths)
+        assert result.ok
+        assert result.valid == paths
+
+    def test_missing_parent_directory(self, tmp_path: Path) -> None:
+        """Test paths whose parent directory does not exist."""
+        result = validate_file_paths([tmp_path / "nope" / "a.csv"])
+        assert result.valid == []
+        assert len(result.errors) == 1
+
+    def test_dangling_symlink_is_missing(self, tmp_path: Path) -> None:
+        """Test that a broken symlink is reported missing, like Path.exists()."""
+        link = tmp_path / "link.csv"
+        link.symlink_to(tmp_path / "target.csv")
+        assert not validate_file_paths([link]).ok
+
+        (tmp_path / "target.csv").touch()
+        assert validate_file_paths([link]).ok
+
+    def test_thread_pool(self, tmp_path: Path) -> None:
+        """Test concurrent resolution of several directories."""
+        paths = []
+        for i in range(5):
+            directory = tmp_path / f"d{i}"
+            directory.mkdir()
+            (directory / "x.csv").touch()
+            paths.extend([directory / "x.csv", directory / "y.csv"])
+
+        result = validate_file_paths(paths, max_workers=4)
+        assert result.valid == paths[::2]
+        assert [raw for raw, _ in result.errors] == paths[1::2]
+
+    def test_cache_reuses_listing_until_ttl(self, tmp_path: Path) -> None:
+        """Test that cached listings are reused and expire."""
+        path = tmp_path / "late.csv"
+        cache = DirectoryListingCache(ttl=60.0)
+        assert not validate_file_paths([path], cache=cache).ok
+
+        path.touch()
+        assert not validate_file_paths([path], cache=cache).ok
+
+        cache.clear()
+        assert validate_file_paths([path], cache=cache).ok
+
+        expired = DirectoryListingCache(ttl=0.0)
+        path.unlink()
+        validate_file_paths([path], cache=expired)
+        path.touch()
+        assert validate_file_paths([path], cache=expired).ok
+
+    def test_negative_ttl_raises_error(self) -> None:
+        """Test that a negative TTL is rejected."""
+        with pytest.raises(ValueError, match="non-negative"):
+            DirectoryListingCache(ttl=-1.0)
+
+
 class TestMergeDicts:
     """Tests for merge_dicts function."""
 
@@ -108,3 +201,345 @@ class TestMergeDicts:
 
         assert dict1 == original_dict1
         assert dict2 == original_dict2
+
+    def test_shallow_merge_replaces_nested(self) -> None:
+        """Test that nested dictionaries are replaced by default."""
+        result = merge_dicts({"db": {"host": "x", "port": 1}}, {"db": {"port": 2}})
+        assert result == {"db": {"port": 2}}
+
+    def test_deep_merge(self) -> None:
+        """Test that deep merge combines nested dictionaries key by key."""
+        result = merge_dicts(
+            {"db": {"host": "x", "opts": {"ssl": False, "timeout": 5}}, "debug": False},
+            {"db": {"opts": {"ssl": True}}},
+            {"debug": True},
+            deep=True,
+        )
+        assert result == {"db": {"host": "x", "opts": {"ssl": True, "timeout": 5}}, "debug": True}
+
+    def test_deep_merge_scalar_and_mapping_override(self) -> None:
+        """Test that deep merge lets mappings and scalars replace each other."""
+        assert merge_dicts({"a": 1}, {"a": {"x": 1}}, deep=True) == {"a": {"x": 1}}
+        assert merge_dicts({"a": {"x": 1}}, {"a": 1}, deep=True) == {"a": 1}
+
+    def test_deep_merge_does_not_share_nested_dicts(self) -> None:
+        """Test that mutating a deep-merged result leaves the inputs unchanged."""
+        base = {"db": {"host": "x"}}
+        result = merge_dicts(base, {}, deep=True)
+        result["db"]["host"] = "y"
+        assert base == {"db": {"host": "x"}}
+
+
+class TestLayeredDict:
+    """Tests for LayeredDict view."""
+
+    def test_resolves_like_deep_merge(self) -> None:
+        """Test that the view matches merge_dicts(deep=True)."""
+        layers = [
+            {"db": {"host": "x", "port": 1}, "name": "default", "tags": ["a"]},
+            {"db": {"port": 2}, "env": "prod"},
+            {"db": {"opts": {"ssl": True}}, "name": "request"},
+        ]
+        view = LayeredDict(*layers)
+        expected = merge_dicts(*layers, deep=True)
+
+        assert view == expected
+        assert view.to_dict() == expected
+        assert list(view) == list(expected)
+        assert len(view) == len(expected)
+        assert view["db"]["port"] == 2
+        assert view["db"]["opts"]["ssl"] is True
+        assert view["name"] == "request"
+
+    def test_nested_values_are_views(self) -> None:
+        """Test that nested mappings are resolved lazily as views."""
+        view = LayeredDict({"db": {"host": "x"}}, {"db": {"port": 2}})
+        nested = view["db"]
+        assert isinstance(nested, LayeredDict)
+        assert nested is view["db"]
+
+    def test_scalar_blocks_lower_mappings(self) -> None:
+        """Test that a scalar layer hides mappings below it."""
+        view = LayeredDict({"a": {"x": 1}}, {"a": 5}, {"a": {"y": 1}})
+        assert view["a"] == {"y": 1}
+
+    def test_missing_key_raises_error(self) -> None:
+        """Test that unknown keys raise KeyError."""
+        view = LayeredDict({"a": 1})
+        with pytest.raises(KeyError):
+            view["missing"]
+        assert "missing" not in view
+        assert view.get("missing") is None
+
+    def test_push_and_replace_layer_invalidate_cache(self) -> None:
+        """Test that changing layers through the view refreshes results."""
+        view = LayeredDict({"a": 1, "b": {"x": 1}})
+        assert view["a"] == 1
+        assert view.to_dict() == {"a": 1, "b": {"x": 1}}
+
+        view.push_layer({"a": 2, "c": 3})
+        assert view["a"] == 2
+        assert view.to_dict() == {"a": 2, "b": {"x": 1}, "c": 3}
+
+        view.replace_layer(0, {"b": {"y": 2}})
+        assert view["b"] == {"y": 2}
+        assert "c" in view
+        assert len(view.layers) == 2
+
+    def test_invalidate_after_in_place_mutation(self) -> None:
+        """Test that invalidate refreshes the view and the nested views resolved from it."""
+        layer: dict[str, Any] = {"a": 1, "db": {"port": 1}}
+        view = LayeredDict(layer)
+        nested = view["db"]
+        assert view["a"] == 1
+        assert view.to_dict() == {"a": 1, "db": {"port": 1}}
+        layer["a"] = 2
+        layer["b"] = 3
+        layer["db"]["port"] = 2
+        layer["db"]["host"] = "x"
+
+        nested.invalidate()
+        assert view["a"] == 2
+        assert nested["port"] == 2
+        assert list(nested) == ["port", "host"]
+        assert view.to_dict() == {"a": 2, "db": {"port": 2, "host": "x"}, "b": 3}
+        assert list(view) == ["a", "db", "b"]
+
+    def test_layers_are_referenced_not_modified(self) -> None:
+        """Test that the view keeps the caller's layers and never modifies them."""
+        base = {"db": {"host": "x"}}
+        view = LayeredDict(base, {"db": {"port": 1}})
+        view.to_dict()["db"]["host"] = "changed"
+        assert base == {"db": {"host": "x"}}
+        assert view.layers[0] is base
+
+
+class TestCache:
+    """Tests for Cache class."""
+
+    def test_get_and_set(self) -> None:
+        """Test basic storage, hit and miss counting."""
+        cache = Cache()
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert "a" in cache
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted."""
+        cache = Cache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_lfu_eviction(self) -> None:
+        """Test that the least frequently used entry is evicted."""
+        cache = Cache(max_entries=2, policy="lfu")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)
+        assert "b" not in cache
+        cache.set("d", 4)
+        assert "c" not in cache
+        assert "a" in cache
+
+    def test_ttl_expiry(self) -> None:
+        """Test that entries expire after the TTL."""
+        cache = Cache(ttl=0.01)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        time.sleep(0.02)
+        assert "a" not in cache
+        assert cache.get("a") is None
+        assert cache.stats().expirations == 1
+
+    def test_ttl_policy_evicts_oldest(self) -> None:
+        """Test that the ttl policy evicts by insertion order, not access."""
+        cache = Cache(max_entries=2, ttl=60.0, policy="ttl")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" not in cache
+        assert "b" in cache
+
+    def test_byte_bound(self) -> None:
+        """Test eviction by estimated size."""
+        cache = Cache(max_entries=None, max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.set("c", "xxxx")
+        assert "a" not in cache
+        assert cache.stats().bytes == 8
+        cache.set("huge", "x" * 11)
+        assert "huge" not in cache
+
+    def test_overwrite_and_delete(self) -> None:
+        """Test replacing and deleting entries."""
+        cache = Cache(max_bytes=100, sizeof=len)
+        cache.set("a", "xx")
+        cache.set("a", "xxxx")
+        assert cache.stats().bytes == 4
+        assert cache.delete("a")
+        assert not cache.delete("a")
+        assert len(cache) == 0
+
+    def test_invalid_options(self) -> None:
+        """Test option validation."""
+        with pytest.raises(ValueError, match="max_entries"):
+            Cache(max_entries=0)
+        with pytest.raises(ValueError, match="Unknown cache policy"):
+            Cache(policy="mru")  # type: ignore[arg-type]
+        with pytest.raises(ValueError, match="requires a ttl"):
+            Cache(policy="ttl")
+
+    def test_thread_safety(self) -> None:
+        """Test concurrent access keeps bounds and counters consistent."""
+        cache = Cache(max_entries=50, policy="lfu")
+
+        def worker(offset: int) -> None:
+            for i in range(500):
+                cache.set((offset + i) % 80, i)
+                cache.get(i % 80)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert len(cache) <= 50
+        assert stats.hits + stats.misses == 2000
+
+
+class TestMemoize:
+    """Tests for memoize decorator."""
+
+    def test_sync_function(self) -> None:
+        """Test caching of a regular function."""
+        calls = []
+
+        @memoize(max_entries=10)
+        def square(x: int, *, offset: int = 0) -> int:
+            calls.append(x)
+            return x * x + offset
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert square(3, offset=1) == 10
+        assert calls == [3, 3]
+        assert square.cache.stats().hits == 1  # type: ignore[attr-defined]
+
+        square.cache_clear()  # type: ignore[attr-defined]
+        square(3)
+        assert calls == [3, 3, 3]
+
+    def test_custom_key_and_shared_cache(self) -> None:
+        """Test a custom key function with an explicit cache."""
+        cache = Cache(max_entries=10)
+
+        @memoize(cache, key=lambda name: name.lower())
+        def normalize(name: str) -> str:
+            return name.strip()
+
+        normalize("ABC")
+        normalize("abc")
+        assert cache.stats().hits == 1
+
+    def test_cache_and_options_conflict(self) -> None:
+        """Test that a cache and cache options cannot be combined."""
+        with pytest.raises(TypeError, match="either a cache"):
+            memoize(Cache(), ttl=1.0)
+
+    def test_async_single_flight(self) -> None:
+        """Test that concurrent coroutine misses share one computation."""
+        calls = []
+
+        @memoize()
+        async def fetch(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        async def run() -> list[str]:
+            return await asyncio.gather(*(fetch("a") for _ in range(10)), fetch("b"))
+
+        results = asyncio.run(run())
+        assert results == ["A"] * 10 + ["B"]
+        assert calls == ["a", "b"]
+
+    def test_async_exception_not_cached(self) -> None:
+        """Test that failures propagate to all waiters and are retried."""
+        calls = []
+
+        @memoize()
+        async def flaky() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return 42
+
+        async def run() -> tuple[object, ...]:
+            return tuple(await asyncio.gather(flaky(), flaky(), return_exceptions=True))
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert asyncio.run(flaky()) == 42
+        assert len(calls) == 2
+
+    def test_async_cancelled_caller_does_not_cancel_others(self) -> None:
+        """Test that cancelling the caller that started a computation leaves the others waiting on it."""
+        calls = []
+
+        @memoize()
+        async def fetch(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.05)
+            return key.upper()
+
+        async def run() -> list[str]:
+            first = asyncio.ensure_future(fetch("a"))
+            await asyncio.sleep(0)
+            others = asyncio.gather(fetch("a"), fetch("a"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return list(await others)
+
+        assert asyncio.run(run()) == ["A", "A"]
+        assert calls == ["a"]
+        assert asyncio.run(fetch("a")) == "A"
+        assert calls == ["a"]
+
+    def test_async_calls_on_different_loops_are_separate(self) -> None:
+        """Test that a call in flight on one event loop is not awaited from another."""
+        started = threading.Event()
+        calls = []
+
+        @memoize()
+        async def fetch(key: str) -> str:
+            calls.append(key)
+            started.set()
+            await asyncio.sleep(0.2)
+            return key.upper()
+
+        results: list[str] = []
+        thread = threading.Thread(target=lambda: results.append(asyncio.run(fetch("a"))))
+        thread.start()
+        started.wait()
+        results.append(asyncio.run(fetch("a")))
+        thread.join()
+        assert results == ["A", "A"]
+        assert calls == ["a", "a"]
@@ -0,0 +1,232 @@
+"""Tests for validation module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import pickle
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from your_package_name.columnar import filter_file
+from your_package_name.streaming import filter_csv
+from your_package_name.validation import (
+    ColumnRule,
+    ValidationError,
+    ValidationSpec,
+    Validator,
+    load_validation_spec,
+    validate_csv,
+)
+
+SPEC = ValidationSpec(
+    columns={
+        "id": ColumnRule(dtype="int", nullable=False, unique=True),
+        "value": ColumnRule(dtype="float", nullable=False, min_value=0.0, max_value=1.0),
+    },
+)
+
+
+def write_csv(path: Path, rows: list[str], header: str = "id,value") -> Path:
+    """Write a CSV file from a header and raw data lines."""
+    path.write_text("\n".join([header, *rows]) + "\n", encoding="utf-8")
+    return path
+
+
+class TestValidationSpec:
+    """Tests for ValidationSpec and ColumnRule classes."""
+
+    def test_from_mapping_round_trip(self) -> None:
+        """Test that to_dict output builds an equal spec."""
+        assert ValidationSpec.from_mapping(SPEC.to_dict()) == SPEC
+
+    def test_unknown_setting_raises_error(self) -> None:
+        """Test that misspelled settings are rejected instead of ignored."""
+        with pytest.raises(ValueError, match="maxrows"):
+            ValidationSpec.from_mapping({"maxrows": 10})
+        with pytest.raises(ValueError, match="min"):
+            ValidationSpec.from_mapping({"columns": {"value": {"min": 0}}})
+
+    def test_bounds_need_numeric_type(self) -> None:
+        """Test that range and aggregate bounds on a text column are rejected."""
+        with pytest.raises(ValueError, match="numeric"):
+            ColumnRule(min_value=0)
+
+    def test_invalid_type_raises_error(self) -> None:
+        """Test that an unknown column type is rejected."""
+        with pytest.raises(ValueError, match="Column type"):
+            ColumnRule(dtype="date")  # type: ignore[arg-type]
+
+    def test_load_from_toml(self, tmp_path: Path) -> None:
+        """Test loading a spec from a TOML file."""
+        path = tmp_path / "spec.toml"
+        path.write_text('max_rows = 5\n[columns.value]\ndtype = "float"\nmax_mean = 0.6\n', encoding="utf-8")
+        spec = load_validation_spec(path)
+        assert spec.max_rows == 5
+        assert spec.columns["value"] == ColumnRule(dtype="float", max_mean=0.6)
+
+
+class TestValidator:
+    """Tests for Validator class."""
+
+    def test_valid_rows_pass(self) -> None:
+        """Test that clean rows pass and column statistics are reported."""
+        validator = Validator(SPEC)
+        validator.check_header(["id", "value"])
+        validator.check_rows([{"id": "1", "value": "0.25"}, {"id": "2", "value": "0.75"}])
+        report = validator.finish()
+        assert report.passed
+        assert report.rows_checked == 2
+        assert report.columns["value"]["mean"] == pytest.approx(0.5)
+        assert report.columns["value"]["sum"] == pytest.approx(1.0)
+
+    def test_row_level_issues_are_collected(self) -> None:
+        """Test that type, null, range and uniqueness issues are all reported."""
+        validator = Validator(SPEC)
+        validator.check_header(["id", "value"])
+        validator.check_rows(
+            [
+                {"id": "1", "value": "0.5"},
+                {"id": "1", "value": "1.5"},
+                {"id": "x", "value": ""},
+            ]
+        )
+        with pytest.raises(ValidationError) as caught:
+            validator.finish()
+        report = caught.value.report
+        assert report.issue_counts == {"unique": 1, "range": 1, "type": 1, "null": 1}
+        assert [issue.row for issue in report.issues] == [2, 2, 3, 3]
+        assert not report.stopped_early
+
+    def test_missing_column_is_fatal(self) -> None:
+        """Test that a schema issue stops validation at the header."""
+        with pytest.raises(ValidationError) as caught:
+            Validator(SPEC).check_header(["id"])
+        assert caught.value.report.stopped_early
+        assert caught.value.report.issues[0].check == "schema"
+
+    def test_extra_columns_can_be_rejected(self) -> None:
+        """Test that allow_extra_columns=False rejects unnamed columns."""
+        spec = ValidationSpec(columns=SPEC.columns, allow_extra_columns=False)
+        with pytest.raises(ValidationError, match="Unexpected column 'payload'"):
+            Validator(spec).check_header(["id", "value", "payload"])
+
+    def test_max_errors_stops_early(self) -> None:
+        """Test that validation stops once max_errors issues were found."""
+        validator = Validator(ValidationSpec(columns=SPEC.columns, max_errors=2))
+        rows: list[dict[Optional[str], str]] = [{"id": str(row), "value": "2"} for row in range(10)]
+        with pytest.raises(ValidationError) as caught:
+            validator.check_rows(rows)
+        assert caught.value.report.rows_checked == 2
+        assert caught.value.report.stopped_early
+
+    def test_max_rows_is_checked_while_streaming(self) -> None:
+        """Test that exceeding max_rows stops validation at the first extra row."""
+        validator = Validator(ValidationSpec(max_rows=3))
+        with pytest.raises(ValidationError, match="More than 3"):
+            validator.check_rows([{"id": str(row)} for row in range(100)])
+        assert validator.report.rows_checked == 4
+
+    def test_aggregate_bounds(self) -> None:
+        """Test the row count, sum, mean, stddev and null fraction checks."""
+        rule = ColumnRule(dtype="float", max_sum=1.0, min_mean=0.5, max_stddev=0.1, max_null_fraction=0.2)
+        validator = Validator(ValidationSpec(columns={"value": rule}, min_rows=5))
+        validator.check_rows([{"value": "0.0"}, {"value": "0.9"}, {"value": ""}, {"value": "0.6"}])
+        with pytest.raises(ValidationError) as caught:
+            validator.finish()
+        assert caught.value.report.issue_counts == {"count": 1, "sum": 1, "stddev": 1, "null_fraction": 1}
+
+    @pytest.mark.parametrize("raw", ["nan", "inf", "-Infinity"])
+    def test_non_finite_values_are_rejected(self, raw: str) -> None:
+        """Test that nan and inf are type issues and stay out of the statistics."""
+        validator = Validator(ValidationSpec(columns={"value": ColumnRule(dtype="float", max_mean=1.0)}))
+        validator.check_rows([{"value": "0.5"}, {"value": raw}])
+        with pytest.raises(ValidationError, match="not a finite float") as caught:
+            validator.finish()
+        assert caught.value.report.issue_counts == {"type": 1}
+        assert caught.value.report.columns["value"]["mean"] == pytest.approx(0.5)
+
+    def test_overflowing_aggregate_fails(self) -> None:
+        """Test that a sum overflowing to inf fails its bounds instead of passing unchecked."""
+        validator = Validator(ValidationSpec(columns={"value": ColumnRule(dtype="float", min_sum=0.0)}))
+        validator.check_rows([{"value": "1e308"}, {"value": "1e308"}])
+        with pytest.raises(ValidationError) as caught:
+            validator.finish()
+        assert caught.value.report.issue_counts == {"sum": 1}
+
+    def test_error_survives_pickling(self) -> None:
+        """Test that the error and its report cross process boundaries."""
+        with pytest.raises(ValidationError) as caught:
+            Validator(SPEC).check_header([])
+        restored = pickle.loads(pickle.dumps(caught.value))  # noqa: S301
+        assert restored.report == caught.value.report
+        assert str(restored) == str(caught.value)
+
+
+class TestValidateCsv:
+    """Tests for validate_csv function."""
+
+    def test_returns_failed_report(self, tmp_path: Path) -> None:
+        """Test that a failed validation is returned, not raised."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.5", "2,oops"])
+        report = validate_csv(source, SPEC)
+        assert not report.passed
+        assert report.issue_counts == {"type": 1}
+        assert json.loads(json.dumps(report.to_dict()))["passed"] is False
+
+    def test_more_fields_than_header(self, tmp_path: Path) -> None:
+        """Test that a row with extra fields is a fatal schema issue."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.5", "2,0.6,extra"])
+        report = validate_csv(source, SPEC)
+        assert report.stopped_early
+        assert report.issues[0].row == 2
+
+
+class TestFilterWithValidation:
+    """Tests for validation in the same pass as the filter."""
+
+    def test_passing_input_is_filtered(self, tmp_path: Path) -> None:
+        """Test that a valid input is filtered and the report returned."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.2", "2,0.9", "3,0.7"])
+        stats = filter_csv(source, tmp_path / "output.csv", 0.5, validation=SPEC)
+        assert stats.validation is not None
+        assert stats.validation.passed
+        assert (tmp_path / "output.csv").read_text().splitlines() == ["id,value", "2,0.9", "3,0.7"]
+
+    def test_failing_input_leaves_output_untouched(self, tmp_path: Path) -> None:
+        """Test that failed validation keeps any previous output in place."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.2", "2,", "3,0.7"])
+        output = tmp_path / "output.csv"
+        output.write_text("previous\n")
+        with pytest.raises(ValidationError, match="'value' is empty"):
+            filter_csv(source, output, 0.5, validation=SPEC)
+        assert output.read_text() == "previous\n"
+
+    def test_checkpoints_are_disabled(self, tmp_path: Path) -> None:
+        """Test that validation runs without checkpoints and cannot resume."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.2", "2,0.9"])
+        stats = filter_csv(source, tmp_path / "output.csv", checkpoint_interval=0.0, validation=SPEC)
+        assert stats.rows_written == 1
+        with pytest.raises(ValueError, match="cannot resume"):
+            filter_csv(source, tmp_path / "output.csv", resume=True, validation=SPEC)
+
+    def test_filter_file_uses_validating_reader(self, tmp_path: Path) -> None:
+        """Test that validation overrides the split and mmap readers."""
+        source = write_csv(tmp_path / "input.csv", ["1,0.2", "1,0.9"])
+        with pytest.raises(ValidationError, match="duplicate 'id'"):
+            filter_file(source, tmp_path / "output.csv", jobs=2, reader="mmap", validation=SPEC)
@@ -0,0 +1,162 @@
+"""Tests for watch module.
+
+Copyright (C) 2026 Wiktor Hawrylik
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from your_package_name.watch import DirectoryWatcher, WatchReport, watch
+
+
+def inotify_available(directory: Path) -> bool:
+    """Return True if inotify can watch a directory here."""
+    watcher = DirectoryWatcher(directory)
+    try:
+        return watcher.uses_inotify
+    finally:
+        watcher.close()
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> None:
+    """Wait until a condition holds, failing the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Condition not met in time")
+        time.sleep(0.02)
+
+
+class TestDirectoryWatcher:
+    """Tests for DirectoryWatcher class."""
+
+    def test_settled_files_reported_once(self, tmp_path: Path) -> None:
+        """Test that a file is reported after settling and then not again."""
+        (tmp_path / "a.csv").write_text("id,value\n")
+        watcher = DirectoryWatcher(tmp_path, settle=0, use_inotify=False)
+        assert watcher.poll() == [tmp_path / "a.csv"]
+        assert watcher.poll() == []
+
+    def test_unsettled_file_waits(self, tmp_path: Path) -> None:
+        """Test that a file is held back until it stops changing for the settle time."""
+        (tmp_path / "a.csv").write_text("id,value\n")
+        watcher = DirectoryWatcher(tmp_path, settle=0.2, use_inotify=False)
+        assert watcher.poll() == []
+        time.sleep(0.25)
+        assert watcher.poll() == [tmp_path / "a.csv"]
+
+    def test_change_restarts_settle(self, tmp_path: Path) -> None:
+        """Test that a growing file restarts its settle time."""
+        path = tmp_path / "a.csv"
+        path.write_text("id,value\n")
+        watcher = DirectoryWatcher(tmp_path, settle=0.2, use_inotify=False)
+        watcher.poll()
+        time.sleep(0.25)
+        path.write_text("id,value\n1,0.5\n")
+        assert watcher.poll() == []
+
+    def test_completed_names_skip_settle(self, tmp_path: Path) -> None:
+        """Test that files announced as complete are reported without settling."""
+        (tmp_path / "a.csv").write_text("id,value\n")
+        watcher = DirectoryWatcher(tmp_path, settle=60, use_inotify=False)
+        assert watcher.poll(["a.csv"]) == [tmp_path / "a.csv"]
+
+    def test_ignores_hidden_and_other_files(self, tmp_path: Path) -> None:
+        """Test that hidden files, other suffixes and directories are ignored."""
+        (tmp_path / ".a.csv").write_text("id,value\n")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "done.csv").mkdir()
+        watcher = DirectoryWatcher(tmp_path, settle=0, use_inotify=False)
+        assert watcher.poll() == []
+
+    def test_forget(self, tmp_path: Path) -> None:
+        """Test that a forgotten path is reported again."""
+        (tmp_path / "a.csv").write_text("id,value\n")
+        watcher = DirectoryWatcher(tmp_path, settle=0, use_inotify=False)
+        watcher.poll()
+        watcher.forget(tmp_path / "a.csv")
+        assert watcher.poll() == [tmp_path / "a.csv"]
+
+    def test_inotify_reports_closed_file(self, tmp_path: Path) -> None:
+        """Test that inotify reports a file closed after writing without waiting to settle."""
+        if not inotify_available(tmp_path):
+            pytest.skip("inotify is not available")
+        watcher = DirectoryWatcher(tmp_path, settle=60)
+        try:
+            (tmp_path / "a.csv").write_text("id,value\n")
+            assert watcher.wait(5.0) == [tmp_path / "a.csv"]
+        finally:
+            watcher.close()
+
+
+class TestWatch:
+    """Tests for watch function."""
+
+    @pytest.mark.parametrize("use_inotify", [False, None])
+    def test_processes_and_moves_files(self, tmp_path: Path, use_inotify: bool) -> None:
+        """Test that landed files are filtered and moved to done or failed."""
+        incoming, output = tmp_path / "incoming", tmp_path / "processed"
+        incoming.mkdir()
+        (incoming / "early.csv").write_text("id,value\n1,0.9\n2,0.1\n")
+        stop = threading.Event()
+        result: list[WatchReport] = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                watch(incoming, output, 0.5, stop=stop, jobs=1, settle=0, interval=0.05, use_inotify=use_inotify)
+            )
+        )
+        thread.start()
+        try:
+            wait_for((incoming / "done" / "early.csv").exists)
+            (incoming / ".late.csv").write_text("id,value\n3,0.7\n")
+            (incoming / ".late.csv").rename(incoming / "late.csv")
+            (incoming / "bad.csv").write_text("id,value\n4,abc\n")
+            wait_for(lambda: (incoming / "done" / "late.csv").exists() and (incoming / "failed" / "bad.csv").exists())
+        finally:
+            stop.set()
+            thread.join()
+
+        report = result[0]
+        assert sorted(path.name for path in report.processed) == ["early.csv", "late.csv"]
+        assert [path.name for path in report.failed] == ["bad.csv"]
+        assert (report.rows_read, report.rows_written) == (3, 2)
+        assert (output / "early.csv").read_text().splitlines() == ["id,value", "1,0.9"]
+        assert "must be numeric" in (incoming / "failed" / "bad.csv.error.txt").read_text()
+        assert not (output / "bad.csv").exists()
+        assert sorted(path.name for path in incoming.iterdir()) == ["done", "failed"]
+
+    def test_stop_before_start(self, tmp_path: Path) -> None:
+        """Test that a set stop event returns without picking up files."""
+        (tmp_path / "a.csv").write_text("id,value\n1,0.9\n")
+        stop = threading.Event()
+        stop.set()
+        report = watch(tmp_path, tmp_path / "out", stop=stop, jobs=1, settle=0, use_inotify=False)
+        assert report == WatchReport()
+        assert (tmp_path / "a.csv").exists()
+
+    def test_missing_directory(self, tmp_path: Path) -> None:
+        """Test that a missing watch directory is rejected."""
+        with pytest.raises(FileNotFoundError, match="Watch directory"):
+            watch(tmp_path / "missing", tmp_path / "out", stop=threading.Event())
+
+    def test_invalid_threshold(self, tmp_path: Path) -> None:
+        """Test that an out-of-range threshold is rejected."""
+        with pytest.raises(ValueError, match="Threshold"):
+            watch(tmp_path, tmp_path / "out", 2.0, stop=threading.Event())